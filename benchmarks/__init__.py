@@ -0,0 +1 @@
+"""Micro-benchmarks for the mechanics and persistence layers."""
@@ -0,0 +1,402 @@
+"""
+Synthetic large-campaign datasets.
+
+The tests seed a handful of rows, far from what a long-running campaign
+collects. build_campaign synthesizes one campaign at a chosen scale
+(characters with their logs, pool ships, library items, a scene graph,
+encounters with long combat logs) from sta.generators, seeded so every
+run loads the same data:
+
+    dataset = await build_campaign(db, SCALES["large"], seed=7)
+    print(dataset.counts, dataset.seconds)
+
+Rows are built in chunks and loaded with executemany INSERTs. Primary
+keys are assigned up front from the tables' current maximum, so child
+rows can reference their parents without reading anything back.
+Everything is committed once at the end.
+"""
+
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import func, insert, select
+
+from sta.database.schema import (
+    CampaignPlayerRecord,
+    CampaignRecord,
+    CampaignShipRecord,
+    CombatLogRecord,
+    EncounterRecord,
+    SceneEdgeRecord,
+    SceneRecord,
+    StarshipRecord,
+)
+from sta.database.vtt_schema import (
+    LogEntryRecord,
+    UniverseItemRecord,
+    VTTCharacterRecord,
+    VTTShipRecord,
+)
+from sta.generators.bulk import (
+    BULK_CHUNK_SIZE,
+    character_batches,
+    character_rows,
+    ship_batches,
+    ship_rows,
+    starship_from_data,
+)
+from sta.mechanics.action_config import ACTION_CONFIGS
+from sta.models.enums import CrewQuality
+
+PLAYER_POSITIONS = ["captain", "tactical", "conn", "engineering", "science"]
+LOG_TYPES = {  # log_type: (weight, event types)
+    "MISSION": (6, ["scene_enter", "scene_exit"]),
+    "PERSONAL": (3, [None]),
+    "VALUE": (1, ["value_challenged", "value_complied"]),
+}
+SCENE_TYPES = ["narrative", "starship_encounter", "personal_encounter", "social_encounter"]
+COMBAT_ENTRIES_PER_ROUND = 8
+DATASET_START = datetime(2300, 1, 1)  # Fixed, so timestamps are reproducible too
+
+
+@dataclass(frozen=True)
+class DatasetScale:
+    """Row counts of a synthetic campaign."""
+    characters: int
+    log_entries: int
+    ships: int
+    universe_items: int
+    scenes: int
+    encounters: int
+    combat_log_per_encounter: int
+    enemies_per_encounter: int = 3
+    branching: float = 0.3  # Chance of an extra edge out of each scene
+
+
+SCALES = {
+    # Fixture-sized: loads in well under a second
+    "small": DatasetScale(characters=200, log_entries=1_000, ships=50,
+                          universe_items=50, scenes=30, encounters=5,
+                          combat_log_per_encounter=40),
+    "medium": DatasetScale(characters=2_000, log_entries=10_000, ships=500,
+                           universe_items=500, scenes=100, encounters=20,
+                           combat_log_per_encounter=200),
+    # A long-running campaign
+    "large": DatasetScale(characters=20_000, log_entries=60_000, ships=2_000,
+                          universe_items=2_000, scenes=400, encounters=60,
+                          combat_log_per_encounter=500),
+}
+
+
+@dataclass
+class SyntheticCampaign:
+    """What build_campaign loaded."""
+    campaign_pk: int
+    campaign_id: str
+    gm_token: str
+    player_ship_id: int
+    active_encounter_id: str
+    active_scene_id: int
+    counts: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+class _Loader:
+    """Bulk inserts with ids assigned ahead of the INSERT."""
+
+    def __init__(self, db):
+        self.db = db
+        self.counts: dict[str, int] = {}
+        self._next_ids: dict[type, int] = {}
+
+    async def ids(self, model, count: int) -> range:
+        """Reserve count primary keys of model."""
+        if model not in self._next_ids:
+            current = await self.db.scalar(select(func.max(model.id)))
+            self._next_ids[model] = (current or 0) + 1
+        start = self._next_ids[model]
+        self._next_ids[model] = start + count
+        return range(start, start + count)
+
+    async def insert(self, model, rows: list[dict]) -> None:
+        if rows:
+            await self.db.execute(insert(model.__table__), rows)
+            table = model.__tablename__
+            self.counts[table] = self.counts.get(table, 0) + len(rows)
+
+    async def insert_chunked(self, model, rows: Iterable[dict]) -> None:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == BULK_CHUNK_SIZE:
+                await self.insert(model, chunk)
+                chunk = []
+        await self.insert(model, chunk)
+
+
+def _weapons_json(ship) -> str:
+    return json.dumps([
+        {
+            "name": w.name,
+            "weapon_type": w.weapon_type.value,
+            "damage": w.damage,
+            "range": w.range.value,
+            "qualities": w.qualities,
+            "requires_calibration": w.requires_calibration,
+        }
+        for w in ship.weapons
+    ])
+
+
+def _ship_columns(data: dict) -> dict:
+    """Column values shared by StarshipRecord and VTTShipRecord rows."""
+    ship = starship_from_data(data)
+    return {
+        "name": ship.name,
+        "ship_class": ship.ship_class,
+        "ship_registry": ship.registry,
+        "scale": ship.scale,
+        "systems_json": json.dumps(data["systems"]),
+        "departments_json": json.dumps(data["departments"]),
+        "weapons_json": _weapons_json(ship),
+        "talents_json": json.dumps(ship.talents),
+        "traits_json": json.dumps(ship.traits),
+        "breaches_json": "[]",
+        "shields": ship.shields,
+        "shields_max": ship.shields_max,
+        "resistance": ship.resistance,
+        "has_reserve_power": True,
+        "shields_raised": False,
+        "weapons_armed": False,
+        "crew_quality": data["crew_quality"],
+    }
+
+
+async def build_campaign(
+    db,
+    scale: DatasetScale = SCALES["small"],
+    seed: int = 0,
+    campaign_id: Optional[str] = None,
+) -> SyntheticCampaign:
+    """
+    Load a synthetic campaign into db and commit it.
+
+    Args:
+        db: AsyncSession to load into
+        scale: Row counts (see SCALES)
+        seed: Seed for every random draw
+        campaign_id: Public campaign id (defaults to synthetic-<seed>)
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    load = _Loader(db)
+    campaign_id = campaign_id or f"synthetic-{seed}"
+
+    # Campaign, player ship, players
+    [player_data] = next(ship_batches(1, rng.getrandbits(32)))
+    [player_ship_id] = await load.ids(StarshipRecord, 1)
+    await load.insert(StarshipRecord, [{"id": player_ship_id, **_ship_columns(player_data)}])
+    [campaign_pk] = await load.ids(CampaignRecord, 1)
+    await load.insert(CampaignRecord, [{
+        "id": campaign_pk,
+        "campaign_id": campaign_id,
+        "name": f"Synthetic Campaign {seed}",
+        "active_ship_id": player_ship_id,
+        "is_active": True,
+        "momentum": 0,
+        "threat": 0,
+        "enemy_turn_multiplier": 0.5,
+    }])
+    # Players play the first characters (ids reserved now, rows loaded below)
+    character_ids = await load.ids(VTTCharacterRecord, scale.characters)
+    main_characters = len(PLAYER_POSITIONS) - 1
+    gm_token = f"{campaign_id}-gm"
+    await load.insert(CampaignPlayerRecord, [
+        {
+            "campaign_id": campaign_pk,
+            "player_name": f"Player {i + 1}",
+            "session_token": gm_token if i == 0 else f"{campaign_id}-player-{i}",
+            "vtt_character_id": (
+                character_ids[i - 1] if 0 < i <= min(main_characters, scale.characters)
+                else None
+            ),
+            "position": position,
+            "is_gm": i == 0,
+            "is_active": True,
+        }
+        for i, position in enumerate(PLAYER_POSITIONS)
+    ])
+
+    # Encounters, each with its enemy ships and combat log
+    enemy_ids = await load.ids(StarshipRecord, scale.encounters * scale.enemies_per_encounter)
+    enemy_batches = ship_batches(len(enemy_ids), rng.getrandbits(32), faction="Klingon",
+                                 crew_quality=CrewQuality.TALENTED)
+    await load.insert_chunked(StarshipRecord, (
+        {"id": ship_id, **_ship_columns(data)}
+        for ship_id, data in zip(enemy_ids, (d for b in enemy_batches for d in b))
+    ))
+    encounter_ids = await load.ids(EncounterRecord, scale.encounters)
+    rounds = max(1, scale.combat_log_per_encounter // COMBAT_ENTRIES_PER_ROUND)
+    per_encounter = scale.enemies_per_encounter
+    await load.insert(EncounterRecord, [
+        {
+            "id": pk,
+            "encounter_id": f"{campaign_id}-encounter-{i}",
+            "name": f"Engagement {i + 1}",
+            "campaign_id": campaign_pk,
+            "status": "active" if pk == encounter_ids[-1] else "completed",
+            "player_ship_id": player_ship_id,
+            "enemy_ship_ids_json": json.dumps(
+                list(enemy_ids[i * per_encounter:(i + 1) * per_encounter])),
+            "round": rounds,
+            "current_turn": "player",
+            "is_active": pk == encounter_ids[-1],
+            "active_effects_json": "[]",
+        }
+        for i, pk in enumerate(encounter_ids)
+    ])
+    actions = sorted(ACTION_CONFIGS)
+
+    def combat_log():
+        for encounter_pk in encounter_ids:
+            for j in range(scale.combat_log_per_encounter):
+                player_turn = j % 2 == 0
+                yield {
+                    "encounter_id": encounter_pk,
+                    "round": j // COMBAT_ENTRIES_PER_ROUND + 1,
+                    "actor_name": "Captain" if player_turn else "Enemy Commander",
+                    "actor_type": "player" if player_turn else "enemy",
+                    "ship_name": player_data["name"] if player_turn else "Enemy",
+                    "action_name": rng.choice(actions),
+                    "action_type": rng.choice(("minor", "major")),
+                    "description": f"Combat entry {j + 1}",
+                    "task_result_json": None,
+                    "damage_dealt": rng.randint(0, 6),
+                    "momentum_spent": rng.randint(0, 2),
+                    "threat_spent": rng.randint(0, 2),
+                    "timestamp": DATASET_START + timedelta(seconds=encounter_pk * 10_000 + j),
+                }
+    await load.insert_chunked(CombatLogRecord, combat_log())
+
+    # Scenes: completed up to the active one, drafts after it; the first
+    # scenes carry the encounters
+    scene_ids = await load.ids(SceneRecord, scale.scenes)
+    active_index = scale.scenes * 2 // 3
+    scene_types = rng.choices(SCENE_TYPES, k=scale.scenes)
+    encounter_scenes = dict(zip(
+        sorted(rng.sample(range(active_index), min(scale.encounters - 1, active_index))),
+        encounter_ids[:-1],
+    ))
+    encounter_scenes[active_index] = encounter_ids[-1]
+    await load.insert_chunked(SceneRecord, (
+        {
+            "id": pk,
+            "campaign_id": campaign_pk,
+            "encounter_id": encounter_scenes.get(i),
+            "name": f"Scene {i + 1}",
+            "scene_type": "starship_encounter" if i in encounter_scenes else scene_types[i],
+            "status": ("completed" if i < active_index
+                       else "active" if i == active_index else "draft"),
+            "stardate": f"{47000 + i}.{i % 10}",
+        }
+        for i, pk in enumerate(scene_ids)
+    ))
+    edges = set(zip(scene_ids, scene_ids[1:]))  # The main storyline
+    for i, pk in enumerate(scene_ids[:-2]):
+        if rng.random() < scale.branching:
+            edges.add((pk, scene_ids[rng.randint(i + 2, min(i + 6, len(scene_ids) - 1))]))
+    await load.insert_chunked(SceneEdgeRecord, (
+        {"campaign_id": campaign_pk, "from_scene_id": a, "to_scene_id": b}
+        for a, b in sorted(edges)
+    ))
+
+    # Characters and their logs
+    names = {}
+
+    def characters():
+        ids = iter(character_ids)
+        for batch in character_batches(scale.characters, rng.getrandbits(32)):
+            for data in batch:
+                pk = next(ids)
+                is_main = pk - character_ids.start < main_characters
+                names[pk] = data["name"]
+                yield {
+                    "id": pk,
+                    "name": data["name"],
+                    "species": data["species"],
+                    "rank": data["rank"],
+                    "role": data["role"],
+                    "attributes_json": json.dumps(data["attributes"]),
+                    "disciplines_json": json.dumps(data["disciplines"]),
+                    "talents_json": json.dumps(data["talents"]),
+                    "focuses_json": json.dumps(data["focuses"]),
+                    "stress": data["stress"],
+                    "stress_max": data["stress_max"],
+                    "character_type": "main" if is_main else "npc",
+                    "campaign_id": campaign_pk,
+                    "scene_id": rng.choice(scene_ids) if rng.random() < 0.1 else None,
+                    "state": "Ok",
+                }
+    await load.insert_chunked(VTTCharacterRecord, characters())
+
+    # Logs lean towards the main characters, in time order
+    weights = [50 if i < main_characters else 1 for i in range(scale.characters)]
+    log_types = list(LOG_TYPES)
+    log_weights = [LOG_TYPES[t][0] for t in log_types]
+
+    def log_entries():
+        remaining = scale.log_entries
+        written = 0
+        while remaining:
+            n = min(remaining, BULK_CHUNK_SIZE)
+            authors = rng.choices(character_ids, weights=weights, k=n)
+            types = rng.choices(log_types, weights=log_weights, k=n)
+            for author, log_type in zip(authors, types):
+                created = DATASET_START + timedelta(minutes=written)
+                yield {
+                    "character_id": author,
+                    "campaign_id": campaign_pk,
+                    "log_type": log_type,
+                    "content": f"{log_type.title()} log {written + 1}",
+                    "event_type": rng.choice(LOG_TYPES[log_type][1]),
+                    "character_name": names[author],
+                    "created_at": created,
+                    "updated_at": created,
+                }
+                written += 1
+            remaining -= n
+    await load.insert_chunked(LogEntryRecord, log_entries())
+
+    # Ship pool and library
+    pool_ids = await load.ids(VTTShipRecord, scale.ships)
+    pool_batches = ship_batches(scale.ships, rng.getrandbits(32))
+    await load.insert_chunked(VTTShipRecord, (
+        {"id": pk, **_ship_columns(data), "campaign_id": campaign_pk}
+        for pk, data in zip(pool_ids, (d for b in pool_batches for d in b))
+    ))
+    await load.insert_chunked(CampaignShipRecord, (
+        {"campaign_id": campaign_pk, "ship_id": player_ship_id, "vtt_ship_id": pk,
+         "is_available": True}
+        for pk in pool_ids
+    ))
+    half = scale.universe_items // 2
+    for rows in character_rows(half, rng.getrandbits(32)):
+        await load.insert(UniverseItemRecord, rows)
+    for rows in ship_rows(scale.universe_items - half, rng.getrandbits(32)):
+        await load.insert(UniverseItemRecord, rows)
+
+    await db.commit()
+    return SyntheticCampaign(
+        campaign_pk=campaign_pk,
+        campaign_id=campaign_id,
+        gm_token=gm_token,
+        player_ship_id=player_ship_id,
+        active_encounter_id=f"{campaign_id}-encounter-{scale.encounters - 1}",
+        active_scene_id=scene_ids[active_index],
+        counts=load.counts,
+        seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,28 @@
+"""Tabular output shared by the benchmark, simulation and load test scripts."""
+
+import csv
+from pathlib import Path
+
+
+def write_rows(rows: list[dict], path) -> Path:
+    """Write dict rows to CSV, or Parquet for a .parquet path."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError(
+                "Parquet output requires pyarrow; install it or write .csv instead"
+            ) from None
+        pq.write_table(pa.Table.from_pylist(rows), path)
+        return path
+
+    fieldnames = []
+    for row in rows:
+        fieldnames.extend(key for key in row if key not in fieldnames)
+    with path.open("w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
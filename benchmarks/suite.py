@@ -0,0 +1,282 @@
+"""
+Benchmark cases and the timing harness.
+
+Each case is a setup function registered with @benchmark; setup builds
+its inputs once (seeded, so every run times the same work) and returns
+the zero-argument callable to time. Results are per-call times in
+microseconds: the best and median of several timed batches, each long
+enough to swamp timer resolution.
+
+Usage:
+    results = run_benchmarks()
+    regressions = [r for r in compare(baseline, results) if r["regressed"]]
+"""
+
+import json
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+from sta.database.schema import CharacterRecord, StarshipRecord
+from sta.database.vtt_schema import VTTCharacterRecord, VTTShipRecord
+from sta.generators import generate_character, generate_starship
+from sta.generators.starship import generate_enemy_ship
+from sta.mechanics.action_config import get_all_actions_availability
+from sta.mechanics.dice import count_successes, player_task_roll
+from sta.mechanics.movement import get_valid_impulse_moves
+from sta.models.combat import ActiveEffect, HexCoord, TacticalMap
+from sta.models.enums import SystemType, TerrainType
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+DEFAULT_THRESHOLD = 0.25  # Flag cases more than 25% slower than baseline
+
+BENCHMARKS: dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Register a setup function under a benchmark name."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _map_with_terrain(radius: int, seed: int = 7) -> TacticalMap:
+    """A map with roughly a fifth of its hexes covered by terrain."""
+    rng = random.Random(seed)
+    tactical_map = TacticalMap(radius=radius)
+    terrain = [t for t in TerrainType if t != TerrainType.OPEN]
+    for coord in tactical_map.get_all_coords():
+        if coord != HexCoord(0, 0) and rng.random() < 0.2:
+            tactical_map.set_terrain(coord, rng.choice(terrain))
+    return tactical_map
+
+
+# ===== Dice =====
+
+@benchmark("dice.count_successes")
+def _count_successes():
+    rng = random.Random(1)
+    pools = [[rng.randint(1, 20) for _ in range(5)] for _ in range(100)]
+
+    def run():
+        for rolls in pools:
+            count_successes(rolls, 12, focus_value=3)
+    return run
+
+
+@benchmark("dice.player_task_roll")
+def _player_task_roll():
+    def run():
+        random.seed(2)
+        for _ in range(100):
+            player_task_roll(10, 3, difficulty=2, focus=True, bonus_dice=1)
+    return run
+
+
+# ===== Movement =====
+
+def _impulse_moves(radius: int):
+    def setup():
+        tactical_map = _map_with_terrain(radius)
+
+        def run():
+            get_valid_impulse_moves(HexCoord(0, 0), tactical_map)
+        return run
+    return setup
+
+
+for _radius in (3, 6, 10):
+    benchmark(f"movement.get_valid_impulse_moves[r{_radius}]")(_impulse_moves(_radius))
+
+
+# ===== Action availability =====
+
+@benchmark("actions.get_all_actions_availability")
+def _actions_availability():
+    random.seed(3)
+    ship = generate_starship()
+    ship.id = "bench-ship"
+    ship.add_breach(SystemType.WEAPONS)
+    ship.add_breach(SystemType.ENGINES)
+    # Only scene.ships is read, so a stand-in scene keeps this self-contained
+    scene = SimpleNamespace(ships=[ship])
+
+    def run():
+        get_all_actions_availability(scene, "bench-ship")
+    return run
+
+
+# ===== Serialization =====
+
+def _map_round_trip(radius: int):
+    def setup():
+        data = _map_with_terrain(radius).to_dict()
+
+        def run():
+            TacticalMap.from_dict(data).to_dict()
+        return run
+    return setup
+
+
+for _radius in (3, 10):
+    benchmark(f"combat.TacticalMap_round_trip[r{_radius}]")(_map_round_trip(_radius))
+
+
+@benchmark("combat.ActiveEffect_round_trip")
+def _active_effects():
+    effects = [
+        ActiveEffect("Calibrate Weapons", "attack", "next_action", damage_bonus=1),
+        ActiveEffect("Modulate Shields", "defense", "end_of_turn", resistance_bonus=2),
+        ActiveEffect("Targeting Solution", "attack", "next_action", can_reroll=True),
+        ActiveEffect("Evasive Action", "defense", "end_of_round", is_opposed=True),
+        ActiveEffect("Sensor Sweep", "sensor", "end_of_round",
+                      detected_position={"q": 1, "r": -1}),
+    ] * 4
+    payload = json.dumps([e.to_dict() for e in effects])
+
+    def run():
+        loaded = [ActiveEffect.from_dict(e) for e in json.loads(payload)]
+        json.dumps([e.to_dict() for e in loaded])
+    return run
+
+
+# ===== Records =====
+
+def _record_to_model(record_cls, generate):
+    def setup():
+        random.seed(4)
+        record = record_cls.from_model(generate())
+
+        def run():
+            record.to_model()
+        return run
+    return setup
+
+
+benchmark("records.CharacterRecord.to_model")(
+    _record_to_model(CharacterRecord, generate_character))
+benchmark("records.StarshipRecord.to_model")(
+    _record_to_model(StarshipRecord, generate_starship))
+benchmark("records.StarshipRecord.to_model[npc]")(
+    _record_to_model(StarshipRecord, lambda: generate_enemy_ship(difficulty="hard")))
+benchmark("records.VTTCharacterRecord.to_model")(
+    _record_to_model(VTTCharacterRecord, generate_character))
+benchmark("records.VTTShipRecord.to_model")(
+    _record_to_model(VTTShipRecord, generate_starship))
+
+
+# ===== Harness =====
+
+def time_case(func: Callable[[], object], repeat: int = 5, min_time: float = 0.05) -> dict:
+    """
+    Time a callable.
+
+    The loop count doubles until one batch takes at least min_time, then
+    repeat batches are timed at that count.
+
+    Returns:
+        Dict with loops, best_us and median_us (per call)
+    """
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - started >= min_time:
+            break
+        loops *= 2
+
+    per_call = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        per_call.append((time.perf_counter() - started) / loops * 1e6)
+
+    return {
+        "loops": loops,
+        "best_us": round(min(per_call), 3),
+        "median_us": round(statistics.median(per_call), 3),
+    }
+
+
+def run_benchmarks(
+    names: Optional[list[str]] = None,
+    repeat: int = 5,
+    min_time: float = 0.05,
+) -> dict:
+    """
+    Run benchmark cases.
+
+    Args:
+        names: Substrings selecting cases to run (all cases if omitted)
+        repeat: Timed batches per case
+        min_time: Minimum seconds per batch
+
+    Returns:
+        Results dict with run metadata and a "benchmarks" mapping
+    """
+    selected = [
+        name for name in BENCHMARKS
+        if not names or any(part in name for part in names)
+    ]
+    results = {}
+    for name in selected:
+        results[name] = time_case(BENCHMARKS[name](), repeat=repeat, min_time=min_time)
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "benchmarks": results,
+    }
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "best_us",
+) -> list[dict]:
+    """
+    Compare current results against a baseline.
+
+    A case regresses when it is more than threshold (a fraction) slower
+    than its baseline. Cases missing from either side are reported with
+    a ratio of None and never count as regressions.
+    """
+    rows = []
+    base_cases = baseline.get("benchmarks", {})
+    current_cases = current.get("benchmarks", {})
+    for name in sorted(set(base_cases) | set(current_cases)):
+        before = base_cases.get(name, {}).get(metric)
+        after = current_cases.get(name, {}).get(metric)
+        ratio = after / before if before and after is not None else None
+        rows.append({
+            "name": name,
+            "baseline_us": before,
+            "current_us": after,
+            "ratio": round(ratio, 3) if ratio is not None else None,
+            "regressed": ratio is not None and ratio > 1 + threshold,
+        })
+    return rows
+
+
+def load_results(path) -> dict:
+    """Load a results JSON file."""
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def save_results(results: dict, path) -> Path:
+    """Write results as JSON, sorted for stable diffs."""
+    path = Path(path)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    return path
@@ -0,0 +1,45 @@
+/**
+ * Times decoding of the polled payloads in JSON and MessagePack.
+ *
+ * Run by scripts/wire_formats.py with a directory of <name>.json and
+ * <name>.msgpack bodies; prints one JSON line per payload with the mean
+ * microseconds for TextDecoder + JSON.parse and for MsgPack.decode.
+ *
+ *     node benchmarks/wire_parse.js /tmp/bodies
+ *     node --jitless benchmarks/wire_parse.js /tmp/bodies   # interpreter only
+ */
+
+const fs = require('fs');
+const path = require('path');
+
+global.window = {};
+require(path.join(__dirname, '..', 'sta', 'web', 'static', 'js', 'msgpack.js'));
+const MsgPack = window.MsgPack;
+
+const MIN_TIME_MS = 200;
+
+function time(fn) {
+    for (let i = 0; i < 50; i++) fn();  // Warm up
+    let loops = 0;
+    const start = process.hrtime.bigint();
+    let elapsed = 0;
+    while (elapsed < MIN_TIME_MS) {
+        for (let i = 0; i < 50; i++) fn();
+        loops += 50;
+        elapsed = Number(process.hrtime.bigint() - start) / 1e6;
+    }
+    return (elapsed * 1000) / loops;
+}
+
+const directory = process.argv[2];
+const utf8 = new TextDecoder();
+for (const file of fs.readdirSync(directory).filter(f => f.endsWith('.json')).sort()) {
+    const name = file.slice(0, -'.json'.length);
+    const json = new Uint8Array(fs.readFileSync(path.join(directory, file)));
+    const packed = new Uint8Array(fs.readFileSync(path.join(directory, `${name}.msgpack`)));
+    console.log(JSON.stringify({
+        name,
+        json_us: time(() => JSON.parse(utf8.decode(json))),
+        msgpack_us: time(() => MsgPack.decode(packed)),
+    }));
+}
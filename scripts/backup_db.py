@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Take, list, prune and restore online snapshots of the server database.
+
+The database is the server's (STA_ASYNC_DATABASE_URL); the backup
+directory, retention and compression come from Settings (BACKUP_*).
+
+Examples:
+    python scripts/backup_db.py snapshot              # safe while the server runs
+    python scripts/backup_db.py snapshot --no-compress
+    python scripts/backup_db.py list
+    python scripts/backup_db.py prune --keep 3
+    python scripts/backup_db.py restore sta-20260101-120000-000000.db.gz
+"""
+
+import sys
+import os
+import argparse
+from pathlib import Path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sta.database.async_db import engine
+from sta.database.backup import (
+    create_snapshot,
+    database_path,
+    list_snapshots,
+    prune_snapshots,
+    restore_snapshot,
+)
+from sta.database.config import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database snapshots")
+    parser.add_argument("--dir", default=settings.BACKUP_DIR, help="Backup directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="Take a snapshot now")
+    snapshot_parser.add_argument("--no-compress", action="store_true",
+                                 help="Write a plain .db file")
+    subparsers.add_parser("list", help="List snapshots, newest first")
+    prune_parser = subparsers.add_parser("prune", help="Delete old snapshots")
+    prune_parser.add_argument("--keep", type=int, default=settings.BACKUP_KEEP)
+    restore_parser = subparsers.add_parser(
+        "restore", help="Replace the database with a snapshot (stop the server first)"
+    )
+    restore_parser.add_argument("snapshot", help="Snapshot name or path")
+    args = parser.parse_args()
+
+    directory = Path(args.dir)
+    database = database_path(engine)
+    if database is None and args.command in ("snapshot", "restore"):
+        sys.exit("Snapshots need a database file: set STA_ASYNC_DATABASE_URL")
+
+    if args.command == "snapshot":
+        def progress(copied, total):
+            print(f"\r  {copied}/{total} pages", end="", flush=True)
+
+        snapshot = create_snapshot(database, directory,
+                                   compress=False if args.no_compress else None,
+                                   progress=progress)
+        print(f"\nWrote {snapshot.path} ({snapshot.size} bytes)")
+        for path in prune_snapshots(directory):
+            print(f"Pruned {path.name}")
+    elif args.command == "list":
+        for snapshot in list_snapshots(directory):
+            print(f"{snapshot.path.name:<40} {snapshot.size:>12}  {snapshot.created_at:%Y-%m-%d %H:%M:%S}")
+    elif args.command == "prune":
+        for path in prune_snapshots(directory, args.keep):
+            print(f"Pruned {path.name}")
+    elif args.command == "restore":
+        snapshot = Path(args.snapshot)
+        if not snapshot.exists():
+            snapshot = directory / args.snapshot
+        if not snapshot.exists():
+            sys.exit(f"No snapshot {args.snapshot}")
+        try:
+            restore_snapshot(snapshot, database)
+        except ValueError as exc:
+            sys.exit(str(exc))
+        print(f"Restored {database} from {snapshot.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Run the mechanics benchmarks and compare them against the baseline.
+
+Baselines are machine-specific: refresh benchmarks/baseline.json on the
+machine you compare on before starting performance work.
+
+Examples:
+    python scripts/benchmark.py run                        # print results
+    python scripts/benchmark.py run --save                 # refresh the baseline
+    python scripts/benchmark.py run -k movement --output after.json
+    python scripts/benchmark.py compare                    # run now vs baseline
+    python scripts/benchmark.py compare after.json --threshold 0.1
+"""
+
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite import (
+    BASELINE_PATH,
+    DEFAULT_THRESHOLD,
+    compare,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+
+def print_results(results: dict) -> None:
+    for name, case in results["benchmarks"].items():
+        print(f"{name:<45} best {case['best_us']:>10.2f}us  "
+              f"median {case['median_us']:>10.2f}us  ({case['loops']} loops)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mechanics benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument("-k", "--filter", nargs="+", default=None,
+                            help="Only run cases whose name contains one of these")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case")
+    run_parser.add_argument("--min-time", type=float, default=0.05,
+                            help="Minimum seconds per batch")
+    run_parser.add_argument("--output", default=None, help="Write results to this JSON file")
+    run_parser.add_argument("--save", action="store_true",
+                            help=f"Overwrite the baseline ({BASELINE_PATH.name})")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare against the baseline")
+    compare_parser.add_argument("current", nargs="?", default=None,
+                                help="Results JSON to compare (runs the suite if omitted)")
+    compare_parser.add_argument("--baseline", default=str(BASELINE_PATH),
+                                help="Baseline JSON")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Allowed slowdown as a fraction (0.25 = 25%%)")
+    compare_parser.add_argument("--metric", choices=["best_us", "median_us"],
+                                default="best_us")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_benchmarks(args.filter, repeat=args.repeat, min_time=args.min_time)
+        print_results(results)
+        if args.output:
+            print(f"\nResults written to {save_results(results, args.output)}")
+        if args.save:
+            print(f"Baseline written to {save_results(results, BASELINE_PATH)}")
+        return
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current) if args.current else run_benchmarks()
+    if baseline.get("machine") != current.get("machine") or (
+        baseline.get("python") != current.get("python")
+    ):
+        print(f"Warning: baseline is from {baseline.get('machine')} / Python "
+              f"{baseline.get('python')}; timings may not be comparable\n")
+
+    rows = compare(baseline, current, threshold=args.threshold, metric=args.metric)
+    for row in rows:
+        if row["ratio"] is None:
+            status = "missing"
+            change = ""
+        else:
+            status = "REGRESSED" if row["regressed"] else "ok"
+            change = f"{row['ratio'] - 1:+7.1%}"
+        print(f"{row['name']:<45} {change:>8}  {status}")
+
+    regressed = [row["name"] for row in rows if row["regressed"]]
+    if regressed:
+        sys.exit(f"\n{len(regressed)} benchmark(s) regressed more than {args.threshold:.0%}")
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
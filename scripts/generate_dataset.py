@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Load a synthetic large campaign into the database for performance testing.
+
+Examples:
+    python scripts/generate_dataset.py                      # one "large" campaign
+    python scripts/generate_dataset.py --scale small --seed 3
+    python scripts/generate_dataset.py --campaigns 5 --seed 100
+
+Loads into the server's database (STA_ASYNC_DATABASE_URL), creating the
+tables if needed.
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.dataset import SCALES, build_campaign
+from sta.database.async_db import AsyncSessionLocal, initialize_db
+
+
+async def generate(scale_name: str, seed: int, campaigns: int) -> None:
+    await initialize_db()
+    for offset in range(campaigns):
+        async with AsyncSessionLocal() as db:
+            dataset = await build_campaign(db, SCALES[scale_name], seed=seed + offset)
+        rows = sum(dataset.counts.values())
+        print(f"{dataset.campaign_id}: {rows} rows in {dataset.seconds:.1f}s "
+              f"(GM token {dataset.gm_token})")
+        for table, count in sorted(dataset.counts.items()):
+            print(f"  {table:<22} {count:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic campaign datasets")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="large",
+                        help="Row counts per campaign")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed of the first campaign (each further one adds 1)")
+    parser.add_argument("--campaigns", type=int, default=1, help="Campaigns to load")
+    args = parser.parse_args()
+
+    asyncio.run(generate(args.scale, args.seed, args.campaigns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""Load test the web app with simulated game tables.
+
+Each step seeds a fresh file-backed SQLite database with one campaign and
+active encounter per table, starts the app under uvicorn against it, and
+runs every table's clients (GM screen, viewscreen and players) at the poll
+cadences used by the combat templates, with players and the GM posting
+actions at random intervals. The number of tables grows from step to step
+so the point where latency or lock contention falls over is visible.
+
+Each step is run once per --workers count, so multi-worker throughput can
+be compared against a single worker. A probe on the first table measures
+how long a committed change takes to reach a /api/changes long-poll,
+which with several workers usually crosses processes.
+
+Examples:
+    python scripts/load_test.py --tables 1 5 10 25 50 --duration 60
+    python scripts/load_test.py --tables 10 25 --workers 1 4 --report load.csv
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import secrets
+import statistics
+import subprocess
+import tempfile
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.report import write_rows
+from sta.database.schema import (
+    Base,
+    CampaignPlayerRecord,
+    CampaignRecord,
+    EncounterRecord,
+    StarshipRecord,
+)
+from sta.generators import generate_starship
+from sta.generators.starship import generate_enemy_ship
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Poll cadences in seconds, per client type (see combat_gm.html,
+# combat_viewscreen.html, combat_player_new.html and announcements.js)
+CLIENT_POLLS = {
+    "gm": {"status": 3.0, "combat-log": 5.0, "round-status": 4.0},
+    "viewscreen": {"status": 2.0, "map": 5.0, "combat-log": 2.0},
+    "player": {"status": 2.0, "map": 5.0, "round-status": 4.0, "combat-log?limit=1": 2.0},
+}
+
+LOCKED_MARKER = "database is locked"
+
+
+@dataclass
+class Table:
+    """One seeded campaign with an active encounter."""
+    encounter_id: str
+    encounter_pk: int
+    gm_token: str
+    player_ids: list[int]
+    enemy_ship_ids: list[int]
+
+
+@dataclass
+class RouteStats:
+    """Latencies and outcomes for one route."""
+    latencies_ms: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+    transport_errors: int = 0
+    locked: int = 0
+
+
+def seed_tables(db_path: str, tables: int, players: int, seed: int = 0) -> list[Table]:
+    """Create the schema and one campaign, crew and encounter per table."""
+    random.seed(seed)
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+
+    seeded = []
+    with Session(engine) as session:
+        for index in range(tables):
+            player_ship = StarshipRecord.from_model(generate_starship())
+            enemy_ships = [
+                StarshipRecord.from_model(generate_enemy_ship(difficulty="standard"))
+                for _ in range(2)
+            ]
+            session.add_all([player_ship, *enemy_ships])
+            session.flush()
+
+            campaign = CampaignRecord(
+                campaign_id=f"load-campaign-{index:03d}",
+                name=f"Load Table {index + 1}",
+                active_ship_id=player_ship.id,
+            )
+            session.add(campaign)
+            session.flush()
+
+            gm_token = secrets.token_urlsafe(16)
+            gm = CampaignPlayerRecord(
+                campaign_id=campaign.id,
+                player_name="Game Master",
+                session_token=gm_token,
+                is_gm=True,
+                position="gm",
+            )
+            crew = [
+                CampaignPlayerRecord(
+                    campaign_id=campaign.id,
+                    player_name=f"Player {n + 1}",
+                    session_token=secrets.token_urlsafe(16),
+                    position=position,
+                )
+                for n, position in zip(
+                    range(players),
+                    ["captain", "helm", "tactical", "operations", "engineering", "science"] * 2,
+                )
+            ]
+            session.add_all([gm, *crew])
+            session.flush()
+
+            encounter = EncounterRecord(
+                encounter_id=f"load-encounter-{index:03d}",
+                name=f"Load Encounter {index + 1}",
+                campaign_id=campaign.id,
+                player_ship_id=player_ship.id,
+                enemy_ship_ids_json=json.dumps([s.id for s in enemy_ships]),
+                round=1,
+                current_turn="player",
+                is_active=True,
+                momentum=2,
+                threat=4,
+                players_turns_used_json="{}",
+                active_effects_json="[]",
+                ship_positions_json=json.dumps(
+                    {
+                        "player": {"q": 0, "r": 0},
+                        "enemy_0": {"q": 2, "r": -1},
+                        "enemy_1": {"q": -2, "r": 2},
+                    }
+                ),
+            )
+            session.add(encounter)
+            session.flush()
+            seeded.append(
+                Table(
+                    encounter_id=encounter.encounter_id,
+                    encounter_pk=encounter.id,
+                    gm_token=gm_token,
+                    player_ids=[p.id for p in crew],
+                    enemy_ship_ids=[s.id for s in enemy_ships],
+                )
+            )
+        session.commit()
+    engine.dispose()
+    return seeded
+
+
+def start_server(db_path: str, port: int, workers: int, log_file) -> subprocess.Popen:
+    """Start uvicorn serving the app against the seeded database."""
+    env = dict(os.environ, STA_ASYNC_DATABASE_URL=f"sqlite+aiosqlite:///{db_path}")
+    command = [
+        sys.executable, "-m", "uvicorn", "sta.web.app:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env, stdout=log_file, stderr=log_file)
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    """Poll until the server answers or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/api/action-config/Fire")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start within {timeout:.0f}s")
+
+
+async def request(client, stats, route, method, path, **kwargs) -> None:
+    """Send one request and record its latency and outcome under route."""
+    route_stats = stats[route]
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, path, **kwargs)
+    except httpx.HTTPError:
+        route_stats.errors += 1
+        route_stats.transport_errors += 1
+        return
+    route_stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+    route_stats.statuses[response.status_code] += 1
+    if response.status_code >= 500:
+        route_stats.errors += 1
+        if LOCKED_MARKER in response.text:
+            route_stats.locked += 1
+
+
+async def poll(client, stats, table, route, interval, stop_at, headers) -> None:
+    """Poll one route at a fixed cadence, like the page's setInterval."""
+    path = f"/api/encounter/{table.encounter_id}/{route}"
+    route_name = f"GET {route}"
+    # Clients open their pages at different moments
+    await asyncio.sleep(random.uniform(0, interval))
+    while time.monotonic() < stop_at:
+        started = time.monotonic()
+        await request(client, stats, route_name, "GET", path, headers=headers)
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+async def player_actions(client, stats, table, player_id, interval, stop_at) -> None:
+    """Claim the turn, act and release it, at random intervals."""
+    encounter_path = f"/api/encounter/{table.encounter_id}"
+    while time.monotonic() < stop_at:
+        await asyncio.sleep(random.expovariate(1 / interval))
+        await request(client, stats, "POST claim-turn", "POST",
+                      f"{encounter_path}/claim-turn", json={"player_id": player_id})
+        await request(client, stats, "POST execute-action", "POST", "/api/execute-action",
+                      json={"encounter_id": table.encounter_id,
+                            "action_name": random.choice(["Calibrate Weapons", "Fire", "Scan For Weakness"]),
+                            "actor_type": "player", "player_id": player_id})
+        await request(client, stats, "POST release-turn", "POST",
+                      f"{encounter_path}/release-turn", json={"player_id": player_id})
+
+
+async def gm_actions(client, stats, table, interval, stop_at) -> None:
+    """Adjust Momentum and Threat, damage ships and advance turns."""
+    encounter_path = f"/api/encounter/{table.encounter_id}"
+    headers = {"Cookie": f"sta_session_token={table.gm_token}"}
+    while time.monotonic() < stop_at:
+        await asyncio.sleep(random.expovariate(1 / interval))
+        choice = random.random()
+        if choice < 0.3:
+            await request(client, stats, "POST momentum", "POST", f"{encounter_path}/momentum",
+                          json={"change": random.choice([-1, 1])}, headers=headers)
+        elif choice < 0.6:
+            await request(client, stats, "POST threat", "POST", f"{encounter_path}/threat",
+                          json={"change": random.choice([-1, 1])}, headers=headers)
+        elif choice < 0.8:
+            ship_id = random.choice(table.enemy_ship_ids)
+            await request(client, stats, "POST damage", "POST", f"/api/ship/{ship_id}/damage",
+                          json={"damage": random.randint(1, 4),
+                                "encounter_id": table.encounter_id})
+        else:
+            await request(client, stats, "POST next-turn", "POST", f"{encounter_path}/next-turn")
+
+
+async def notification_probe(client, stats, table, stop_at) -> None:
+    """Time from a committed change to a long-poll on /api/changes seeing it."""
+    params = {"entity_type": "encounter", "entity_id": table.encounter_pk}
+    headers = {"Cookie": f"sta_session_token={table.gm_token}"}
+    route_stats = stats["NOTIFY change"]
+    response = await client.get("/api/changes", params={**params, "since": 0})
+    since = response.json()["seq"]
+    while time.monotonic() + 5 < stop_at:
+        waiter = asyncio.create_task(
+            client.get("/api/changes", params={**params, "since": since, "wait": 5})
+        )
+        await asyncio.sleep(0.2)  # Let the long-poll start waiting
+        await client.post(f"/api/encounter/{table.encounter_id}/threat",
+                          json={"change": random.choice([-1, 1])}, headers=headers)
+        posted = time.perf_counter()
+        try:
+            response = await waiter
+        except httpx.HTTPError:
+            route_stats.errors += 1
+            route_stats.transport_errors += 1
+            continue
+        route_stats.statuses[response.status_code] += 1
+        if response.status_code != 200 or not response.json()["changes"]:
+            route_stats.errors += 1
+            continue
+        # The other GM actions can land first, so clamp early wake-ups to 0
+        route_stats.latencies_ms.append(max(0.0, (time.perf_counter() - posted) * 1000))
+        since = response.json()["seq"]
+        await asyncio.sleep(1)
+
+
+def count_locked_in_log(log_path: str) -> int:
+    """Count failed requests whose traceback ended in a SQLite lock error."""
+    with open(log_path, errors="replace") as handle:
+        return sum(
+            1 for line in handle
+            if line.startswith("sqlalchemy.exc.OperationalError") and LOCKED_MARKER in line
+        )
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize_step(
+    tables: int, workers: int, elapsed: float, stats: dict, server_locked: int
+) -> list[dict]:
+    """One row per route plus a row for the whole step."""
+    rows = []
+    all_latencies = []
+    totals = Counter()
+    for route, route_stats in sorted(stats.items()):
+        latencies = sorted(route_stats.latencies_ms)
+        count = len(latencies) + route_stats.transport_errors
+        # 4xx answers (not your turn, wrong auth) are game rules, not failures
+        rejected = sum(n for code, n in route_stats.statuses.items() if 400 <= code < 500)
+        rows.append(_row(tables, workers, route, elapsed, count, route_stats.errors,
+                         rejected, route_stats.locked, latencies))
+        if route.startswith("NOTIFY"):
+            continue  # A delivery delay, not a request
+        all_latencies.extend(latencies)
+        totals["requests"] += count
+        totals["errors"] += route_stats.errors
+        totals["locked"] += route_stats.locked
+        totals["rejected"] += rejected
+
+    total = _row(tables, workers, "ALL", elapsed, totals["requests"], totals["errors"],
+                 totals["rejected"], max(totals["locked"], server_locked),
+                 sorted(all_latencies))
+    return [total, *rows]
+
+
+def _row(tables, workers, route, elapsed, count, errors, rejected, locked,
+         latencies) -> dict:
+    return {
+        "tables": tables,
+        "workers": workers,
+        "route": route,
+        "requests": count,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "errors": errors,
+        "rejected": rejected,
+        "database_locked": locked,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+    }
+
+
+async def run_step(args, tables: int, workers: int, workdir: str) -> list[dict]:
+    """Seed, serve and drive one table count; return its report rows."""
+    db_path = os.path.join(workdir, f"load_{tables}_{workers}w.db")
+    log_path = os.path.join(workdir, f"server_{tables}_{workers}w.log")
+    seeded = seed_tables(db_path, tables, args.players, seed=args.seed)
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    with open(log_path, "w") as log_file:
+        server = start_server(db_path, args.port, workers, log_file)
+        try:
+            await wait_until_ready(base_url)
+            stats = defaultdict(RouteStats)
+            limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+            async with httpx.AsyncClient(base_url=base_url, limits=limits,
+                                         timeout=args.timeout) as client:
+                started = time.monotonic()
+                stop_at = started + args.duration
+                tasks = []
+                for table in seeded:
+                    gm_headers = {"Cookie": f"sta_session_token={table.gm_token}"}
+                    clients = [("gm", gm_headers), ("viewscreen", None)]
+                    clients += [("player", None)] * len(table.player_ids)
+                    for kind, headers in clients:
+                        for route, interval in CLIENT_POLLS[kind].items():
+                            tasks.append(poll(client, stats, table, route, interval,
+                                              stop_at, headers))
+                    for player_id in table.player_ids:
+                        tasks.append(player_actions(client, stats, table, player_id,
+                                                    args.action_interval, stop_at))
+                    tasks.append(gm_actions(client, stats, table, args.action_interval, stop_at))
+                tasks.append(notification_probe(client, stats, seeded[0], stop_at))
+                await asyncio.gather(*tasks)
+                elapsed = time.monotonic() - started
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    return summarize_step(tables, workers, elapsed, stats, count_locked_in_log(log_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the app with simulated tables")
+    parser.add_argument("--tables", nargs="+", type=int, default=[1, 5, 10, 25, 50],
+                        help="Table counts to step through")
+    parser.add_argument("--players", type=int, default=4, help="Players per table")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds per step")
+    parser.add_argument("--action-interval", type=float, default=20.0,
+                        help="Mean seconds between actions per player and per GM")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1],
+                        help="Uvicorn worker counts to compare")
+    parser.add_argument("--port", type=int, default=8765, help="Port to serve on")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for data and timing")
+    parser.add_argument("--workdir", default=None,
+                        help="Directory for databases and server logs (default: temporary)")
+    parser.add_argument("--report", default="load_test_report.csv",
+                        help="Report output (.csv or .parquet)")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="sta-load-") as tmp:
+        workdir = args.workdir or tmp
+        os.makedirs(workdir, exist_ok=True)
+        for workers, tables in itertools.product(args.workers, args.tables):
+            random.seed(args.seed)
+            step_rows = asyncio.run(run_step(args, tables, workers, workdir))
+            rows.extend(step_rows)
+            total = step_rows[0]
+            print(
+                f"{tables:>3} tables x{workers} workers  "
+                f"{total['throughput_rps']:8.1f} req/s  "
+                f"p50 {total['p50_ms']:7.1f}ms  "
+                f"p95 {total['p95_ms']:7.1f}ms  "
+                f"p99 {total['p99_ms']:7.1f}ms  "
+                f"errors {total['error_rate']:6.2%}  "
+                f"locked {total['database_locked']}"
+            )
+            for row in step_rows[1:]:
+                print(
+                    f"      {row['route']:<28} {row['requests']:>6}  "
+                    f"p50 {row['p50_ms']:7.1f}  p95 {row['p95_ms']:7.1f}  "
+                    f"p99 {row['p99_ms']:7.1f}  errors {row['errors']}"
+                )
+
+    try:
+        print(f"\nReport written to {write_rows(rows, args.report)}")
+    except RuntimeError as e:
+        sys.exit(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
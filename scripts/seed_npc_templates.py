@@ -1,8 +1,19 @@
-"""Seed script for adding generic NPC templates to the global manifest."""
+"""Seed script for adding generic NPC templates to the global manifest.
 
+With --bulk N it instead fills the universe library with N random NPCs
+(or ships, with --ships), drawn from --seed if given:
+
+    python scripts/seed_npc_templates.py --bulk 5000 --seed 42
+"""
+
+import argparse
 import json
+import random
+from sqlalchemy import insert
 from sta.database.db import get_session
 from sta.database.schema import NPCRecord
+from sta.database.vtt_schema import UniverseItemRecord
+from sta.generators.bulk import character_rows, ship_rows
 
 
 def seed_npc_templates():
@@ -313,6 +324,36 @@ def seed_npc_templates():
     return added, skipped
 
 
+def seed_bulk_library(count: int, seed: int | None = None, ships: bool = False):
+    """Add count random NPCs (or ships) to the universe library."""
+    if seed is None:
+        seed = random.randrange(2**32)
+    chunks = ship_rows(count, seed) if ships else character_rows(count, seed)
+
+    session = get_session()
+    added = 0
+    for rows in chunks:
+        session.execute(insert(UniverseItemRecord), rows)
+        added += len(rows)
+    session.commit()
+    session.close()
+
+    return added, seed
+
+
 if __name__ == "__main__":
-    added, skipped = seed_npc_templates()
-    print(f"Added {added} NPC templates, skipped {skipped} existing.")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bulk", type=int, metavar="N",
+                        help="add N random NPCs to the universe library instead")
+    parser.add_argument("--ships", action="store_true",
+                        help="with --bulk, generate ships instead of NPCs")
+    parser.add_argument("--seed", type=int, help="seed for --bulk generation")
+    args = parser.parse_args()
+
+    if args.bulk:
+        added, seed = seed_bulk_library(args.bulk, args.seed, args.ships)
+        kind = "ships" if args.ships else "NPCs"
+        print(f"Added {added} random {kind} to the universe library (seed {seed}).")
+    else:
+        added, skipped = seed_npc_templates()
+        print(f"Added {added} NPC templates, skipped {skipped} existing.")
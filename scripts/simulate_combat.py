@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Run batches of headless combat encounters for balancing.
+
+Every combination of --difficulty and --multiplier is simulated with the
+same seeds, so rows in the summary are directly comparable.
+
+Examples:
+    python scripts/simulate_combat.py --runs 2000 --difficulty easy standard hard
+    python scripts/simulate_combat.py --multiplier 0.3 0.5 0.8 --enemies 2 \\
+        --summary sweep.csv --outcomes encounters.parquet
+"""
+
+import sys
+import os
+import argparse
+import itertools
+import time
+from dataclasses import asdict
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.report import write_rows
+from sta.generators.data import WEAPON_TEMPLATES
+from sta.mechanics.simulator import (
+    POLICIES,
+    SimulationConfig,
+    run_batch,
+    summarize,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate starship combat in bulk")
+    parser.add_argument("--runs", type=int, default=1000, help="Encounters per configuration")
+    parser.add_argument("--seed", type=int, default=0, help="First seed")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument("--difficulty", nargs="+", choices=["easy", "standard", "hard"],
+                        default=["standard"], help="Enemy difficulty tiers to sweep")
+    parser.add_argument("--multiplier", nargs="+", type=float, default=[0.5],
+                        help="Enemy turn multipliers to sweep")
+    parser.add_argument("--enemies", type=int, default=1, help="Enemy ships per encounter")
+    parser.add_argument("--faction", choices=["Klingon", "Romulan"], default=None,
+                        help="Enemy faction (random if omitted)")
+    parser.add_argument("--crew", type=int, default=3, help="Player turns per round")
+    parser.add_argument("--player-policy", choices=sorted(POLICIES), default="heuristic")
+    parser.add_argument("--enemy-policy", choices=sorted(POLICIES), default="heuristic")
+    parser.add_argument("--player-weapons", nargs="+", choices=sorted(WEAPON_TEMPLATES),
+                        default=None, help="Replace the player ship's weapons")
+    parser.add_argument("--enemy-weapons", nargs="+", choices=sorted(WEAPON_TEMPLATES),
+                        default=None, help="Replace every enemy ship's weapons")
+    parser.add_argument("--max-rounds", type=int, default=30, help="Rounds before a draw")
+    parser.add_argument("--summary", default="simulation_summary.csv",
+                        help="Summary output (.csv or .parquet)")
+    parser.add_argument("--outcomes", default=None,
+                        help="Optional per-encounter output (.csv or .parquet)")
+    args = parser.parse_args()
+
+    summaries = []
+    outcome_rows = []
+    for difficulty, multiplier in itertools.product(args.difficulty, args.multiplier):
+        config = SimulationConfig(
+            enemy_count=args.enemies,
+            enemy_difficulty=difficulty,
+            enemy_faction=args.faction,
+            enemy_turn_multiplier=multiplier,
+            player_crew=args.crew,
+            player_policy=args.player_policy,
+            enemy_policy=args.enemy_policy,
+            player_weapons=args.player_weapons,
+            enemy_weapons=args.enemy_weapons,
+            max_rounds=args.max_rounds,
+        )
+        started = time.perf_counter()
+        outcomes = run_batch(config, args.runs, base_seed=args.seed, workers=args.workers)
+        elapsed = time.perf_counter() - started
+
+        summary = summarize(outcomes, config)
+        summaries.append(summary)
+        outcome_rows.extend(
+            {"enemy_difficulty": difficulty, "enemy_turn_multiplier": multiplier, **asdict(o)}
+            for o in outcomes
+        )
+        print(
+            f"{difficulty:>8} x{multiplier:<4} "
+            f"player {summary['player_win_rate']:6.1%}  "
+            f"enemy {summary['enemy_win_rate']:6.1%}  "
+            f"draw {summary['draw_rate']:6.1%}  "
+            f"rounds {summary['rounds_mean']:5.2f}  "
+            f"({args.runs} runs in {elapsed:.1f}s)"
+        )
+
+    try:
+        print(f"\nSummary written to {write_rows(summaries, args.summary)}")
+        if args.outcomes:
+            print(f"Outcomes written to {write_rows(outcome_rows, args.outcomes)}")
+    except RuntimeError as e:
+        sys.exit(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Compare JSON and MessagePack bodies of the polled encounter endpoints.
+
+Loads a synthetic campaign (benchmarks/dataset.py) into an in-memory
+database, fetches each polled endpoint of its active encounter in both
+formats, checks they carry the same payload, and reports:
+
+- bytes on the wire, raw and gzipped for reference
+- server encode time (json.dumps as JSONResponse does it, vs packb)
+- client parse time in node (TextDecoder + JSON.parse vs MsgPack.decode),
+  with the JIT and with --jitless, which stands in for a low-end client
+
+Examples:
+    python scripts/wire_formats.py
+    python scripts/wire_formats.py --scale small --seed 3
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import gzip
+import json
+import shutil
+import subprocess
+import tempfile
+import timeit
+from pathlib import Path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.dataset import SCALES, build_campaign
+from sta.database.async_db import AsyncSessionLocal, initialize_db
+from sta.web.app import create_app
+from sta.web.negotiation import MSGPACK_MEDIA_TYPE, packb, unpackb
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PARSE_SCRIPT = REPO_ROOT / "benchmarks" / "wire_parse.js"
+
+ENDPOINTS = {
+    "status": "status?role=gm",
+    "map": "map?role=gm",
+    "round-status": "round-status",
+    "combat-log": "combat-log?limit=50",
+    "player-resources": "player-resources",
+}
+
+
+def _encode_us(func, payload) -> float:
+    loops, total = timeit.Timer(lambda: func(payload)).autorange()
+    return total / loops * 1e6
+
+
+def _json_dumps(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode()
+
+
+async def fetch_bodies(scale: str, seed: int) -> dict[str, tuple[bytes, bytes]]:
+    """(json, msgpack) bodies per endpoint for a fresh synthetic campaign."""
+    await initialize_db()
+    async with AsyncSessionLocal() as db:
+        dataset = await build_campaign(db, SCALES[scale], seed=seed)
+
+    bodies = {}
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test",
+                                 cookies={"sta_session_token": dataset.gm_token}) as client:
+        for name, path in ENDPOINTS.items():
+            url = f"/api/encounter/{dataset.active_encounter_id}/{path}"
+            as_json = await client.get(url, headers={"Accept": "application/json"})
+            as_msgpack = await client.get(url, headers={"Accept": MSGPACK_MEDIA_TYPE})
+            as_json.raise_for_status()
+            if unpackb(as_msgpack.content) != as_json.json():
+                raise SystemExit(f"{name}: MessagePack and JSON payloads differ")
+            bodies[name] = (as_json.content, as_msgpack.content)
+    return bodies
+
+
+def parse_times(bodies: dict[str, tuple[bytes, bytes]], jitless: bool) -> dict[str, dict]:
+    """Client parse times from node, or {} without node."""
+    node = shutil.which("node")
+    if node is None:
+        return {}
+    with tempfile.TemporaryDirectory(prefix="sta-wire-") as tmp:
+        for name, (as_json, as_msgpack) in bodies.items():
+            Path(tmp, f"{name}.json").write_bytes(as_json)
+            Path(tmp, f"{name}.msgpack").write_bytes(as_msgpack)
+        command = [node, *(["--jitless"] if jitless else []), str(PARSE_SCRIPT), tmp]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return {row["name"]: row for row in map(json.loads, output.splitlines())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs MessagePack for polled endpoints")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium",
+                        help="Synthetic campaign size")
+    parser.add_argument("--seed", type=int, default=0, help="Dataset seed")
+    args = parser.parse_args()
+
+    os.chdir(REPO_ROOT)  # create_app serves static files from a relative path
+    bodies = asyncio.run(fetch_bodies(args.scale, args.seed))
+    parsed = {"jit": parse_times(bodies, jitless=False),
+              "jitless": parse_times(bodies, jitless=True)}
+
+    print(f"{'endpoint':<17} {'json B':>8} {'mpk B':>8} {'saved':>6} "
+          f"{'json gz':>8} {'mpk gz':>8}  {'encode us json/mpk':>19}"
+          f"  {'parse us jit':>15}  {'parse us jitless':>17}")
+    for name, (as_json, as_msgpack) in bodies.items():
+        payload = json.loads(as_json)
+        saved = 1 - len(as_msgpack) / len(as_json)
+        encode = f"{_encode_us(_json_dumps, payload):.0f}/{_encode_us(packb, payload):.0f}"
+        parse = []
+        for mode in ("jit", "jitless"):
+            row = parsed[mode].get(name)
+            parse.append(f"{row['json_us']:.1f}/{row['msgpack_us']:.1f}" if row else "no node")
+        print(f"{name:<17} {len(as_json):>8} {len(as_msgpack):>8} {saved:>6.0%} "
+              f"{len(gzip.compress(as_json)):>8} {len(gzip.compress(as_msgpack)):>8}"
+              f"  {encode:>19}  {parse[0]:>15}  {parse[1]:>17}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ from .schema import (
     SceneNPCRecord,
     CharacterTraitRecord,
     PersonnelEncounterRecord,
+    PersonnelParticipantRecord,
     SceneParticipantRecord,
     SceneShipRecord,
 )
@@ -46,6 +47,7 @@ __all__ = [
     "SceneNPCRecord",
     "CharacterTraitRecord",
     "PersonnelEncounterRecord",
+    "PersonnelParticipantRecord",
     "SceneParticipantRecord",
     "SceneShipRecord",
     "VTTCharacterRecord",
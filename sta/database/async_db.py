@@ -1,8 +1,11 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import text
+from sqlalchemy import event, text
+from sqlalchemy.engine import URL
 import os
-from .schema import Base
+from .config import settings
+from .schema_version import ensure_schema
+from . import changes  # noqa: F401  Registers the change journal flush hooks
 
 DEFAULT_ASYNC_DB_PATH = os.path.join(
     os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
@@ -11,15 +14,77 @@ DEFAULT_ASYNC_DB_PATH = os.path.join(
 # Defaulting to in-memory for simple web app testing if env var is missing
 DATABASE_URL = os.environ.get("STA_ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///:memory:")
 
+
+
+def is_file_database(url: URL) -> bool:
+    """Whether url is a SQLite database file other connections can open."""
+    return (
+        url.get_backend_name() == "sqlite"
+        and url.database not in (None, "", ":memory:")
+        and url.query.get("mode") != "memory"
+    )
+
+
+def use_wal(engine: AsyncEngine) -> None:
+    """Put engine's database in WAL mode, so readers and the writer don't block each other."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _wal(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+
+def create_read_engine(url, pool_size: int = None) -> AsyncEngine:
+    """
+    An engine for read-only sessions on a SQLite database file.
+
+    Its connections have query_only set, so a stray write fails instead
+    of taking the write lock, and each session reads in one explicit
+    transaction: under WAL that is a consistent snapshot which never
+    waits on, or holds up, a writer.
+    """
+    read_engine = create_async_engine(
+        url, echo=False, future=True,
+        pool_size=pool_size or settings.READ_POOL_SIZE,
+    )
+
+    @event.listens_for(read_engine.sync_engine, "connect")
+    def _read_only(dbapi_connection, connection_record):
+        # Hand BEGIN to the "begin" hook below; the driver would only
+        # start a transaction before a write
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    @event.listens_for(read_engine.sync_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return read_engine
+
+
 engine = create_async_engine(DATABASE_URL, echo=False, future=True)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+if is_file_database(engine.url):
+    use_wal(engine)
+    read_engine = create_read_engine(DATABASE_URL)
+else:
+    # Every connection to an in-memory database sees its own database, so
+    # reads share the writer's engine
+    read_engine = engine
+ReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+)
+
 
 async def initialize_db():
-    """Creates tables via engine.begin() context manager."""
+    """Creates or upgrades the tables, unless the database records the current schema version."""
     async with engine.begin() as conn:
-        # Create all tables defined in Base metadata
-        await conn.run_sync(Base.metadata.create_all)
+        # One PRAGMA read when up to date (see schema_version.py)
+        await conn.run_sync(ensure_schema)
 
 
 async def get_db() -> AsyncSession:
@@ -33,3 +98,15 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+
+
+async def get_read_db() -> AsyncSession:
+    """
+    FastAPI dependency provider for a read-only async session.
+
+    For the polled GET endpoints: it comes from its own pool, so polls
+    don't wait for a connection behind writes, and it is never committed
+    (closing it just ends the read transaction).
+    """
+    async with ReadSessionLocal() as session:
+        yield session
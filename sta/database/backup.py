@@ -0,0 +1,286 @@
+"""
+Online snapshots of the live SQLite database.
+
+A snapshot is a page-for-page copy made with SQLite's online backup API
+on a private read-only connection. The copy runs in steps of
+BACKUP_PAGES_PER_STEP pages with a short pause after each, so a writer
+never waits for more than one step; if a step meets a writer's lock it
+is retried after a sleep rather than failing. A write from another
+connection between steps makes SQLite restart the copy, so after
+MAX_RESTARTS restarts the rest is copied in one step. Snapshots are
+written next to their final name and renamed into place when complete,
+and are optionally gzipped:
+
+    snapshot = create_snapshot(database_path(engine), Path(settings.BACKUP_DIR))
+    prune_snapshots(Path(settings.BACKUP_DIR), keep=settings.BACKUP_KEEP)
+
+With BACKUP_INTERVAL_MINUTES set, the BackupScheduler started in the app
+lifespan takes one on that interval and prunes the oldest beyond
+BACKUP_KEEP. restore_snapshot (scripts/backup_db.py restore) checks the
+snapshot's integrity and copies it back over the database in a single
+backup step, so other connections see either the old or the restored
+database, never a mix.
+"""
+
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "sta-"
+PARTIAL_SUFFIX = ".partial"
+LOCK_RETRY_SLEEP = 0.05  # Seconds before retrying a step that met a lock
+MAX_RESTARTS = 3  # Paged copies restarted by writes before copying in one step
+
+# progress(copied_pages, total_pages), called after every step
+BackupProgress = Callable[[int, int], None]
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A snapshot file in the backup directory."""
+    path: Path
+    created_at: datetime
+    size: int
+
+    @property
+    def compressed(self) -> bool:
+        return self.path.suffix == ".gz"
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.path.name,
+            "created_at": self.created_at.isoformat(),
+            "size": self.size,
+            "compressed": self.compressed,
+        }
+
+
+def database_path(engine: AsyncEngine) -> Optional[Path]:
+    """The database file behind engine, or None for in-memory databases."""
+    url = engine.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return Path(url.database)
+
+
+def backup_database(
+    source: Path,
+    target: Path,
+    *,
+    pages: Optional[int] = None,
+    pause: Optional[float] = None,
+    progress: Optional[BackupProgress] = None,
+) -> None:
+    """
+    Copy the database at source to target with the online backup API.
+
+    Args:
+        source: Live database file (opened read-only)
+        target: File to write (overwritten)
+        pages: Pages copied per step (BACKUP_PAGES_PER_STEP if None)
+        pause: Seconds to pause after each step (BACKUP_STEP_PAUSE_MS if None)
+        progress: Called with (copied, total) pages after each step; an
+            exception raised there aborts the backup
+    """
+    pages = pages or settings.BACKUP_PAGES_PER_STEP
+    if pause is None:
+        pause = settings.BACKUP_STEP_PAUSE_MS / 1000
+
+    copied_before = 0
+    restarts = 0
+
+    def step_done(status, remaining, total):
+        nonlocal copied_before, restarts
+        copied = total - remaining
+        if remaining and copied <= copied_before:
+            # Another connection wrote to the source, so SQLite started over
+            restarts += 1
+            if restarts > MAX_RESTARTS:
+                raise _TooManyRestarts()
+        copied_before = copied
+        if progress is not None:
+            progress(copied, total)
+        if remaining and pause:
+            time.sleep(pause)  # Lets writers in between steps
+
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    try:
+        dst = sqlite3.connect(target)
+        try:
+            try:
+                src.backup(dst, pages=pages, progress=step_done, sleep=LOCK_RETRY_SLEEP)
+            except _TooManyRestarts:
+                # Writers keep outpacing the paged copy: copy the rest in one
+                # step, which holds a read lock until done
+                src.backup(dst, pages=-1, sleep=LOCK_RETRY_SLEEP)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+def create_snapshot(
+    source: Path,
+    directory: Path,
+    *,
+    compress: Optional[bool] = None,
+    pages: Optional[int] = None,
+    pause: Optional[float] = None,
+    progress: Optional[BackupProgress] = None,
+) -> Snapshot:
+    """Take a snapshot of source into directory (BACKUP_COMPRESS if compress is None)."""
+    if compress is None:
+        compress = settings.BACKUP_COMPRESS
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f"{SNAPSHOT_PREFIX}{datetime.now():%Y%m%d-%H%M%S-%f}.db"
+    final = directory / (name + ".gz" if compress else name)
+    copy = directory / (name + PARTIAL_SUFFIX)
+    packed = final.with_name(final.name + PARTIAL_SUFFIX)
+    try:
+        backup_database(source, copy, pages=pages, pause=pause, progress=progress)
+        if compress:
+            with open(copy, "rb") as raw, gzip.open(packed, "wb", compresslevel=6) as out:
+                shutil.copyfileobj(raw, out)
+            os.replace(packed, final)
+        else:
+            os.replace(copy, final)
+    finally:
+        copy.unlink(missing_ok=True)
+        packed.unlink(missing_ok=True)
+    return _snapshot(final)
+
+
+def _snapshot(path: Path) -> Snapshot:
+    stat = path.stat()
+    return Snapshot(path=path, created_at=datetime.fromtimestamp(stat.st_mtime),
+                    size=stat.st_size)
+
+
+def list_snapshots(directory: Path) -> list[Snapshot]:
+    """Complete snapshots in directory, newest first."""
+    if not directory.is_dir():
+        return []
+    paths = [
+        path for path in directory.iterdir()
+        if path.name.startswith(SNAPSHOT_PREFIX) and path.name.endswith((".db", ".db.gz"))
+    ]
+    # Names embed the creation time, so they sort chronologically
+    return [_snapshot(path) for path in sorted(paths, key=lambda p: p.name, reverse=True)]
+
+
+def prune_snapshots(directory: Path, keep: Optional[int] = None) -> list[Path]:
+    """Delete all but the newest keep snapshots (BACKUP_KEEP if None)."""
+    keep = settings.BACKUP_KEEP if keep is None else keep
+    removed = [snapshot.path for snapshot in list_snapshots(directory)[max(keep, 0):]]
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return removed
+
+
+def restore_snapshot(snapshot: Path, database: Path) -> None:
+    """
+    Replace the contents of database with snapshot.
+
+    The snapshot is integrity-checked first (raises ValueError if it is
+    damaged). The copy is one backup step, so it waits for writers to
+    finish and is atomic for every other connection.
+    """
+    unpacked = None
+    try:
+        if snapshot.suffix == ".gz":
+            unpacked = database.with_name(database.name + ".restore" + PARTIAL_SUFFIX)
+            with gzip.open(snapshot, "rb") as packed, open(unpacked, "wb") as out:
+                shutil.copyfileobj(packed, out)
+        source = unpacked or snapshot
+
+        src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+        try:
+            try:
+                check = src.execute("PRAGMA integrity_check").fetchone()[0]
+            except sqlite3.DatabaseError as exc:
+                check = str(exc)
+            if check != "ok":
+                raise ValueError(f"Snapshot {snapshot.name} is damaged: {check}")
+            dst = sqlite3.connect(database, timeout=30)
+            try:
+                src.backup(dst, pages=-1)
+            finally:
+                dst.close()
+        finally:
+            src.close()
+    finally:
+        if unpacked is not None:
+            unpacked.unlink(missing_ok=True)
+
+
+class BackupScheduler:
+    """
+    Takes a snapshot every BACKUP_INTERVAL_MINUTES and prunes old ones.
+
+    Every worker runs one; a worker skips its turn when the newest
+    snapshot is younger than the interval, so several workers sharing a
+    backup directory do not each take one.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, engine: AsyncEngine) -> None:
+        source = database_path(engine)
+        if self._task is None and source is not None and settings.BACKUP_INTERVAL_MINUTES > 0:
+            self._task = asyncio.create_task(self._run(source))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self, source: Path) -> Optional[Snapshot]:
+        """Take a snapshot unless a recent one exists, then prune."""
+        directory = Path(settings.BACKUP_DIR)
+        snapshots = list_snapshots(directory)
+        interval = settings.BACKUP_INTERVAL_MINUTES * 60
+        if snapshots and (datetime.now() - snapshots[0].created_at).total_seconds() < interval:
+            return None
+        snapshot = await asyncio.to_thread(create_snapshot, source, directory)
+        await asyncio.to_thread(prune_snapshots, directory)
+        return snapshot
+
+    async def _run(self, source: Path) -> None:
+        while True:
+            try:
+                await self.run_once(source)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # A failed snapshot (disk full, locked file) is retried next interval
+                logger.exception(
+                    "Scheduled snapshot of %s failed; retrying in %s minutes",
+                    source, settings.BACKUP_INTERVAL_MINUTES,
+                )
+            await asyncio.sleep(settings.BACKUP_INTERVAL_MINUTES * 60)
+
+
+backup_scheduler = BackupScheduler()
@@ -0,0 +1,310 @@
+"""
+Cross-process change notification through an SQLite change journal.
+
+Every flush that inserts, modifies or deletes an encounter, campaign,
+scene or personnel encounter (or one of its participants) appends a row
+to change_journal and bumps that entity's row in change_versions, inside
+the same transaction. Because SQLite serializes
+writers, journal seq order is commit order, so any process sharing the
+database file can catch up on changes with a single indexed range scan.
+
+Each worker runs one ChangeNotifier (started in the app lifespan) that
+watches the database every few milliseconds and wakes in-process waiters
+and subscribers, e.g. to invalidate caches. For a database file the watch
+is PRAGMA data_version on a private read-only connection, which changes
+only when another connection commits, so an idle worker reads nothing:
+
+    unsubscribe = notifier.subscribe(lambda changes: cache.clear())
+    changed = await notifier.wait(since_seq, timeout=25)
+"""
+
+import asyncio
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import event, func, insert, select, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from .schema import (
+    CampaignRecord,
+    ChangeJournalRecord,
+    ChangeVersionRecord,
+    EncounterRecord,
+    PersonnelEncounterRecord,
+    PersonnelParticipantRecord,
+    SceneRecord,
+)
+
+TRACKED_RECORDS = {
+    EncounterRecord: "encounter",
+    CampaignRecord: "campaign",
+    SceneRecord: "scene",
+    PersonnelEncounterRecord: "personnel",
+    PersonnelParticipantRecord: "personnel",
+}
+# Records journaled as a change to their parent: record -> parent id attribute
+PARENT_IDS = {
+    PersonnelParticipantRecord: "personnel_encounter_id",
+}
+
+POLL_INTERVAL = 0.01  # Seconds between journal polls per worker
+JOURNAL_RETENTION = 10000  # Journal rows kept for catch-up
+TRIM_INTERVAL = 60.0  # Seconds between journal trims
+JOURNAL_PAGE = 500  # Journal rows read per poll
+
+_PENDING_KEY = "sta_pending_changes"
+
+
+@dataclass(frozen=True)
+class Change:
+    """A journal entry: entity_type/entity_id changed at seq."""
+    seq: int
+    entity_type: str
+    entity_id: int
+
+    def to_dict(self) -> dict:
+        return {"seq": self.seq, "entity_type": self.entity_type, "entity_id": self.entity_id}
+
+
+# ===== Writing the journal =====
+
+def journal_change(connection, entity_type: str, entity_id: int) -> int:
+    """Append a journal row and bump the entity's version. Returns the seq."""
+    result = connection.execute(
+        insert(ChangeJournalRecord).values(entity_type=entity_type, entity_id=entity_id)
+    )
+    seq = result.inserted_primary_key[0]
+    connection.execute(
+        sqlite_insert(ChangeVersionRecord)
+        .values(entity_type=entity_type, entity_id=entity_id, seq=seq)
+        .on_conflict_do_update(
+            index_elements=["entity_type", "entity_id"], set_={"seq": seq}
+        )
+    )
+    return seq
+
+
+async def record_change(db: AsyncSession, entity_type: str, entity_id: int) -> int:
+    """Journal a change made outside the ORM unit of work (e.g. a bulk UPDATE)."""
+    return await db.run_sync(
+        lambda session: journal_change(session.connection(), entity_type, entity_id)
+    )
+
+
+def _entity_key(obj) -> tuple[str, int]:
+    return TRACKED_RECORDS[type(obj)], getattr(obj, PARENT_IDS.get(type(obj), "id"))
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(session, flush_context, instances):
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    for obj in session.new:
+        if type(obj) in TRACKED_RECORDS:
+            pending.append(obj)  # id is assigned by the flush
+    for obj in session.dirty:
+        if type(obj) in TRACKED_RECORDS and session.is_modified(obj, include_collections=False):
+            pending.append(_entity_key(obj))
+    for obj in session.deleted:
+        if type(obj) in TRACKED_RECORDS:
+            pending.append(_entity_key(obj))
+
+
+@event.listens_for(Session, "after_flush")
+def _write_changes(session, flush_context):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    keys = {item if isinstance(item, tuple) else _entity_key(item) for item in pending}
+    connection = session.connection()
+    for entity_type, entity_id in sorted(keys):
+        journal_change(connection, entity_type, entity_id)
+
+
+# ===== Reading the journal =====
+
+async def latest_seq(db) -> int:
+    """The most recent journal seq (0 when the journal is empty)."""
+    result = await db.execute(select(func.max(ChangeJournalRecord.seq)))
+    return result.scalar() or 0
+
+
+async def changes_since(
+    db,
+    since: int,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    limit: int = JOURNAL_PAGE,
+) -> list[Change]:
+    """Journal entries after seq, oldest first, optionally for one entity."""
+    stmt = select(
+        ChangeJournalRecord.seq,
+        ChangeJournalRecord.entity_type,
+        ChangeJournalRecord.entity_id,
+    ).filter(ChangeJournalRecord.seq > since)
+    if entity_type:
+        stmt = stmt.filter(ChangeJournalRecord.entity_type == entity_type)
+    if entity_id is not None:
+        stmt = stmt.filter(ChangeJournalRecord.entity_id == entity_id)
+    result = await db.execute(stmt.order_by(ChangeJournalRecord.seq).limit(limit))
+    return [Change(*row) for row in result.all()]
+
+
+async def get_version(db, entity_type: str, entity_id: int) -> int:
+    """Seq of an entity's latest change (0 if it never changed)."""
+    result = await db.execute(
+        select(ChangeVersionRecord.seq).filter(
+            ChangeVersionRecord.entity_type == entity_type,
+            ChangeVersionRecord.entity_id == entity_id,
+        )
+    )
+    return result.scalar() or 0
+
+
+class ChangeNotifier:
+    """Follows the change journal from one worker process."""
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.last_seq = 0
+        self.versions: dict[tuple[str, int], int] = {}
+        self.changed_at: dict[tuple[str, int], float] = {}  # time.monotonic() when seen
+        self._subscribers: list[Callable[[list[Change]], None]] = []
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_trim = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self, callback: Callable[[list[Change]], None]) -> Callable[[], None]:
+        """Call callback with each batch of new changes. Returns an unsubscribe function."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def version(self, entity_type: str, entity_id: int) -> int:
+        """Latest seq seen for an entity since this notifier started (0 if none)."""
+        return self.versions.get((entity_type, entity_id), 0)
+
+    def seconds_since_change(self, entity_type: str, entity_id: int) -> Optional[float]:
+        """Seconds since a change to an entity was seen (None if none since this notifier started)."""
+        changed_at = self.changed_at.get((entity_type, entity_id))
+        return None if changed_at is None else time.monotonic() - changed_at
+
+    async def wait(self, since: int, timeout: float) -> bool:
+        """Wait until a change after since is seen. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self.last_seq <= since:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def poll(self, conn: AsyncConnection) -> list[Change]:
+        """Read new journal rows and notify waiters and subscribers."""
+        return self._publish(await changes_since(conn, self.last_seq))
+
+    def _publish(self, changes: list[Change]) -> list[Change]:
+        if not changes:
+            return []
+        now = time.monotonic()
+        for change in changes:
+            self.versions[(change.entity_type, change.entity_id)] = change.seq
+            self.changed_at[(change.entity_type, change.entity_id)] = now
+        self.last_seq = changes[-1].seq
+
+        # Wake everyone waiting on the current event, then start a new one
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        for callback in list(self._subscribers):
+            callback(changes)
+        return changes
+
+    async def start(self, engine: AsyncEngine) -> None:
+        """Begin following the journal from its current end."""
+        if self.running:
+            return
+        async with engine.connect() as conn:
+            self.last_seq = await latest_seq(conn)
+        self._task = asyncio.create_task(self._run(engine))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def trim(self, engine: AsyncEngine, keep: int = JOURNAL_RETENTION) -> None:
+        """Delete journal rows older than the newest keep rows."""
+        async with engine.begin() as conn:
+            newest = await latest_seq(conn)
+            await conn.execute(
+                delete(ChangeJournalRecord).filter(ChangeJournalRecord.seq <= newest - keep)
+            )
+
+    async def _run(self, engine: AsyncEngine) -> None:
+        watch = _open_watch_connection(engine)
+        data_version = None
+        try:
+            while True:
+                try:
+                    if watch is None:
+                        async with engine.connect() as conn:
+                            await self.poll(conn)
+                    else:
+                        current = watch.execute("PRAGMA data_version").fetchone()[0]
+                        if current != data_version:
+                            changes = self._publish(self._read_journal(watch))
+                            # A full page means there is more to read next time
+                            data_version = None if len(changes) == JOURNAL_PAGE else current
+                    await self._maybe_trim(engine)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    # A locked or busy database is retried on the next poll
+                    pass
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            if watch is not None:
+                watch.close()
+
+    def _read_journal(self, watch: sqlite3.Connection) -> list[Change]:
+        rows = watch.execute(
+            "SELECT seq, entity_type, entity_id FROM change_journal"
+            " WHERE seq > ? ORDER BY seq LIMIT ?",
+            (self.last_seq, JOURNAL_PAGE),
+        ).fetchall()
+        return [Change(*row) for row in rows]
+
+    async def _maybe_trim(self, engine: AsyncEngine) -> None:
+        if time.monotonic() - self._last_trim > TRIM_INTERVAL:
+            self._last_trim = time.monotonic()
+            await self.trim(engine)
+
+
+def _open_watch_connection(engine: AsyncEngine) -> Optional[sqlite3.Connection]:
+    """A read-only connection to the database file, or None for in-memory databases.
+
+    timeout=0 means a poll that meets a writer's lock fails immediately
+    instead of blocking the event loop; it is retried on the next poll.
+    """
+    url = engine.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return sqlite3.connect(
+        f"file:{url.database}?mode=ro", uri=True, timeout=0, isolation_level=None
+    )
+
+
+notifier = ChangeNotifier()
@@ -6,6 +6,20 @@ class Settings(BaseSettings):
 
     SECRET_KEY: str = "a-very-secure-default-secret-key-for-development"
     DATABASE_URL: str = "sqlite+aiosqlite:///./sta_dev.db"
+    READ_POOL_SIZE: int = 10  # Connections for read-only sessions (async_db.get_read_db)
+
+    # Background jobs (sta/web/jobs.py)
+    JOB_WORKERS: int = 2  # Jobs running at once
+    JOB_THREADS: int = 4  # Threads for blocking work inside jobs
+    JOB_RETENTION_HOURS: int = 24  # Finished jobs are deleted after this
+
+    # Database snapshots (sta/database/backup.py)
+    BACKUP_DIR: str = "./backups"
+    BACKUP_INTERVAL_MINUTES: int = 0  # Scheduled snapshots; 0 turns them off
+    BACKUP_KEEP: int = 14  # Newest snapshots kept when pruning
+    BACKUP_COMPRESS: bool = True  # gzip snapshots
+    BACKUP_PAGES_PER_STEP: int = 256  # Pages copied per backup step
+    BACKUP_STEP_PAUSE_MS: int = 5  # Pause after each step, for writers
 
 
 settings = Settings()
@@ -0,0 +1,147 @@
+"""
+Campaign dashboard queries.
+
+Long campaigns collect hundreds of scenes and encounters, so the
+dashboard never loads them all. Per-status totals come from one
+COUNT ... GROUP BY status over both tables, and the lists it shows are
+pages read through the (campaign_id, status, id) indexes:
+
+    counts = await status_counts(db, campaign.id)
+    drafts = await status_page(db, SceneRecord, campaign.id, "draft", page=2)
+
+The sidebar (players, ship pool, active ship) is loaded by
+campaign_sidebar in one round trip per table, with the pool's starships
+joined in rather than looked up one by one.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import func, literal, select, union_all
+
+from .schema import (
+    CampaignPlayerRecord,
+    CampaignRecord,
+    CampaignShipRecord,
+    EncounterRecord,
+    SceneRecord,
+    StarshipRecord,
+)
+
+DASHBOARD_PAGE_SIZE = 20  # Rows per dashboard list page
+
+_KINDS = {"scenes": SceneRecord, "encounters": EncounterRecord}
+
+
+@dataclass(frozen=True)
+class StatusCounts:
+    """Scene and encounter totals per status."""
+    scenes: dict[str, int]
+    encounters: dict[str, int]
+
+    def total(self, kind: str) -> int:
+        return sum(getattr(self, kind).values())
+
+    def pages(self, kind: str, status: str, page_size: int = DASHBOARD_PAGE_SIZE) -> int:
+        """Number of pages of kind in status (at least 1)."""
+        count = getattr(self, kind).get(status, 0)
+        return max(1, -(-count // page_size))
+
+
+async def status_counts(db, campaign_pk: int) -> StatusCounts:
+    """Scene and encounter counts per status, in one statement."""
+    grouped = [
+        select(literal(kind).label("kind"), model.status, func.count())
+        .filter(model.campaign_id == campaign_pk)
+        .group_by(model.status)
+        for kind, model in _KINDS.items()
+    ]
+    result = await db.execute(union_all(*grouped))
+    counts = {kind: {} for kind in _KINDS}
+    for kind, status, count in result.all():
+        counts[kind][status] = count
+    return StatusCounts(**counts)
+
+
+async def status_page(
+    db,
+    model,
+    campaign_pk: int,
+    status: str,
+    page: int = 1,
+    page_size: int = DASHBOARD_PAGE_SIZE,
+    newest_first: bool = False,
+) -> list:
+    """One page of a campaign's scenes or encounters in a status (pages start at 1)."""
+    order = model.id.desc() if newest_first else model.id
+    result = await db.execute(
+        select(model)
+        .filter(model.campaign_id == campaign_pk, model.status == status)
+        .order_by(order)
+        .offset((max(page, 1) - 1) * page_size)
+        .limit(page_size)
+    )
+    return list(result.scalars().all())
+
+
+async def first_with_status(db, model, campaign_pk: int, status: str):
+    """The campaign's first scene or encounter in a status, or None."""
+    pages = await status_page(db, model, campaign_pk, status, page_size=1)
+    return pages[0] if pages else None
+
+
+@dataclass
+class CampaignSidebar:
+    """Players, ship pool and active ship of a campaign."""
+    players: list
+    ships: list[dict]
+    active_ship: Optional[StarshipRecord]
+
+    def player_for_token(self, token: Optional[str]):
+        if not token:
+            return None
+        return next((p for p in self.players if p.session_token == token), None)
+
+
+async def campaign_sidebar(db, campaign: CampaignRecord) -> CampaignSidebar:
+    """
+    Load the dashboard sidebar: all players (the current player is found
+    among them) and the ship pool joined with its starships, which also
+    yields the active ship when it is in the pool.
+    """
+    players_result = await db.execute(
+        select(CampaignPlayerRecord)
+        .filter(CampaignPlayerRecord.campaign_id == campaign.id)
+        .order_by(CampaignPlayerRecord.id)
+    )
+    players = list(players_result.scalars().all())
+
+    ships_result = await db.execute(
+        select(CampaignShipRecord, StarshipRecord)
+        .join(StarshipRecord, StarshipRecord.id == CampaignShipRecord.ship_id)
+        .filter(CampaignShipRecord.campaign_id == campaign.id)
+        .order_by(CampaignShipRecord.id)
+    )
+    ships = []
+    active_ship = None
+    for pool_entry, ship in ships_result.all():
+        is_active = ship.id == campaign.active_ship_id
+        if is_active:
+            active_ship = ship
+        ships.append({
+            "id": pool_entry.id,
+            "ship_id": ship.id,
+            "name": ship.name,
+            "ship_class": ship.ship_class,
+            "registry": ship.ship_registry,
+            "scale": ship.scale,
+            "is_active": is_active,
+            "is_enemy": ship.crew_quality is not None,
+            "is_available": pool_entry.is_available,
+        })
+
+    if campaign.active_ship_id and active_ship is None:
+        # Active ship outside the pool
+        active_ship = await db.get(StarshipRecord, campaign.active_ship_id)
+
+    return CampaignSidebar(players=players, ships=ships, active_ship=active_ship)
@@ -0,0 +1,446 @@
+"""
+Event-sourced encounter journal.
+
+Combat mutations append a small typed event to encounter_events instead of
+clients re-reading the whole encounter row and its JSON blobs. Each event
+carries the values it set (e.g. the new momentum, not just the change), so
+replaying events over a snapshot reproduces the encounter state exactly:
+
+    await append_event(db, encounter, "momentum_changed", change=1, momentum=3)
+    seq, state = await materialize(db, encounter)
+    events = await events_since(db, encounter.id, since=seq)
+
+The first event of an encounter snapshots its current state, and another
+snapshot is written every SNAPSHOT_INTERVAL events, so materializing reads
+one snapshot and at most SNAPSHOT_INTERVAL - 1 events.
+
+The event is also the write path for the EncounterRecord columns it
+covers: append_event applies it to the turn, position and effect columns
+with one UPDATE (SQLite JSON1 edits the JSON blobs in place), so routes
+never rewrite those columns themselves and the existing views read the
+same state the journal replays. Momentum and Threat are written by
+pool_ledger.change_pool, which journals the change, and ship events
+follow a change to the ship records.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import DateTime, func, insert, literal, select, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .changes import TRACKED_RECORDS, record_change
+from .schema import (
+    EncounterEventRecord,
+    EncounterRecord,
+    EncounterSnapshotRecord,
+    StarshipRecord,
+)
+from .undo import remember_original_value
+
+SNAPSHOT_INTERVAL = 50  # Events between snapshots
+EVENT_PAGE = 200  # Events returned per catch-up request
+
+
+@dataclass(frozen=True)
+class EncounterEvent:
+    """An entry in an encounter's event journal."""
+    seq: int
+    event_type: str
+    payload: dict
+    round: int
+    created_at: Optional[datetime] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "seq": self.seq,
+            "event_type": self.event_type,
+            "payload": self.payload,
+            "round": self.round,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+# ===== Event types =====
+# Each event type maps to its required payload fields and a reducer that
+# applies the event to a state dict (see encounter_state for its shape).
+
+def _ship(state: dict, ship_id) -> dict:
+    return state["ships"].setdefault(
+        str(ship_id), {"shields": 0, "breaches": [], "has_reserve_power": True}
+    )
+
+
+def _momentum_changed(state, payload):
+    state["momentum"] = payload["momentum"]
+
+
+def _threat_changed(state, payload):
+    state["threat"] = payload["threat"]
+
+
+def _ship_moved(state, payload):
+    state["ship_positions"][payload["ship"]] = payload["position"]
+
+
+def _effect_added(state, payload):
+    state["active_effects"].append(payload["effect"])
+
+
+def _effects_cleared(state, payload):
+    source = payload.get("source_action")
+    state["active_effects"] = [
+        effect for effect in state["active_effects"]
+        if source is not None and effect.get("source_action") != source
+    ]
+
+
+def _shields_changed(state, payload):
+    _ship(state, payload["ship_id"])["shields"] = payload["shields"]
+
+
+def _breach_added(state, payload):
+    _ship(state, payload["ship_id"])["breaches"] = payload["breaches"]
+
+
+def _ships_placed(state, payload):
+    state["ship_positions"] = payload["ship_positions"]
+
+
+def _reserve_power_changed(state, payload):
+    _ship(state, payload["ship_id"])["has_reserve_power"] = payload["has_reserve_power"]
+
+
+def _turn_claimed(state, payload):
+    state["current_player_id"] = payload["player_id"]
+
+
+def _turn_released(state, payload):
+    if payload.get("acted"):
+        state["players_turns"][str(payload["player_id"])] = {"acted": True}
+    state["current_player_id"] = None
+
+
+def _player_acted(state, payload):
+    state["players_turns"][str(payload["player_id"])] = {"acted": payload["acted"]}
+
+
+def _ship_acted(state, payload):
+    state.setdefault("ships_turns", {})[str(payload["ship"])] = payload["used"]
+
+
+def _turn_advanced(state, payload):
+    state["current_turn"] = payload["current_turn"]
+    state["round"] = payload["round"]
+    state["current_player_id"] = None
+    if payload.get("round_advanced"):
+        state["players_turns"] = {}
+        state["ships_turns"] = {}
+
+
+def _state_restored(state, payload):
+    state.clear()
+    state.update(payload["state"])
+
+
+EVENT_TYPES: dict[str, tuple[tuple[str, ...], Callable[[dict, dict], None]]] = {
+    "momentum_changed": (("change", "momentum"), _momentum_changed),
+    "threat_changed": (("change", "threat"), _threat_changed),
+    "ship_moved": (("ship", "position"), _ship_moved),
+    "ships_placed": (("ship_positions",), _ships_placed),  # GM map edit
+    "effect_added": (("effect",), _effect_added),
+    "effects_cleared": ((), _effects_cleared),
+    "damage_taken": (("ship_id", "damage", "shields"), _shields_changed),
+    "shields_restored": (("ship_id", "shields"), _shields_changed),
+    "breach_added": (("ship_id", "system", "breaches"), _breach_added),
+    "reserve_power_changed": (("ship_id", "has_reserve_power"), _reserve_power_changed),
+    "turn_claimed": (("player_id",), _turn_claimed),
+    "turn_released": (("player_id",), _turn_released),
+    "player_acted": (("player_id", "acted"), _player_acted),
+    "ship_acted": (("ship", "used"), _ship_acted),
+    "turn_advanced": (("current_turn", "round"), _turn_advanced),
+    "state_restored": (("state",), _state_restored),  # GM undo/rewind
+}
+
+
+def validate_event(event_type: str, payload: dict) -> None:
+    """Raise ValueError for an unknown event type or missing payload fields."""
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Unknown encounter event type: {event_type}")
+    missing = [name for name in EVENT_TYPES[event_type][0] if name not in payload]
+    if missing:
+        raise ValueError(f"{event_type} event is missing {', '.join(missing)}")
+
+
+def apply_event(state: dict, event: EncounterEvent) -> dict:
+    """Apply one event to a state dict in place and return it."""
+    EVENT_TYPES[event.event_type][1](state, event.payload)
+    return state
+
+
+# ===== Columns =====
+# Events that write EncounterRecord columns map to a function returning
+# the column values, as SQL expressions over the current row.
+
+def _with_key(column, key, value):
+    """column's JSON object with key set to value."""
+    return func.json_set(func.coalesce(column, "{}"), f'$."{key}"', func.json(json.dumps(value)))
+
+
+def _ship_moved_columns(payload):
+    column = EncounterRecord.ship_positions_json
+    return {"ship_positions_json": _with_key(column, payload["ship"], payload["position"])}
+
+
+def _ships_placed_columns(payload):
+    return {"ship_positions_json": json.dumps(payload["ship_positions"])}
+
+
+def _effect_added_columns(payload):
+    effects = func.coalesce(EncounterRecord.active_effects_json, "[]")
+    return {
+        "active_effects_json": func.json_insert(
+            effects, "$[#]", func.json(json.dumps(payload["effect"]))
+        )
+    }
+
+
+def _effects_cleared_columns(payload):
+    source = payload.get("source_action")
+    if source is None:
+        return {"active_effects_json": "[]"}
+    each = func.json_each(EncounterRecord.active_effects_json).table_valued("value")
+    remaining = (
+        select(func.json_group_array(func.json(each.c.value)))
+        .select_from(each)
+        .filter(func.json_extract(each.c.value, "$.source_action").is_distinct_from(source))
+        .scalar_subquery()
+    )
+    return {"active_effects_json": remaining}
+
+
+def _turn_claimed_columns(payload):
+    return {"current_player_id": payload["player_id"]}
+
+
+def _turn_released_columns(payload):
+    columns = {"current_player_id": None}
+    if payload.get("acted"):
+        columns.update(_player_acted_columns({**payload, "acted": True}))
+    return columns
+
+
+def _player_acted_columns(payload):
+    column = EncounterRecord.players_turns_used_json
+    value = {"acted": payload["acted"]}
+    return {"players_turns_used_json": _with_key(column, payload["player_id"], value)}
+
+
+def _ship_acted_columns(payload):
+    column = EncounterRecord.ships_turns_used_json
+    return {"ships_turns_used_json": _with_key(column, payload["ship"], payload["used"])}
+
+
+def _turn_advanced_columns(payload):
+    columns = {
+        "current_turn": payload["current_turn"],
+        "round": payload["round"],
+        "current_player_id": None,
+    }
+    if payload.get("round_advanced"):
+        columns.update(
+            players_turns_used_json="{}", ships_turns_used_json="{}", player_turns_used=0
+        )
+    return columns
+
+
+EVENT_COLUMNS: dict[str, Callable[[dict], dict]] = {
+    "ship_moved": _ship_moved_columns,
+    "ships_placed": _ships_placed_columns,
+    "effect_added": _effect_added_columns,
+    "effects_cleared": _effects_cleared_columns,
+    "turn_claimed": _turn_claimed_columns,
+    "turn_released": _turn_released_columns,
+    "player_acted": _player_acted_columns,
+    "ship_acted": _ship_acted_columns,
+    "turn_advanced": _turn_advanced_columns,
+}
+
+
+async def _write_columns(db, encounter: EncounterRecord, values: dict) -> None:
+    """UPDATE the encounter's columns to values and keep the record current."""
+    names = list(values)
+    previous = [getattr(encounter, name) for name in names]
+    result = await db.execute(
+        update(EncounterRecord)
+        .filter(EncounterRecord.id == encounter.id)
+        .values(values)
+        .returning(*(getattr(EncounterRecord, name) for name in names))
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one()
+    for name, before, value in zip(names, previous, row):
+        remember_original_value(db.sync_session, encounter, name, before)
+        # Keep the loaded record current without marking it dirty
+        set_committed_value(encounter, name, value)
+    await record_change(db, TRACKED_RECORDS[EncounterRecord], encounter.id)
+
+
+# ===== State =====
+
+async def encounter_state(db, encounter: EncounterRecord) -> dict:
+    """The encounter's current state, read from its columns and ships."""
+    ship_ids = [encounter.player_ship_id, *json.loads(encounter.enemy_ship_ids_json or "[]")]
+    ship_ids = [ship_id for ship_id in ship_ids if ship_id is not None]
+    ships = {}
+    if ship_ids:
+        result = await db.execute(
+            select(
+                StarshipRecord.id,
+                StarshipRecord.shields,
+                StarshipRecord.breaches_json,
+                StarshipRecord.has_reserve_power,
+            ).filter(StarshipRecord.id.in_(ship_ids))
+        )
+        ships = {
+            str(ship_id): {
+                "shields": shields,
+                "breaches": json.loads(breaches or "[]"),
+                "has_reserve_power": bool(reserve_power),
+            }
+            for ship_id, shields, breaches, reserve_power in result.all()
+        }
+    return {
+        "momentum": encounter.momentum or 0,
+        "threat": encounter.threat or 0,
+        "round": encounter.round or 1,
+        "current_turn": encounter.current_turn or "player",
+        "current_player_id": encounter.current_player_id,
+        "players_turns": json.loads(encounter.players_turns_used_json or "{}"),
+        "ships_turns": json.loads(encounter.ships_turns_used_json or "{}"),
+        "ship_positions": json.loads(encounter.ship_positions_json or "{}"),
+        "active_effects": json.loads(encounter.active_effects_json or "[]"),
+        "ships": ships,
+    }
+
+
+# ===== Writing =====
+
+async def latest_event_seq(db, encounter_pk: int) -> int:
+    """The encounter's most recent event seq (0 before its first event)."""
+    result = await db.execute(
+        select(func.max(EncounterEventRecord.seq)).filter(
+            EncounterEventRecord.encounter_id == encounter_pk
+        )
+    )
+    return result.scalar() or 0
+
+
+async def append_event(db, encounter: EncounterRecord, event_type: str, **payload) -> int:
+    """
+    Apply an event to the encounter's columns (see EVENT_COLUMNS) and
+    append it to the encounter's journal. Ship events go after the
+    change to the ship records, in the same transaction.
+
+    The seq is allocated by the INSERT itself (max + 1, read under
+    SQLite's write lock), so concurrent appends can't take the same seq.
+
+    Returns:
+        The event's seq
+    """
+    validate_event(event_type, payload)
+    if event_type in EVENT_COLUMNS:
+        await _write_columns(db, encounter, EVENT_COLUMNS[event_type](payload))
+
+    next_seq = func.coalesce(func.max(EncounterEventRecord.seq), 0) + 1
+    source = select(
+        literal(encounter.id),
+        next_seq,
+        literal(event_type),
+        literal(json.dumps(payload)),
+        literal(encounter.round or 1),
+        literal(datetime.now(), DateTime),
+    ).filter(EncounterEventRecord.encounter_id == encounter.id)
+    result = await db.execute(
+        insert(EncounterEventRecord)
+        .from_select(
+            ["encounter_id", "seq", "event_type", "payload_json", "round", "created_at"], source
+        )
+        .returning(EncounterEventRecord.seq)
+    )
+    seq = result.scalar_one()
+
+    if seq == 1:
+        # Journal starts here: the records already include this event
+        state = await encounter_state(db, encounter)
+    elif seq % SNAPSHOT_INTERVAL == 0:
+        _, state = await materialize(db, encounter)
+    else:
+        return seq
+    db.add(EncounterSnapshotRecord(encounter_id=encounter.id, seq=seq, state_json=json.dumps(state)))
+    return seq
+
+
+# ===== Reading =====
+
+def _to_event(record) -> EncounterEvent:
+    return EncounterEvent(
+        seq=record.seq,
+        event_type=record.event_type,
+        payload=json.loads(record.payload_json or "{}"),
+        round=record.round,
+        created_at=record.created_at,
+    )
+
+
+async def events_since(
+    db,
+    encounter_pk: int,
+    since: int = 0,
+    until: Optional[int] = None,
+    limit: Optional[int] = EVENT_PAGE,
+) -> list[EncounterEvent]:
+    """Events after seq since (and up to until), oldest first."""
+    stmt = select(EncounterEventRecord).filter(
+        EncounterEventRecord.encounter_id == encounter_pk,
+        EncounterEventRecord.seq > since,
+    )
+    if until is not None:
+        stmt = stmt.filter(EncounterEventRecord.seq <= until)
+    stmt = stmt.order_by(EncounterEventRecord.seq)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await db.execute(stmt)
+    return [_to_event(record) for record in result.scalars().all()]
+
+
+async def materialize(
+    db, encounter: EncounterRecord, at: Optional[int] = None
+) -> tuple[int, dict]:
+    """
+    Encounter state from the latest snapshot plus the events after it.
+
+    Args:
+        at: Materialize as of this seq (default: the latest event)
+
+    Returns:
+        (seq, state); seq is 0 and state comes from the encounter's
+        columns if it has no events yet
+    """
+    stmt = select(EncounterSnapshotRecord).filter(
+        EncounterSnapshotRecord.encounter_id == encounter.id
+    )
+    if at is not None:
+        stmt = stmt.filter(EncounterSnapshotRecord.seq <= at)
+    result = await db.execute(stmt.order_by(EncounterSnapshotRecord.seq.desc()).limit(1))
+    snapshot = result.scalars().first()
+    if snapshot is None:
+        return 0, await encounter_state(db, encounter)
+
+    seq, state = snapshot.seq, json.loads(snapshot.state_json)
+    for event in await events_since(db, encounter.id, since=seq, until=at, limit=None):
+        apply_event(state, event)
+        seq = event.seq
+    return seq, state
@@ -0,0 +1,88 @@
+"""Fold the startup column checks into a revision
+
+Revision ID: 005_fold_startup_migrations
+Revises: 004_scene_m3_changes
+Create Date: 2026-10-18 00:00:00.000000
+
+These changes used to be made by run_migrations() in sta/database/db.py,
+which checked for them on every startup. Databases that already ran it
+have some or all of them, so each step checks before changing anything.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "005_fold_startup_migrations"
+down_revision = "004_scene_m3_changes"
+branch_labels = None
+depends_on = None
+
+ADDED_COLUMNS = {
+    "starships": [
+        ("shields_raised", "BOOLEAN DEFAULT 0"),
+        ("weapons_armed", "BOOLEAN DEFAULT 0"),
+    ],
+    "encounters": [
+        ("campaign_id", "INTEGER REFERENCES campaigns(id)"),
+        ("status", "VARCHAR(20) DEFAULT 'active'"),
+        ("players_turns_used_json", "TEXT DEFAULT '{}'"),
+        ("current_player_id", "INTEGER"),
+        ("turn_claimed_at", "DATETIME"),
+        ("description", "TEXT"),
+        ("hailing_state_json", "TEXT"),
+    ],
+    "campaigns": [
+        ("gm_password_hash", "VARCHAR(255)"),
+    ],
+}
+
+STATUS_INDEXES = [
+    ("ix_encounters_campaign_status", "encounters"),
+    ("ix_scenes_campaign_status", "scenes"),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    starship_columns = {c["name"] for c in inspector.get_columns("starships")}
+    if "registry" in starship_columns and "ship_registry" not in starship_columns:
+        op.execute("ALTER TABLE starships RENAME COLUMN registry TO ship_registry")
+
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        for name, ddl in columns:
+            if name not in existing:
+                op.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+
+    # Status indexes for the campaign dashboard
+    for index, table in STATUS_INDEXES:
+        if index not in {i["name"] for i in inspector.get_indexes(table)}:
+            op.create_index(index, table, ["campaign_id", "status", "id"])
+
+    # Scene connections moved from JSON columns to the scene_edges table
+    for own, other, column in (
+        ("s.id", "t.id", "next_scene_ids_json"),
+        ("t.id", "s.id", "previous_scene_ids_json"),
+    ):
+        op.execute(
+            "INSERT OR IGNORE INTO scene_edges "
+            "(campaign_id, from_scene_id, to_scene_id, created_at) "
+            f"SELECT s.campaign_id, {own}, {other}, CURRENT_TIMESTAMP "
+            "FROM scenes s, json_each("
+            f"CASE WHEN json_valid(s.{column}) THEN s.{column} ELSE '[]' END) j "
+            "JOIN scenes t ON t.id = j.value AND t.campaign_id = s.campaign_id "
+            "WHERE s.id != t.id"
+        )
+    op.execute(
+        "UPDATE scenes SET next_scene_ids_json = '[]', previous_scene_ids_json = '[]' "
+        "WHERE next_scene_ids_json NOT IN ('', '[]') "
+        "OR previous_scene_ids_json NOT IN ('', '[]')"
+    )
+
+
+def downgrade():
+    # The columns and indexes are part of the models; nothing to undo
+    pass
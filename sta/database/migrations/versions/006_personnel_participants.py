@@ -0,0 +1,79 @@
+"""Move personnel encounter character state into personnel_participants rows
+
+Revision ID: 006_personnel_participants
+Revises: 005_fold_startup_migrations
+Create Date: 2026-10-19 00:00:00.000000
+
+The personnel_participants table itself comes from the models (it is
+created before revisions run); this copies each encounter's
+character_states_json, character_positions_json and
+characters_turns_used_json into it, then drops those columns.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "006_personnel_participants"
+down_revision = "005_fold_startup_migrations"
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = [
+    "character_states_json",
+    "character_positions_json",
+    "characters_turns_used_json",
+]
+UNNAMED = "'Character ' || j.key"
+NO_INJURIES = "'[]'"
+
+
+def upgrade():
+    columns = {
+        c["name"] for c in sa.inspect(op.get_bind()).get_columns("personnel_encounters")
+    }
+    if not set(JSON_COLUMNS) <= columns:
+        return
+
+    def state(field, default):
+        return f"coalesce(json_extract(j.value, '$.{field}'), {default})"
+
+    def turn(field):
+        return (
+            f"coalesce(json_extract(pe.characters_turns_used_json, '$.\"' || j.key || '\".{field}'), "
+            f"json_extract(pe.characters_turns_used_json, '$.character_' || j.key || '.{field}'))"
+        )
+
+    def position(axis):
+        return (
+            "coalesce(json_extract(pe.character_positions_json, "
+            f"'$.character_' || j.key || '.{axis}'), 0)"
+        )
+
+    op.execute(
+        "INSERT INTO personnel_participants (personnel_encounter_id, slot, character_id, "
+        "name, is_player, stress, stress_max, determination, determination_max, "
+        "injuries_json, is_defeated, protection, q, r, has_acted, acted_at) "
+        "SELECT pe.id, j.key, json_extract(j.value, '$.character_id'), "
+        f"{state('name', UNNAMED)}, "
+        f"{state('is_player', 0)}, {state('stress', 5)}, {state('stress_max', 5)}, "
+        f"{state('determination', 0)}, {state('determination_max', 3)}, "
+        f"{state('injuries', NO_INJURIES)}, {state('is_defeated', 0)}, "
+        f"{state('protection', 0)}, {position('q')}, {position('r')}, "
+        f"coalesce({turn('acted')}, 0), datetime({turn('acted_at')}) "
+        "FROM personnel_encounters pe, json_each(CASE WHEN json_valid(pe.character_states_json) "
+        "AND json_type(pe.character_states_json) = 'array' "
+        "THEN pe.character_states_json ELSE '[]' END) j "
+        "WHERE NOT EXISTS (SELECT 1 FROM personnel_participants pp "
+        "WHERE pp.personnel_encounter_id = pe.id)"
+    )
+    for column in JSON_COLUMNS:
+        op.execute(f"ALTER TABLE personnel_encounters DROP COLUMN {column}")
+
+
+def downgrade():
+    for column, default in zip(JSON_COLUMNS, ("'[]'", "'{}'", "'{}'")):
+        op.execute(
+            f"ALTER TABLE personnel_encounters ADD COLUMN {column} TEXT NOT NULL DEFAULT {default}"
+        )
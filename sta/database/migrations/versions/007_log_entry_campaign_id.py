@@ -0,0 +1,43 @@
+"""Denormalize campaign_id onto log_entries for the campaign log feed
+
+Revision ID: 007_log_entry_campaign_id
+Revises: 006_personnel_participants
+Create Date: 2026-10-19 00:00:00.000000
+
+Adds log_entries.campaign_id, fills it from each entry's character and
+indexes it with (created_at, id), the feed's sort key.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "007_log_entry_campaign_id"
+down_revision = "006_personnel_participants"
+branch_labels = None
+depends_on = None
+
+FEED_INDEX = "ix_log_entries_campaign_feed"
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "campaign_id" not in {c["name"] for c in inspector.get_columns("log_entries")}:
+        op.execute(
+            "ALTER TABLE log_entries ADD COLUMN campaign_id INTEGER REFERENCES campaigns(id)"
+        )
+    op.execute(
+        "UPDATE log_entries SET campaign_id = "
+        "(SELECT c.campaign_id FROM vtt_characters c WHERE c.id = log_entries.character_id) "
+        "WHERE campaign_id IS NULL"
+    )
+
+    if FEED_INDEX not in {i["name"] for i in inspector.get_indexes("log_entries")}:
+        op.create_index(FEED_INDEX, "log_entries", ["campaign_id", "created_at", "id"])
+
+
+def downgrade():
+    op.drop_index(FEED_INDEX, "log_entries")
+    op.execute("ALTER TABLE log_entries DROP COLUMN campaign_id")
@@ -0,0 +1,31 @@
+"""Record who queued each background job
+
+Revision ID: 008_job_created_by
+Revises: 007_log_entry_campaign_id
+Create Date: 2026-10-19 00:00:00.000000
+
+Adds jobs.created_by, the campaign player whose session queued the job,
+so the job routes can limit jobs to their owner and campaign GM. Jobs
+queued before this have no owner; only their campaign's GM sees them.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "008_job_created_by"
+down_revision = "007_log_entry_campaign_id"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "created_by" not in {c["name"] for c in inspector.get_columns("jobs")}:
+        op.add_column("jobs", sa.Column("created_by", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.execute("ALTER TABLE jobs DROP COLUMN created_by")
@@ -0,0 +1,328 @@
+"""
+Momentum and Threat pools backed by an append-only ledger.
+
+Pool arithmetic happens in SQL, never as read-modify-write in Python.
+change_pool appends the change to pool_ledger with one INSERT ... SELECT
+that reads the live pool value, clamps the new total and RETURNs both,
+then writes the total back with an UPDATE in the same transaction:
+
+    spent = await change_pool(db, encounter, "threat", -cost, "hazard", require=True)
+    if spent is None:
+        raise HTTPException(status_code=400, detail="Not enough Threat")
+
+The INSERT takes SQLite's write lock before it reads the pool, so two
+concurrent spends can neither lose an update nor overspend. (SQLite's
+RETURNING only reports new values, which is why the previous total is
+read by the ledger insert rather than by the UPDATE.)
+
+Each ledger row keeps the running total (balance), so a pool's history
+and per-scene/per-round totals come from indexed ledger queries.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, case, func, insert, literal, null, select, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .changes import TRACKED_RECORDS, record_change
+from .encounter_journal import append_event
+from .schema import CampaignRecord, EncounterRecord, PoolLedgerRecord, SceneRecord
+from .undo import remember_original_value
+
+POOLS = ("momentum", "threat")
+MOMENTUM_MAX = 6
+THREAT_MAX = 24  # Cap applied when Momentum is claimed as Threat
+HISTORY_PAGE = 100  # Ledger rows returned per history request
+
+_LEDGER_COLUMNS = [
+    PoolLedgerRecord.campaign_id,
+    PoolLedgerRecord.encounter_id,
+    PoolLedgerRecord.scene_id,
+    PoolLedgerRecord.round,
+    PoolLedgerRecord.pool,
+    PoolLedgerRecord.reason,
+    PoolLedgerRecord.previous,
+    PoolLedgerRecord.balance,
+    PoolLedgerRecord.change,
+    PoolLedgerRecord.created_at,
+]
+
+
+@dataclass(frozen=True)
+class PoolChange:
+    """One ledger entry."""
+    id: int
+    pool: str
+    change: int
+    previous: int
+    balance: int
+    reason: str
+    encounter_id: Optional[int] = None
+    scene_id: Optional[int] = None
+    round: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "pool": self.pool,
+            "change": self.change,
+            "previous": self.previous,
+            "balance": self.balance,
+            "reason": self.reason,
+            "encounter_id": self.encounter_id,
+            "scene_id": self.scene_id,
+            "round": self.round,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+_RETURNING = (
+    PoolLedgerRecord.id,
+    PoolLedgerRecord.pool,
+    PoolLedgerRecord.change,
+    PoolLedgerRecord.previous,
+    PoolLedgerRecord.balance,
+    PoolLedgerRecord.reason,
+    PoolLedgerRecord.encounter_id,
+    PoolLedgerRecord.scene_id,
+    PoolLedgerRecord.round,
+    PoolLedgerRecord.created_at,
+)
+
+
+def _pool_column(model, pool: str):
+    if pool not in POOLS:
+        raise ValueError(f"Unknown pool: {pool}")
+    if model not in (EncounterRecord, CampaignRecord):
+        raise ValueError(f"{model.__name__} has no Momentum/Threat pools")
+    return getattr(model, pool)
+
+
+def _ledger_source(model, record, pool: str, reason: str, previous, balance,
+                   scene_id: Optional[int]):
+    """SELECT producing one ledger row for record, in _LEDGER_COLUMNS order."""
+    if model is EncounterRecord:
+        scope = [
+            model.campaign_id,
+            model.id,
+            literal(scene_id) if scene_id is not None else SceneRecord.id,
+            model.round,
+        ]
+    else:
+        active_scene = (
+            select(SceneRecord.id)
+            .filter(SceneRecord.campaign_id == model.id, SceneRecord.status == "active")
+            .order_by(SceneRecord.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        scope = [
+            model.id,
+            null(),
+            literal(scene_id) if scene_id is not None else active_scene,
+            null(),
+        ]
+    stmt = select(
+        *scope,
+        literal(pool),
+        literal(reason),
+        previous,
+        balance,
+        balance - previous,
+        literal(datetime.now(), DateTime),
+    ).filter(model.id == record.id)
+    if model is EncounterRecord and scene_id is None:
+        stmt = stmt.outerjoin(SceneRecord, SceneRecord.encounter_id == model.id)
+    return stmt
+
+
+async def _insert_ledger_row(db, source) -> Optional[PoolChange]:
+    result = await db.execute(
+        insert(PoolLedgerRecord).from_select(_LEDGER_COLUMNS, source).returning(*_RETURNING)
+    )
+    row = result.first()
+    return PoolChange(*row) if row is not None else None
+
+
+async def change_pool(
+    db,
+    record,
+    pool: str,
+    change: int,
+    reason: str,
+    *,
+    maximum: Optional[int] = None,
+    require: bool = False,
+    scene_id: Optional[int] = None,
+) -> Optional[PoolChange]:
+    """
+    Add change to an encounter's or campaign's pool, clamped to
+    0..maximum, and append it to the ledger (and an encounter's change
+    to its event journal). The caller commits.
+
+    A pool already above maximum is capped first, so spending 1 from an
+    overfull Momentum pool of 8 leaves 5.
+
+    Args:
+        record: The EncounterRecord or CampaignRecord that owns the pool
+        maximum: Upper bound for the pool (None: unbounded)
+        require: For spends: fail instead of clamping at 0 if the pool
+            holds less than -change
+        scene_id: Scene to attribute the change to (default: the scene
+            playing the encounter, or the campaign's active scene)
+
+    Returns:
+        The ledger entry, or None if the record is gone or the pool
+        could not cover a required spend
+    """
+    model = type(record)
+    column = _pool_column(model, pool)
+    previous = func.coalesce(column, 0)
+    # SQLite's scalar min/max; an overfull pool is capped before the change
+    start = func.min(previous, maximum) if maximum is not None else previous
+    balance = func.max(start + change, 0)
+    if maximum is not None:
+        balance = func.min(balance, maximum)
+
+    source = _ledger_source(model, record, pool, reason, previous, balance, scene_id)
+    if require:
+        source = source.filter(previous >= -change)
+    entry = await _insert_ledger_row(db, source)
+    if entry is None:
+        return None
+
+    await db.execute(update(model).filter(model.id == record.id).values({pool: entry.balance}))
+    # Keep the loaded record current without marking it dirty
+    set_committed_value(record, pool, entry.balance)
+    remember_original_value(db.sync_session, record, pool, entry.previous)
+    await record_change(db, TRACKED_RECORDS[model], record.id)
+    if model is EncounterRecord:
+        await append_event(
+            db, record, f"{pool}_changed", change=entry.change, **{pool: entry.balance}
+        )
+    return entry
+
+
+async def record_pool_corrections(db, record, reason: str) -> list[PoolChange]:
+    """
+    Ledger pool values that were set directly on the record (e.g. by GM
+    undo) since its last ledger entry, so running totals stay continuous.
+    """
+    model = type(record)
+    await db.flush()
+    corrections = []
+    for pool in POOLS:
+        column = _pool_column(model, pool)
+        scope = PoolLedgerRecord.encounter_id == record.id
+        if model is CampaignRecord:
+            scope = (PoolLedgerRecord.campaign_id == record.id) & PoolLedgerRecord.encounter_id.is_(None)
+        latest = (
+            select(PoolLedgerRecord.balance)
+            .filter(scope, PoolLedgerRecord.pool == pool)
+            .order_by(PoolLedgerRecord.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        current = func.coalesce(column, 0)
+        source = _ledger_source(model, record, pool, reason, latest, current, None).filter(
+            latest.is_not(None), latest != current
+        )
+        entry = await _insert_ledger_row(db, source)
+        if entry is not None:
+            corrections.append(entry)
+    return corrections
+
+
+# ===== Reading =====
+
+def _scope_filters(campaign_pk, encounter_pk, scene_id, pool) -> list:
+    filters = []
+    if campaign_pk is not None:
+        filters.append(PoolLedgerRecord.campaign_id == campaign_pk)
+    if encounter_pk is not None:
+        filters.append(PoolLedgerRecord.encounter_id == encounter_pk)
+    if scene_id is not None:
+        filters.append(PoolLedgerRecord.scene_id == scene_id)
+    if pool is not None:
+        filters.append(PoolLedgerRecord.pool == pool)
+    return filters
+
+
+async def pool_history(
+    db,
+    campaign_pk: Optional[int] = None,
+    encounter_pk: Optional[int] = None,
+    scene_id: Optional[int] = None,
+    pool: Optional[str] = None,
+    campaign_only: bool = False,
+    before: Optional[int] = None,
+    limit: Optional[int] = HISTORY_PAGE,
+) -> list[PoolChange]:
+    """
+    Ledger entries newest first, paged by id (pass the last id as before).
+
+    Args:
+        campaign_only: Only the campaign pools, not its encounters' pools
+    """
+    stmt = select(*_RETURNING).filter(*_scope_filters(campaign_pk, encounter_pk, scene_id, pool))
+    if campaign_only:
+        stmt = stmt.filter(PoolLedgerRecord.encounter_id.is_(None))
+    if before is not None:
+        stmt = stmt.filter(PoolLedgerRecord.id < before)
+    stmt = stmt.order_by(PoolLedgerRecord.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await db.execute(stmt)
+    return [PoolChange(*row) for row in result.all()]
+
+
+async def pool_totals(
+    db,
+    group_by: str = "scene",
+    campaign_pk: Optional[int] = None,
+    encounter_pk: Optional[int] = None,
+) -> list[dict]:
+    """
+    Gained/spent totals per pool and scene ("scene") or encounter round
+    ("round"), with each group's closing balance.
+    """
+    if group_by == "scene":
+        keys = [PoolLedgerRecord.scene_id]
+    elif group_by == "round":
+        keys = [PoolLedgerRecord.encounter_id, PoolLedgerRecord.round]
+    else:
+        raise ValueError(f"Cannot group pool totals by {group_by}")
+
+    stmt = (
+        select(
+            *keys,
+            PoolLedgerRecord.pool,
+            func.sum(case((PoolLedgerRecord.change > 0, PoolLedgerRecord.change), else_=0)),
+            -func.sum(case((PoolLedgerRecord.change < 0, PoolLedgerRecord.change), else_=0)),
+            func.count(),
+            # SQLite takes bare columns from the row that holds the max()
+            func.max(PoolLedgerRecord.id),
+            PoolLedgerRecord.balance,
+        )
+        .filter(*_scope_filters(campaign_pk, encounter_pk, None, None))
+        .group_by(*keys, PoolLedgerRecord.pool)
+        .order_by(*keys, PoolLedgerRecord.pool)
+    )
+    if group_by == "round":
+        stmt = stmt.filter(PoolLedgerRecord.encounter_id.is_not(None))
+
+    totals = []
+    for row in (await db.execute(stmt)).all():
+        *key_values, pool, gained, spent, changes, _, balance = row
+        totals.append({
+            **{key.key: value for key, value in zip(keys, key_values)},
+            "pool": pool,
+            "gained": gained,
+            "spent": spent,
+            "changes": changes,
+            "balance": balance,
+        })
+    return totals
@@ -0,0 +1,310 @@
+"""
+Scene graph: branching connections between a campaign's scenes.
+
+Connections are rows in scene_edges (from_scene_id -> to_scene_id),
+indexed in both directions. Next/previous scenes are single index
+lookups, and walks over the graph are recursive CTEs, so a campaign
+with hundreds of scenes is never loaded into Python to answer "what is
+reachable from here":
+
+    await connect_scenes(db, scene.campaign_id, scene.id, target.id)
+    reachable = await reachable_scene_ids(db, scene.id)
+    path = await scene_path(db, scene.id, finale.id)
+
+The whole flowchart of a campaign is built with two queries and cached
+until one of its scenes or edges changes (see FlowchartCache).
+"""
+
+from typing import Optional
+
+from sqlalchemy import delete, func, literal, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .schema import SceneEdgeRecord, SceneRecord
+
+MAX_PATH_DEPTH = 64  # Longest path scene_path will find
+
+
+# ===== Edges =====
+
+async def scene_connections(db, scene_id: int) -> dict[str, list[int]]:
+    """A scene's next and previous scene ids, in the order they were connected."""
+    result = await db.execute(
+        select(SceneEdgeRecord.from_scene_id, SceneEdgeRecord.to_scene_id)
+        .filter(
+            or_(
+                SceneEdgeRecord.from_scene_id == scene_id,
+                SceneEdgeRecord.to_scene_id == scene_id,
+            )
+        )
+        .order_by(SceneEdgeRecord.id)
+    )
+    next_ids, previous_ids = [], []
+    for from_id, to_id in result.all():
+        if from_id == scene_id:
+            next_ids.append(to_id)
+        else:
+            previous_ids.append(from_id)
+    return {"next_scene_ids": next_ids, "previous_scene_ids": previous_ids}
+
+
+async def campaign_scene_ids(db, campaign_id: int, scene_ids) -> list[int]:
+    """The given ids that are scenes of the campaign, in input order, deduplicated."""
+    scene_ids = list(dict.fromkeys(scene_ids))
+    if not scene_ids:
+        return []
+    result = await db.execute(
+        select(SceneRecord.id).filter(
+            SceneRecord.id.in_(scene_ids), SceneRecord.campaign_id == campaign_id
+        )
+    )
+    valid = set(result.scalars().all())
+    return [scene_id for scene_id in scene_ids if scene_id in valid]
+
+
+async def connect_scenes(db, campaign_id: int, from_scene_id: int, to_scene_id: int) -> bool:
+    """Add an edge. Returns False if it already existed."""
+    result = await db.execute(
+        sqlite_insert(SceneEdgeRecord)
+        .values(campaign_id=campaign_id, from_scene_id=from_scene_id, to_scene_id=to_scene_id)
+        .on_conflict_do_nothing(index_elements=["from_scene_id", "to_scene_id"])
+    )
+    return result.rowcount > 0
+
+
+async def disconnect_scenes(db, from_scene_id: int, to_scene_id: int) -> bool:
+    """Remove an edge. Returns False if there was none."""
+    result = await db.execute(
+        delete(SceneEdgeRecord).filter(
+            SceneEdgeRecord.from_scene_id == from_scene_id,
+            SceneEdgeRecord.to_scene_id == to_scene_id,
+        )
+    )
+    return result.rowcount > 0
+
+
+async def set_scene_connections(
+    db, scene: SceneRecord, scene_ids, direction: str = "next"
+) -> list[int]:
+    """
+    Replace a scene's next (or previous) scenes. Ids that are not scenes
+    of the same campaign are ignored.
+
+    Returns:
+        The connected ids, in input order
+    """
+    own, other = _edge_columns(direction)
+    scene_ids = await campaign_scene_ids(db, scene.campaign_id, scene_ids)
+
+    stale = delete(SceneEdgeRecord).filter(own == scene.id)
+    if scene_ids:
+        stale = stale.filter(other.not_in(scene_ids))
+    await db.execute(stale)
+    if scene_ids:
+        rows = [
+            {
+                "campaign_id": scene.campaign_id,
+                own.key: scene.id,
+                other.key: scene_id,
+            }
+            for scene_id in scene_ids
+        ]
+        await db.execute(
+            sqlite_insert(SceneEdgeRecord)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["from_scene_id", "to_scene_id"])
+        )
+    return scene_ids
+
+
+async def delete_scene_edges(db, scene_ids) -> None:
+    """Remove every edge into or out of the given scenes (before deleting them)."""
+    scene_ids = list(scene_ids)
+    await db.execute(
+        delete(SceneEdgeRecord).filter(
+            or_(
+                SceneEdgeRecord.from_scene_id.in_(scene_ids),
+                SceneEdgeRecord.to_scene_id.in_(scene_ids),
+            )
+        )
+    )
+
+
+def _edge_columns(direction: str):
+    """(column for the starting scene, column for the connected scene)."""
+    if direction == "next":
+        return SceneEdgeRecord.from_scene_id, SceneEdgeRecord.to_scene_id
+    if direction == "previous":
+        return SceneEdgeRecord.to_scene_id, SceneEdgeRecord.from_scene_id
+    raise ValueError(f"direction must be 'next' or 'previous', not {direction!r}")
+
+
+# ===== Traversal =====
+
+async def reachable_scene_ids(db, scene_id: int, direction: str = "next") -> set[int]:
+    """Every scene reachable from scene_id by following edges (cycle-safe)."""
+    own, other = _edge_columns(direction)
+    walk = (
+        select(other.label("scene_id")).filter(own == scene_id).cte("walk", recursive=True)
+    )
+    # UNION (not UNION ALL) drops scenes already visited, which ends cycles
+    walk = walk.union(
+        select(other).select_from(SceneEdgeRecord).join(walk, own == walk.c.scene_id)
+    )
+    result = await db.execute(select(walk.c.scene_id).filter(walk.c.scene_id != scene_id))
+    return set(result.scalars().all())
+
+
+async def scene_distances(db, scene_id: int, direction: str = "next") -> dict[int, int]:
+    """Fewest edges from scene_id to each scene within MAX_PATH_DEPTH."""
+    own, other = _edge_columns(direction)
+    walk = (
+        select(other.label("scene_id"), literal(1).label("depth"))
+        .filter(own == scene_id)
+        .cte("distances", recursive=True)
+    )
+    walk = walk.union(
+        select(other, walk.c.depth + 1)
+        .select_from(SceneEdgeRecord)
+        .join(walk, own == walk.c.scene_id)
+        .filter(walk.c.depth < MAX_PATH_DEPTH)
+    )
+    result = await db.execute(
+        select(walk.c.scene_id, func.min(walk.c.depth))
+        .filter(walk.c.scene_id != scene_id)
+        .group_by(walk.c.scene_id)
+    )
+    return dict(result.all())
+
+
+async def scene_path(db, from_scene_id: int, to_scene_id: int) -> Optional[list[int]]:
+    """A shortest path of scene ids from one scene to another, or None."""
+    if from_scene_id == to_scene_id:
+        return [from_scene_id]
+    distances = await scene_distances(db, from_scene_id)
+    if to_scene_id not in distances:
+        return None
+
+    # Walk back from the target through scenes one step closer each time
+    distances[from_scene_id] = 0
+    result = await db.execute(
+        select(SceneEdgeRecord.from_scene_id, SceneEdgeRecord.to_scene_id)
+        .filter(SceneEdgeRecord.to_scene_id.in_(list(distances)))
+        .order_by(SceneEdgeRecord.id)
+    )
+    previous: dict[int, list[int]] = {}
+    for from_id, to_id in result.all():
+        previous.setdefault(to_id, []).append(from_id)
+
+    path = [to_scene_id]
+    while path[-1] != from_scene_id:
+        depth = distances[path[-1]]
+        path.append(next(p for p in previous[path[-1]] if distances.get(p) == depth - 1))
+    return path[::-1]
+
+
+async def next_scene_candidates(db, scene_id: int, status: Optional[str] = "draft") -> list[dict]:
+    """The scenes directly after scene_id (optionally only those in status)."""
+    stmt = (
+        select(SceneRecord.id, SceneRecord.name, SceneRecord.status)
+        .join(SceneEdgeRecord, SceneEdgeRecord.to_scene_id == SceneRecord.id)
+        .filter(SceneEdgeRecord.from_scene_id == scene_id)
+        .order_by(SceneEdgeRecord.id)
+    )
+    if status is not None:
+        stmt = stmt.filter(SceneRecord.status == status)
+    result = await db.execute(stmt)
+    return [{"id": id, "name": name, "status": status} for id, name, status in result.all()]
+
+
+# ===== Flowchart =====
+
+class FlowchartCache:
+    """
+    Flowchart payloads per campaign.
+
+    Entries store the campaign's scene count, latest scene update and edge
+    count/latest edge id they were built from, so a payload is reused until
+    a scene or edge is added, changed or removed (edge ids are never
+    reused). Checking that state is one aggregate query.
+    """
+
+    def __init__(self):
+        self._entries: dict[int, tuple[tuple, dict]] = {}
+
+    def get(self, campaign_id: int, state: tuple) -> Optional[dict]:
+        entry = self._entries.get(campaign_id)
+        if entry and entry[0] == state:
+            return entry[1]
+        return None
+
+    def put(self, campaign_id: int, state: tuple, payload: dict) -> None:
+        self._entries[campaign_id] = (state, payload)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+flowchart_cache = FlowchartCache()
+
+
+async def _flowchart_state(db, campaign_id: int) -> tuple:
+    def edges(aggregate):
+        return (
+            select(aggregate(SceneEdgeRecord.id))
+            .filter(SceneEdgeRecord.campaign_id == campaign_id)
+            .scalar_subquery()
+        )
+
+    result = await db.execute(
+        select(
+            func.count(SceneRecord.id),
+            func.max(SceneRecord.updated_at),
+            edges(func.count),
+            edges(func.max),
+        ).filter(SceneRecord.campaign_id == campaign_id)
+    )
+    return tuple(result.one())
+
+
+async def campaign_flowchart(db, campaign_id: int) -> dict:
+    """
+    The campaign's scene graph: scenes, edges and root scenes (those with
+    no previous scene). Cached; do not modify the returned payload.
+    """
+    state = await _flowchart_state(db, campaign_id)
+    payload = flowchart_cache.get(campaign_id, state)
+    if payload is not None:
+        return payload
+
+    scenes = await db.execute(
+        select(
+            SceneRecord.id,
+            SceneRecord.name,
+            SceneRecord.scene_type,
+            SceneRecord.status,
+            SceneRecord.is_focused,
+        )
+        .filter(SceneRecord.campaign_id == campaign_id)
+        .order_by(SceneRecord.id)
+    )
+    edges = await db.execute(
+        select(SceneEdgeRecord.from_scene_id, SceneEdgeRecord.to_scene_id)
+        .filter(SceneEdgeRecord.campaign_id == campaign_id)
+        .order_by(SceneEdgeRecord.id)
+    )
+    edge_list = [{"from": from_id, "to": to_id} for from_id, to_id in edges.all()]
+    has_previous = {edge["to"] for edge in edge_list}
+    nodes = [
+        {"id": id, "name": name, "scene_type": scene_type, "status": status,
+         "is_focused": is_focused}
+        for id, name, scene_type, status, is_focused in scenes.all()
+    ]
+    payload = {
+        "campaign_id": campaign_id,
+        "scenes": nodes,
+        "edges": edge_list,
+        "roots": [node["id"] for node in nodes if node["id"] not in has_previous],
+    }
+    flowchart_cache.put(campaign_id, state, payload)
+    return payload
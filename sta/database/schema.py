@@ -9,6 +9,7 @@ from sqlalchemy import (
     Text,
     DateTime,
     ForeignKey,
+    Index,
     UniqueConstraint,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
@@ -291,6 +292,8 @@ class EncounterRecord(Base):
     """Database record for a combat encounter."""
 
     __tablename__ = "encounters"
+    # Campaign dashboard: counts and pages per status
+    __table_args__ = (Index("ix_encounters_campaign_status", "campaign_id", "status", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     encounter_id: Mapped[str] = mapped_column(String(50), unique=True)
@@ -586,6 +589,8 @@ class SceneRecord(Base):
     """Scene information - first-class entity for narrative context."""
 
     __tablename__ = "scenes"
+    # Campaign dashboard: counts and pages per status
+    __table_args__ = (Index("ix_scenes_campaign_status", "campaign_id", "status", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -624,8 +629,12 @@ class SceneRecord(Base):
     tactical_map_json: Mapped[str] = mapped_column(Text, default="{}")
 
     # Scene connections (for branching narratives)
-    next_scene_ids_json: Mapped[str] = mapped_column(Text, default="[]")
-    previous_scene_ids_json: Mapped[str] = mapped_column(Text, default="[]")
+    next_scene_ids_json: Mapped[str] = mapped_column(
+        Text, default="[]"
+    )  # Deprecated: use scene_edges table
+    previous_scene_ids_json: Mapped[str] = mapped_column(
+        Text, default="[]"
+    )  # Deprecated: use scene_edges table
 
     # Starship combat specific fields
     player_ship_id: Mapped[Optional[int]] = mapped_column(
@@ -671,24 +680,6 @@ class SceneRecord(Base):
         except (json.JSONDecodeError, TypeError):
             return {}
 
-    @hybrid_property
-    def next_scenes(self):
-        import json
-
-        try:
-            return json.loads(self.next_scene_ids_json or "[]")
-        except (json.JSONDecodeError, TypeError):
-            return []
-
-    @hybrid_property
-    def previous_scenes(self):
-        import json
-
-        try:
-            return json.loads(self.previous_scene_ids_json or "[]")
-        except (json.JSONDecodeError, TypeError):
-            return []
-
     @hybrid_property
     def encounter_config(self):
         import json
@@ -723,6 +714,29 @@ class SceneRecord(Base):
             return []
 
 
+class SceneEdgeRecord(Base):
+    """A connection from a scene to one of its possible next scenes.
+
+    Indexed in both directions, so next and previous scenes are single
+    index lookups and graph walks are recursive CTEs over this table
+    (see sta/database/scene_graph.py).
+    """
+
+    __tablename__ = "scene_edges"
+    # AUTOINCREMENT so ids are never reused; the flowchart cache relies on it
+    __table_args__ = (
+        UniqueConstraint("from_scene_id", "to_scene_id", name="uq_scene_edge"),
+        Index("ix_scene_edges_to", "to_scene_id", "from_scene_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    campaign_id: Mapped[int] = mapped_column(ForeignKey("campaigns.id"), index=True)
+    from_scene_id: Mapped[int] = mapped_column(ForeignKey("scenes.id"))
+    to_scene_id: Mapped[int] = mapped_column(ForeignKey("scenes.id"))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+
 class SceneShipRecord(Base):
     """Ships assigned to a scene (replaces enemy_ships_json)."""
 
@@ -860,18 +874,7 @@ class PersonnelEncounterRecord(Base):
     current_turn: Mapped[str] = mapped_column(String(20), default="player")
     is_active: Mapped[bool] = mapped_column(default=True)
 
-    # Character positions on tactical map
-    # Structure: {"character_0": {"q": int, "r": int}, "character_1": {...}, ...}
-    character_positions_json: Mapped[str] = mapped_column(Text, default="{}")
-
-    # Character states (stress, injuries, status)
-    # Structure: [{"character_id": int, "name": str, "stress": int, "stress_max": int,
-    #              "injuries": [{"type": "stun"|"deadly", "severity": int, "name": str}],
-    #              "is_defeated": bool, "protection": int}]
-    character_states_json: Mapped[str] = mapped_column(Text, default="[]")
-
-    # Turn tracking - JSON dict: {"character_index": {"acted": bool, "acted_at": "timestamp"}}
-    characters_turns_used_json: Mapped[str] = mapped_column(Text, default="{}")
+    # Characters' states, positions and turns are PersonnelParticipantRecord rows
 
     # Track who currently has claimed the turn
     current_player_id: Mapped[Optional[int]] = mapped_column(
@@ -891,3 +894,201 @@ class PersonnelEncounterRecord(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.now, onupdate=datetime.now
     )
+
+
+class PersonnelParticipantRecord(Base):
+    """One character's state in a personnel encounter.
+
+    A row per character, so a change to one character writes one row and
+    the whole encounter is read with a single indexed range scan.
+    """
+
+    __tablename__ = "personnel_participants"
+    __table_args__ = (
+        UniqueConstraint("personnel_encounter_id", "slot", name="uq_personnel_participant_slot"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    personnel_encounter_id: Mapped[int] = mapped_column(ForeignKey("personnel_encounters.id"))
+    slot: Mapped[int] = mapped_column(Integer)  # Turn order; the map's character_<slot> token
+    character_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("vtt_characters.id"), nullable=True, index=True
+    )
+
+    name: Mapped[str] = mapped_column(String(100))
+    is_player: Mapped[bool] = mapped_column(default=False)
+    stress: Mapped[int] = mapped_column(Integer, default=5)
+    stress_max: Mapped[int] = mapped_column(Integer, default=5)
+    determination: Mapped[int] = mapped_column(Integer, default=0)
+    determination_max: Mapped[int] = mapped_column(Integer, default=3)
+    # [{"type": "stun"|"deadly", "severity": int, "name": str}]
+    injuries_json: Mapped[str] = mapped_column(Text, default="[]")
+    is_defeated: Mapped[bool] = mapped_column(default=False)
+    protection: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Position on the tactical map
+    q: Mapped[int] = mapped_column(Integer, default=0)
+    r: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Turn tracking
+    has_acted: Mapped[bool] = mapped_column(default=False)
+    acted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    @hybrid_property
+    def injuries(self):
+        try:
+            return json.loads(self.injuries_json) if self.injuries_json else []
+        except (json.JSONDecodeError, TypeError):
+            return []
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.slot,
+            "character_id": self.character_id,
+            "name": self.name,
+            "is_player": self.is_player,
+            "stress": self.stress,
+            "stress_max": self.stress_max,
+            "determination": self.determination,
+            "determination_max": self.determination_max,
+            "injuries": self.injuries,
+            "is_defeated": self.is_defeated,
+            "protection": self.protection,
+            "position": {"q": self.q, "r": self.r},
+            "has_acted": self.has_acted,
+        }
+
+
+class ChangeJournalRecord(Base):
+    """One committed change to an encounter, campaign, scene or personnel encounter.
+
+    Rows are appended in the same transaction as the change itself, so
+    every worker process can follow changes in commit order by seq
+    (see sta/database/changes.py).
+    """
+
+    __tablename__ = "change_journal"
+    # AUTOINCREMENT so seq is never reused after the journal is trimmed
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: Mapped[int] = mapped_column(primary_key=True)
+    entity_type: Mapped[str] = mapped_column(String(20))  # encounter, campaign, scene, personnel
+    entity_id: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+
+class ChangeVersionRecord(Base):
+    """Latest change journal seq for each entity."""
+
+    __tablename__ = "change_versions"
+
+    entity_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    entity_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    seq: Mapped[int] = mapped_column(Integer)
+
+
+class EncounterEventRecord(Base):
+    """One event in an encounter's append-only journal.
+
+    seq counts from 1 per encounter; state is materialized from the
+    latest snapshot plus later events (see sta/database/encounter_journal.py).
+    """
+
+    __tablename__ = "encounter_events"
+    __table_args__ = (
+        UniqueConstraint("encounter_id", "seq", name="uq_encounter_event_seq"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    encounter_id: Mapped[int] = mapped_column(ForeignKey("encounters.id"))
+    seq: Mapped[int] = mapped_column(Integer)
+    event_type: Mapped[str] = mapped_column(String(30))
+    payload_json: Mapped[str] = mapped_column(Text, default="{}")
+    round: Mapped[int] = mapped_column(Integer, default=1)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+
+class EncounterSnapshotRecord(Base):
+    """Materialized encounter state as of event seq."""
+
+    __tablename__ = "encounter_snapshots"
+
+    encounter_id: Mapped[int] = mapped_column(ForeignKey("encounters.id"), primary_key=True)
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    state_json: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+
+class EncounterUndoRecord(Base):
+    """Reverse diff of one GM-undoable operation on an encounter.
+
+    diff_json lists the touched rows and the values their fields had
+    before the operation (see sta/database/undo.py).
+    """
+
+    __tablename__ = "encounter_undo"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    encounter_id: Mapped[int] = mapped_column(ForeignKey("encounters.id"), index=True)
+    round: Mapped[int] = mapped_column(Integer, default=1)  # Round the operation started in
+    label: Mapped[str] = mapped_column(String(100))
+    diff_json: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+
+class PoolLedgerRecord(Base):
+    """One change to a campaign or encounter Momentum/Threat pool.
+
+    Rows are only ever appended. balance is the pool's running total after
+    the change (see sta/database/pool_ledger.py). encounter_id and scene_id
+    are plain columns so history outlives deleted encounters and scenes.
+    """
+
+    __tablename__ = "pool_ledger"
+    __table_args__ = (
+        Index("ix_pool_ledger_campaign", "campaign_id", "pool", "id"),
+        Index("ix_pool_ledger_encounter_round", "encounter_id", "round"),
+        Index("ix_pool_ledger_scene", "scene_id", "pool"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    campaign_id: Mapped[Optional[int]] = mapped_column(ForeignKey("campaigns.id"), nullable=True)
+    encounter_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # None: campaign pool
+    scene_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    round: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    pool: Mapped[str] = mapped_column(String(10))  # momentum, threat
+    change: Mapped[int] = mapped_column(Integer)  # As applied, after clamping
+    previous: Mapped[int] = mapped_column(Integer)
+    balance: Mapped[int] = mapped_column(Integer)
+    reason: Mapped[str] = mapped_column(String(50), default="")
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+
+class JobRecord(Base):
+    """A background job (export, import, generation) and its result.
+
+    Jobs run in the process that queued them; every process can poll,
+    cancel and download them through this table (see sta/web/jobs.py).
+    Only the player who queued a job and its campaign's GM can see it.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_created", "status", "created_at"),)
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)  # uuid4 hex
+    kind: Mapped[str] = mapped_column(String(50))  # e.g. campaign_backup
+    status: Mapped[str] = mapped_column(
+        String(20), default="queued"
+    )  # queued, running, completed, failed, cancelled
+    progress: Mapped[int] = mapped_column(Integer, default=0)  # Percent
+    message: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    campaign_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_by: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True
+    )  # campaign_players.id of the session that queued it
+    result_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    result_filename: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
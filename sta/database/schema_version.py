@@ -0,0 +1,106 @@
+"""
+One-lookup schema check for startup.
+
+The database records which schema it has in SQLite's user_version
+header field: a number derived from the DDL of every model and the
+names of the Alembic revisions in sta/database/migrations/versions.
+When it matches this code's, which is the usual case, startup reads
+that one value and does nothing else, however many migrations there are:
+
+    with engine.begin() as conn:
+        ensure_schema(conn)
+
+When it doesn't, the schema is brought up to date once and the new
+version recorded:
+
+- create_all adds any tables the models have and the database lacks
+- a database made that way from nothing is stamped at the Alembic head
+- otherwise the Alembic revisions it is missing are run, starting after
+  UNVERSIONED_REVISION for databases from before the Alembic tree was
+  run by the app (these have no alembic_version table)
+
+So new tables only need a model; changes to existing tables (new
+columns, indexes, data moves) need a model change and a revision.
+"""
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from .schema import Base
+from . import vtt_schema  # noqa: F401  Registers the VTT tables on Base
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+# The last revision whose changes databases made by create_all already have
+UNVERSIONED_REVISION = "004_scene_m3_changes"
+
+
+@lru_cache(maxsize=None)
+def schema_fingerprint() -> str:
+    """sha256 of the models' DDL and the revision file names."""
+    dialect = sqlite.dialect()
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    for revision in sorted((MIGRATIONS_DIR / "versions").glob("*.py")):
+        digest.update(revision.name.encode())
+    return digest.hexdigest()
+
+
+def schema_version() -> int:
+    """The fingerprint as a user_version: positive and 31 bits, since the field is signed."""
+    return int(schema_fingerprint()[:8], 16) & 0x7FFFFFFF or 1
+
+
+def stored_version(connection: Connection) -> int:
+    """The schema version recorded in the database (0 if none)."""
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def alembic_config(connection: Connection) -> Config:
+    """Alembic config running the migrations tree on connection."""
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.attributes["connection"] = connection
+    return config
+
+
+def upgrade_schema(connection: Connection) -> None:
+    """Bring the database's tables up to date with the models."""
+    tables = set(inspect(connection).get_table_names())
+    fresh = not tables & set(Base.metadata.tables)
+    versioned = "alembic_version" in tables
+
+    Base.metadata.create_all(connection)
+
+    config = alembic_config(connection)
+    if fresh:
+        command.stamp(config, "head")
+        return
+    if not versioned:
+        command.stamp(config, UNVERSIONED_REVISION)
+    command.upgrade(config, "head")
+
+
+def ensure_schema(connection: Connection) -> bool:
+    """
+    Upgrade the schema unless the database already records this version.
+
+    Returns whether anything was run. The version is recorded last, so
+    an upgrade that fails part way is picked up again on the next start.
+    """
+    expected = schema_version()
+    if stored_version(connection) == expected:
+        return False
+    upgrade_schema(connection)
+    connection.exec_driver_sql(f"PRAGMA user_version = {expected}")
+    return True
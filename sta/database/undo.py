@@ -0,0 +1,255 @@
+"""
+GM undo and rewind for encounters.
+
+A session hook remembers the original value of every field changed on an
+encounter or ship before each flush. A mutating route turns those into
+one compact reverse diff by calling record_undo before it commits:
+
+    encounter.threat -= cost
+    await record_undo(db, encounter, "Spend Threat")
+    await db.commit()
+
+undo_operations and rewind_to_round then write the old values back in
+one transaction, newest operation first, so several operations touching
+the same field restore the value from before the oldest one. Only the
+newest MAX_UNDO_OPERATIONS diffs are kept per encounter.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from .schema import EncounterRecord, EncounterUndoRecord, SceneRecord, StarshipRecord
+from .vtt_schema import VTTShipRecord
+
+UNDO_RECORDS = {
+    EncounterRecord: "encounters",
+    StarshipRecord: "starships",
+    VTTShipRecord: "vtt_ships",
+}
+RECORDS_BY_TABLE = {table: record for record, table in UNDO_RECORDS.items()}
+
+MAX_UNDO_OPERATIONS = 50  # Diffs kept per encounter
+
+# Bookkeeping columns that are never restored
+SKIPPED_FIELDS = frozenset({"id", "created_at", "updated_at"})
+
+_PENDING_KEY = "sta_pending_undo"
+
+
+@dataclass(frozen=True)
+class UndoOperation:
+    """A recorded operation that can be undone."""
+    id: int
+    label: str
+    round: int
+    created_at: Optional[datetime]
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "round": self.round,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict) and "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+# ===== Capturing =====
+
+@event.listens_for(Session, "before_flush")
+def _capture_original_values(session, flush_context, instances):
+    pending = None
+    for obj in session.dirty:
+        table = UNDO_RECORDS.get(type(obj))
+        if table is None:
+            continue
+        state = inspect(obj)
+        for attr in state.mapper.column_attrs:
+            if attr.key in SKIPPED_FIELDS:
+                continue
+            history = state.attrs[attr.key].history
+            if not history.has_changes() or not history.deleted:
+                continue  # Unchanged, or the old value was never loaded
+            if pending is None:
+                pending = session.info.setdefault(_PENDING_KEY, {})
+            # The first flush in a transaction has the value before the operation
+            pending.setdefault((table, obj.id), {}).setdefault(
+                attr.key, _encode(history.deleted[0])
+            )
+
+
+def remember_original_value(session, obj, field: str, value) -> None:
+    """Capture a field changed outside the unit of work (e.g. by a Core UPDATE)."""
+    table = UNDO_RECORDS.get(type(obj))
+    if table is None:
+        return
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    pending.setdefault((table, obj.id), {}).setdefault(field, _encode(value))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session, *args):
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def encounter_for_scene(db, scene_id: Optional[int]) -> Optional[EncounterRecord]:
+    """The encounter a scene plays out, for changes made to the scene's ships."""
+    if scene_id is None:
+        return None
+    result = await db.execute(
+        select(EncounterRecord)
+        .join(SceneRecord, SceneRecord.encounter_id == EncounterRecord.id)
+        .filter(SceneRecord.id == scene_id)
+    )
+    return result.scalars().first()
+
+
+async def record_undo(db, encounter: EncounterRecord, label: str) -> Optional[int]:
+    """
+    Store the reverse diff of the changes made so far in this transaction.
+    Call after the changes and before the commit.
+
+    Returns:
+        The undo record id, or None if nothing changed
+    """
+    await db.flush()
+    pending = db.sync_session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return None
+
+    rows = [
+        {"table": table, "id": row_id, "fields": fields}
+        for (table, row_id), fields in pending.items()
+    ]
+    # Operations that advance the round belong to the round they started in
+    encounter_fields = pending.get(("encounters", encounter.id), {})
+    record = EncounterUndoRecord(
+        encounter_id=encounter.id,
+        round=encounter_fields.get("round", encounter.round) or 1,
+        label=label,
+        diff_json=json.dumps(rows),
+    )
+    db.add(record)
+    await db.flush()
+
+    # Cap storage: drop everything older than the newest MAX_UNDO_OPERATIONS
+    oldest_kept = (
+        select(EncounterUndoRecord.id)
+        .filter(EncounterUndoRecord.encounter_id == encounter.id)
+        .order_by(EncounterUndoRecord.id.desc())
+        .offset(MAX_UNDO_OPERATIONS - 1)
+        .limit(1)
+        .scalar_subquery()
+    )
+    await db.execute(
+        delete(EncounterUndoRecord).filter(
+            EncounterUndoRecord.encounter_id == encounter.id,
+            EncounterUndoRecord.id < oldest_kept,
+        )
+    )
+    return record.id
+
+
+# ===== Undoing =====
+
+async def list_operations(db, encounter: EncounterRecord) -> list[UndoOperation]:
+    """Undoable operations, newest first."""
+    result = await db.execute(
+        select(
+            EncounterUndoRecord.id,
+            EncounterUndoRecord.label,
+            EncounterUndoRecord.round,
+            EncounterUndoRecord.created_at,
+        )
+        .filter(EncounterUndoRecord.encounter_id == encounter.id)
+        .order_by(EncounterUndoRecord.id.desc())
+    )
+    return [UndoOperation(*row) for row in result.all()]
+
+
+async def _revert(db, records: list) -> list[tuple[str, int]]:
+    """Apply reverse diffs newest first and delete them. Returns the rows touched."""
+    touched = []
+    for record in records:
+        for row in json.loads(record.diff_json):
+            obj = await db.get(RECORDS_BY_TABLE[row["table"]], row["id"])
+            if obj is None:
+                continue  # Deleted since
+            for field, value in row["fields"].items():
+                setattr(obj, field, _decode(value))
+            touched.append((row["table"], row["id"]))
+    if records:
+        await db.execute(
+            delete(EncounterUndoRecord).filter(
+                EncounterUndoRecord.id.in_([record.id for record in records])
+            )
+        )
+    # Reverting is not itself undoable
+    await db.flush()
+    db.sync_session.info.pop(_PENDING_KEY, None)
+    return touched
+
+
+async def undo_operations(db, encounter: EncounterRecord, steps: int = 1):
+    """
+    Undo the last steps operations. The caller commits.
+
+    Returns:
+        (undone operations newest first, rows touched as (table, id))
+    """
+    result = await db.execute(
+        select(EncounterUndoRecord)
+        .filter(EncounterUndoRecord.encounter_id == encounter.id)
+        .order_by(EncounterUndoRecord.id.desc())
+        .limit(steps)
+    )
+    records = list(result.scalars().all())
+    operations = [UndoOperation(r.id, r.label, r.round, r.created_at) for r in records]
+    return operations, await _revert(db, records)
+
+
+async def rewind_to_round(db, encounter: EncounterRecord, round: Optional[int] = None):
+    """
+    Undo every operation since the start of a round (default: the current
+    round). The caller commits.
+
+    Returns:
+        (undone operations newest first, rows touched as (table, id))
+    """
+    target = round if round is not None else encounter.round or 1
+    result = await db.execute(
+        select(EncounterUndoRecord)
+        .filter(
+            EncounterUndoRecord.encounter_id == encounter.id,
+            EncounterUndoRecord.round >= target,
+        )
+        .order_by(EncounterUndoRecord.id.desc())
+    )
+    records = list(result.scalars().all())
+    operations = [UndoOperation(r.id, r.label, r.round, r.created_at) for r in records]
+    return operations, await _revert(db, records)
+
+
+async def count_operations(db, encounter: EncounterRecord) -> int:
+    """Number of undoable operations left."""
+    result = await db.execute(
+        select(func.count()).filter(EncounterUndoRecord.encounter_id == encounter.id)
+    )
+    return result.scalar() or 0
@@ -3,7 +3,18 @@
 import json
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, Float, Boolean
+from sqlalchemy import (
+    String,
+    Integer,
+    Text,
+    DateTime,
+    ForeignKey,
+    Float,
+    Boolean,
+    Index,
+    event,
+    select,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from sta.database.schema import Base
@@ -495,11 +506,18 @@ class LogEntryRecord(Base):
     """
 
     __tablename__ = "log_entries"
+    __table_args__ = (
+        # Campaign log feed, newest first, paged by (created_at, id)
+        Index("ix_log_entries_campaign_feed", "campaign_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     character_id: Mapped[int] = mapped_column(
         ForeignKey("vtt_characters.id"), nullable=False
     )
+    campaign_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("campaigns.id")
+    )  # The character's campaign when logged, so the feed needs no join
     log_type: Mapped[str] = mapped_column(
         String(20), default="MISSION"
     )  # PERSONAL, MISSION, VALUE
@@ -524,6 +542,7 @@ class LogEntryRecord(Base):
         return {
             "id": self.id,
             "character_id": self.character_id,
+            "campaign_id": self.campaign_id,
             "log_type": self.log_type,
             "content": self.content,
             "event_type": self.event_type,
@@ -532,3 +551,14 @@ class LogEntryRecord(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+@event.listens_for(LogEntryRecord, "before_insert")
+def _log_entry_campaign(mapper, connection, target):
+    """Entries added without a campaign_id get their character's, in the INSERT."""
+    if target.campaign_id is None:
+        target.campaign_id = (
+            select(VTTCharacterRecord.campaign_id)
+            .where(VTTCharacterRecord.id == target.character_id)
+            .scalar_subquery()
+        )
@@ -0,0 +1,200 @@
+"""
+Bulk NPC and ship generation for the universe library.
+
+generate_character and generate_starship build one model at a time from
+the module-level random state. Filling a library with thousands of NPCs
+or ships instead draws each column (species, rank, class, registry, ...)
+for a whole chunk in one call on a seeded random.Random, and yields rows
+ready for an executemany INSERT into universe_items:
+
+    for rows in character_rows(5000, seed=42):
+        db.execute(insert(UniverseItemRecord), rows)
+
+Rows follow the library's data_json contract, the same shape the
+add-to-library and import routes use: a character's attributes map or a
+ship's systems map, with the rank, species and role (or ship class) in
+the description. character_batches and ship_batches yield the full data
+as plain dicts for callers that build other records from it. The same count, seed and
+chunk size always give the same items. Names come from small lists, so
+they repeat in large batches.
+"""
+
+import json
+import random
+from typing import Iterator, Optional
+
+from sta.models.character import Disciplines
+from sta.models.enums import CrewQuality, Position
+from sta.models.starship import Departments, Starship, Systems
+from .character import (
+    _point_buy, random_focuses, random_name, random_talents, stress_for,
+)
+from .data import RANKS, SHIP_CLASSES, SHIP_TALENTS, SPECIES
+from .starship import classes_for_faction, get_weapon, random_ship_name
+
+BULK_CHUNK_SIZE = 500  # Rows per yielded chunk (and per INSERT)
+BULK_MAX_COUNT = 10_000  # Largest batch the API accepts
+
+ATTRIBUTE_NAMES = ("control", "fitness", "daring", "insight", "presence", "reason")
+DISCIPLINE_NAMES = ("command", "conn", "engineering", "medicine", "science", "security")
+
+
+def _chunk_sizes(count: int, chunk_size: int) -> Iterator[int]:
+    for start in range(0, count, chunk_size):
+        yield min(chunk_size, count - start)
+
+
+def character_batches(
+    count: int,
+    seed: Optional[int] = None,
+    *,
+    attribute_total: int = 56,
+    discipline_total: int = 16,
+    talent_count: int = 2,
+    focus_count: int = 4,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> Iterator[list[dict]]:
+    """
+    Generate count random characters as plain dicts, in chunks.
+
+    Args:
+        count: Number of characters
+        seed: Seed for the generator (random if None)
+        attribute_total: Total attribute points per character
+        discipline_total: Total discipline points per character
+        talent_count: Number of talents per character
+        focus_count: Number of focuses per character
+        chunk_size: Characters per yielded list
+    """
+    rng = random.Random(seed)
+    positions = list(Position)
+    for n in _chunk_sizes(count, chunk_size):
+        species = rng.choices(SPECIES, k=n)
+        ranks = rng.choices(RANKS, k=n)
+        roles = [p.value.title() for p in rng.choices(positions, k=n)]
+        attributes = [_point_buy(7, 12, attribute_total, rng) for _ in range(n)]
+        disciplines = [_point_buy(1, 5, discipline_total, rng) for _ in range(n)]
+        talents = [random_talents(talent_count, rng) for _ in range(n)]
+        focuses = [random_focuses(Disciplines(*d), focus_count, rng) for d in disciplines]
+        names = [random_name(s, rng) for s in species]
+
+        batch = []
+        for i in range(n):
+            stress = stress_for(attributes[i][1], talents[i])
+            batch.append({
+                "name": names[i],
+                "species": species[i],
+                "rank": ranks[i],
+                "role": roles[i],
+                "character_type": "npc",
+                "attributes": dict(zip(ATTRIBUTE_NAMES, attributes[i])),
+                "disciplines": dict(zip(DISCIPLINE_NAMES, disciplines[i])),
+                "talents": talents[i],
+                "focuses": focuses[i],
+                "stress": stress,
+                "stress_max": stress,
+            })
+        yield batch
+
+
+def character_rows(
+    count: int, seed: Optional[int] = None, *, category: str = "npcs", **options
+) -> Iterator[list[dict]]:
+    """
+    Generate count random characters as universe_items rows, in chunks.
+    Options are those of character_batches.
+    """
+    for batch in character_batches(count, seed, **options):
+        yield [
+            {
+                "name": data["name"],
+                "category": category,
+                "item_type": "character",
+                "data_json": json.dumps(data["attributes"]),
+                "description": f"{data['rank']}, {data['species']} {data['role']}",
+            }
+            for data in batch
+        ]
+
+
+def ship_batches(
+    count: int,
+    seed: Optional[int] = None,
+    *,
+    faction: str = "any",
+    crew_quality: Optional[CrewQuality] = None,
+    talent_count: int = 2,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> Iterator[list[dict]]:
+    """
+    Generate count random starships as plain dicts, in chunks.
+
+    Args:
+        count: Number of ships
+        seed: Seed for the generator (random if None)
+        faction: Ship faction (Federation, Klingon, Romulan, or "any")
+        crew_quality: NPC crew quality (None for player ships)
+        talent_count: Number of talents per ship
+        chunk_size: Ships per yielded list
+    """
+    rng = random.Random(seed)
+    classes = classes_for_faction(faction)
+    talent_count = min(talent_count, len(SHIP_TALENTS))
+    quality = crew_quality.value if crew_quality else None
+    for n in _chunk_sizes(count, chunk_size):
+        ship_classes = rng.choices(classes, k=n)
+        registries = rng.choices(range(1000, 80000), k=n)
+        talents = [rng.sample(SHIP_TALENTS, talent_count) for _ in range(n)]
+
+        batch = []
+        for i, ship_class in enumerate(ship_classes):
+            class_data = SHIP_CLASSES[ship_class]
+            ship_faction = class_data.get("faction", "Federation")
+            batch.append({
+                "name": random_ship_name(ship_faction, rng),
+                "ship_class": ship_class,
+                "registry": f"NCC-{registries[i]}",
+                "faction": ship_faction,
+                "scale": class_data["scale"],
+                "systems": dict(class_data["systems"]),
+                "departments": dict(class_data["departments"]),
+                "weapons": list(class_data.get("weapons", [])),
+                "talents": talents[i],
+                "traits": [f"{ship_faction} Starship", f"{ship_class}-class"],
+                "crew_quality": quality,
+            })
+        yield batch
+
+
+def ship_rows(count: int, seed: Optional[int] = None, **options) -> Iterator[list[dict]]:
+    """
+    Generate count random starships as universe_items rows, in chunks.
+    Options are those of ship_batches.
+    """
+    for batch in ship_batches(count, seed, **options):
+        yield [
+            {
+                "name": data["name"],
+                "category": "ships",
+                "item_type": "ship",
+                "data_json": json.dumps(data["systems"]),
+                "description": data["ship_class"],
+            }
+            for data in batch
+        ]
+
+
+def starship_from_data(data: dict) -> Starship:
+    """Build a Starship model from a ship_batches dict."""
+    return Starship(
+        name=data["name"],
+        ship_class=data["ship_class"],
+        scale=data["scale"],
+        systems=Systems(**data["systems"]),
+        departments=Departments(**data["departments"]),
+        weapons=[get_weapon(name) for name in data["weapons"]],
+        talents=list(data["talents"]),
+        traits=list(data["traits"]),
+        registry=data["registry"],
+        crew_quality=CrewQuality(data["crew_quality"]) if data["crew_quality"] else None,
+    )
@@ -1,5 +1,6 @@
 """Random character generator for STA."""
 
+import functools
 import random
 from sta.models.character import Character, Attributes, Disciplines
 from sta.models.enums import Position
@@ -9,23 +10,32 @@ from .data import (
 )
 
 
-def random_attributes(total: int = 56) -> Attributes:
+@functools.cache
+def _slots(room: int) -> tuple[int, ...]:
+    """Indexes 0-5, each repeated room times."""
+    return tuple(idx for idx in range(6) for _ in range(room))
+
+
+def _point_buy(base: int, cap: int, total: int, rng=None) -> list[int]:
+    """
+    Six values starting at base, with total - 6 * base points spread over
+    them and none above cap, drawn in one go: each point is a draw without
+    replacement from cap - base slots per value.
+    """
+    slots = _slots(cap - base)
+    points = max(0, min(total - 6 * base, len(slots)))
+    values = [base] * 6
+    for idx in (rng or random).sample(slots, points):
+        values[idx] += 1
+    return values
+
+
+def random_attributes(total: int = 56, rng=None) -> Attributes:
     """
     Generate random attributes totaling approximately the given amount.
     Each attribute will be between 7 and 12.
     """
-    # Start with base values
-    values = [7, 7, 7, 7, 7, 7]  # 42 total
-    remaining = total - 42
-
-    # Distribute remaining points randomly
-    while remaining > 0:
-        idx = random.randint(0, 5)
-        if values[idx] < 12:
-            values[idx] += 1
-            remaining -= 1
-
-    random.shuffle(values)
+    values = _point_buy(7, 12, total, rng)
     return Attributes(
         control=values[0],
         fitness=values[1],
@@ -36,23 +46,12 @@ def random_attributes(total: int = 56) -> Attributes:
     )
 
 
-def random_disciplines(total: int = 16) -> Disciplines:
+def random_disciplines(total: int = 16, rng=None) -> Disciplines:
     """
     Generate random disciplines totaling approximately the given amount.
     Each discipline will be between 1 and 5.
     """
-    # Start with base values
-    values = [1, 1, 1, 1, 1, 1]  # 6 total
-    remaining = total - 6
-
-    # Distribute remaining points randomly
-    while remaining > 0:
-        idx = random.randint(0, 5)
-        if values[idx] < 5:
-            values[idx] += 1
-            remaining -= 1
-
-    random.shuffle(values)
+    values = _point_buy(1, 5, total, rng)
     return Disciplines(
         command=values[0],
         conn=values[1],
@@ -63,26 +62,28 @@ def random_disciplines(total: int = 16) -> Disciplines:
     )
 
 
-def random_name(species: str) -> str:
+def random_name(species: str, rng=None) -> str:
     """Generate a random name based on species."""
+    rng = rng or random
     first_names = FIRST_NAMES.get(species, FIRST_NAMES["Human"])
     last_names = LAST_NAMES.get(species, [])
 
-    first = random.choice(first_names)
+    first = rng.choice(first_names)
 
     if last_names:
         if species == "Bajoran":
             # Bajoran names: family name first
-            return f"{random.choice(last_names)} {first}"
+            return f"{rng.choice(last_names)} {first}"
         else:
-            return f"{first} {random.choice(last_names)}"
+            return f"{first} {rng.choice(last_names)}"
     return first
 
 
-def random_focuses(disciplines: Disciplines, count: int = 4) -> list[str]:
+def random_focuses(disciplines: Disciplines, count: int = 4, rng=None) -> list[str]:
     """
     Generate random focuses, weighted toward higher disciplines.
     """
+    rng = rng or random
     # Weight disciplines by their value
     discipline_names = ["command", "conn", "engineering", "medicine", "science", "security"]
     weights = [
@@ -99,20 +100,28 @@ def random_focuses(disciplines: Disciplines, count: int = 4) -> list[str]:
 
     for _ in range(count):
         # Pick a discipline weighted by value
-        disc = random.choices(discipline_names, weights=weights)[0]
+        disc = rng.choices(discipline_names, weights=weights)[0]
         available = [f for f in FOCUSES[disc] if f not in used_focuses]
 
         if available:
-            focus = random.choice(available)
+            focus = rng.choice(available)
             focuses.append(focus)
             used_focuses.add(focus)
 
     return focuses
 
 
-def random_talents(count: int = 2) -> list[str]:
+def random_talents(count: int = 2, rng=None) -> list[str]:
     """Generate random talents from the general talent pool."""
-    return random.sample(GENERAL_TALENTS, min(count, len(GENERAL_TALENTS)))
+    return (rng or random).sample(GENERAL_TALENTS, min(count, len(GENERAL_TALENTS)))
+
+
+def stress_for(fitness: int, talents: list[str]) -> int:
+    """Stress track from Fitness, with +2 for the Tough talent."""
+    stress = 5 + (fitness - 7) // 2
+    if "Tough" in talents:
+        stress += 2
+    return stress
 
 
 def random_position() -> Position:
@@ -164,10 +173,7 @@ def generate_character(
     focuses = random_focuses(disciplines, focus_count)
     talents = random_talents(talent_count)
 
-    # Calculate stress based on Fitness
-    base_stress = 5 + (attributes.fitness - 7) // 2
-    if "Tough" in talents:
-        base_stress += 2
+    base_stress = stress_for(attributes.fitness, talents)
 
     return Character(
         name=name,
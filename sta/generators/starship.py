@@ -30,14 +30,15 @@ def get_weapon(name: str) -> Weapon:
     )
 
 
-def random_ship_name(faction: str = "Federation") -> str:
+def random_ship_name(faction: str = "Federation", rng=None) -> str:
     """Generate a random ship name with appropriate prefix."""
+    rng = rng or random
     if faction == "Klingon":
-        return f"IKS {random.choice(SHIP_NAMES_KLINGON)}"
+        return f"IKS {rng.choice(SHIP_NAMES_KLINGON)}"
     elif faction == "Romulan":
-        return f"IRW {random.choice(SHIP_NAMES_ROMULAN)}"
+        return f"IRW {rng.choice(SHIP_NAMES_ROMULAN)}"
     else:
-        return f"USS {random.choice(SHIP_NAMES_FEDERATION)}"
+        return f"USS {rng.choice(SHIP_NAMES_FEDERATION)}"
 
 
 def random_registry(ship_class: str) -> str:
@@ -48,6 +49,15 @@ def random_registry(ship_class: str) -> str:
     return f"NCC-{base}"
 
 
+def classes_for_faction(faction: str = "Federation") -> list[str]:
+    """Ship classes of a faction ("any" for all; all if the faction has none)."""
+    classes = [
+        k for k, v in SHIP_CLASSES.items()
+        if v.get("faction", "Federation") == faction or faction == "any"
+    ]
+    return classes or list(SHIP_CLASSES)
+
+
 def generate_starship(
     name: str | None = None,
     ship_class: str | None = None,
@@ -70,18 +80,8 @@ def generate_starship(
     Returns:
         A randomly generated Starship
     """
-    # Filter classes by faction if specified
-    available_classes = {
-        k: v for k, v in SHIP_CLASSES.items()
-        if v.get("faction", "Federation") == faction or faction == "any"
-    }
-
-    # If no faction-specific classes, use all
-    if not available_classes:
-        available_classes = SHIP_CLASSES
-
     if ship_class is None:
-        ship_class = random.choice(list(available_classes.keys()))
+        ship_class = random.choice(classes_for_faction(faction))
 
     class_data = SHIP_CLASSES.get(ship_class, SHIP_CLASSES["Constitution"])
 
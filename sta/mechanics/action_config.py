@@ -5,7 +5,11 @@ This module defines actions as data configurations rather than code,
 making it much faster to add new actions without writing custom handlers.
 """
 
-from typing import Literal, TypedDict, Optional
+import json
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, Literal, TypedDict, Optional
+from sta.models.starship import system_destroyed
 from sta.models.vtt.models import Scene, Ship
 
 
@@ -471,38 +475,18 @@ def is_major_action(action_name: str) -> bool:
     This is the centralized function for determining action type across
     both player and NPC actions. Use this instead of ad-hoc checks.
 
-    Rules:
-    - If the action config has an explicit "is_major" field, use that
-    - Otherwise, use these defaults:
-      - task_roll actions → major
-      - special actions → major (except "Change Position" which is minor)
-      - buff actions → minor (unless explicitly marked is_major: True)
-      - toggle actions → minor
+    The classification is precomputed by the action registry (see
+    action_registry.classify_major for the rules). Unknown actions are
+    major, to be safe (they end the turn).
 
     Returns:
         True if the action is major (should end turn), False if minor
     """
-    config = get_action_config(action_name)
-    if not config:
-        # Unknown action - default to major to be safe (will trigger turn end)
-        return True
-
-    # Explicit override takes precedence
-    if "is_major" in config:
-        return config["is_major"]
-
-    # Default rules based on action type
-    action_type = config.get("type")
+    # Imported here to avoid circular imports (the registry compiles this module's configs)
+    from sta.mechanics.action_registry import ACTION_REGISTRY
 
-    if action_type == "task_roll":
-        return True
-
-    if action_type == "special":
-        # Special actions are major except Change Position
-        return action_name != "Change Position"
-
-    # buff and toggle actions are minor by default
-    return False
+    spec = ACTION_REGISTRY.get(action_name)
+    return spec is None or spec.is_major
 
 
 # ===== NPC ACTIONS =====
@@ -688,59 +672,170 @@ def get_shields_zero_difficulty_modifier(
     return 0
 
 
-def get_all_actions_availability(scene: Scene, ship_id: str) -> dict[str, dict]:
+# Every action with its required system, and the inverted system -> actions
+# index, built once at import so availability never re-derives either
+ACTION_REQUIRED_SYSTEMS: dict[str, Optional[str]] = {
+    action_name: get_action_required_system(action_name)
+    for action_name in [*ACTION_CONFIGS, *SPECIAL_ACTION_SYSTEMS]
+}
+
+ACTIONS_BY_SYSTEM: dict[Optional[str], tuple[str, ...]] = {}
+for _action_name, _system in ACTION_REQUIRED_SYSTEMS.items():
+    ACTIONS_BY_SYSTEM[_system] = ACTIONS_BY_SYSTEM.get(_system, ()) + (_action_name,)
+
+RESERVE_POWER_ACTIONS = frozenset(
+    name for name, config in ACTION_CONFIGS.items() if config.get("requires_reserve_power")
+)
+
+
+def availability_matrix(
+    scale: int,
+    breaches: Iterable[tuple[str, int]],
+    shields: int,
+    has_reserve_power: bool,
+) -> dict[str, dict]:
     """
-    Get availability status for all configured actions.
+    Availability and difficulty of every action for one ship state.
+
+    Matrices are cached per distinct state (Scale, breach potency per
+    system, shields down, reserve power), so the returned dict is shared
+    and must not be modified.
 
     Args:
-        ship: Starship model with breach data
+        scale: Ship Scale (a system is destroyed at potency >= Scale // 2)
+        breaches: (system, potency) pairs
+        shields: Current shields
+        has_reserve_power: Whether the ship has Reserve Power
 
     Returns:
         Dict mapping action names to their availability info:
         {
             "action_name": {
                 "available": True/False,
-                "reason": None or "SYSTEM DESTROYED",
+                "reason": None, "WEAPONS DESTROYED" or "NO RESERVE POWER",
                 "breach_modifier": int,
-                "required_system": str or None
+                "difficulty_modifier": int (breaches plus shields at 0),
+                "required_system": str or None,
+                "requires_reserve_power": bool
             }
         }
     """
+    potency: dict[str, int] = {}
+    for system, value in breaches:
+        potency[system] = potency.get(system, 0) + value
+    return _availability_for_state(
+        scale, tuple(sorted(potency.items())), shields == 0, bool(has_reserve_power)
+    )
+
+
+@lru_cache(maxsize=1024)
+def _availability_for_state(
+    scale: int,
+    potency: tuple[tuple[str, int], ...],
+    shields_down: bool,
+    has_reserve_power: bool,
+) -> dict[str, dict]:
+    potency_by_system = dict(potency)
+    result = {}
+    for system, action_names in ACTIONS_BY_SYSTEM.items():
+        breach_modifier = potency_by_system.get(system, 0) if system else 0
+        destroyed = system is not None and system_destroyed(breach_modifier, scale)
+        for action_name in action_names:
+            needs_power = action_name in RESERVE_POWER_ACTIONS
+            reason = None
+            if destroyed:
+                reason = f"{system.upper()} DESTROYED"
+            elif needs_power and not has_reserve_power:
+                reason = "NO RESERVE POWER"
+            shields_modifier = 1 if action_name == "Regenerate Shields" and shields_down else 0
+            result[action_name] = {
+                "available": reason is None,
+                "reason": reason,
+                "breach_modifier": breach_modifier if reason is None else 0,
+                "difficulty_modifier": breach_modifier + shields_modifier
+                if reason is None
+                else 0,
+                "required_system": system,
+                "requires_reserve_power": needs_power,
+            }
+    return result
+
+
+def get_ship_action_availability(ship) -> dict[str, dict]:
+    """Availability matrix for a Starship model (see availability_matrix)."""
+    return availability_matrix(
+        ship.scale,
+        ((b.system.value, b.potency) for b in ship.breaches),
+        ship.shields,
+        getattr(ship, "has_reserve_power", True),
+    )
+
+
+def get_all_actions_availability(scene: Scene, ship_id: str) -> dict[str, dict]:
+    """
+    Get availability status for all configured actions.
+
+    Args:
+        scene: Scene whose ships include the ship
+        ship_id: ID of the ship within the scene
+
+    Returns:
+        The ship's availability matrix (see availability_matrix), or an
+        empty dict if the ship is not in the scene
+    """
     ship = next((s for s in scene.ships if s.id == ship_id), None)
     if not ship:
         return {}  # Return no actions if ship not found
+    return get_ship_action_availability(ship)
 
-    result = {}
 
-    # Check all actions in ACTION_CONFIGS
-    for action_name in ACTION_CONFIGS:
-        available, reason = is_action_available(action_name, scene, ship_id)
-        result[action_name] = {
-            "available": available,
-            "reason": reason,
-            "breach_modifier": get_breach_difficulty_modifier(
-                action_name, scene, ship_id
-            )
-            if available
-            else 0,
-            "required_system": get_action_required_system(action_name),
-        }
+class ActionAvailabilityCache:
+    """
+    Availability matrices per ship, for polled endpoints, least recently
+    used first out.
 
-    # Check special actions
-    for action_name in SPECIAL_ACTION_SYSTEMS:
-        available, reason = is_action_available(action_name, scene, ship_id)
-        result[action_name] = {
-            "available": available,
-            "reason": reason,
-            "breach_modifier": get_breach_difficulty_modifier(
-                action_name, scene, ship_id
+    Entries are keyed by (table, ship id) and store the raw column values
+    they were built from, so a matrix is only reused while the ship row is
+    unchanged.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int], tuple[tuple, dict]] = OrderedDict()
+
+    def get(self, key: tuple[str, int], state: tuple) -> Optional[dict[str, dict]]:
+        entry = self._entries.get(key)
+        if entry and entry[0] == state:
+            self._entries.move_to_end(key)
+            return entry[1]
+        return None
+
+    def put(self, key: tuple[str, int], state: tuple, matrix: dict[str, dict]) -> None:
+        self._entries[key] = (state, matrix)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_or_build(
+        self, key: tuple[str, int], scale: int, breaches_json: str, shields: int,
+        has_reserve_power: bool,
+    ) -> dict[str, dict]:
+        """Cached matrix for a ship row's columns, building it on a miss."""
+        state = (scale, breaches_json, shields, has_reserve_power)
+        matrix = self.get(key, state)
+        if matrix is None:
+            breaches = json.loads(breaches_json or "[]")
+            matrix = availability_matrix(
+                scale,
+                ((b["system"], b.get("potency", 1)) for b in breaches),
+                shields,
+                has_reserve_power,
             )
-            if available
-            else 0,
-            "required_system": get_action_required_system(action_name),
-        }
+            self.put(key, state, matrix)
+        return matrix
 
-    return result
+
+action_availability_cache = ActionAvailabilityCache()
 
 
 # ===== RANGE HELPERS =====
@@ -0,0 +1,260 @@
+"""
+Compiled action registry.
+
+ACTION_CONFIGS (mechanics), SPECIAL_ACTION_SYSTEMS and the bridge station
+lists in actions.py describe the same actions from three angles. The
+registry compiles them once, at import, into one immutable ActionSpec per
+action name with everything callers used to re-derive on every request:
+major/minor classification, required system, range and difficulty rules
+and the bridge positions that can take the action.
+
+Building the registry validates the configuration, so a bad entry fails
+at startup with ActionConfigError instead of at the first request that
+touches it:
+
+    spec = ACTION_REGISTRY.get("Scan For Weakness")
+    if spec.is_major: ...
+    spec.difficulty_at(distance=2)
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping, Optional
+
+from sta.models.enums import ActionType, Position, SystemType
+from sta.mechanics.action_config import (
+    ACTION_CONFIGS,
+    SPECIAL_ACTION_SYSTEMS,
+    ActionConfig,
+)
+from sta.mechanics.actions import ALL_ACTIONS, Action, get_actions_for_position
+
+ACTION_KINDS = ("buff", "task_roll", "toggle", "special", "resource_action")
+
+EFFECT_TARGETS = (
+    "attack", "defense", "sensor", "movement", "all", "next_attack", "next_target"
+)
+EFFECT_DURATIONS = ("next_action", "end_of_turn", "end_of_round", "next_turn")
+
+SYSTEM_NAMES = frozenset(system.value for system in SystemType)
+
+
+class ActionConfigError(ValueError):
+    """The action configuration is invalid."""
+
+
+@dataclass(frozen=True, slots=True)
+class ActionSpec:
+    """Everything known about one action, precomputed."""
+    name: str
+    kind: Optional[str]  # Config type ("buff", "task_roll", ...); None if not configured
+    is_major: bool
+    required_system: Optional[str] = None
+    requires_reserve_power: bool = False
+    requires_shields_raised: bool = False
+    difficulty: int = 0  # Base task difficulty
+    attribute: Optional[str] = None
+    discipline: Optional[str] = None
+    max_range: Optional[int] = None  # Hexes; None means no range limit
+    difficulty_per_range: int = 0
+    momentum_cost: int = 0
+    threat_cost: int = 0
+    positions: tuple[Position, ...] = ()
+    description: str = ""
+    config: Optional[Mapping] = None  # Read-only view of the ActionConfig
+    bridge_action: Optional[Action] = None  # The actions.py listing, if any
+
+    @property
+    def is_minor(self) -> bool:
+        return not self.is_major
+
+    @property
+    def configured(self) -> bool:
+        """Whether the action has a mechanics config (not just a bridge listing)."""
+        return self.config is not None
+
+    def in_range(self, distance: int) -> bool:
+        return self.max_range is None or distance <= self.max_range
+
+    def difficulty_at(self, distance: int = 0) -> int:
+        """Task difficulty against a target distance hexes away."""
+        return self.difficulty + self.difficulty_per_range * distance
+
+
+def classify_major(config: Optional[ActionConfig], bridge_action: Optional[Action]) -> bool:
+    """
+    Whether an action is major (ends the turn).
+
+    Rules, first match wins:
+    - explicit is_major / is_minor in the config
+    - task_roll actions are major
+    - the bridge station listing (actions.py) decides
+    - special actions are major
+    - everything else (buff, toggle, resource_action) is minor
+    - unknown actions are major, so the turn ends to be safe
+    """
+    if config is None:
+        return bridge_action is None or bridge_action.action_type == ActionType.MAJOR
+    if "is_major" in config:
+        return bool(config["is_major"])
+    if config.get("is_minor"):
+        return False
+    if config.get("type") == "task_roll":
+        return True
+    if bridge_action is not None:
+        return bridge_action.action_type == ActionType.MAJOR
+    return config.get("type") == "special"
+
+
+def validate_action_configs(
+    configs: Mapping[str, ActionConfig] = ACTION_CONFIGS,
+    special_systems: Mapping[str, str] = SPECIAL_ACTION_SYSTEMS,
+) -> None:
+    """Check action configs for mistakes. Raises ActionConfigError listing all of them."""
+    problems = []
+
+    def check_count(name, field, value):
+        if value is not None and (not isinstance(value, int) or value < 0):
+            problems.append(f"{name}: {field} must be a non-negative integer, got {value!r}")
+
+    for name, config in configs.items():
+        kind = config.get("type")
+        if kind not in ACTION_KINDS:
+            problems.append(f"{name}: unknown type {kind!r}")
+        if config.get("is_major") and config.get("is_minor"):
+            problems.append(f"{name}: cannot be both is_major and is_minor")
+        system = config.get("requires_system")
+        if system is not None and system not in SYSTEM_NAMES:
+            problems.append(f"{name}: unknown requires_system {system!r}")
+
+        roll = config.get("roll")
+        if roll is not None:
+            if not isinstance(roll, Mapping):
+                problems.append(f"{name}: roll must be a dict")
+            else:
+                check_count(name, "roll.difficulty", roll.get("difficulty"))
+        elif kind == "task_roll":
+            problems.append(f"{name}: task_roll actions need a roll")
+
+        effect = config.get("effect")
+        if kind == "buff" and effect is None:
+            problems.append(f"{name}: buff actions need an effect")
+        if effect is not None:
+            if effect.get("applies_to") not in (None, *EFFECT_TARGETS):
+                problems.append(f"{name}: unknown effect.applies_to {effect['applies_to']!r}")
+            if effect.get("duration") not in (None, *EFFECT_DURATIONS):
+                problems.append(f"{name}: unknown effect.duration {effect['duration']!r}")
+        if kind == "toggle" and not config.get("toggles"):
+            problems.append(f"{name}: toggle actions need toggles")
+
+        for field in ("max_range", "difficulty_per_range", "momentum_cost", "threat_cost"):
+            check_count(name, field, config.get(field))
+        for field in ("blocks", "blocked_by"):
+            for other in config.get(field, ()):
+                if other not in configs:
+                    problems.append(f"{name}: {field} references unknown action {other!r}")
+
+    for name, system in special_systems.items():
+        if system not in SYSTEM_NAMES:
+            problems.append(f"{name}: unknown required system {system!r}")
+
+    if problems:
+        raise ActionConfigError("Invalid action configuration:\n  " + "\n  ".join(problems))
+
+
+def compile_action_spec(
+    name: str,
+    config: Optional[ActionConfig],
+    bridge_action: Optional[Action],
+    required_system: Optional[str] = None,
+) -> ActionSpec:
+    """Build the spec for one action from its config and bridge listing."""
+    values = config or {}
+    roll = values.get("roll") or {}
+    bridge = bridge_action
+    return ActionSpec(
+        name=name,
+        kind=values.get("type"),
+        is_major=classify_major(config, bridge),
+        required_system=values.get("requires_system") or required_system,
+        requires_reserve_power=bool(
+            values.get("requires_reserve_power") or (bridge and bridge.requires_reserve_power)
+        ),
+        requires_shields_raised=bool(values.get("requires_shields_raised")),
+        difficulty=roll.get("difficulty", bridge.difficulty if bridge else 0),
+        attribute=roll.get("attribute", bridge.attribute if bridge else None),
+        discipline=roll.get("discipline", bridge.discipline if bridge else None),
+        max_range=values.get("max_range"),
+        difficulty_per_range=values.get("difficulty_per_range") or 0,
+        momentum_cost=values.get("momentum_cost", bridge.momentum_cost if bridge else 0),
+        threat_cost=values.get("threat_cost", bridge.threat_cost if bridge else 0),
+        positions=tuple(bridge.positions) if bridge else (),
+        description=bridge.description if bridge else "",
+        config=MappingProxyType(dict(config)) if config else None,
+        bridge_action=bridge,
+    )
+
+
+class ActionRegistry:
+    """Action specs indexed by name and by bridge position."""
+
+    __slots__ = ("_by_name", "_by_position")
+
+    def __init__(self, specs: Iterable[ActionSpec]):
+        self._by_name: dict[str, ActionSpec] = {spec.name: spec for spec in specs}
+        self._by_position: dict[Position, tuple[ActionSpec, ...]] = {}
+        for position in Position:
+            actions = get_actions_for_position(position)
+            self._by_position[position] = tuple(
+                self._by_name[action.name] for action in actions["minor"] + actions["major"]
+            )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __iter__(self) -> Iterator[ActionSpec]:
+        return iter(self._by_name.values())
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def get(self, name: str) -> Optional[ActionSpec]:
+        """Look up an action by exact name."""
+        return self._by_name.get(name)
+
+    def find(self, name: str, position: Position) -> Optional[ActionSpec]:
+        """The action a bridge position can take by this name, ignoring case."""
+        folded = name.lower()
+        return next(
+            (spec for spec in self._by_position[position] if spec.name.lower() == folded),
+            None,
+        )
+
+    def for_position(
+        self, position: Position, major: Optional[bool] = None
+    ) -> tuple[ActionSpec, ...]:
+        """Actions a bridge position can take, optionally only major or minor ones."""
+        specs = self._by_position[position]
+        if major is None:
+            return specs
+        return tuple(spec for spec in specs if spec.is_major == major)
+
+
+def build_action_registry(
+    configs: Mapping[str, ActionConfig] = ACTION_CONFIGS,
+    special_systems: Mapping[str, str] = SPECIAL_ACTION_SYSTEMS,
+    bridge_actions: Iterable[Action] = ALL_ACTIONS,
+) -> ActionRegistry:
+    """Validate the configuration and compile every known action."""
+    validate_action_configs(configs, special_systems)
+    bridge_by_name = {action.name: action for action in bridge_actions}
+    names = dict.fromkeys([*configs, *special_systems, *bridge_by_name])
+    return ActionRegistry(
+        compile_action_spec(
+            name, configs.get(name), bridge_by_name.get(name), special_systems.get(name)
+        )
+        for name in names
+    )
+
+
+ACTION_REGISTRY = build_action_registry()
@@ -508,15 +508,6 @@ def get_actions_for_position(position: Position) -> dict[str, list[Action]]:
     return actions
 
 
-def get_action_by_name(name: str, position: Position) -> Optional[Action]:
-    """Find a specific action by name for a position."""
-    actions = get_actions_for_position(position)
-    for action in actions["minor"] + actions["major"]:
-        if action.name.lower() == name.lower():
-            return action
-    return None
-
-
 # All actions combined for reference
 ALL_ACTIONS = (
     STANDARD_MINOR_ACTIONS +
@@ -532,3 +523,12 @@ ALL_ACTIONS = (
     COMMS_MAJOR_ACTIONS +
     MEDICAL_MAJOR_ACTIONS
 )
+
+
+def get_action_by_name(name: str, position: Position) -> Optional[Action]:
+    """Find a specific action by name for a position."""
+    # Imported here to avoid circular imports (the registry compiles this module's actions)
+    from sta.mechanics.action_registry import ACTION_REGISTRY
+
+    spec = ACTION_REGISTRY.find(name, position)
+    return spec.bridge_action if spec else None
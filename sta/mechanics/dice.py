@@ -263,6 +263,61 @@ def assisted_task_roll(
     )
 
 
+def die_success_odds(
+    target_number: int, focus_value: Optional[int] = None
+) -> tuple[float, float, float]:
+    """
+    Probability of a single d20 scoring 0, 1 or 2 successes.
+
+    Mirrors count_successes: a 1 always scores 2, rolls at or under the
+    focus value score 2 when focus applies, other rolls at or under the
+    target number score 1.
+    """
+    in_range = max(0, min(target_number, 20) - 1)  # faces 2..TN
+    doubles = 0
+    if focus_value is not None:
+        doubles = max(0, min(target_number, focus_value, 20) - 1)
+    two = (1 + doubles) / 20
+    one = (in_range - doubles) / 20
+    return (1.0 - one - two, one, two)
+
+
+def task_success_probability(
+    target_number: int,
+    difficulty: int,
+    dice_count: int = 2,
+    focus_value: Optional[int] = None,
+    assist_target_number: Optional[int] = None,
+) -> float:
+    """
+    Exact probability that a task roll meets its difficulty.
+
+    Args:
+        target_number: Attribute + Discipline of the rolling character
+        difficulty: Successes needed
+        dice_count: Character dice (base 2 plus any bonus dice)
+        focus_value: Discipline value when focus applies
+        assist_target_number: System + Department for a ship assist die
+
+    Returns:
+        Probability between 0 and 1
+    """
+    faces = [die_success_odds(target_number, focus_value)] * dice_count
+    if assist_target_number is not None:
+        faces.append(die_success_odds(assist_target_number))
+
+    distribution = [1.0]
+    for zero, one, two in faces:
+        rolled = [0.0] * (len(distribution) + 2)
+        for successes, chance in enumerate(distribution):
+            rolled[successes] += chance * zero
+            rolled[successes + 1] += chance * one
+            rolled[successes + 2] += chance * two
+        distribution = rolled
+
+    return sum(distribution[max(0, difficulty):])
+
+
 def apply_talent_modifiers(
     rolls: list[int],
     modifiers: list[TalentModifier],
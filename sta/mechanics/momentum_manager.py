@@ -5,11 +5,12 @@ gain extra actions, and activate abilities. It accumulates from successful tasks
 and can be spent for various benefits.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from sta.database.pool_ledger import MOMENTUM_MAX, change_pool, pool_history
 from sta.database.schema import CampaignRecord
 
 
@@ -42,7 +43,6 @@ class MomentumManager:
     """
 
     db: AsyncSession
-    _change_history: dict[str, list[MomentumChange]] = field(default_factory=dict)
 
     async def get_momentum(self, campaign_id: str) -> tuple[int, int]:
         """Get current and max Momentum for a campaign.
@@ -53,9 +53,7 @@ class MomentumManager:
         Returns:
             Tuple of (current_momentum, max_momentum=6)
         """
-        stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
-        result = await self.db.execute(stmt)
-        campaign = result.scalars().first()
+        campaign = await self._get_campaign(campaign_id)
 
         if not campaign:
             return (0, 0)
@@ -76,19 +74,13 @@ class MomentumManager:
         if amount <= 0:
             return False
 
-        stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
-        result = await self.db.execute(stmt)
-        campaign = result.scalars().first()
+        campaign = await self._get_campaign(campaign_id)
 
         if not campaign:
             return False
 
-        previous_total = campaign.momentum or 0
-        new_total = min(previous_total + amount, 6)
-        campaign.momentum = new_total
-
-        self._record_change(
-            campaign_id, new_total - previous_total, reason, previous_total, new_total
+        await change_pool(
+            self.db, campaign, "momentum", amount, reason, maximum=MOMENTUM_MAX
         )
 
         await self.db.commit()
@@ -108,48 +100,43 @@ class MomentumManager:
         if amount <= 0:
             return False
 
-        stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
-        result = await self.db.execute(stmt)
-        campaign = result.scalars().first()
+        campaign = await self._get_campaign(campaign_id)
 
         if not campaign:
             return False
 
-        current_momentum = campaign.momentum or 0
-        if current_momentum < amount:
+        if not await change_pool(
+            self.db, campaign, "momentum", -amount, reason, require=True
+        ):
             return False
 
-        previous_total = current_momentum
-        campaign.momentum = current_momentum - amount
-
-        self._record_change(
-            campaign_id, -amount, reason, previous_total, campaign.momentum
-        )
-
         await self.db.commit()
         return True
 
-    def _record_change(
-        self,
-        campaign_id: str,
-        amount: int,
-        reason: str,
-        previous_total: int,
-        new_total: int,
-    ) -> None:
-        """Record a Momentum change for history tracking."""
-        if campaign_id not in self._change_history:
-            self._change_history[campaign_id] = []
-
-        self._change_history[campaign_id].append(
+    async def get_history(self, campaign_id: str) -> list[MomentumChange]:
+        """Get Momentum change history for a campaign, oldest first.
+
+        History is read from the pool ledger, so it survives restarts and
+        includes changes made through the API.
+        """
+        campaign = await self._get_campaign(campaign_id)
+        if not campaign:
+            return []
+
+        entries = await pool_history(
+            self.db, campaign_pk=campaign.id, pool="momentum", campaign_only=True, limit=None
+        )
+        return [
             MomentumChange(
-                amount=amount,
-                reason=reason,
-                previous_total=previous_total,
-                new_total=new_total,
+                amount=entry.change,
+                reason=entry.reason,
+                previous_total=entry.previous,
+                new_total=entry.balance,
             )
-        )
+            for entry in reversed(entries)
+        ]
 
-    def get_history(self, campaign_id: str) -> list[MomentumChange]:
-        """Get Momentum change history for a campaign."""
-        return self._change_history.get(campaign_id, [])
+    async def _get_campaign(self, campaign_id: str):
+        stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
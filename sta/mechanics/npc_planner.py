@@ -0,0 +1,311 @@
+"""
+Time-bounded turn planner for NPC ships.
+
+Scores movement, attack and support options for each enemy ship by
+expected damage computed from exact dice odds, and returns the best plan
+found before a hard time budget runs out. The search is anytime: a plan
+for holding position is scored first, so a ship always gets an answer
+even when the budget is spent.
+
+Usage:
+    plans = plan_enemy_turns(encounter, budget_ms=50)
+    best = plans[0]  # Highest scoring ship should act first
+"""
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from sta.mechanics.action_config import get_action_config, get_action_required_system
+from sta.mechanics.dice import task_success_probability
+from sta.mechanics.movement import get_range_category, get_valid_impulse_moves
+from sta.models.combat import Encounter, HexCoord, ShipCombatant
+from sta.models.enums import CrewQuality, SystemType
+from sta.models.starship import Starship, Weapon
+
+# Range categories from nearest to furthest; a weapon reaches its own band
+RANGE_ORDER = ["close", "medium", "long", "extreme"]
+
+# Score weights
+BREACH_VALUE = 4.0  # A breach is worth this many points of damage
+THREAT_COST = 0.5  # Per point of Threat spent on movement
+SHIELD_VALUE = 0.5  # Per point of shields regenerated
+MOMENTUM_VALUE = 0.5  # Per expected point of Threat generated
+
+DEFAULT_BUDGET_MS = 50.0
+
+# Ships stored without a crew quality plan as a standard-difficulty crew
+DEFAULT_CREW_QUALITY = CrewQuality.TALENTED
+
+
+@dataclass
+class NPCPlan:
+    """The planned turn for one enemy ship."""
+    ship_index: int
+    ship_name: str
+    major: str = "Pass"
+    minor: Optional[str] = None
+    move_to: Optional[HexCoord] = None
+    move_cost: int = 0
+    weapon_name: Optional[str] = None
+    range_category: Optional[str] = None
+    hit_chance: float = 0.0
+    expected_damage: float = 0.0
+    score: float = 0.0
+    candidates_scored: int = 0
+    timed_out: bool = False
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON response."""
+        return {
+            "ship_index": self.ship_index,
+            "ship_name": self.ship_name,
+            "major": self.major,
+            "minor": self.minor,
+            "move_to": self.move_to.to_dict() if self.move_to else None,
+            "move_cost": self.move_cost,
+            "weapon_name": self.weapon_name,
+            "range_category": self.range_category,
+            "hit_chance": round(self.hit_chance, 4),
+            "expected_damage": round(self.expected_damage, 2),
+            "score": round(self.score, 2),
+            "candidates_scored": self.candidates_scored,
+            "timed_out": self.timed_out,
+        }
+
+
+@lru_cache(maxsize=4096)
+def _success_chance(
+    target_number: int,
+    difficulty: int,
+    focus_value: Optional[int],
+    assist_target_number: Optional[int],
+) -> float:
+    return task_success_probability(
+        target_number,
+        difficulty,
+        focus_value=focus_value,
+        assist_target_number=assist_target_number,
+    )
+
+
+def weapon_in_range(weapon: Weapon, distance: int) -> bool:
+    """Whether the weapon's range band reaches a hex distance."""
+    category = get_range_category(distance)
+    reach = weapon.range.value if weapon.range.value in RANGE_ORDER else "close"
+    return RANGE_ORDER.index(category) <= RANGE_ORDER.index(reach)
+
+
+def npc_roll_chance(ship: Starship, difficulty: int, assist_system: Optional[str] = None,
+                    assist_department: Optional[str] = None) -> float:
+    """Exact success chance for an NPC crew task roll."""
+    crew = ship.crew_quality or DEFAULT_CREW_QUALITY
+    focus_value = crew.department if crew.has_focus else None
+    assist = None
+    if assist_system:
+        assist = ship.systems.get(assist_system) + ship.departments.get(assist_department)
+    return _success_chance(crew.target_number, max(0, difficulty), focus_value, assist)
+
+
+def expected_hit_damage(damage: int, target: Starship) -> float:
+    """
+    Value of a hit: damage dealt plus the breaches it causes.
+
+    Shields absorb first, then hull damage is reduced by Resistance; every
+    5 hull damage causes a breach, as in Starship.take_damage.
+    """
+    through_shields = max(0, damage - target.shields)
+    hull = max(0, through_shields - target.resistance)
+    breaches = hull // 5
+    return min(damage, target.shields) + hull + BREACH_VALUE * breaches
+
+
+def _attack_difficulty(encounter: Encounter, attacker: Starship, weapon: Weapon) -> int:
+    difficulty = weapon.attack_difficulty
+    difficulty += attacker.get_breach_potency(SystemType.WEAPONS)
+    # Evasive Action on the player ship makes it harder to hit
+    if any(e.source_action == "Evasive Action" for e in encounter.active_effects):
+        difficulty += 1
+    return difficulty
+
+
+def _is_available(ship: Starship, action_name: str) -> bool:
+    required_system = get_action_required_system(action_name)
+    if not required_system:
+        return True
+    return not ship.is_system_destroyed(SystemType(required_system))
+
+
+def plan_enemy_turn(
+    encounter: Encounter,
+    enemy_index: int,
+    deadline: Optional[float] = None,
+) -> NPCPlan:
+    """
+    Plan one enemy ship's turn.
+
+    Args:
+        encounter: The combat encounter
+        enemy_index: Index into encounter.enemy_ships
+        deadline: time.perf_counter() value after which the search stops
+
+    Returns:
+        The best NPCPlan found before the deadline
+    """
+    combatant: ShipCombatant = encounter.enemy_ships[enemy_index]
+    ship = combatant.ship
+    plan = NPCPlan(ship_index=enemy_index, ship_name=ship.name)
+
+    target = encounter.player_ship
+    if target is None or ship.is_destroyed():
+        return plan
+
+    # Support options are scored first so they are always considered
+    _score_support(encounter, combatant, plan)
+
+    can_fire = _is_available(ship, "Fire")
+    damage_bonus = ship.weapons_damage_bonus()
+    calibrate_bonus = 0
+    if _is_available(ship, "Calibrate Weapons"):
+        calibrate_bonus = get_action_config("Calibrate Weapons")["effect"]["damage_bonus"]
+
+    def score_position(position: HexCoord, cost: int) -> None:
+        distance = position.distance_to(target.position)
+        moved = position != combatant.position
+        for weapon in ship.weapons if can_fire else []:
+            plan.candidates_scored += 1
+            if not weapon_in_range(weapon, distance):
+                continue
+            chance = npc_roll_chance(
+                ship,
+                _attack_difficulty(encounter, ship, weapon),
+                "weapons",
+                "security",
+            )
+            # Moving uses the minor action, otherwise calibrate the weapons
+            bonus = 0 if moved else calibrate_bonus
+            expected = chance * expected_hit_damage(
+                weapon.damage + damage_bonus + bonus, target.ship
+            )
+            score = expected - THREAT_COST * cost
+            if score > plan.score:
+                plan.major = "Fire"
+                plan.minor = "Impulse" if moved else ("Calibrate Weapons" if bonus else None)
+                plan.move_to = position if moved else None
+                plan.move_cost = cost
+                plan.weapon_name = weapon.name
+                plan.range_category = get_range_category(distance)
+                plan.hit_chance = chance
+                plan.expected_damage = expected
+                plan.score = score
+
+    # Holding position is always scored; moves only while time remains
+    score_position(combatant.position, 0)
+
+    def out_of_time() -> bool:
+        if deadline is not None and time.perf_counter() > deadline:
+            plan.timed_out = True
+        return plan.timed_out
+
+    positions = []
+    if _is_available(ship, "Impulse") and not out_of_time():
+        moves = get_valid_impulse_moves(
+            combatant.position,
+            encounter.tactical_map,
+            momentum_available=encounter.threat,
+        )
+        positions = sorted(((m.coord, m.cost) for m in moves), key=lambda p: p[1])
+
+    for position, cost in positions:
+        if out_of_time():
+            break
+        score_position(position, cost)
+
+    if plan.weapon_name is None and positions:
+        # Nothing in reach: close on the target
+        position, cost = min(
+            positions, key=lambda p: (p[0].distance_to(target.position), p[1])
+        )
+        if position.distance_to(target.position) < combatant.position.distance_to(
+            target.position
+        ):
+            plan.minor = "Impulse"
+            plan.move_to = position
+            plan.move_cost = cost
+            plan.range_category = get_range_category(position.distance_to(target.position))
+
+    return plan
+
+
+def _score_support(encounter: Encounter, combatant: ShipCombatant, plan: NPCPlan) -> None:
+    """Score repair, shield and Threat-generating major actions."""
+    ship = combatant.ship
+    options = []
+
+    if ship.breaches:
+        config = get_action_config("Damage Control")
+        worst = max(ship.breaches, key=lambda b: b.potency)
+        chance = npc_roll_chance(ship, config["roll"]["difficulty"] + worst.potency)
+        # Patching matters more the closer the ship is to destruction
+        urgency = ship.total_breach_potency() / max(1, ship.scale)
+        options.append(("Damage Control", chance, chance * BREACH_VALUE * urgency * 2))
+
+    if (
+        ship.has_reserve_power
+        and ship.shields_raised
+        and ship.shields < ship.shields_max
+        and _is_available(ship, "Regenerate Shields")
+    ):
+        config = get_action_config("Regenerate Shields")
+        difficulty = config["roll"]["difficulty"] + (1 if ship.shields == 0 else 0)
+        difficulty += ship.get_breach_potency(SystemType.STRUCTURE)
+        chance = npc_roll_chance(ship, difficulty, "structure", "engineering")
+        crew = ship.crew_quality or DEFAULT_CREW_QUALITY
+        restored = min(crew.department, ship.shields_max - ship.shields)
+        options.append(("Regenerate Shields", chance, chance * restored * SHIELD_VALUE))
+
+    if _is_available(ship, "Maneuver"):
+        config = get_action_config("Maneuver")
+        difficulty = config["roll"]["difficulty"] + ship.get_breach_potency(SystemType.ENGINES)
+        chance = npc_roll_chance(ship, difficulty, "engines", "conn")
+        options.append(("Maneuver", chance, chance * MOMENTUM_VALUE))
+
+    for name, chance, score in options:
+        plan.candidates_scored += 1
+        if score > plan.score:
+            plan.major = name
+            plan.hit_chance = chance
+            plan.score = score
+
+
+def plan_enemy_turns(
+    encounter: Encounter, budget_ms: float = DEFAULT_BUDGET_MS
+) -> list[NPCPlan]:
+    """
+    Plan turns for every enemy ship that has not acted this round.
+
+    The budget is shared: each ship gets an equal slice of whatever time
+    remains when its turn is planned, so a cheap early ship leaves more
+    for the ones after it.
+
+    Returns:
+        Plans ordered by score, best first
+    """
+    started = time.perf_counter()
+    hard_deadline = started + budget_ms / 1000
+    pending = [
+        index
+        for index, enemy in enumerate(encounter.enemy_ships)
+        if not enemy.has_acted and not enemy.ship.is_destroyed()
+    ]
+
+    plans = []
+    for position, index in enumerate(pending):
+        now = time.perf_counter()
+        remaining = max(0.0, hard_deadline - now)
+        deadline = now + remaining / (len(pending) - position)
+        plans.append(plan_enemy_turn(encounter, index, deadline))
+
+    plans.sort(key=lambda p: p.score, reverse=True)
+    return plans
@@ -0,0 +1,777 @@
+"""
+Headless combat simulator for balancing.
+
+Plays complete starship encounters without the web layer or a database,
+using the same dice, movement and action handler rules as live play.
+Every encounter is seeded so a run can be reproduced exactly, and batches
+are spread across a process pool.
+
+Typical use:
+
+    config = SimulationConfig(enemy_count=2, enemy_difficulty="hard")
+    outcomes = run_batch(config, runs=2000, workers=8)
+    summary = summarize(outcomes, config)
+
+scripts/simulate_combat.py writes outcomes and summaries to CSV or Parquet.
+"""
+
+import math
+import os
+import random
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Callable, Optional
+
+from sta.generators import generate_character, generate_starship
+from sta.generators.starship import generate_enemy_ship, get_weapon
+from sta.mechanics.action_config import get_action_config, get_action_required_system
+from sta.mechanics.action_handlers import (
+    apply_effects_to_attack,
+    apply_effects_to_defense,
+    apply_task_roll_success,
+    execute_buff_action,
+)
+from sta.mechanics.dice import assisted_task_roll, task_roll, task_success_probability
+from sta.mechanics.movement import get_valid_impulse_moves
+from sta.mechanics.npc_planner import plan_enemy_turn, weapon_in_range
+from sta.models.character import Character
+from sta.models.combat import Encounter, HexCoord, ShipCombatant, TacticalMap, TaskResult
+from sta.models.enums import SystemType
+from sta.models.starship import Weapon
+
+# Fire is not in ACTION_CONFIGS; attacks roll Control + Security
+# assisted by Weapons + Security.
+FIRE_ROLL = {
+    "attribute": "control",
+    "discipline": "security",
+    "ship_assist_system": "weapons",
+    "ship_assist_department": "security",
+}
+
+
+@dataclass
+class SimulationConfig:
+    """Parameters shared by every encounter in a batch."""
+    enemy_count: int = 1
+    enemy_difficulty: str = "standard"  # "easy", "standard" or "hard"
+    enemy_faction: Optional[str] = None  # Random per ship if None
+    enemy_turn_multiplier: float = 0.5  # Enemy turns per round = Scale x multiplier
+    player_crew: int = 3  # Player turns per round
+    player_policy: str = "heuristic"
+    enemy_policy: str = "heuristic"
+    player_weapons: Optional[list[str]] = None  # WEAPON_TEMPLATES names
+    enemy_weapons: Optional[list[str]] = None
+    starting_threat: int = 2
+    map_radius: int = 3
+    max_rounds: int = 30
+
+
+@dataclass
+class EncounterOutcome:
+    """Result of one simulated encounter."""
+    seed: int
+    winner: str  # "player", "enemy" or "draw"
+    rounds: int
+    player_attacks: int = 0
+    player_hits: int = 0
+    player_damage: int = 0
+    player_breaches: int = 0
+    enemy_attacks: int = 0
+    enemy_hits: int = 0
+    enemy_damage: int = 0
+    enemy_breaches: int = 0
+    enemies_destroyed: int = 0
+    player_shields_remaining: int = 0
+
+
+@dataclass
+class TurnPlan:
+    """What a combatant does with one turn."""
+    major: str = "Pass"
+    minor: Optional[str] = None  # Buff name or "Impulse"
+    move_to: Optional[HexCoord] = None  # Destination when minor is "Impulse"
+    target: Optional[ShipCombatant] = None
+    weapon: Optional[Weapon] = None
+    breach_system: Optional[SystemType] = None  # For Damage Control
+
+
+def enemy_turns_per_round(scale: int, multiplier: float) -> int:
+    """Turns an NPC ship takes each round (half of Scale by default)."""
+    return max(1, math.floor(scale * multiplier + 0.5))
+
+
+def is_out_of_action(combatant: ShipCombatant) -> bool:
+    """A ship is out of the fight once destroyed or its structure is disabled."""
+    ship = combatant.ship
+    return ship.is_destroyed() or ship.is_system_disabled(SystemType.STRUCTURE)
+
+
+class CombatSimulation:
+    """
+    One headless encounter between a player ship and NPC enemies.
+
+    Dice and generators draw from the module-level random generator, so
+    the simulation reseeds it. Run one simulation at a time per process.
+    """
+
+    def __init__(self, config: SimulationConfig, seed: int):
+        self.config = config
+        self.seed = seed
+        random.seed(seed)
+
+        radius = max(1, config.map_radius)
+        player_ship = generate_starship()
+        if config.player_weapons:
+            player_ship.weapons = [get_weapon(name) for name in config.player_weapons]
+        self.crew: list[Character] = [
+            generate_character() for _ in range(max(1, config.player_crew))
+        ]
+
+        enemies = []
+        for index in range(config.enemy_count):
+            enemy_ship = generate_enemy_ship(
+                difficulty=config.enemy_difficulty, faction=config.enemy_faction
+            )
+            if config.enemy_weapons:
+                enemy_ship.weapons = [get_weapon(name) for name in config.enemy_weapons]
+            enemies.append(
+                ShipCombatant(
+                    ship=enemy_ship,
+                    faction="enemy",
+                    position=self._spawn_position(radius, index),
+                )
+            )
+
+        for combatant_ship in [player_ship] + [e.ship for e in enemies]:
+            combatant_ship.shields_raised = True
+            combatant_ship.weapons_armed = True
+
+        self.encounter = Encounter(
+            name=f"Simulation {seed}",
+            player_ship=ShipCombatant(
+                ship=player_ship, faction="player", position=HexCoord(1 - radius, 0)
+            ),
+            player_character=self.crew[0],
+            enemy_ships=enemies,
+            tactical_map=TacticalMap(radius=radius),
+            threat=config.starting_threat,
+        )
+        # Encounter keeps a single effect list; each side gets its own
+        # and it is swapped in while that side's handlers run.
+        self.effects = {"player": [], "enemy": []}
+        self.stats = {"player": Counter(), "enemy": Counter()}
+        self.policies = {
+            "player": get_policy(config.player_policy),
+            "enemy": get_policy(config.enemy_policy),
+        }
+
+    def _spawn_position(self, radius: int, index: int) -> HexCoord:
+        """Line enemies up along the far edge of the map."""
+        q = radius - 1
+        r = -(index % (radius + 1))
+        coord = HexCoord(q, r)
+        if coord.distance_to(HexCoord(0, 0)) <= radius:
+            return coord
+        return HexCoord(q, 0)
+
+    # ===== State queries =====
+
+    def combatants(self, side: str) -> list[ShipCombatant]:
+        """Ships still fighting on a side."""
+        if side == "player":
+            ships = [self.encounter.player_ship]
+        else:
+            ships = self.encounter.enemy_ships
+        return [c for c in ships if not is_out_of_action(c)]
+
+    def opponents(self, side: str) -> list[ShipCombatant]:
+        """Ships still fighting on the other side."""
+        return self.combatants("enemy" if side == "player" else "player")
+
+    def pool(self, side: str) -> int:
+        """Momentum for the players, Threat for the NPCs."""
+        return self.encounter.momentum if side == "player" else self.encounter.threat
+
+    def spend_pool(self, side: str, amount: int) -> bool:
+        """Spend Momentum or Threat."""
+        if side == "player":
+            return self.encounter.spend_momentum(amount)
+        return self.encounter.spend_threat(amount)
+
+    def gain_pool(self, side: str, amount: int) -> None:
+        """NPC Momentum goes into the Threat pool."""
+        if side == "player":
+            self.encounter.add_momentum(amount)
+        else:
+            self.encounter.add_threat(amount)
+
+    def action_available(self, combatant: ShipCombatant, action_name: str) -> bool:
+        """An action is unavailable while its required system is destroyed."""
+        required_system = get_action_required_system(action_name)
+        if not required_system:
+            return True
+        return not combatant.ship.is_system_destroyed(SystemType(required_system))
+
+    def roll_inputs(
+        self, combatant: ShipCombatant, character: Optional[Character], roll: dict
+    ) -> tuple[int, int, bool]:
+        """Attribute, discipline and focus for a roll by this ship's crew."""
+        ship = combatant.ship
+        if ship.is_npc_ship():
+            attribute = ship.crew_quality.attribute
+            discipline = ship.crew_quality.department
+            has_focus = ship.crew_quality.has_focus
+        else:
+            attribute = character.attributes.get(roll["attribute"])
+            discipline = character.disciplines.get(roll["discipline"])
+            has_focus = bool(character.focuses)
+        return attribute, discipline, has_focus and roll.get("focus_eligible", True)
+
+    def assist_target_number(self, combatant: ShipCombatant, roll: dict) -> Optional[int]:
+        """System + Department for the ship assist die, if the roll has one."""
+        if not roll.get("ship_assist_system"):
+            return None
+        ship = combatant.ship
+        return ship.systems.get(roll["ship_assist_system"]) + ship.departments.get(
+            roll["ship_assist_department"]
+        )
+
+    def attack_difficulty(
+        self, side: str, attacker: ShipCombatant, target: ShipCombatant, weapon: Weapon
+    ) -> int:
+        """Weapon difficulty plus breaches, Attack Pattern and Evasive Action."""
+        difficulty = weapon.attack_difficulty
+        difficulty += attacker.ship.get_breach_potency(SystemType.WEAPONS)
+        difficulty += sum(
+            e.difficulty_modifier
+            for e in self.effects[side]
+            if e.applies_to_action("attack")
+        )
+        defender_side = "enemy" if side == "player" else "player"
+        if any(e.source_action == "Evasive Action" for e in self.effects[defender_side]):
+            difficulty += 1
+        return max(0, difficulty)
+
+    def hit_probability(
+        self,
+        side: str,
+        attacker: ShipCombatant,
+        character: Optional[Character],
+        target: ShipCombatant,
+        weapon: Weapon,
+        bonus_dice: int = 0,
+    ) -> float:
+        """Exact chance that a Fire action hits."""
+        attribute, discipline, focus = self.roll_inputs(attacker, character, FIRE_ROLL)
+        return task_success_probability(
+            attribute + discipline,
+            self.attack_difficulty(side, attacker, target, weapon),
+            dice_count=2 + bonus_dice,
+            focus_value=discipline if focus else None,
+            assist_target_number=self.assist_target_number(attacker, FIRE_ROLL),
+        )
+
+    # ===== Turn resolution =====
+
+    def _with_effects(self, side: str, handler: Callable, *args, **kwargs):
+        """Run an action handler against one side's active effects."""
+        self.encounter.active_effects = self.effects[side]
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            self.effects[side] = self.encounter.active_effects
+
+    def _roll(
+        self,
+        combatant: ShipCombatant,
+        character: Optional[Character],
+        roll: dict,
+        difficulty: int,
+        bonus_dice: int = 0,
+    ) -> TaskResult:
+        attribute, discipline, focus = self.roll_inputs(combatant, character, roll)
+        if self.assist_target_number(combatant, roll) is not None:
+            ship = combatant.ship
+            return assisted_task_roll(
+                attribute=attribute,
+                discipline=discipline,
+                system=ship.systems.get(roll["ship_assist_system"]),
+                department=ship.departments.get(roll["ship_assist_department"]),
+                difficulty=difficulty,
+                focus=focus,
+                bonus_dice=bonus_dice,
+            )
+        return task_roll(
+            attribute=attribute,
+            discipline=discipline,
+            difficulty=difficulty,
+            focus=focus,
+            bonus_dice=bonus_dice,
+        )
+
+    def take_turn(
+        self, side: str, combatant: ShipCombatant, character: Optional[Character]
+    ) -> None:
+        """Ask the side's policy for a plan and carry it out."""
+        plan = self.policies[side](self, side, combatant, character)
+
+        if plan.minor == "Impulse" and plan.move_to is not None:
+            self._impulse(side, combatant, plan.move_to)
+        elif plan.minor and self.action_available(combatant, plan.minor):
+            self._with_effects(side, execute_buff_action, plan.minor, self.encounter)
+        combatant.minor_actions_used += 1
+
+        if plan.major == "Fire" and plan.target is not None and plan.weapon is not None:
+            self._fire(side, combatant, character, plan.target, plan.weapon)
+        elif plan.major == "Damage Control" and plan.breach_system is not None:
+            self._damage_control(side, combatant, character, plan.breach_system)
+        elif plan.major != "Pass" and self.action_available(combatant, plan.major):
+            config = get_action_config(plan.major)
+            if config and config.get("type") == "task_roll":
+                self._task_roll_action(side, combatant, character, plan.major, config)
+            elif config and config.get("type") == "buff":
+                self._with_effects(side, execute_buff_action, plan.major, self.encounter)
+        combatant.major_actions_used += 1
+        combatant.has_acted = True
+
+        self.effects[side] = [
+            e for e in self.effects[side] if e.duration != "end_of_turn"
+        ]
+
+    def _impulse(self, side: str, combatant: ShipCombatant, destination: HexCoord) -> None:
+        if not self.action_available(combatant, "Impulse"):
+            return
+        moves = get_valid_impulse_moves(
+            combatant.position,
+            self.encounter.tactical_map,
+            momentum_available=self.pool(side),
+        )
+        move = next((m for m in moves if m.coord == destination), None)
+        if move and self.spend_pool(side, move.cost):
+            combatant.position = move.coord
+            self.stats[side]["moves"] += 1
+
+    def _fire(
+        self,
+        side: str,
+        attacker: ShipCombatant,
+        character: Optional[Character],
+        target: ShipCombatant,
+        weapon: Weapon,
+    ) -> None:
+        if not self.action_available(attacker, "Fire"):
+            return
+        if not weapon_in_range(weapon, attacker.hex_distance_to(target)):
+            return
+
+        stats = self.stats[side]
+        stats["attacks"] += 1
+        bonus_dice = 1 if self.pool(side) >= 1 and self.spend_pool(side, 1) else 0
+        result = self._roll(
+            attacker,
+            character,
+            FIRE_ROLL,
+            self.attack_difficulty(side, attacker, target, weapon),
+            bonus_dice,
+        )
+        if not result.succeeded:
+            return
+
+        stats["hits"] += 1
+        self.gain_pool(side, result.momentum_generated)
+
+        base_damage = weapon.damage + attacker.ship.weapons_damage_bonus()
+        damage, _, attack_details = self._with_effects(
+            side, apply_effects_to_attack, self.encounter, base_damage, target.ship.resistance
+        )
+        defender_side = "enemy" if side == "player" else "player"
+        resistance, _, _ = self._with_effects(
+            defender_side, apply_effects_to_defense, self.encounter, target.ship.resistance
+        )
+        if attack_details["piercing"]:
+            resistance = 0
+
+        base_resistance = target.ship.resistance
+        target.ship.resistance = resistance
+        try:
+            damage_result = target.ship.take_damage(damage)
+        finally:
+            target.ship.resistance = base_resistance
+
+        breaches = damage_result["breaches_caused"]
+        for _ in range(breaches):
+            system = (
+                SystemType.STRUCTURE
+                if attack_details["can_choose_system"]
+                else random.choice(list(SystemType))
+            )
+            target.ship.add_breach(system)
+
+        stats["damage"] += damage_result["shield_damage"] + damage_result["hull_damage"]
+        stats["breaches"] += breaches
+
+    def _task_roll_action(
+        self,
+        side: str,
+        combatant: ShipCombatant,
+        character: Optional[Character],
+        action_name: str,
+        config: dict,
+    ) -> None:
+        roll = config["roll"]
+        ship = combatant.ship
+        if config.get("requires_reserve_power") and not ship.has_reserve_power:
+            return
+
+        difficulty = roll.get("difficulty", 1)
+        required_system = get_action_required_system(action_name)
+        if required_system:
+            difficulty += ship.get_breach_potency(SystemType(required_system))
+        if action_name == "Regenerate Shields" and ship.shields == 0:
+            difficulty += 1
+
+        result = self._roll(combatant, character, roll, difficulty)
+        if not result.succeeded:
+            return
+
+        # apply_task_roll_success adds Momentum to the encounter; NPC
+        # Momentum goes to Threat instead.
+        momentum = result.momentum_generated if side == "player" else 0
+        if side == "enemy" and config.get("on_success", {}).get("generate_momentum"):
+            self.gain_pool(side, result.momentum_generated)
+        _, discipline, _ = self.roll_inputs(combatant, character, roll)
+        self._with_effects(
+            side,
+            apply_task_roll_success,
+            action_name,
+            self.encounter,
+            ship,
+            momentum_generated=momentum,
+            config=config,
+            discipline_value=discipline,
+        )
+
+    def _damage_control(
+        self,
+        side: str,
+        combatant: ShipCombatant,
+        character: Optional[Character],
+        system: SystemType,
+    ) -> None:
+        config = get_action_config("Damage Control")
+        difficulty = config["roll"]["difficulty"] + combatant.ship.get_breach_potency(system)
+        result = self._roll(combatant, character, config["roll"], difficulty)
+        if result.succeeded:
+            combatant.ship.patch_breach(system)
+            self.stats[side]["breaches_patched"] += 1
+
+    # ===== Encounter loop =====
+
+    def play_round(self) -> None:
+        """Alternate turns between the sides until both have used theirs."""
+        player_turns = len(self.crew)
+        enemy_turns = {
+            id(c): enemy_turns_per_round(c.ship.scale, self.config.enemy_turn_multiplier)
+            for c in self.combatants("enemy")
+        }
+        crew_index = 0
+        enemy_index = 0
+        side = "player"
+
+        while not self.is_over():
+            if side == "player" and player_turns > 0:
+                player_ship = self.encounter.player_ship
+                player_ship.reset_turn()
+                self.take_turn("player", player_ship, self.crew[crew_index])
+                crew_index += 1
+                player_turns -= 1
+            elif side == "enemy":
+                ready = [c for c in self.combatants("enemy") if enemy_turns.get(id(c), 0) > 0]
+                if ready:
+                    # Rotate through ships rather than spending one ship's turns first
+                    combatant = ready[enemy_index % len(ready)]
+                    enemy_index += 1
+                    combatant.reset_turn()
+                    self.take_turn("enemy", combatant, None)
+                    enemy_turns[id(combatant)] -= 1
+
+            enemy_left = any(
+                enemy_turns.get(id(c), 0) > 0 for c in self.combatants("enemy")
+            )
+            if player_turns == 0 and not enemy_left:
+                break
+            if side == "player" and enemy_left:
+                side = "enemy"
+            elif side == "enemy" and player_turns > 0:
+                side = "player"
+
+        for side_name in self.effects:
+            self.effects[side_name] = [
+                e for e in self.effects[side_name] if e.duration != "end_of_round"
+            ]
+        self.encounter.player_ship.reset_round()
+        for enemy in self.encounter.enemy_ships:
+            enemy.reset_round()
+
+    def is_over(self) -> bool:
+        return not self.combatants("player") or not self.combatants("enemy")
+
+    def run(self) -> EncounterOutcome:
+        """Play rounds until one side is out of action or max_rounds passes."""
+        while not self.is_over() and self.encounter.round <= self.config.max_rounds:
+            self.play_round()
+            if not self.is_over():
+                self.encounter.round += 1
+
+        if not self.combatants("player"):
+            winner = "enemy"
+        elif not self.combatants("enemy"):
+            winner = "player"
+        else:
+            winner = "draw"
+
+        player, enemy = self.stats["player"], self.stats["enemy"]
+        return EncounterOutcome(
+            seed=self.seed,
+            winner=winner,
+            rounds=min(self.encounter.round, self.config.max_rounds),
+            player_attacks=player["attacks"],
+            player_hits=player["hits"],
+            player_damage=player["damage"],
+            player_breaches=player["breaches"],
+            enemy_attacks=enemy["attacks"],
+            enemy_hits=enemy["hits"],
+            enemy_damage=enemy["damage"],
+            enemy_breaches=enemy["breaches"],
+            enemies_destroyed=len(self.encounter.enemy_ships) - len(self.combatants("enemy")),
+            player_shields_remaining=self.encounter.player_ship.ship.shields,
+        )
+
+
+# ===== Policies =====
+# A policy receives (simulation, side, combatant, character) and returns a TurnPlan.
+
+
+def _best_weapon(combatant: ShipCombatant, distance: int) -> Optional[Weapon]:
+    """Highest damage weapon that reaches the given distance."""
+    in_range = [w for w in combatant.ship.weapons if weapon_in_range(w, distance)]
+    return max(in_range, key=lambda w: w.damage, default=None)
+
+
+def scripted_policy(
+    sim: CombatSimulation, side: str, combatant: ShipCombatant, character
+) -> TurnPlan:
+    """Close on the first opponent and fire the strongest weapon in range."""
+    target = sim.opponents(side)[0]
+    plan = TurnPlan(target=target)
+
+    position = combatant.position
+    if _best_weapon(combatant, position.distance_to(target.position)) is None:
+        moves = get_valid_impulse_moves(
+            position, sim.encounter.tactical_map, momentum_available=sim.pool(side)
+        )
+        if moves:
+            closest = min(moves, key=lambda m: (m.coord.distance_to(target.position), m.cost))
+            plan.minor, plan.move_to = "Impulse", closest.coord
+            position = closest.coord
+
+    plan.weapon = _best_weapon(combatant, position.distance_to(target.position))
+    plan.major = "Fire" if plan.weapon else "Pass"
+    return plan
+
+
+def heuristic_policy(
+    sim: CombatSimulation, side: str, combatant: ShipCombatant, character
+) -> TurnPlan:
+    """
+    Maximise expected damage, falling back to repairs and Momentum.
+
+    Every reachable hex (including staying put) is scored against every
+    opponent by exact hit odds times weapon damage. Badly damaged ships
+    patch breaches or regenerate shields before attacking.
+    """
+    ship = combatant.ship
+
+    # Patch breaches before the next one takes the ship out
+    if ship.total_breach_potency() >= ship.scale and ship.breaches:
+        worst = max(ship.breaches, key=lambda b: b.potency)
+        return TurnPlan(major="Damage Control", breach_system=worst.system)
+
+    if (
+        ship.shields <= ship.shields_max // 3
+        and ship.has_reserve_power
+        and ship.shields_raised
+        and sim.action_available(combatant, "Regenerate Shields")
+    ):
+        return TurnPlan(major="Regenerate Shields")
+
+    positions = [(combatant.position, 0)]
+    if sim.action_available(combatant, "Impulse"):
+        positions += [
+            (m.coord, m.cost)
+            for m in get_valid_impulse_moves(
+                combatant.position,
+                sim.encounter.tactical_map,
+                momentum_available=sim.pool(side),
+            )
+        ]
+
+    best = None  # (score, -cost, position, target, weapon)
+    original_position = combatant.position
+    for position, cost in positions:
+        combatant.position = position
+        for target in sim.opponents(side):
+            distance = position.distance_to(target.position)
+            for weapon in combatant.ship.weapons:
+                if not weapon_in_range(weapon, distance):
+                    continue
+                expected = sim.hit_probability(side, combatant, character, target, weapon) * (
+                    weapon.damage + ship.weapons_damage_bonus()
+                )
+                # Prefer finishing off weakened targets
+                expected += 0.1 * target.ship.total_breach_potency()
+                candidate = (expected, -cost, position, target, weapon)
+                if best is None or candidate[:2] > best[:2]:
+                    best = candidate
+    combatant.position = original_position
+
+    if best is None:
+        # Nothing reachable: close the distance and build Momentum
+        target = min(
+            sim.opponents(side),
+            key=lambda t: combatant.position.distance_to(t.position),
+        )
+        closest = min(positions, key=lambda p: (p[0].distance_to(target.position), p[1]))
+        plan = TurnPlan(major="Maneuver", target=target)
+        if closest[0] != combatant.position:
+            plan.minor, plan.move_to = "Impulse", closest[0]
+        return plan
+
+    _, neg_cost, position, target, weapon = best
+    plan = TurnPlan(major="Fire", target=target, weapon=weapon)
+    if position != combatant.position:
+        plan.minor, plan.move_to = "Impulse", position
+    elif sim.action_available(combatant, "Calibrate Weapons"):
+        plan.minor = "Calibrate Weapons"
+    return plan
+
+
+def planner_policy(
+    sim: CombatSimulation, side: str, combatant: ShipCombatant, character
+) -> TurnPlan:
+    """Enemy ships follow the NPC turn planner; players play heuristically."""
+    if side != "enemy":
+        return heuristic_policy(sim, side, combatant, character)
+
+    # The planner reads the player's effects (Evasive Action) off the encounter
+    sim.encounter.active_effects = sim.effects["player"]
+    index = next(i for i, e in enumerate(sim.encounter.enemy_ships) if e is combatant)
+    npc_plan = plan_enemy_turn(sim.encounter, index)
+
+    plan = TurnPlan(
+        major=npc_plan.major,
+        minor=npc_plan.minor,
+        move_to=npc_plan.move_to,
+        target=sim.encounter.player_ship,
+        weapon=next(
+            (w for w in combatant.ship.weapons if w.name == npc_plan.weapon_name), None
+        ),
+    )
+    if plan.major == "Damage Control":
+        plan.breach_system = max(combatant.ship.breaches, key=lambda b: b.potency).system
+    return plan
+
+
+POLICIES: dict[str, Callable[..., TurnPlan]] = {
+    "scripted": scripted_policy,
+    "heuristic": heuristic_policy,
+    "planner": planner_policy,
+}
+
+
+def get_policy(name: str) -> Callable[..., TurnPlan]:
+    """Look up a policy by name."""
+    try:
+        return POLICIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown policy: {name} (expected one of {', '.join(sorted(POLICIES))})"
+        ) from None
+
+
+# ===== Batches and reporting =====
+
+
+def simulate_encounter(config: SimulationConfig, seed: int) -> EncounterOutcome:
+    """Play one seeded encounter."""
+    return CombatSimulation(config, seed).run()
+
+
+def run_batch(
+    config: SimulationConfig,
+    runs: int,
+    base_seed: int = 0,
+    workers: Optional[int] = None,
+) -> list[EncounterOutcome]:
+    """
+    Play `runs` encounters with seeds base_seed .. base_seed + runs - 1.
+
+    Encounters are spread across a process pool; workers=1 plays them in
+    this process. Results are returned in seed order either way.
+    """
+    seeds = range(base_seed, base_seed + runs)
+    if workers == 1:
+        return [simulate_encounter(config, seed) for seed in seeds]
+
+    worker_count = workers or os.cpu_count() or 1
+    chunksize = max(1, runs // (worker_count * 4))
+    with ProcessPoolExecutor(max_workers=worker_count) as pool:
+        return list(pool.map(partial(simulate_encounter, config), seeds, chunksize=chunksize))
+
+
+def _percentile(values: list[int], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(
+    outcomes: list[EncounterOutcome], config: Optional[SimulationConfig] = None
+) -> dict:
+    """
+    Aggregate win rates, round counts and damage distributions.
+
+    The config, if given, is flattened into the row so summaries of a
+    parameter sweep can be written to one table.
+    """
+    summary = {}
+    if config is not None:
+        for key, value in asdict(config).items():
+            summary[key] = ",".join(value) if isinstance(value, list) else value
+
+    total = len(outcomes)
+    summary["runs"] = total
+    if not total:
+        return summary
+
+    winners = Counter(o.winner for o in outcomes)
+    summary["player_win_rate"] = winners["player"] / total
+    summary["enemy_win_rate"] = winners["enemy"] / total
+    summary["draw_rate"] = winners["draw"] / total
+
+    for metric in ("rounds", "player_damage", "enemy_damage", "player_breaches", "enemy_breaches"):
+        values = [getattr(o, metric) for o in outcomes]
+        summary[f"{metric}_mean"] = statistics.fmean(values)
+        summary[f"{metric}_p10"] = _percentile(values, 0.10)
+        summary[f"{metric}_p50"] = _percentile(values, 0.50)
+        summary[f"{metric}_p90"] = _percentile(values, 0.90)
+
+    for side in ("player", "enemy"):
+        attacks = sum(getattr(o, f"{side}_attacks") for o in outcomes)
+        hits = sum(getattr(o, f"{side}_hits") for o in outcomes)
+        summary[f"{side}_hit_rate"] = hits / attacks if attacks else 0.0
+
+    return summary
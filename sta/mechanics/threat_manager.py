@@ -5,12 +5,13 @@ hazards, complications, and reinforcements. It accumulates from failed tasks,
 complications, and NPC actions.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from sta.database.pool_ledger import change_pool, pool_history
 from sta.database.schema import CampaignRecord
 
 
@@ -44,7 +45,6 @@ class ThreatManager:
     """
 
     db: AsyncSession
-    _change_history: dict[str, list[ThreatChange]] = field(default_factory=dict)
 
     async def get_threat(self, campaign_id: str) -> tuple[int, int]:
         """Get current and max Threat for a campaign.
@@ -55,9 +55,7 @@ class ThreatManager:
         Returns:
             Tuple of (current_threat, max_threat)
         """
-        stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
-        result = await self.db.execute(stmt)
-        campaign = result.scalars().first()
+        campaign = await self._get_campaign(campaign_id)
 
         if not campaign:
             return (0, 0)
@@ -78,19 +76,12 @@ class ThreatManager:
         if amount <= 0:
             return False
 
-        stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
-        result = await self.db.execute(stmt)
-        campaign = result.scalars().first()
+        campaign = await self._get_campaign(campaign_id)
 
         if not campaign:
             return False
 
-        previous_total = campaign.threat or 0
-        campaign.threat = previous_total + amount
-
-        self._record_change(
-            campaign_id, amount, reason, previous_total, campaign.threat
-        )
+        await change_pool(self.db, campaign, "threat", amount, reason)
 
         await self.db.commit()
         return True
@@ -109,48 +100,43 @@ class ThreatManager:
         if amount <= 0:
             return False
 
-        stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
-        result = await self.db.execute(stmt)
-        campaign = result.scalars().first()
+        campaign = await self._get_campaign(campaign_id)
 
         if not campaign:
             return False
 
-        current_threat = campaign.threat or 0
-        if current_threat < amount:
+        if not await change_pool(
+            self.db, campaign, "threat", -amount, reason, require=True
+        ):
             return False
 
-        previous_total = current_threat
-        campaign.threat = current_threat - amount
-
-        self._record_change(
-            campaign_id, -amount, reason, previous_total, campaign.threat
-        )
-
         await self.db.commit()
         return True
 
-    def _record_change(
-        self,
-        campaign_id: str,
-        amount: int,
-        reason: str,
-        previous_total: int,
-        new_total: int,
-    ) -> None:
-        """Record a Threat change for history tracking."""
-        if campaign_id not in self._change_history:
-            self._change_history[campaign_id] = []
-
-        self._change_history[campaign_id].append(
+    async def get_history(self, campaign_id: str) -> list[ThreatChange]:
+        """Get Threat change history for a campaign, oldest first.
+
+        History is read from the pool ledger, so it survives restarts and
+        includes changes made through the API.
+        """
+        campaign = await self._get_campaign(campaign_id)
+        if not campaign:
+            return []
+
+        entries = await pool_history(
+            self.db, campaign_pk=campaign.id, pool="threat", campaign_only=True, limit=None
+        )
+        return [
             ThreatChange(
-                amount=amount,
-                reason=reason,
-                previous_total=previous_total,
-                new_total=new_total,
+                amount=entry.change,
+                reason=entry.reason,
+                previous_total=entry.previous,
+                new_total=entry.balance,
             )
-        )
+            for entry in reversed(entries)
+        ]
 
-    def get_history(self, campaign_id: str) -> list[ThreatChange]:
-        """Get Threat change history for a campaign."""
-        return self._change_history.get(campaign_id, [])
+    async def _get_campaign(self, campaign_id: str):
+        stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
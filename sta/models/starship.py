@@ -83,6 +83,11 @@ class Breach:
         return f"{self.system.value.title()} Breach ({self.potency})"
 
 
+def system_destroyed(potency: int, scale: int) -> bool:
+    """Whether breaches of this total potency destroy a system (>= half of Scale)."""
+    return potency >= scale // 2
+
+
 @dataclass
 class Starship:
     """A starship (player or enemy)."""
@@ -170,7 +175,7 @@ class Starship:
 
     def is_system_destroyed(self, system: SystemType) -> bool:
         """Check if a system is destroyed (breach potency >= half ship's Scale)."""
-        return self.get_breach_potency(system) >= (self.scale // 2)
+        return system_destroyed(self.get_breach_potency(system), self.scale)
 
     def has_critical_damage(self) -> bool:
         """Check if ship has critical damage (total breaches >= Scale)."""
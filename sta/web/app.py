@@ -3,27 +3,39 @@
 import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.requests import Request
 from starlette.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from sta.database.async_db import initialize_db
+from sta.database.async_db import engine, initialize_db
+from sta.database.backup import backup_scheduler
+from sta.database.changes import notifier
+from sta.web.jobs import job_runner
 
 templates = Jinja2Templates(directory="sta/web/templates")
 
 SECRET_KEY = "sta-simulator-dev-key"
+GZIP_MINIMUM_SIZE = 500  # Bytes; smaller bodies aren't worth compressing
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events for FastAPI."""
-    # 1. Initialization: Create tables using the async engine
-    # NOTE: Migrations (from sta/database/db.py) must be run separately before web startup.
+    # 1. Initialization: Create or migrate tables if the schema version changed
     await initialize_db()
+    # Follow the change journal so this worker sees writes made by the others
+    await notifier.start(engine)
+    # Background jobs (exports, imports, generation)
+    await job_runner.start()
+    # Scheduled database snapshots (if BACKUP_INTERVAL_MINUTES is set)
+    await backup_scheduler.start(engine)
 
     yield
 
-    # 2. Shutdown: No explicit cleanup needed for in-memory SQLite engine dispose
-    pass
+    # 2. Shutdown: Stop snapshots, following the change journal and running jobs
+    await backup_scheduler.stop()
+    await job_runner.stop()
+    await notifier.stop()
 
 
 def create_app():
@@ -41,6 +53,9 @@ def create_app():
     app.state.UPLOAD_FOLDER = upload_folder
     app.state.MAX_CONTENT_LENGTH = 16 * 1024 * 1024
 
+    # Compress responses (JSON or MessagePack) for clients that accept gzip
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
     # Register APIRouters (replacing Flask Blueprints)
     # Must import routers from their corresponding new files (e.g., main.py -> main_router.py)
     from sta.web.routes.main_router import main_router
@@ -53,6 +68,8 @@ def create_app():
     from sta.web.routes.ships_router import ships_router
     from sta.web.routes.import_export_router import backup_router
     from sta.web.routes.users_router import users_router
+    from sta.web.routes.jobs_router import jobs_router
+    from sta.web.routes.snapshots_router import snapshots_router
     from sta.web.routes.ui_router import ui_router
 
     # Register routers with prefixes mirroring original blueprint URLs
@@ -83,6 +100,8 @@ def create_app():
         ships_router, prefix="/api/vtt"
     )  # VTT ship routes -> /api/vtt/ships
     app.include_router(backup_router, prefix="/api")  # Backup routes -> /api/backup
+    app.include_router(jobs_router, prefix="/api")  # Background jobs -> /api/jobs
+    app.include_router(snapshots_router, prefix="/api")  # Database snapshots -> /api/snapshots
     app.include_router(users_router)  # User preferences -> /api/users
     # scenes_router must come after ui_router so its /scenes/{id} overrides ui_router's HTML versions
     app.include_router(scenes_router, prefix="")  # Scene API routes
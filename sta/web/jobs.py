@@ -0,0 +1,347 @@
+"""
+In-process background jobs.
+
+Exports, imports, random generation and backups used to run inline on
+the event loop, so a large json.dumps or generator call stalled every
+table's polls. Routes hand such work to job_runner instead:
+
+    async def work(job, db):
+        await job.progress(20, "Generating ship")
+        ship = await job.run_sync(generate_starship)
+        ...
+        return {"ship_name": ship.name}
+
+    return await run_or_queue(background, "random_campaign", work, db)
+
+Without background the work runs in the request as before (its blocking
+calls still go to the thread pool). With background the route answers
+202 with the job id, and one of JOB_WORKERS worker tasks fed by an
+asyncio queue runs the work in its own session. Blocking calls run on a
+pool of JOB_THREADS threads; CPU-bound Python there still shares the
+GIL, but the interpreter switches threads every few milliseconds, so the
+event loop keeps answering polls.
+
+Job state lives in the jobs table, so any process can poll, cancel and
+download a job. Each job records the campaign player who queued it (and
+their campaign, unless the route names one); only that player and the
+campaign's GM can see it (see sta/web/routes/jobs_router.py). Live progress is kept in memory by the process running
+the job. The result is stored by a conditional UPDATE in the job's own
+transaction: a job cancelled in the meantime (from any process) has its
+result and its database writes rolled back.
+"""
+
+import asyncio
+import functools
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select, update
+
+from sta.database.async_db import AsyncSessionLocal
+from sta.database.config import settings
+from sta.database.schema import CampaignPlayerRecord, JobRecord
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's work once the job has been cancelled."""
+
+
+class JobContext:
+    """Passed to job work: progress reporting, cancellation and blocking calls."""
+
+    def __init__(self, runner: "JobRunner", job_id: Optional[str] = None):
+        self.runner = runner
+        self.id = job_id  # None: running inline in a request
+        self.progress_percent = 0
+        self.message: Optional[str] = None
+        self.cancelled = False
+
+    def check_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled()
+
+    def report(self, percent: int, message: Optional[str] = None) -> None:
+        """
+        Report progress (0-100) without yielding, e.g. from a callback in
+        the thread pool. Raises JobCancelled if the job was cancelled.
+        """
+        self.check_cancelled()
+        self.progress_percent = max(0, min(int(percent), 100))
+        self.message = message
+
+    async def progress(self, percent: int, message: Optional[str] = None) -> None:
+        """Report progress (0-100). Raises JobCancelled if the job was cancelled."""
+        self.report(percent, message)
+        await asyncio.sleep(0)  # Let polls and cancellations in
+
+    async def run_sync(self, func: Callable, *args, **kwargs):
+        """Run a blocking call on the job thread pool."""
+        self.check_cancelled()
+        result = await self.runner.run_sync(func, *args, **kwargs)
+        self.check_cancelled()
+        return result
+
+
+JobWork = Callable[[JobContext, object], Awaitable[object]]
+
+
+class JobRunner:
+    """
+    Runs queued jobs on worker tasks of the event loop it was started on.
+
+    Started and stopped with the app; submit also starts it on demand, so
+    jobs work wherever there is a running loop.
+    """
+
+    def __init__(self, workers: Optional[int] = None, threads: Optional[int] = None):
+        self.workers = workers or settings.JOB_WORKERS
+        self.threads = threads or settings.JOB_THREADS
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._live: dict[str, JobContext] = {}
+
+    @property
+    def running(self) -> bool:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return self._loop is loop and any(not task.done() for task in self._tasks)
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        # Anything left from a loop that has gone away is unreachable now
+        self._tasks = []
+        self._live.clear()
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        unfinished = list(self._live)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if unfinished:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(JobRecord)
+                    .filter(JobRecord.id.in_(unfinished),
+                            JobRecord.status.in_(ACTIVE_STATUSES))
+                    .values(status="failed", error="Server stopped",
+                            finished_at=datetime.now())
+                )
+                await db.commit()
+            self._live.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._loop = self._queue = None
+
+    async def run_sync(self, func: Callable, *args, **kwargs):
+        """Run a blocking call on the job thread pool (usable outside jobs too)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.threads, thread_name_prefix="sta-job"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def submit(
+        self,
+        kind: str,
+        work: JobWork,
+        *,
+        campaign_id: Optional[int] = None,
+        filename: Optional[str] = None,
+        created_by: Optional[int] = None,
+    ) -> str:
+        """Queue work as a new job and return its id."""
+        await self.start()
+        job_id = uuid.uuid4().hex
+        async with AsyncSessionLocal() as db:
+            cutoff = datetime.now() - timedelta(hours=settings.JOB_RETENTION_HOURS)
+            await db.execute(
+                delete(JobRecord).filter(
+                    JobRecord.status.in_(FINISHED_STATUSES), JobRecord.finished_at < cutoff
+                )
+            )
+            db.add(JobRecord(id=job_id, kind=kind, campaign_id=campaign_id,
+                             created_by=created_by, result_filename=filename))
+            await db.commit()
+
+        job = JobContext(self, job_id)
+        self._live[job_id] = job
+        self._queue.put_nowait((job, work))
+        return job_id
+
+    async def cancel(self, db, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns False if it had already finished."""
+        job = self._live.get(job_id)
+        if job is not None:
+            # Flag first: the job stops at its next check and releases its locks
+            job.cancelled = True
+        result = await db.execute(
+            update(JobRecord)
+            .filter(JobRecord.id == job_id, JobRecord.status.in_(ACTIVE_STATUSES))
+            .values(status="cancelled", finished_at=datetime.now())
+        )
+        return result.rowcount > 0
+
+    def live(self, job_id: str) -> Optional[JobContext]:
+        """The context of a job queued or running in this process."""
+        return self._live.get(job_id)
+
+    async def _work(self) -> None:
+        while True:
+            job, work = await self._queue.get()
+            try:
+                await self._execute(job, work)
+            finally:
+                self._live.pop(job.id, None)
+                self._queue.task_done()
+
+    async def _set_status(self, job_id: str, from_statuses, **values) -> bool:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(JobRecord)
+                .filter(JobRecord.id == job_id, JobRecord.status.in_(from_statuses))
+                .values(**values)
+            )
+            await db.commit()
+        return result.rowcount > 0
+
+    async def _execute(self, job: JobContext, work: JobWork) -> None:
+        if job.cancelled or not await self._set_status(
+            job.id, ("queued",), status="running", started_at=datetime.now()
+        ):
+            return  # Cancelled while queued
+
+        try:
+            async with AsyncSessionLocal() as db:
+                try:
+                    result = await work(job, db)
+                    job.check_cancelled()
+                    if not isinstance(result, str):
+                        result = await job.run_sync(json.dumps, result, default=str)
+                    finished = await db.execute(
+                        update(JobRecord)
+                        .filter(JobRecord.id == job.id, JobRecord.status == "running")
+                        .values(status="completed", progress=100, message=job.message,
+                                result_json=result, finished_at=datetime.now())
+                    )
+                    if finished.rowcount:
+                        await db.commit()
+                    else:
+                        await db.rollback()  # Cancelled from another process
+                except BaseException:
+                    await db.rollback()
+                    raise
+        except JobCancelled:
+            pass
+        except HTTPException as exc:
+            await self._fail(job, str(exc.detail))
+        except Exception as exc:
+            await self._fail(job, f"{type(exc).__name__}: {exc}")
+
+    async def _fail(self, job: JobContext, error: str) -> None:
+        await self._set_status(
+            job.id, ("running",), status="failed", error=error,
+            progress=job.progress_percent, message=job.message,
+            finished_at=datetime.now(),
+        )
+
+
+job_runner = JobRunner()
+
+
+def job_to_dict(record: JobRecord) -> dict:
+    """Job status for polling, with live progress if this process runs it."""
+    progress, message = record.progress, record.message
+    job = job_runner.live(record.id)
+    if job is not None and record.status == "running":
+        progress, message = job.progress_percent, job.message
+    return {
+        "job_id": record.id,
+        "kind": record.kind,
+        "status": record.status,
+        "progress": progress,
+        "message": message,
+        "error": record.error,
+        "campaign_id": record.campaign_id,
+        "created_by": record.created_by,
+        "created_at": record.created_at.isoformat() if record.created_at else None,
+        "started_at": record.started_at.isoformat() if record.started_at else None,
+        "finished_at": record.finished_at.isoformat() if record.finished_at else None,
+        "status_url": f"/api/jobs/{record.id}",
+        "result_url": (
+            f"/api/jobs/{record.id}/result" if record.status == "completed" else None
+        ),
+    }
+
+
+async def run_or_queue(
+    background: bool,
+    kind: str,
+    work: JobWork,
+    db,
+    *,
+    campaign_id: Optional[int] = None,
+    filename: Optional[str] = None,
+    session_token: Optional[str] = None,
+):
+    """
+    Run work in the request, or queue it as a job and answer 202 with the
+    job id and the URLs to poll and download it.
+
+    work flushes but does not commit: this commits it in the request, and
+    the runner commits it together with the job result.
+
+    Args:
+        campaign_id: Campaign the job belongs to (default: the caller's)
+        session_token: The caller's sta_session_token, recorded as the
+            job's owner
+    """
+    if not background:
+        result = await work(JobContext(job_runner), db)
+        await db.commit()
+        return result
+
+    owner = None
+    if session_token:
+        result = await db.execute(
+            select(CampaignPlayerRecord).filter(
+                CampaignPlayerRecord.session_token == session_token
+            )
+        )
+        owner = result.scalars().first()
+    if owner is not None and campaign_id is None:
+        campaign_id = owner.campaign_id
+    job_id = await job_runner.submit(
+        kind, work, campaign_id=campaign_id, filename=filename,
+        created_by=owner.id if owner is not None else None,
+    )
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "status_url": f"/api/jobs/{job_id}",
+            "result_url": f"/api/jobs/{job_id}/result",
+        },
+    )
@@ -0,0 +1,255 @@
+"""
+Server-rendered SVG of an encounter's tactical map.
+
+For clients too slow to redraw the hex grid in static/js/hex-map.js on
+every poll (the viewscreen on a TV or an old tablet): the map comes as
+one standalone SVG document the page shows as an image. It is drawn the
+way HexMap.render draws a read-only map, in two layers:
+
+- terrain: hexes, terrain fills and overlays, movement costs; drawn
+  from the tactical map JSON alone
+- tokens: ship markers and names; drawn from the visible ships
+
+Each layer is keyed by a digest of what it is drawn from, and the
+terrain layer is cached on its own, so when ships move only the token
+layer is drawn again. The pair of digests is the document's ETag:
+
+    etag, svg = map_svg_cache.render(encounter.tactical_map_json, visible_ships)
+"""
+
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from html import escape
+from typing import Optional
+
+from sta.models.combat import TacticalMap
+from sta.models.enums import TerrainType
+
+MEDIA_TYPE = "image/svg+xml"
+
+HEX_SIZE = 40  # Center to corner; the image scales to fit anyway
+MARGIN = 80
+SHIP_SIZE = 12
+LABEL_FONT_SIZE = 18  # Readable across the room
+MAX_NAME_LENGTH = 16
+
+# Colours as in hex-map.js, with its CSS variables resolved (an SVG
+# shown as an image doesn't see the page's stylesheet)
+TERRAIN_COLORS = {
+    "open": "#1a1a2e",
+    "planetary_gravity": "#2a2a1a",
+    "dust_cloud": "#2a3a4a",
+    "debris_field": "#3a2a1a",
+    "asteroid_field": "#3a2a2a",
+    "dense_nebula": "#1a2a3a",
+    "stellar_gravity": "#4a3a1a",
+}
+GRID_COLOR = "#ff9900"
+COST_COLOR = "#cc9966"
+PLAYER_COLOR = "#99cc99"
+ENEMY_COLOR = "#cc6666"
+
+DEFS = (
+    '<defs>'
+    '<pattern id="fog-pattern" patternUnits="userSpaceOnUse" width="8" height="8">'
+    '<line x1="0" y1="8" x2="8" y2="0" stroke="rgba(150, 180, 200, 0.4)" stroke-width="2"/>'
+    '</pattern>'
+    '<pattern id="hindrance-pattern" patternUnits="userSpaceOnUse" width="6" height="6">'
+    '<circle cx="3" cy="3" r="1" fill="rgba(204, 153, 102, 0.3)"/>'
+    '</pattern>'
+    '<pattern id="hazard-pattern" patternUnits="userSpaceOnUse" width="10" height="10" '
+    'patternTransform="rotate(45)">'
+    '<rect width="5" height="10" fill="rgba(204, 102, 102, 0.2)"/>'
+    '</pattern>'
+    '</defs>'
+)
+
+
+def map_size(radius: int) -> tuple[float, float]:
+    """Width and height of the drawing for a map radius."""
+    return (
+        HEX_SIZE * (3 * radius + 2) + MARGIN,
+        HEX_SIZE * math.sqrt(3) * (2 * radius + 1) + MARGIN,
+    )
+
+
+def hex_center(radius: int, q: int, r: int) -> tuple[float, float]:
+    """Pixel centre of hex (q, r), flat-top as in HexMap.axialToPixel."""
+    width, height = map_size(radius)
+    return (
+        width / 2 + HEX_SIZE * 1.5 * q,
+        height / 2 + HEX_SIZE * (math.sqrt(3) / 2 * q + math.sqrt(3) * r),
+    )
+
+
+def _hex_path(x: float, y: float) -> str:
+    corners = (
+        f"{x + HEX_SIZE * math.cos(math.pi / 3 * i):.2f},"
+        f"{y + HEX_SIZE * math.sin(math.pi / 3 * i):.2f}"
+        for i in range(6)
+    )
+    return "M" + "L".join(corners) + "Z"
+
+
+def _terrain(tactical_map: TacticalMap, q: int, r: int) -> TerrainType:
+    tile = tactical_map.tiles.get((q, r))
+    return tile.terrain if tile else TerrainType.OPEN
+
+
+def _cost_label(x: float, y: float, cost: int, color: str) -> str:
+    return (
+        f'<text x="{x + HEX_SIZE * 0.5:.2f}" y="{y - HEX_SIZE * 0.4:.2f}" text-anchor="middle" '
+        f'fill="{color}" font-size="9" font-weight="bold">{cost}M</text>'
+    )
+
+
+def render_terrain_layer(tactical_map: TacticalMap) -> str:
+    """The hex grid with terrain, overlays and movement costs."""
+    radius = tactical_map.radius
+    tiles, overlays, fog, labels = [], [], [], []
+    for q in range(-radius, radius + 1):
+        for r in range(max(-radius, -q - radius), min(radius, -q + radius) + 1):
+            x, y = hex_center(radius, q, r)
+            path = _hex_path(x, y)
+            terrain = _terrain(tactical_map, q, r)
+            tiles.append(
+                f'<path d="{path}" fill="{TERRAIN_COLORS.get(terrain.value, TERRAIN_COLORS["open"])}" '
+                f'stroke="{GRID_COLOR}" stroke-width="1"/>'
+            )
+            if terrain.blocks_visibility:
+                fog.append(f'<path d="{path}" fill="url(#fog-pattern)"/>')
+            elif terrain.movement_cost:
+                overlays.append(f'<path d="{path}" fill="url(#hindrance-pattern)"/>')
+                # Costs of fogged hexes are only shown under the player's ship
+                labels.append(_cost_label(x, y, terrain.movement_cost, COST_COLOR))
+            if terrain.is_hazardous:
+                overlays.append(f'<path d="{path}" fill="url(#hazard-pattern)"/>')
+
+    x, y = hex_center(radius, 0, 0)
+    labels.append(
+        f'<text x="{x:.2f}" y="{y - HEX_SIZE * 0.2:.2f}" text-anchor="middle" '
+        f'fill="{GRID_COLOR}" font-size="9">CENTER</text>'
+    )
+    return (
+        f'<g id="hex-tiles">{"".join(tiles)}</g>'
+        f'<g id="hindrance-overlays">{"".join(overlays)}</g>'
+        f'<g id="fog-overlays">{"".join(fog)}</g>'
+        f'<g id="hex-highlights">{"".join(labels)}</g>'
+    )
+
+
+def render_token_layer(tactical_map: TacticalMap, ships: list[dict]) -> str:
+    """
+    Ship markers and names. ships are the /map endpoint's ship_positions
+    entries (name, is_player, q, r), in order.
+    """
+    radius = tactical_map.radius
+    parts = []
+    for index, ship in enumerate(ships):
+        q, r = ship.get("q", 0), ship.get("r", 0)
+        x, y = hex_center(radius, q, r)
+        is_player = ship.get("is_player", False)
+        color = PLAYER_COLOR if is_player else ENEMY_COLOR
+
+        terrain = _terrain(tactical_map, q, r)
+        if is_player and terrain.blocks_visibility and terrain.movement_cost:
+            parts.append(_cost_label(x, y, terrain.movement_cost, GRID_COLOR))
+
+        points = " ".join(
+            f"{px:.2f},{py:.2f}"
+            for px, py in (
+                (x, y - SHIP_SIZE),
+                (x - SHIP_SIZE * 0.866, y + SHIP_SIZE * 0.5),
+                (x + SHIP_SIZE * 0.866, y + SHIP_SIZE * 0.5),
+            )
+        )
+        name = (ship.get("name") or "")[:MAX_NAME_LENGTH] or (
+            "Player" if is_player else f"Enemy {index + 1}"
+        )
+        parts.append(
+            f'<polygon points="{points}" fill="{color}" stroke="#000000" stroke-width="2"/>'
+            f'<text x="{x:.2f}" y="{y + SHIP_SIZE + 14 + LABEL_FONT_SIZE - 10:.2f}" '
+            f'text-anchor="middle" fill="{color}" font-size="{LABEL_FONT_SIZE}" '
+            f'font-weight="bold">{escape(name)}</text>'
+        )
+    return f'<g id="ships">{"".join(parts)}</g>'
+
+
+def compose_map_svg(radius: int, terrain_layer: str, token_layer: str) -> str:
+    """A standalone SVG document from the two layers."""
+    width, height = map_size(radius)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width:.2f} {height:.2f}" '
+        f'width="{width:.2f}" height="{height:.2f}" style="background: #000000">'
+        f"{DEFS}{terrain_layer}{token_layer}</svg>"
+    )
+
+
+def _digest(data: str) -> str:
+    return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
+
+
+class MapSvgCache:
+    """
+    Rendered maps, least recently used first out.
+
+    Terrain layers are kept by tactical map digest (so encounters with
+    the same map share one), whole documents by (map, ships) digest.
+    """
+
+    def __init__(self, max_maps: int = 64, max_documents: int = 256):
+        self.max_maps = max_maps
+        self.max_documents = max_documents
+        self._maps: OrderedDict[str, tuple[TacticalMap, str]] = OrderedDict()
+        self._documents: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def etag(tactical_map_json: Optional[str], ships: list[dict]) -> str:
+        """The ETag of the document for a map and its visible ships."""
+        ships_json = json.dumps(ships, sort_keys=True, separators=(",", ":"))
+        return f'"{_digest(tactical_map_json or "")}-{_digest(ships_json)}"'
+
+    def render(self, tactical_map_json: Optional[str], ships: list[dict]) -> tuple[str, str]:
+        """(etag, svg) for a map and its visible ships, drawing only what isn't cached."""
+        etag = self.etag(tactical_map_json, ships)
+        svg = self._documents.get(etag)
+        if svg is not None:
+            self._documents.move_to_end(etag)
+            return etag, svg
+
+        map_key = etag[1:].split("-", 1)[0]
+        entry = self._maps.get(map_key)
+        if entry is None:
+            entry = self._terrain(tactical_map_json)
+            self._maps[map_key] = entry
+            if len(self._maps) > self.max_maps:
+                self._maps.popitem(last=False)
+        else:
+            self._maps.move_to_end(map_key)
+        tactical_map, terrain_layer = entry
+
+        svg = compose_map_svg(
+            tactical_map.radius, terrain_layer, render_token_layer(tactical_map, ships)
+        )
+        self._documents[etag] = svg
+        if len(self._documents) > self.max_documents:
+            self._documents.popitem(last=False)
+        return etag, svg
+
+    @staticmethod
+    def _terrain(tactical_map_json: Optional[str]) -> tuple[TacticalMap, str]:
+        try:
+            data = json.loads(tactical_map_json) if tactical_map_json else {}
+            tactical_map = TacticalMap.from_dict(data)
+        except (ValueError, KeyError, TypeError):
+            tactical_map = TacticalMap()
+        return tactical_map, render_terrain_layer(tactical_map)
+
+    def clear(self) -> None:
+        self._maps.clear()
+        self._documents.clear()
+
+
+map_svg_cache = MapSvgCache()
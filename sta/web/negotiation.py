@@ -0,0 +1,251 @@
+"""
+Accept-negotiated MessagePack responses.
+
+Routers built with default_response_class=NegotiatedResponse answer in
+MessagePack when the request's Accept header prefers it, and in JSON
+otherwise. The payload is the same either way, but MessagePack drops the
+quoting and punctuation and packs numbers in binary, which shrinks the
+key-heavy polled bodies:
+
+    api_router = APIRouter(default_response_class=NegotiatedResponse)
+
+    Accept: application/msgpack, application/json;q=0.9   -> MessagePack
+    Accept: */*                                           -> JSON
+
+static/js/msgpack.js decodes it in the browser (see MsgPack.fetch), and
+scripts/wire_formats.py compares the two formats. The codec covers
+the JSON data model only (nil, bools, ints, floats, strings, arrays and
+maps); a body holding an integer beyond MessagePack's 64 bits is sent
+as JSON instead.
+"""
+
+import json
+import struct
+from functools import lru_cache
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = frozenset(
+    {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+)
+JSON_MEDIA_RANGES = frozenset({"application/json", "application/*", "*/*"})
+
+_FLOAT = struct.Struct(">Bd")
+
+
+# ===== Encoding =====
+
+def packb(obj) -> bytes:
+    """Encode a JSON-compatible value as MessagePack."""
+    out = bytearray()
+    _pack(obj, out)
+    return bytes(out)
+
+
+def _pack(obj, out: bytearray) -> None:
+    kind = type(obj)
+    if kind is str:
+        out += _pack_str(obj)
+    elif kind is dict:
+        _pack_header(len(obj), 0x80, 0xDE, out)
+        for key, value in obj.items():
+            out += _pack_key(key if type(key) is str else json.dumps(key))
+            _pack(value, out)
+    elif kind is int:
+        _pack_int(obj, out)
+    elif kind is list or kind is tuple:
+        _pack_header(len(obj), 0x90, 0xDC, out)
+        for item in obj:
+            _pack(item, out)
+    elif obj is None:
+        out.append(0xC0)
+    elif kind is bool:
+        out.append(0xC3 if obj else 0xC2)
+    elif kind is float:
+        out += _FLOAT.pack(0xCB, obj)
+    elif isinstance(obj, str):
+        out += _pack_str(obj)
+    elif isinstance(obj, bool):
+        out.append(0xC3 if obj else 0xC2)
+    elif isinstance(obj, int):
+        _pack_int(int(obj), out)
+    elif isinstance(obj, float):
+        out += _FLOAT.pack(0xCB, obj)
+    elif isinstance(obj, dict):
+        _pack(dict(obj), out)
+    elif isinstance(obj, (list, tuple)):
+        _pack(list(obj), out)
+    else:
+        raise TypeError(f"Cannot encode {kind.__name__} as MessagePack")
+
+
+def _pack_header(size: int, fix: int, wide: int, out: bytearray) -> None:
+    """Array (0x90/0xDC) or map (0x80/0xDE) header."""
+    if size < 16:
+        out.append(fix | size)
+    elif size < 0x10000:
+        out.append(wide)
+        out += size.to_bytes(2, "big")
+    else:
+        out.append(wide + 1)
+        out += size.to_bytes(4, "big")
+
+
+def _pack_int(value: int, out: bytearray) -> None:
+    if 0 <= value < 0x80:
+        out.append(value)
+    elif -32 <= value < 0:
+        out.append(value & 0xFF)
+    elif value > 0:
+        for marker, size in ((0xCC, 1), (0xCD, 2), (0xCE, 4), (0xCF, 8)):
+            if value < 1 << (8 * size):
+                out.append(marker)
+                out += value.to_bytes(size, "big")
+                return
+        raise OverflowError("Integer too large for MessagePack")
+    else:
+        for marker, size in ((0xD0, 1), (0xD1, 2), (0xD2, 4), (0xD3, 8)):
+            if value >= -(1 << (8 * size - 1)):
+                out.append(marker)
+                out += value.to_bytes(size, "big", signed=True)
+                return
+        raise OverflowError("Integer too large for MessagePack")
+
+
+def _pack_str(value: str) -> bytes:
+    data = value.encode()
+    size = len(data)
+    if size < 32:
+        return bytes((0xA0 | size,)) + data
+    if size < 0x100:
+        return bytes((0xD9, size)) + data
+    if size < 0x10000:
+        return b"\xda" + size.to_bytes(2, "big") + data
+    return b"\xdb" + size.to_bytes(4, "big") + data
+
+
+# Keys repeat on every row and every poll, so their encodings are cached
+_pack_key = lru_cache(maxsize=4096)(_pack_str)
+
+
+# ===== Decoding =====
+
+def unpackb(data: bytes):
+    """Decode MessagePack produced by packb (or any nil/bool/int/float/str/array/map)."""
+    value, offset = _unpack(memoryview(data), 0)
+    if offset != len(data):
+        raise ValueError("Extra bytes after MessagePack value")
+    return value
+
+
+def _unpack(data: memoryview, offset: int):
+    marker = data[offset]
+    offset += 1
+    if marker < 0x80:
+        return marker, offset
+    if marker >= 0xE0:
+        return marker - 0x100, offset
+    if 0xA0 <= marker <= 0xBF:
+        return _unpack_str(data, offset, marker & 0x1F)
+    if 0x90 <= marker <= 0x9F:
+        return _unpack_array(data, offset, marker & 0x0F)
+    if 0x80 <= marker <= 0x8F:
+        return _unpack_map(data, offset, marker & 0x0F)
+    if marker == 0xC0:
+        return None, offset
+    if marker in (0xC2, 0xC3):
+        return marker == 0xC3, offset
+    if marker in (0xCA, 0xCB):
+        fmt, size = (">f", 4) if marker == 0xCA else (">d", 8)
+        return struct.unpack_from(fmt, data, offset)[0], offset + size
+    if 0xCC <= marker <= 0xD3:
+        size = 1 << ((marker - 0xCC) % 4)
+        value = int.from_bytes(data[offset:offset + size], "big", signed=marker >= 0xD0)
+        return value, offset + size
+    if marker in (0xD9, 0xDA, 0xDB, 0xC4, 0xC5, 0xC6):
+        width = {0xD9: 1, 0xDA: 2, 0xDB: 4, 0xC4: 1, 0xC5: 2, 0xC6: 4}[marker]
+        size = int.from_bytes(data[offset:offset + width], "big")
+        if marker >= 0xD9:
+            return _unpack_str(data, offset + width, size)
+        return bytes(data[offset + width:offset + width + size]), offset + width + size
+    if marker in (0xDC, 0xDD, 0xDE, 0xDF):
+        width = 2 if marker in (0xDC, 0xDE) else 4
+        size = int.from_bytes(data[offset:offset + width], "big")
+        unpack = _unpack_array if marker <= 0xDD else _unpack_map
+        return unpack(data, offset + width, size)
+    raise ValueError(f"Unsupported MessagePack marker 0x{marker:02x}")
+
+
+def _unpack_str(data: memoryview, offset: int, size: int):
+    return str(data[offset:offset + size], "utf-8"), offset + size
+
+
+def _unpack_array(data: memoryview, offset: int, size: int):
+    items = []
+    for _ in range(size):
+        item, offset = _unpack(data, offset)
+        items.append(item)
+    return items, offset
+
+
+def _unpack_map(data: memoryview, offset: int, size: int):
+    result = {}
+    for _ in range(size):
+        key, offset = _unpack(data, offset)
+        result[key], offset = _unpack(data, offset)
+    return result, offset
+
+
+# ===== Negotiation =====
+
+@lru_cache(maxsize=256)
+def prefers_msgpack(accept: str) -> bool:
+    """Whether an Accept header ranks MessagePack at least as high as JSON."""
+    msgpack_q = json_q = 0.0
+    for media_range in accept.split(","):
+        media_type, _, params = media_range.partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in JSON_MEDIA_RANGES:
+            json_q = max(json_q, q)
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+class NegotiatedResponse(JSONResponse):
+    """
+    JSON, or MessagePack when the request's Accept header prefers it.
+
+    The choice is made when the response is sent, since that is where
+    the request's headers are in reach; either way Vary: Accept is set.
+    Content MessagePack can't hold (integers beyond 64 bits) stays JSON.
+    """
+
+    def __init__(self, content, *args, **kwargs):
+        self.content = content
+        super().__init__(content, *args, **kwargs)
+
+    async def __call__(self, scope, receive, send) -> None:
+        headers = MutableHeaders(raw=self.raw_headers)
+        headers.add_vary_header("Accept")
+        accept = next((value for name, value in scope["headers"] if name == b"accept"), b"")
+        if accept and prefers_msgpack(accept.decode("latin-1")) and self.body:
+            try:
+                body = packb(self.content)
+            except OverflowError:
+                body = None
+            if body is not None:
+                self.body = body
+                headers["content-type"] = MSGPACK_MEDIA_TYPE
+                headers["content-length"] = str(len(body))
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,53 @@
+"""
+Recommended poll intervals for the polled encounter endpoints.
+
+Polled GETs set an X-Poll-Interval header: the milliseconds the client
+should wait before polling again. It is short while the encounter or
+scene is running and has just changed (as seen by the change notifier),
+longer as it goes quiet, and long once it is no longer active:
+
+    set_poll_interval(response, "encounter", encounter.id, encounter_running(encounter))
+
+The shared Poller in static/js/polling.js honours it, backs off further
+while responses stay the same, and speeds up again as soon as one changes.
+"""
+
+from typing import Optional
+
+from fastapi import Response
+
+from sta.database.changes import notifier
+
+POLL_HEADER = "X-Poll-Interval"
+
+POLL_BUSY_MS = 1000  # Changed within BUSY_SECONDS
+POLL_ACTIVE_MS = 2000  # Running, changed within QUIET_SECONDS (or unknown)
+POLL_QUIET_MS = 5000  # Running, no change for QUIET_SECONDS
+POLL_IDLE_MS = 15000  # Not running (draft, paused, completed)
+
+BUSY_SECONDS = 10
+QUIET_SECONDS = 120
+
+
+def encounter_running(encounter) -> bool:
+    return bool(encounter.is_active) and encounter.status == "active"
+
+
+def poll_interval(entity_type: str, entity_id: int, active: bool) -> int:
+    """Milliseconds until the next poll of an entity."""
+    if not active:
+        return POLL_IDLE_MS
+    since: Optional[float] = notifier.seconds_since_change(entity_type, entity_id)
+    if since is None:
+        # A running notifier would have seen any change since it started
+        return POLL_QUIET_MS if notifier.running else POLL_ACTIVE_MS
+    if since < BUSY_SECONDS:
+        return POLL_BUSY_MS
+    if since < QUIET_SECONDS:
+        return POLL_ACTIVE_MS
+    return POLL_QUIET_MS
+
+
+def set_poll_interval(response: Response, entity_type: str, entity_id: int, active: bool) -> None:
+    """Tell the client when to poll again (see POLL_HEADER)."""
+    response.headers[POLL_HEADER] = str(poll_interval(entity_type, entity_id, active))
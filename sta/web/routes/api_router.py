@@ -1,6 +1,7 @@
 """API routes for AJAX operations (FastAPI)."""
 
 import json
+import time
 import uuid
 import asyncio
 from datetime import datetime
@@ -19,8 +20,8 @@ from fastapi import (
     Cookie,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete as sqlalchemy_delete
-from sta.database.async_db import get_db  # New async dependency
+from sqlalchemy import and_, func, select, delete as sqlalchemy_delete
+from sta.database.async_db import get_db, get_read_db
 from sta.database.schema import (
     EncounterRecord,
     StarshipRecord,
@@ -31,12 +32,21 @@ from sta.database.schema import (
     SceneRecord,
     NPCRecord,
     PersonnelEncounterRecord,
+    PersonnelParticipantRecord,
     SceneParticipantRecord,
     SceneNPCRecord,
     SceneShipRecord,
+    ChangeVersionRecord,
 )
 from sta.models.enums import SystemType, TerrainType, Range
-from sta.models.combat import ActiveEffect, HexCoord, HexTile, TacticalMap
+from sta.models.combat import (
+    ActiveEffect,
+    Encounter,
+    HexCoord,
+    HexTile,
+    ShipCombatant,
+    TacticalMap,
+)
 
 # NOTE: Many action handlers are imported but their synchronous nature
 # means they need wrapping or removal/stubbing.
@@ -49,10 +59,39 @@ from sta.mechanics.action_config import (
     is_task_roll_action,
     is_action_available,
     get_breach_difficulty_modifier,
+    action_availability_cache,
+)
+from sta.mechanics.action_registry import ACTION_REGISTRY
+from sta.mechanics.npc_planner import DEFAULT_BUDGET_MS, plan_enemy_turns
+from sta.database.changes import TRACKED_RECORDS, changes_since, latest_seq, notifier
+from sta.database.encounter_journal import (
+    EVENT_PAGE,
+    append_event,
+    encounter_state,
+    events_since,
+    latest_event_seq,
+    materialize,
+)
+from sta.database.pool_ledger import (
+    MOMENTUM_MAX,
+    THREAT_MAX,
+    change_pool,
+    record_pool_corrections,
+)
+from sta.database.undo import (
+    count_operations,
+    list_operations,
+    record_undo,
+    rewind_to_round,
+    undo_operations,
 )
+from sta.web.jobs import run_or_queue
+from sta.web.map_svg import MEDIA_TYPE as MAP_SVG_MEDIA_TYPE, map_svg_cache
+from sta.web.negotiation import NegotiatedResponse
+from sta.web.polling import encounter_running, set_poll_interval
 
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=NegotiatedResponse)
 
 
 async def _require_gm_auth(
@@ -134,6 +173,67 @@ def get_tactical_map_from_encounter(encounter) -> dict:
         return {}
 
 
+async def get_ships_by_id(db: AsyncSession, ship_ids) -> dict:
+    """Load several starships in one query, keyed by id."""
+    ids = [ship_id for ship_id in ship_ids if ship_id is not None]
+    if not ids:
+        return {}
+    result = await db.execute(select(StarshipRecord).filter(StarshipRecord.id.in_(ids)))
+    return {ship.id: ship for ship in result.scalars().all()}
+
+
+async def _get_encounter_or_404(db: AsyncSession, encounter_id: str) -> EncounterRecord:
+    result = await db.execute(
+        select(EncounterRecord).filter(EncounterRecord.encounter_id == encounter_id)
+    )
+    encounter = result.scalars().first()
+    if not encounter:
+        raise HTTPException(status_code=404, detail="Encounter not found")
+    return encounter
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already has etag."""
+    if_none_match = request.headers.get("if-none-match", "")
+    return if_none_match.strip() == "*" or etag in {
+        tag.strip() for tag in if_none_match.split(",")
+    }
+
+
+async def _get_journal_encounter(
+    db: AsyncSession, encounter_id: Optional[str], ship_id: int
+) -> Optional[EncounterRecord]:
+    """
+    The encounter a ship change should be journaled to: the one given, or
+    else the latest active encounter the ship is fighting in (if any).
+    """
+    if encounter_id:
+        return await _get_encounter_or_404(db, encounter_id)
+    enemy = func.json_each(EncounterRecord.enemy_ship_ids_json).table_valued("value")
+    result = await db.execute(
+        select(EncounterRecord)
+        .filter(
+            EncounterRecord.status == "active",
+            (EncounterRecord.player_ship_id == ship_id)
+            | select(enemy.c.value).filter(enemy.c.value == ship_id).exists(),
+        )
+        .order_by(EncounterRecord.id.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+def get_enemy_ship_ids_from_encounter(encounter) -> list:
+    try:
+        return (
+            json.loads(encounter.enemy_ship_ids_json)
+            if encounter.enemy_ship_ids_json
+            else []
+        )
+    except json.JSONDecodeError:
+        return []
+
+
 VISIBILITY_BLOCKING_TERRAIN = ["dust_cloud", "dense_nebula"]
 
 
@@ -299,25 +399,36 @@ async def get_action_config_endpoint(action_name: str):
 async def get_action_availability(
     encounter_id: str, db: AsyncSession = Depends(get_db)
 ):
-    """STUB: Get availability of all actions based on ship breach status."""
+    """Get availability of all actions for the player ship's breaches, shields and power.
 
-    encounter = (
-        (
-            await db.execute(
-                select(EncounterRecord).filter(
-                    EncounterRecord.encounter_id == encounter_id
-                )
+    Only the columns the matrix depends on are read; the matrix itself is
+    served from the per-ship cache while they are unchanged.
+    """
+    row = (
+        await db.execute(
+            select(
+                EncounterRecord.player_ship_id,
+                StarshipRecord.scale,
+                StarshipRecord.breaches_json,
+                StarshipRecord.shields,
+                StarshipRecord.has_reserve_power,
             )
+            .outerjoin(StarshipRecord, StarshipRecord.id == EncounterRecord.player_ship_id)
+            .filter(EncounterRecord.encounter_id == encounter_id)
         )
-        .scalars()
-        .first()
-    )
-    if not encounter:
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Encounter not found")
+    if row.scale is None:
+        raise HTTPException(status_code=404, detail="Player ship not found")
 
-    return {
-        "action_availability": "Requires ship context and synchronous helper access - STUBBED"
-    }
+    return action_availability_cache.get_or_build(
+        ("starships", row.player_ship_id),
+        row.scale,
+        row.breaches_json,
+        row.shields,
+        row.has_reserve_power,
+    )
 
 
 @api_router.post("/encounter/{encounter_id}/momentum")
@@ -347,7 +458,8 @@ async def update_momentum(
     if encounter.campaign_id:
         await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
 
-    encounter.momentum = max(0, min(6, encounter.momentum + change))
+    await change_pool(db, encounter, "momentum", change, "gm_adjustment", maximum=MOMENTUM_MAX)
+    await record_undo(db, encounter, f"Momentum {change:+d}")
     await db.commit()
 
     return {"momentum": encounter.momentum}
@@ -380,7 +492,8 @@ async def update_threat(
     if encounter.campaign_id:
         await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
 
-    encounter.threat = max(0, encounter.threat + change)
+    await change_pool(db, encounter, "threat", change, "gm_adjustment")
+    await record_undo(db, encounter, f"Threat {change:+d}")
     await db.commit()
 
     return {"threat": encounter.threat}
@@ -544,7 +657,10 @@ async def spend_momentum_for_shields(
     if not encounter:
         raise HTTPException(status_code=404, detail="Encounter not found")
 
-    if encounter.momentum < momentum_to_spend:
+    # Rolled back with the request if the ship is missing
+    if not await change_pool(
+        db, encounter, "momentum", -momentum_to_spend, "restore_shields", require=True
+    ):
         raise HTTPException(
             status_code=400,
             detail=f"Not enough Momentum! Have {encounter.momentum}, need {momentum_to_spend}",
@@ -568,7 +684,10 @@ async def spend_momentum_for_shields(
     )
 
     ship_record.shields = ship_model.shields
-    encounter.momentum -= momentum_to_spend
+    await append_event(
+        db, encounter, "shields_restored", ship_id=ship_record.id, shields=ship_record.shields
+    )
+    await record_undo(db, encounter, f"Spend {momentum_to_spend} Momentum on shields")
 
     await db.commit()
 
@@ -602,6 +721,13 @@ async def apply_damage(
     result = await asyncio.to_thread(ship_model.take_damage, damage)
 
     ship_record.shields = ship_model.shields
+    encounter = await _get_journal_encounter(db, data.get("encounter_id"), ship_id)
+    if encounter:
+        await append_event(
+            db, encounter, "damage_taken",
+            ship_id=ship_id, damage=damage, shields=ship_record.shields,
+        )
+        await record_undo(db, encounter, f"{damage} damage to {ship_record.name}")
     await db.commit()
 
     return {
@@ -637,6 +763,13 @@ async def add_breach(
         {"system": b.system.value, "potency": b.potency} for b in ship_model.breaches
     ]
     ship_record.breaches_json = json.dumps(breaches_data)
+    encounter = await _get_journal_encounter(db, data.get("encounter_id"), ship_id)
+    if encounter:
+        await append_event(
+            db, encounter, "breach_added",
+            ship_id=ship_id, system=system, breaches=breaches_data,
+        )
+        await record_undo(db, encounter, f"{system.title()} breach on {ship_record.name}")
     await db.commit()
 
     return {
@@ -694,15 +827,19 @@ async def next_turn(encounter_id: str, db: AsyncSession = Depends(get_db)):
         all_enemy_turns_exhausted = all_enemy_turns_exhausted and ship_turns_used >= 1
 
     if player_turns_exhausted and all_enemy_turns_exhausted:
-        encounter.round = (encounter.round or 1) + 1
-        encounter.current_turn = "player"
-        encounter.ships_turns_used_json = "{}"
-        encounter.players_turns_used_json = "{}"
-        encounter.player_turns_used = 0
+        next_turn, next_round = "player", (encounter.round or 1) + 1
         round_advanced = True
     else:
-        encounter.current_turn = "player" if current == "enemy" else "enemy"
-
+        next_turn = "player" if current == "enemy" else "enemy"
+        next_round = encounter.round or 1
+
+    await append_event(
+        db, encounter, "turn_advanced",
+        current_turn=next_turn,
+        round=next_round,
+        round_advanced=round_advanced,
+    )
+    await record_undo(db, encounter, "Next turn")
     await db.commit()
 
     return {
@@ -716,7 +853,10 @@ async def next_turn(encounter_id: str, db: AsyncSession = Depends(get_db)):
 
 @api_router.get("/encounter/{encounter_id}/status")
 async def get_encounter_status(
-    encounter_id: str, role: str = Query("player"), db: AsyncSession = Depends(get_db)
+    encounter_id: str,
+    response: Response,
+    role: str = Query("player"),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get current encounter status for polling."""
 
@@ -733,18 +873,13 @@ async def get_encounter_status(
     )
     if not encounter:
         raise HTTPException(status_code=404, detail="Encounter not found")
+    set_poll_interval(response, "encounter", encounter.id, encounter_running(encounter))
 
-    player_ship_record = (
-        (
-            await db.execute(
-                select(StarshipRecord).filter(
-                    StarshipRecord.id == encounter.player_ship_id
-                )
-            )
-        )
-        .scalars()
-        .first()
+    enemy_ship_ids = get_enemy_ship_ids_from_encounter(encounter)
+    ships_by_id = await get_ships_by_id(
+        db, [encounter.player_ship_id, *enemy_ship_ids]
     )
+    player_ship_record = ships_by_id.get(encounter.player_ship_id)
     has_reserve_power = (
         getattr(player_ship_record, "has_reserve_power", True)
         if player_ship_record
@@ -783,43 +918,27 @@ async def get_encounter_status(
             }
         )
 
-    if encounter.enemy_ship_ids_json:
-        try:
-            enemy_ship_ids = json.loads(encounter.enemy_ship_ids_json)
-        except json.JSONDecodeError:
-            enemy_ship_ids = []
-
-        for idx, enemy_ship_id in enumerate(enemy_ship_ids):
-            enemy_record = (
-                (
-                    await db.execute(
-                        select(StarshipRecord).filter(
-                            StarshipRecord.id == enemy_ship_id
-                        )
-                    )
-                )
-                .scalars()
-                .first()
-            )
-            if not enemy_record:
-                continue
+    for idx, enemy_ship_id in enumerate(enemy_ship_ids):
+        enemy_record = ships_by_id.get(enemy_ship_id)
+        if not enemy_record:
+            continue
 
-            enemy_key = f"enemy_{idx}"
-            enemy_pos = ship_positions.get(enemy_key, {"q": 0, "r": 0})
+        enemy_key = f"enemy_{idx}"
+        enemy_pos = ship_positions.get(enemy_key, {"q": 0, "r": 0})
 
-            is_visible = role == "gm" or is_ship_visible_to_player(
-                player_pos, enemy_pos, tactical_map, detected_positions
-            )
+        is_visible = role == "gm" or is_ship_visible_to_player(
+            player_pos, enemy_pos, tactical_map, detected_positions
+        )
 
-            if is_visible:
-                ships_info.append(
-                    {
-                        "id": enemy_record.id,
-                        "name": enemy_record.name,
-                        "ship_class": enemy_record.ship_class,
-                        "is_player": False,
-                    }
-                )
+        if is_visible:
+            ships_info.append(
+                {
+                    "id": enemy_record.id,
+                    "name": enemy_record.name,
+                    "ship_class": enemy_record.ship_class,
+                    "is_player": False,
+                }
+            )
 
     # Check if multiplayer (multiple non-GM players)
     players_stmt = select(CampaignPlayerRecord).filter(
@@ -884,27 +1003,10 @@ async def get_encounter_status(
     }
 
 
-@api_router.get("/encounter/{encounter_id}/map")
-async def get_encounter_map(
-    encounter_id: str, role: str = Query("player"), db: AsyncSession = Depends(get_db)
-):
-    """Get tactical map for encounter with ship positions."""
-
-    encounter = (
-        (
-            await db.execute(
-                select(EncounterRecord).filter(
-                    EncounterRecord.encounter_id == encounter_id
-                )
-            )
-        )
-        .scalars()
-        .first()
-    )
-    if not encounter:
-        raise HTTPException(status_code=404, detail="Encounter not found")
-
-    tactical_map = get_tactical_map_from_encounter(encounter)
+async def get_visible_map_ships(
+    db: AsyncSession, encounter, tactical_map: dict, role: str
+) -> list:
+    """The encounter's ships with their hex positions, as seen by role."""
     ship_positions = get_ship_positions_from_encounter(encounter)
 
     try:
@@ -917,17 +1019,11 @@ async def get_encounter_map(
         active_effects = []
     detected_positions = get_detected_positions_from_effects(active_effects)
 
-    player_ship_record = (
-        (
-            await db.execute(
-                select(StarshipRecord).filter(
-                    StarshipRecord.id == encounter.player_ship_id
-                )
-            )
-        )
-        .scalars()
-        .first()
+    enemy_ship_ids = get_enemy_ship_ids_from_encounter(encounter)
+    ships_by_id = await get_ships_by_id(
+        db, [encounter.player_ship_id, *enemy_ship_ids]
     )
+    player_ship_record = ships_by_id.get(encounter.player_ship_id)
 
     visible_ships = []
     player_pos = {"q": 0, "r": 0}
@@ -945,48 +1041,62 @@ async def get_encounter_map(
             }
         )
 
-    if encounter.enemy_ship_ids_json:
-        try:
-            enemy_ship_ids = json.loads(encounter.enemy_ship_ids_json)
-        except json.JSONDecodeError:
-            enemy_ship_ids = []
-
-        for idx, enemy_ship_id in enumerate(enemy_ship_ids):
-            enemy_record = (
-                (
-                    await db.execute(
-                        select(StarshipRecord).filter(
-                            StarshipRecord.id == enemy_ship_id
-                        )
-                    )
-                )
-                .scalars()
-                .first()
-            )
-            if not enemy_record:
-                continue
+    for idx, enemy_ship_id in enumerate(enemy_ship_ids):
+        enemy_record = ships_by_id.get(enemy_ship_id)
+        if not enemy_record:
+            continue
 
-            enemy_key = f"enemy_{idx}"
-            enemy_pos = ship_positions.get(enemy_key, {"q": 0, "r": 0})
+        enemy_key = f"enemy_{idx}"
+        enemy_pos = ship_positions.get(enemy_key, {"q": 0, "r": 0})
 
-            is_visible = role == "gm" or is_ship_visible_to_player(
-                player_pos if player_ship_record else {"q": 0, "r": 0},
-                enemy_pos,
-                tactical_map,
-                detected_positions,
+        is_visible = role == "gm" or is_ship_visible_to_player(
+            player_pos if player_ship_record else {"q": 0, "r": 0},
+            enemy_pos,
+            tactical_map,
+            detected_positions,
+        )
+
+        if is_visible:
+            visible_ships.append(
+                {
+                    "id": enemy_record.id,
+                    "name": enemy_record.name,
+                    "ship_class": enemy_record.ship_class,
+                    "is_player": False,
+                    "q": enemy_pos.get("q", 0),
+                    "r": enemy_pos.get("r", 0),
+                }
             )
 
-            if is_visible:
-                visible_ships.append(
-                    {
-                        "id": enemy_record.id,
-                        "name": enemy_record.name,
-                        "ship_class": enemy_record.ship_class,
-                        "is_player": False,
-                        "q": enemy_pos.get("q", 0),
-                        "r": enemy_pos.get("r", 0),
-                    }
+    return visible_ships
+
+
+@api_router.get("/encounter/{encounter_id}/map")
+async def get_encounter_map(
+    encounter_id: str,
+    response: Response,
+    role: str = Query("player"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get tactical map for encounter with ship positions."""
+
+    encounter = (
+        (
+            await db.execute(
+                select(EncounterRecord).filter(
+                    EncounterRecord.encounter_id == encounter_id
                 )
+            )
+        )
+        .scalars()
+        .first()
+    )
+    if not encounter:
+        raise HTTPException(status_code=404, detail="Encounter not found")
+    set_poll_interval(response, "encounter", encounter.id, encounter_running(encounter))
+
+    tactical_map = get_tactical_map_from_encounter(encounter)
+    visible_ships = await get_visible_map_ships(db, encounter, tactical_map, role)
 
     return {
         "map": tactical_map,
@@ -995,6 +1105,130 @@ async def get_encounter_map(
     }
 
 
+@api_router.get("/encounter/{encounter_id}/map.svg")
+async def get_encounter_map_svg(
+    encounter_id: str,
+    request: Request,
+    role: str = Query("player"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    The tactical map drawn as an SVG image, for clients too slow to draw it.
+
+    Revalidate with If-None-Match: the ETag only changes when the terrain
+    or the visible ships do (see sta/web/map_svg.py).
+    """
+    encounter = await _get_encounter_or_404(db, encounter_id)
+
+    tactical_map = get_tactical_map_from_encounter(encounter)
+    visible_ships = await get_visible_map_ships(db, encounter, tactical_map, role)
+    etag = map_svg_cache.etag(encounter.tactical_map_json, visible_ships)
+
+    if _etag_matches(request, etag):
+        response = Response(status_code=304)
+    else:
+        etag, svg = map_svg_cache.render(encounter.tactical_map_json, visible_ships)
+        response = Response(content=svg, media_type=MAP_SVG_MEDIA_TYPE)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    set_poll_interval(response, "encounter", encounter.id, encounter_running(encounter))
+    return response
+
+
+def build_combat_encounter(encounter, ships_by_id: dict) -> Encounter:
+    """Assemble an Encounter model from an encounter record and its ships."""
+    ship_positions = get_ship_positions_from_encounter(encounter)
+    try:
+        ships_turns_used = json.loads(encounter.ships_turns_used_json or "{}")
+    except json.JSONDecodeError:
+        ships_turns_used = {}
+
+    player_record = ships_by_id.get(encounter.player_ship_id)
+    player_ship = None
+    if player_record:
+        player_ship = ShipCombatant(
+            ship=player_record.to_model(),
+            faction="player",
+            position=HexCoord.from_dict(ship_positions.get("player", {})),
+        )
+
+    enemy_ships = []
+    for idx, enemy_ship_id in enumerate(get_enemy_ship_ids_from_encounter(encounter)):
+        enemy_record = ships_by_id.get(enemy_ship_id)
+        if not enemy_record:
+            continue
+        enemy_ships.append(
+            ShipCombatant(
+                ship=enemy_record.to_model(),
+                faction="enemy",
+                position=HexCoord.from_dict(ship_positions.get(f"enemy_{idx}", {})),
+                has_acted=ships_turns_used.get(str(enemy_ship_id), 0) >= 1,
+            )
+        )
+
+    active_effects = []
+    for effect_data in encounter.active_effects:
+        try:
+            active_effects.append(ActiveEffect.from_dict(effect_data))
+        except (KeyError, TypeError, AttributeError):
+            continue
+
+    return Encounter(
+        id=encounter.encounter_id,
+        name=encounter.name,
+        player_ship=player_ship,
+        enemy_ships=enemy_ships,
+        tactical_map=TacticalMap.from_dict(get_tactical_map_from_encounter(encounter)),
+        momentum=encounter.momentum,
+        threat=encounter.threat,
+        round=encounter.round,
+        current_turn=encounter.current_turn,
+        active_effects=active_effects,
+    )
+
+
+@api_router.get("/encounter/{encounter_id}/enemy-plan")
+async def get_enemy_plan(
+    encounter_id: str,
+    budget_ms: float = Query(DEFAULT_BUDGET_MS, gt=0, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    """Suggest a turn for every enemy ship that has not acted this round.
+
+    Plans are ordered best first, so the first entry is the ship the GM
+    should act with next. Planning stops after budget_ms.
+    """
+    encounter = (
+        (
+            await db.execute(
+                select(EncounterRecord).filter(
+                    EncounterRecord.encounter_id == encounter_id
+                )
+            )
+        )
+        .scalars()
+        .first()
+    )
+    if not encounter:
+        raise HTTPException(status_code=404, detail="Encounter not found")
+
+    ships_by_id = await get_ships_by_id(
+        db,
+        [encounter.player_ship_id, *get_enemy_ship_ids_from_encounter(encounter)],
+    )
+    combat = build_combat_encounter(encounter, ships_by_id)
+
+    started = time.perf_counter()
+    plans = await asyncio.to_thread(plan_enemy_turns, combat, budget_ms)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        "plans": [plan.to_dict() for plan in plans],
+        "budget_ms": budget_ms,
+        "elapsed_ms": round(elapsed_ms, 2),
+    }
+
+
 # ========== MULTI-PLAYER TURN CLAIMING ENDPOINTS (STUBBED) ==========
 
 
@@ -1058,7 +1292,8 @@ async def claim_turn(
             "detail": "turn already claimed",
         }
 
-    encounter.current_player_id = player_id
+    await append_event(db, encounter, "turn_claimed", player_id=player_id)
+    await record_undo(db, encounter, "Claim turn")
     await db.commit()
 
     return {
@@ -1093,13 +1328,8 @@ async def release_turn(
         return {"success": True, "detail": "no turn to release"}
 
     player_id = encounter.current_player_id
-
-    if not force:
-        players_turns = json.loads(encounter.players_turns_used_json or "{}")
-        players_turns[str(player_id)] = {"acted": True}
-        encounter.players_turns_used_json = json.dumps(players_turns)
-
-    encounter.current_player_id = None
+    await append_event(db, encounter, "turn_released", player_id=player_id, acted=not force)
+    await record_undo(db, encounter, "Release turn")
     await db.commit()
 
     return {
@@ -1140,6 +1370,11 @@ async def toggle_reserve_power(encounter_id: str, db: AsyncSession = Depends(get
         raise HTTPException(status_code=404, detail="Player ship not found")
 
     player_ship_record.has_reserve_power = not player_ship_record.has_reserve_power
+    await append_event(
+        db, encounter, "reserve_power_changed",
+        ship_id=player_ship_record.id, has_reserve_power=player_ship_record.has_reserve_power,
+    )
+    await record_undo(db, encounter, "Toggle Reserve Power")
     await db.commit()
 
     return {
@@ -1253,11 +1488,12 @@ async def execute_action(
             detail="Cannot perform player actions during enemy's turn.",
         )
 
-    # Check if this is a major action
-    # In STA 2e: task_roll types are major by default, others are minor unless explicitly marked
-    action_config = get_action_config(action_name)
-    is_major = False
-    is_minor = False
+    # Major/minor classification is precomputed by the action registry.
+    # Actions without a mechanics config are neither and don't end the turn.
+    spec = ACTION_REGISTRY.get(action_name)
+    configured = spec is not None and spec.configured
+    is_major = configured and spec.is_major
+    is_minor = configured and spec.is_minor
     effect_created = False
     message = ""
     # Determine success based on roll parameters (if provided) - moved earlier for use in buff check
@@ -1265,20 +1501,7 @@ async def execute_action(
     if "roll_succeeded" in data:
         success = bool(data["roll_succeeded"])
 
-    if action_config:
-        action_type = action_config.get("type")
-        # Check explicit is_major first (takes priority)
-        if "is_major" in action_config and action_config["is_major"]:
-            is_major = True
-        elif action_type == "task_roll":
-            is_major = True
-        # Check explicit is_minor second
-        elif "is_minor" in action_config and action_config["is_minor"]:
-            is_minor = True
-        # Buff, toggle, special, resource_action types are minor by default
-        elif action_type in ("buff", "toggle", "special", "resource_action"):
-            is_minor = True
-
+    if configured:
         # === ACTION REQUIREMENT VALIDATION ===
 
         # Get player ship for requirement checks
@@ -1289,7 +1512,7 @@ async def execute_action(
             player_ship = ship_result.scalar_one_or_none()
 
         # Validate: requires_reserve_power
-        if action_config.get("requires_reserve_power"):
+        if spec.requires_reserve_power:
             if not player_ship or not player_ship.has_reserve_power:
                 raise HTTPException(
                     status_code=400,
@@ -1297,7 +1520,7 @@ async def execute_action(
                 )
 
         # Validate: requires_system (system must not be destroyed)
-        required_system = action_config.get("requires_system")
+        required_system = spec.required_system
         if required_system and player_ship:
             # Check if system has breaches >= half scale (destroyed)
             # Scale 4 ship = 2 breaches to destroy (threshold = 4 total potency)
@@ -1321,7 +1544,7 @@ async def execute_action(
             )
 
         # Validate: max_range (for actions like Scan For Weakness)
-        max_range = action_config.get("max_range")
+        max_range = spec.max_range
         if max_range is not None:
             # Check for target_distance directly or look up from target_index
             target_distance = data.get("target_distance")
@@ -1347,14 +1570,13 @@ async def execute_action(
                 else:
                     target_distance = 0
 
-            if target_distance > max_range:
+            if not spec.in_range(target_distance):
                 raise HTTPException(
                     status_code=400,
                     detail=f"Target is out of range. Maximum range is {max_range} hexes.",
                 )
 
-        # Validate: momentum_cost (for bonus dice)
-        momentum_cost = action_config.get("momentum_cost", 0)
+        # Validate: momentum (for bonus dice)
         bonus_dice = data.get("bonus_dice", 0)
         if bonus_dice > 0:
             # Bonus dice cost momentum: 1 for first, 2 for second, etc.
@@ -1367,7 +1589,7 @@ async def execute_action(
                 )
 
         # Handle buff actions - mark effect as created
-        if action_type == "buff" and success:
+        if spec.kind == "buff" and success:
             effect_created = True
             message = f"{action_name} effect applied."
 
@@ -1385,13 +1607,13 @@ async def execute_action(
 
         # Mark player as acted (for both major and minor actions) before switching turn
         if str(player_id) not in players_turns:
-            players_turns[str(player_id)] = {"acted": True}
-            encounter.players_turns_used_json = json.dumps(players_turns)
+            await append_event(db, encounter, "player_acted", player_id=player_id, acted=True)
 
     # If major action and it's player's turn, switch to enemy
     if is_major and encounter.current_turn == "player":
-        encounter.current_turn = "enemy"
-        encounter.current_player_id = None
+        await append_event(
+            db, encounter, "turn_advanced", current_turn="enemy", round=encounter.round or 1
+        )
 
     # Get the ship name from the encounter's player ship
     ship_name = data.get("ship_name")
@@ -1411,6 +1633,8 @@ async def execute_action(
     elif success and not message:
         message = f"{action_name} succeeded."
 
+    await record_undo(db, encounter, action_name)
+
     # Create a combat log entry
     log_entry = CombatLogRecord(
         encounter_id=encounter.id,
@@ -1448,10 +1672,11 @@ async def execute_action(
 @api_router.get("/encounter/{encounter_id}/combat-log")
 async def get_combat_log(
     encounter_id: str,
+    response: Response,
     limit: Optional[int] = Query(None),
     since_id: Optional[int] = Query(None),
     round_filter: Optional[int] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get combat log entries for an encounter."""
     # First, find the encounter by its string ID to get the integer ID
@@ -1461,6 +1686,7 @@ async def get_combat_log(
 
     if not encounter:
         raise HTTPException(status_code=404, detail="Encounter not found")
+    set_poll_interval(response, "encounter", encounter.id, encounter_running(encounter))
 
     encounter_int_id = encounter.id
 
@@ -1508,170 +1734,243 @@ async def get_combat_log(
 
 
 # Export/Import Routes (backward compatibility)
+# With ?background=true each of these runs as a job (see /api/jobs).
+
+IMPORT_PROGRESS_EVERY = 100  # Rows between progress reports
 
 
 @api_router.get("/characters/export")
-async def export_all_characters(db: AsyncSession = Depends(get_db)):
+async def export_all_characters(
+    background: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
     """Export all characters as JSON."""
     from sta.database.vtt_schema import VTTCharacterRecord
 
-    stmt = select(VTTCharacterRecord)
-    result = await db.execute(stmt)
-    characters = result.scalars().all()
+    async def work(job, db):
+        stmt = select(VTTCharacterRecord)
+        result = await db.execute(stmt)
+        characters = result.scalars().all()
 
-    return {
-        "characters": [
-            {
-                "id": char.id,
-                "name": char.name,
-                "attributes": json.loads(char.attributes_json or "{}"),
-                "disciplines": json.loads(char.disciplines_json or "{}"),
-            }
-            for char in characters
-        ]
-    }
+        return {
+            "characters": [
+                {
+                    "id": char.id,
+                    "name": char.name,
+                    "attributes": json.loads(char.attributes_json or "{}"),
+                    "disciplines": json.loads(char.disciplines_json or "{}"),
+                }
+                for char in characters
+            ]
+        }
+
+    return await run_or_queue(
+        background, "characters_export", work, db, filename="characters.json",
+        session_token=sta_session_token,
+    )
 
 
 @api_router.post("/characters/import")
 async def import_character_batch(
     data: dict = Body(...),
+    background: bool = Query(False),
     db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
 ):
     """Import multiple characters."""
     from sta.database.vtt_schema import VTTCharacterRecord
 
     characters = data.get("characters", [])
-    imported = []
 
-    for char_data in characters:
-        char = VTTCharacterRecord(
-            name=char_data.get("name", "Unknown"),
-            description=char_data.get("description", ""),
-            attributes_json=json.dumps(char_data.get("attributes", {})),
-            disciplines_json=json.dumps(char_data.get("disciplines", {})),
-            talents_json=json.dumps(char_data.get("talents", [])),
-            focuses_json=json.dumps(char_data.get("focuses", [])),
-        )
-        db.add(char)
-        imported.append(char.id)
+    async def work(job, db):
+        imported = []
+        for index, char_data in enumerate(characters, start=1):
+            char = VTTCharacterRecord(
+                name=char_data.get("name", "Unknown"),
+                description=char_data.get("description", ""),
+                attributes_json=json.dumps(char_data.get("attributes", {})),
+                disciplines_json=json.dumps(char_data.get("disciplines", {})),
+                talents_json=json.dumps(char_data.get("talents", [])),
+                focuses_json=json.dumps(char_data.get("focuses", [])),
+            )
+            db.add(char)
+            imported.append(char.id)
+            if index % IMPORT_PROGRESS_EVERY == 0:
+                await job.progress(100 * index // len(characters))
 
-    await db.commit()
+        await db.flush()
+        return {"imported": imported, "count": len(imported)}
 
-    return {"imported": imported, "count": len(imported)}
+    return await run_or_queue(
+        background, "characters_import", work, db,
+        session_token=sta_session_token,
+    )
 
 
 @api_router.get("/npcs/export")
-async def export_all_npcs(db: AsyncSession = Depends(get_db)):
+async def export_all_npcs(
+    background: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
     """Export all NPCs as JSON."""
-    stmt = select(NPCRecord)
-    result = await db.execute(stmt)
-    npcs = result.scalars().all()
 
-    return {
-        "npcs": [
-            {
-                "id": npc.id,
-                "name": npc.name,
-                "role": npc.role,
-                "rank": npc.rank,
-            }
-            for npc in npcs
-        ]
-    }
+    async def work(job, db):
+        stmt = select(NPCRecord)
+        result = await db.execute(stmt)
+        npcs = result.scalars().all()
+
+        return {
+            "npcs": [
+                {
+                    "id": npc.id,
+                    "name": npc.name,
+                    "role": npc.role,
+                    "rank": npc.rank,
+                }
+                for npc in npcs
+            ]
+        }
+
+    return await run_or_queue(
+        background, "npcs_export", work, db, filename="npcs.json",
+        session_token=sta_session_token,
+    )
 
 
 @api_router.post("/npcs/import")
 async def import_npc_batch(
     data: dict = Body(...),
+    background: bool = Query(False),
     db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
 ):
     """Import multiple NPCs."""
     npcs = data.get("npcs", [])
-    imported = []
 
-    for npc_data in npcs:
-        npc = NPCRecord(
-            name=npc_data.get("name", "Unknown"),
-            role=npc_data.get("role", ""),
-            rank=npc_data.get("rank", ""),
-        )
-        db.add(npc)
-        imported.append(npc.id)
+    async def work(job, db):
+        imported = []
+        for index, npc_data in enumerate(npcs, start=1):
+            npc = NPCRecord(
+                name=npc_data.get("name", "Unknown"),
+                role=npc_data.get("role", ""),
+                rank=npc_data.get("rank", ""),
+            )
+            db.add(npc)
+            imported.append(npc.id)
+            if index % IMPORT_PROGRESS_EVERY == 0:
+                await job.progress(100 * index // len(npcs))
 
-    await db.commit()
+        await db.flush()
+        return {"imported": imported, "count": len(imported)}
 
-    return {"imported": imported, "count": len(imported)}
+    return await run_or_queue(
+        background, "npcs_import", work, db,
+        session_token=sta_session_token,
+    )
 
 
 @api_router.get("/ships/export")
-async def export_all_ships(db: AsyncSession = Depends(get_db)):
+async def export_all_ships(
+    background: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
     """Export all ships as JSON."""
     from sta.database.vtt_schema import VTTShipRecord
 
-    stmt = select(VTTShipRecord)
-    result = await db.execute(stmt)
-    ships = result.scalars().all()
+    async def work(job, db):
+        stmt = select(VTTShipRecord)
+        result = await db.execute(stmt)
+        ships = result.scalars().all()
 
-    return {
-        "ships": [
-            {
-                "id": ship.id,
-                "name": ship.name,
-                "ship_class": ship.ship_class,
-            }
-            for ship in ships
-        ]
-    }
+        return {
+            "ships": [
+                {
+                    "id": ship.id,
+                    "name": ship.name,
+                    "ship_class": ship.ship_class,
+                }
+                for ship in ships
+            ]
+        }
+
+    return await run_or_queue(
+        background, "ships_export", work, db, filename="ships.json",
+        session_token=sta_session_token,
+    )
 
 
 @api_router.post("/ships/import")
 async def import_ship_batch(
     data: dict = Body(...),
+    background: bool = Query(False),
     db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
 ):
     """Import multiple ships."""
     from sta.database.vtt_schema import VTTShipRecord
 
     ships = data.get("ships", [])
-    imported = []
 
-    for ship_data in ships:
-        ship = VTTShipRecord(
-            name=ship_data.get("name", "Unknown"),
-            ship_class=ship_data.get("ship_class", "Unknown"),
-            systems_json=json.dumps(ship_data.get("systems", {})),
-            departments_json=json.dumps(ship_data.get("departments", {})),
-        )
-        db.add(ship)
-        imported.append(ship.id)
+    async def work(job, db):
+        imported = []
+        for index, ship_data in enumerate(ships, start=1):
+            ship = VTTShipRecord(
+                name=ship_data.get("name", "Unknown"),
+                ship_class=ship_data.get("ship_class", "Unknown"),
+                systems_json=json.dumps(ship_data.get("systems", {})),
+                departments_json=json.dumps(ship_data.get("departments", {})),
+            )
+            db.add(ship)
+            imported.append(ship.id)
+            if index % IMPORT_PROGRESS_EVERY == 0:
+                await job.progress(100 * index // len(ships))
 
-    await db.commit()
+        await db.flush()
+        return {"imported": imported, "count": len(imported)}
 
-    return {"imported": imported, "count": len(imported)}
+    return await run_or_queue(
+        background, "ships_import", work, db,
+        session_token=sta_session_token,
+    )
 
 
 @api_router.get("/backup")
-async def get_backup(db: AsyncSession = Depends(get_db)):
+async def get_backup(
+    background: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
     """Get full database backup."""
     from sta.database.vtt_schema import VTTCharacterRecord, VTTShipRecord
 
-    characters_stmt = select(VTTCharacterRecord)
-    characters_result = await db.execute(characters_stmt)
-    characters = characters_result.scalars().all()
+    async def work(job, db):
+        characters_stmt = select(VTTCharacterRecord)
+        characters_result = await db.execute(characters_stmt)
+        characters = characters_result.scalars().all()
+        await job.progress(33)
 
-    ships_stmt = select(VTTShipRecord)
-    ships_result = await db.execute(ships_stmt)
-    ships = ships_result.scalars().all()
+        ships_stmt = select(VTTShipRecord)
+        ships_result = await db.execute(ships_stmt)
+        ships = ships_result.scalars().all()
+        await job.progress(66)
 
-    npcs_stmt = select(NPCRecord)
-    npcs_result = await db.execute(npcs_stmt)
-    npcs = npcs_result.scalars().all()
+        npcs_stmt = select(NPCRecord)
+        npcs_result = await db.execute(npcs_stmt)
+        npcs = npcs_result.scalars().all()
 
-    return {
-        "characters": [{"id": c.id, "name": c.name} for c in characters],
-        "ships": [{"id": s.id, "name": s.name} for s in ships],
-        "npcs": [{"id": n.id, "name": n.name} for n in npcs],
-    }
+        return {
+            "characters": [{"id": c.id, "name": c.name} for c in characters],
+            "ships": [{"id": s.id, "name": s.name} for s in ships],
+            "npcs": [{"id": n.id, "name": n.name} for n in npcs],
+        }
+
+    return await run_or_queue(
+        background, "backup", work, db, filename="sta-backup.json",
+        session_token=sta_session_token,
+    )
 
 
 # Scene endpoints (API style)
@@ -1803,35 +2102,81 @@ async def create_personnel_encounter(
 @api_router.get("/personnel/{scene_id}/status")
 async def get_personnel_status(
     scene_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get personnel encounter status."""
-    from sta.database.schema import SceneRecord
+    """
+    Personnel encounter status: turn state and every participant with
+    their position and whether they have acted.
 
-    scene_stmt = select(SceneRecord).filter(SceneRecord.id == scene_id)
-    scene_result = await db.execute(scene_stmt)
-    scene = scene_result.scalars().first()
+    One query finds the scene, its active personnel encounter and that
+    encounter's change version, which is the ETag: a revalidation with
+    If-None-Match while nothing has changed gets a 304 without reading
+    any participant. Otherwise all participants come from one range scan.
+    """
+    row = (
+        await db.execute(
+            select(
+                SceneRecord.status,
+                PersonnelEncounterRecord,
+                func.coalesce(ChangeVersionRecord.seq, 0),
+            )
+            .select_from(SceneRecord)
+            .outerjoin(
+                PersonnelEncounterRecord,
+                and_(
+                    PersonnelEncounterRecord.scene_id == SceneRecord.id,
+                    PersonnelEncounterRecord.is_active == True,
+                ),
+            )
+            .outerjoin(
+                ChangeVersionRecord,
+                and_(
+                    ChangeVersionRecord.entity_type == "personnel",
+                    ChangeVersionRecord.entity_id == PersonnelEncounterRecord.id,
+                ),
+            )
+            .filter(SceneRecord.id == scene_id)
+        )
+    ).first()
 
-    if not scene:
+    if not row:
         raise HTTPException(status_code=404, detail="Scene not found")
-
-    encounter_stmt = select(EncounterRecord).filter(
-        EncounterRecord.scene_id == scene_id,
-        EncounterRecord.is_active == True,
-    )
-    encounter_result = await db.execute(encounter_stmt)
-    encounter = encounter_result.scalars().first()
+    scene_status, encounter, version = row
+    running = scene_status == "active"
 
     if not encounter:
+        set_poll_interval(response, "scene", scene_id, running)
         return {
             "has_active_encounter": False,
         }
 
+    # Paced by changes to the personnel encounter, which its participants count as
+    set_poll_interval(response, "personnel", encounter.id, running)
+    etag = f'"personnel-{encounter.id}-{version}"'
+    if _etag_matches(request, etag):
+        not_modified = Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+        set_poll_interval(not_modified, "personnel", encounter.id, running)
+        return not_modified
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+    participants = await db.execute(
+        select(PersonnelParticipantRecord)
+        .filter(PersonnelParticipantRecord.personnel_encounter_id == encounter.id)
+        .order_by(PersonnelParticipantRecord.slot)
+    )
     return {
         "has_active_encounter": True,
-        "encounter_id": encounter.encounter_id,
+        "personnel_encounter_id": encounter.id,
+        "version": version,
         "current_turn": encounter.current_turn,
         "round": encounter.round,
+        "momentum": encounter.momentum,
+        "threat": encounter.threat,
+        "current_player_id": encounter.current_player_id,
+        "characters": [participant.to_dict() for participant in participants.scalars().all()],
     }
 
 
@@ -1984,13 +2329,12 @@ async def spend_threat_action(
     if encounter.campaign_id:
         await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
 
-    if encounter.threat < cost:
+    if not await change_pool(db, encounter, "threat", -cost, spend_type, require=True):
         raise HTTPException(
             status_code=400,
             detail=f"Not enough Threat! Have {encounter.threat}, need {cost}",
         )
-
-    encounter.threat -= cost
+    await record_undo(db, encounter, f"Spend Threat: {spend_names.get(spend_type, spend_type)}")
     await db.commit()
 
     log_entry = CombatLogRecord(
@@ -2050,14 +2394,15 @@ async def claim_momentum_for_threat(
         await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
 
     momentum_cost = amount * 2
-    if encounter.momentum < momentum_cost:
+    if not await change_pool(
+        db, encounter, "momentum", -momentum_cost, "claim_momentum", require=True
+    ):
         raise HTTPException(
             status_code=400,
             detail=f"Not enough Momentum! Have {encounter.momentum}, need {momentum_cost} (2 per Threat)",
         )
-
-    encounter.momentum -= momentum_cost
-    encounter.threat = min(24, encounter.threat + amount)
+    await change_pool(db, encounter, "threat", amount, "claim_momentum", maximum=THREAT_MAX)
+    await record_undo(db, encounter, "Claim Momentum")
     await db.commit()
 
     log_entry = CombatLogRecord(
@@ -2088,7 +2433,8 @@ async def claim_momentum_for_threat(
 @api_router.get("/encounter/{encounter_id}/player-resources")
 async def get_player_resources(
     encounter_id: str,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all player character resources for GM Console display.
 
@@ -2109,6 +2455,7 @@ async def get_player_resources(
     )
     if not encounter:
         raise HTTPException(status_code=404, detail="Encounter not found")
+    set_poll_interval(response, "encounter", encounter.id, encounter_running(encounter))
 
     player_chars = []
 
@@ -2157,12 +2504,18 @@ async def get_player_resources(
         participants_result = await db.execute(participants_stmt)
         participants = participants_result.scalars().all()
 
-        for p in participants:
-            char_stmt = select(VTTCharacterRecord).filter(
-                VTTCharacterRecord.id == p.character_id
+        chars_by_id = {}
+        character_ids = [p.character_id for p in participants]
+        if character_ids:
+            chars_result = await db.execute(
+                select(VTTCharacterRecord).filter(
+                    VTTCharacterRecord.id.in_(character_ids)
+                )
             )
-            char_result = await db.execute(char_stmt)
-            char = char_result.scalars().first()
+            chars_by_id = {c.id: c for c in chars_result.scalars().all()}
+
+        for p in participants:
+            char = chars_by_id.get(p.character_id)
             if char:
                 values = json.loads(char.values_json or "[]")
                 existing_ids = [c["character_id"] for c in player_chars]
@@ -2362,11 +2715,11 @@ async def start_new_round(
         await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
 
     old_round = encounter.round or 1
-    encounter.round = old_round + 1
-    encounter.current_turn = "player"
-    encounter.players_turns_used_json = "{}"
-    encounter.ships_turns_used_json = "{}"
-    encounter.current_player_id = None
+    await append_event(
+        db, encounter, "turn_advanced",
+        current_turn="player", round=old_round + 1, round_advanced=True,
+    )
+    await record_undo(db, encounter, f"Start round {encounter.round}")
     await db.commit()
 
     log_entry = CombatLogRecord(
@@ -2428,9 +2781,9 @@ async def toggle_participant_action_status(
         player_id = int(participant_id)
         if player_id < 0:
             raise HTTPException(status_code=400, detail="Invalid player ID")
-        players_turns = json.loads(encounter.players_turns_used_json or "{}")
-        players_turns[str(player_id)] = {"acted": action_taken}
-        encounter.players_turns_used_json = json.dumps(players_turns)
+        await append_event(
+            db, encounter, "player_acted", player_id=player_id, acted=action_taken
+        )
 
         player_stmt = select(CampaignPlayerRecord).filter(
             CampaignPlayerRecord.id == player_id
@@ -2441,19 +2794,24 @@ async def toggle_participant_action_status(
 
     elif participant_type == "enemy_ship":
         ship_index = int(participant_id)
-        ships_turns = json.loads(encounter.ships_turns_used_json or "{}")
-        ships_turns[str(ship_index)] = 1 if action_taken else 0
-        encounter.ships_turns_used_json = json.dumps(ships_turns)
+        await append_event(
+            db, encounter, "ship_acted", ship=ship_index, used=1 if action_taken else 0
+        )
         player_name = f"Enemy Ship {ship_index}"
 
     elif participant_type == "player_ship":
         if action_taken and encounter.current_turn == "player":
-            encounter.current_turn = "enemy"
+            await append_event(
+                db, encounter, "turn_advanced", current_turn="enemy", round=encounter.round or 1
+            )
         player_name = "Player Ship"
 
     else:
         raise HTTPException(status_code=400, detail="Invalid participant_type")
 
+    await record_undo(
+        db, encounter, f"{player_name} {'Action Taken' if action_taken else 'Ready'}"
+    )
     await db.commit()
 
     log_entry = CombatLogRecord(
@@ -2485,7 +2843,8 @@ async def toggle_participant_action_status(
 @api_router.get("/encounter/{encounter_id}/round-status")
 async def get_round_status(
     encounter_id: str,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get current round status with all participants and their action status.
 
@@ -2504,6 +2863,7 @@ async def get_round_status(
     )
     if not encounter:
         raise HTTPException(status_code=404, detail="Encounter not found")
+    set_poll_interval(response, "encounter", encounter.id, encounter_running(encounter))
 
     players_turns = json.loads(encounter.players_turns_used_json or "{}")
     ships_turns = json.loads(encounter.ships_turns_used_json or "{}")
@@ -2595,6 +2955,14 @@ async def get_round_status(
         scene_npcs_result = await db.execute(scene_npcs_stmt)
         scene_npcs = scene_npcs_result.scalars().all()
 
+        npc_ids = [sn.npc_id for sn in scene_npcs if sn.npc_id]
+        npc_names = {}
+        if npc_ids:
+            npc_result = await db.execute(
+                select(NPCRecord.id, NPCRecord.name).filter(NPCRecord.id.in_(npc_ids))
+            )
+            npc_names = {npc_id: name for npc_id, name in npc_result.all()}
+
         for idx, sn in enumerate(scene_npcs):
             npcs_total += 1
             has_acted = ships_turns.get(str(idx), 0) > 0
@@ -2603,11 +2971,7 @@ async def get_round_status(
 
             npc_name = "Unknown NPC"
             if sn.npc_id:
-                npc_stmt = select(NPCRecord).filter(NPCRecord.id == sn.npc_id)
-                npc_result = await db.execute(npc_stmt)
-                npc = npc_result.scalars().first()
-                if npc:
-                    npc_name = npc.name
+                npc_name = npc_names.get(sn.npc_id, npc_name)
             elif sn.quick_name:
                 npc_name = sn.quick_name
 
@@ -2624,37 +2988,29 @@ async def get_round_status(
 
     enemy_ships_acted = 0
     enemy_ships_total = 0
-    if encounter.enemy_ship_ids_json:
-        try:
-            enemy_ship_ids = json.loads(encounter.enemy_ship_ids_json)
-        except json.JSONDecodeError:
-            enemy_ship_ids = []
-
-        enemy_ships_info = []
-        for idx, ship_id in enumerate(enemy_ship_ids):
-            enemy_ships_total += 1
-            has_acted = ships_turns.get(str(ship_id), 0) > 0
-            if has_acted:
-                enemy_ships_acted += 1
+    enemy_ships_info = []
+    enemy_ship_ids = get_enemy_ship_ids_from_encounter(encounter)
+    ships_by_id = await get_ships_by_id(db, enemy_ship_ids)
 
-            ship_stmt = select(StarshipRecord).filter(StarshipRecord.id == ship_id)
-            ship_result = await db.execute(ship_stmt)
-            ship = ship_result.scalars().first()
-            ship_name = ship.name if ship else f"Enemy Ship {idx}"
+    for idx, ship_id in enumerate(enemy_ship_ids):
+        enemy_ships_total += 1
+        has_acted = ships_turns.get(str(ship_id), 0) > 0
+        if has_acted:
+            enemy_ships_acted += 1
 
-            enemy_ships_info.append(
-                {
-                    "participant_id": ship_id,
-                    "participant_type": "enemy_ship",
-                    "name": ship_name,
-                    "has_acted": has_acted,
-                    "status": "Action Taken" if has_acted else "Ready",
-                    "can_act": not has_acted,
-                }
-            )
+        ship = ships_by_id.get(ship_id)
+        ship_name = ship.name if ship else f"Enemy Ship {idx}"
 
-    else:
-        enemy_ships_info = []
+        enemy_ships_info.append(
+            {
+                "participant_id": ship_id,
+                "participant_type": "enemy_ship",
+                "name": ship_name,
+                "has_acted": has_acted,
+                "status": "Action Taken" if has_acted else "Ready",
+                "can_act": not has_acted,
+            }
+        )
 
     all_players_done = players_total > 0 and players_acted >= players_total
     all_npcs_done = npcs_total > 0 and npcs_acted >= npcs_total
@@ -2681,3 +3037,245 @@ async def get_round_status(
             "round_complete": all_players_done and all_npcs_done and all_enemies_done,
         },
     }
+
+
+# =============================================================================
+# Change Notification
+# =============================================================================
+
+
+@api_router.get("/changes")
+async def get_changes(
+    since: int = Query(0, ge=0),
+    entity_type: Optional[str] = Query(None),
+    entity_id: Optional[int] = Query(None),
+    wait: float = Query(0, ge=0, le=30),
+    db: AsyncSession = Depends(get_db),
+):
+    """Changes to encounters, campaigns, scenes and personnel encounters after a journal seq.
+
+    With wait, long-polls for up to that many seconds until a matching
+    change is committed by any worker. Pass the returned seq as since on
+    the next call.
+    """
+    if entity_type and entity_type not in TRACKED_RECORDS.values():
+        raise HTTPException(status_code=400, detail=f"Unknown entity type: {entity_type}")
+
+    changes = await changes_since(db, since, entity_type, entity_id)
+    deadline = time.monotonic() + wait
+    seen = since
+    while not changes and notifier.running:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not await notifier.wait(seen, remaining):
+            break
+        seen = notifier.last_seq
+        changes = await changes_since(db, since, entity_type, entity_id)
+
+    return {
+        "seq": max(since, changes[-1].seq if changes else await latest_seq(db)),
+        "changes": [change.to_dict() for change in changes],
+    }
+
+
+# =============================================================================
+# Encounter Event Journal
+# =============================================================================
+
+
+@api_router.get("/encounter/{encounter_id}/events")
+async def get_encounter_events(
+    encounter_id: str,
+    since: int = Query(0, ge=0),
+    limit: int = Query(EVENT_PAGE, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    """Encounter events after seq since, oldest first.
+
+    Pass the returned seq as since on the next call to catch up; has_more
+    means another page is already waiting.
+    """
+    encounter = await _get_encounter_or_404(db, encounter_id)
+    events = await events_since(db, encounter.id, since=since, limit=limit)
+    return {
+        "seq": events[-1].seq if events else max(since, await latest_event_seq(db, encounter.id)),
+        "events": [event.to_dict() for event in events],
+        "has_more": len(events) == limit,
+    }
+
+
+@api_router.get("/encounter/{encounter_id}/state")
+async def get_encounter_state(
+    encounter_id: str,
+    at: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    """Encounter state materialized from the journal, optionally as of seq at."""
+    encounter = await _get_encounter_or_404(db, encounter_id)
+    seq, state = await materialize(db, encounter, at=at)
+    return {"seq": seq, "state": state}
+
+
+@api_router.post("/encounter/{encounter_id}/move")
+async def move_ship(
+    encounter_id: str,
+    data: dict = Body(...),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Move a ship ("player" or "enemy_<index>") to a hex."""
+    ship = data.get("ship")
+    q, r = data.get("q"), data.get("r")
+    if not isinstance(q, int) or not isinstance(r, int):
+        raise HTTPException(status_code=400, detail="q and r must be integers")
+
+    encounter = await _get_encounter_or_404(db, encounter_id)
+    if encounter.campaign_id:
+        await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
+    enemy_count = len(get_enemy_ship_ids_from_encounter(encounter))
+    valid_ships = ["player", *(f"enemy_{i}" for i in range(enemy_count))]
+    if ship not in valid_ships:
+        raise HTTPException(status_code=400, detail=f"ship must be one of {valid_ships}")
+
+    position = HexCoord(q, r).to_dict()
+    seq = await append_event(db, encounter, "ship_moved", ship=ship, position=position)
+    await record_undo(db, encounter, f"Move {ship}")
+    await db.commit()
+
+    return {"success": True, "ship": ship, "position": position, "seq": seq}
+
+
+@api_router.post("/encounter/{encounter_id}/effects")
+async def add_encounter_effect(
+    encounter_id: str,
+    data: dict = Body(...),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Add an active effect to the encounter."""
+    encounter = await _get_encounter_or_404(db, encounter_id)
+    if encounter.campaign_id:
+        await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
+    try:
+        effect = ActiveEffect.from_dict({"created_round": encounter.round or 1, **data})
+    except (KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid effect: missing {e}")
+
+    seq = await append_event(db, encounter, "effect_added", effect=effect.to_dict())
+    await record_undo(db, encounter, f"Add effect {effect.source_action}")
+    await db.commit()
+
+    return {"success": True, "effect": effect.to_dict(), "seq": seq}
+
+
+@api_router.post("/encounter/{encounter_id}/effects/clear")
+async def clear_encounter_effects(
+    encounter_id: str,
+    data: dict = Body({}),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Clear active effects, or only those from source_action."""
+    encounter = await _get_encounter_or_404(db, encounter_id)
+    if encounter.campaign_id:
+        await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
+    source_action = data.get("source_action")
+
+    cleared = len(json.loads(encounter.active_effects_json or "[]"))
+    seq = await append_event(db, encounter, "effects_cleared", source_action=source_action)
+    cleared -= len(json.loads(encounter.active_effects_json))
+    await record_undo(db, encounter, "Clear effects")
+    await db.commit()
+
+    return {"success": True, "cleared": cleared, "seq": seq}
+
+
+# =============================================================================
+# GM Undo / Rewind
+# =============================================================================
+
+
+async def _finish_undo(db: AsyncSession, encounter: EncounterRecord, operations) -> dict:
+    """Journal and log an undo, then commit it."""
+    if operations:
+        await record_pool_corrections(db, encounter, "gm_undo")
+        await append_event(
+            db, encounter, "state_restored", state=await encounter_state(db, encounter)
+        )
+        labels = ", ".join(operation.label for operation in operations)
+        db.add(CombatLogRecord(
+            encounter_id=encounter.id,
+            round=encounter.round or 1,
+            actor_name="GM",
+            actor_type="gm",
+            ship_name="GM",
+            action_name="Undo",
+            action_type="gm_undo",
+            description=f"GM undid {len(operations)} operation(s): {labels}",
+            timestamp=datetime.now(),
+        ))
+    await db.commit()
+
+    return {
+        "success": True,
+        "undone": [operation.to_dict() for operation in operations],
+        "remaining": await count_operations(db, encounter),
+        "round": encounter.round,
+        "momentum": encounter.momentum,
+        "threat": encounter.threat,
+        "current_turn": encounter.current_turn,
+    }
+
+
+@api_router.get("/encounter/{encounter_id}/undo")
+async def get_undo_history(
+    encounter_id: str,
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Undoable operations for the GM console, newest first."""
+    encounter = await _get_encounter_or_404(db, encounter_id)
+    if encounter.campaign_id:
+        await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
+
+    operations = await list_operations(db, encounter)
+    return {"operations": [operation.to_dict() for operation in operations]}
+
+
+@api_router.post("/encounter/{encounter_id}/undo")
+async def undo_encounter_operations(
+    encounter_id: str,
+    data: dict = Body({}),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Undo the last steps operations (default 1) in one transaction."""
+    steps = data.get("steps", 1)
+    if not isinstance(steps, int) or steps < 1:
+        raise HTTPException(status_code=400, detail="steps must be a positive integer")
+
+    encounter = await _get_encounter_or_404(db, encounter_id)
+    if encounter.campaign_id:
+        await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
+
+    operations, _ = await undo_operations(db, encounter, steps)
+    return await _finish_undo(db, encounter, operations)
+
+
+@api_router.post("/encounter/{encounter_id}/rewind")
+async def rewind_encounter(
+    encounter_id: str,
+    data: dict = Body({}),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Rewind to the start of a round (default: the current round) in one transaction."""
+    target_round = data.get("round")
+    if target_round is not None and (not isinstance(target_round, int) or target_round < 1):
+        raise HTTPException(status_code=400, detail="round must be a positive integer")
+
+    encounter = await _get_encounter_or_404(db, encounter_id)
+    if encounter.campaign_id:
+        await _require_gm_auth(encounter.campaign_id, sta_session_token, db)
+
+    operations, _ = await rewind_to_round(db, encounter, target_round)
+    return await _finish_undo(db, encounter, operations)
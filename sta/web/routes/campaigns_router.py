@@ -5,7 +5,7 @@ import uuid
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional, List
-from sqlalchemy import or_
+from sqlalchemy import case, func, insert, literal, or_, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -28,6 +28,16 @@ from werkzeug.security import generate_password_hash, check_password_hash
 templates = Jinja2Templates(directory="sta/web/templates")
 
 from sta.database.async_db import get_db
+from sta.database.pool_ledger import (
+    HISTORY_PAGE,
+    MOMENTUM_MAX,
+    POOLS,
+    change_pool,
+    pool_history,
+    pool_totals,
+)
+from sta.database.scene_graph import delete_scene_edges
+from sta.web.jobs import run_or_queue
 from sta.database.schema import (
     EncounterRecord,
     CharacterRecord,
@@ -40,6 +50,7 @@ from sta.database.schema import (
     NPCRecord,
 )
 from sta.database.vtt_schema import (
+    LogEntryRecord,
     VTTCharacterRecord,
     VTTShipRecord,
 )
@@ -48,6 +59,10 @@ campaigns_router = APIRouter(prefix="/campaigns", tags=["campaigns"])
 
 DEFAULT_GM_PASSWORD = "ENGAGE1"
 
+LOG_FEED_PAGE = 50  # Log entries returned per campaign feed request
+SESSION_DETERMINATION = 1  # Determination each character starts a session with
+SESSION_LOG = "New session: Values refreshed, Determination reset, Stress recovered"
+
 
 async def _get_current_player(
     campaign_id: int,
@@ -810,8 +825,24 @@ async def link_vtt_ship_to_campaign(
 
 
 @campaigns_router.post("/api/generate-random")
-async def api_generate_random_campaign(db: AsyncSession = Depends(get_db)):
-    """API: Generate a random campaign with ship and encounter ready to go."""
+async def api_generate_random_campaign(
+    background: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """API: Generate a random campaign with ship and encounter ready to go.
+
+    With ?background=true generation runs as a job (see /api/jobs).
+    """
+    return await run_or_queue(
+        background, "random_campaign", _generate_random_campaign, db,
+        session_token=sta_session_token,
+    )
+
+
+async def _generate_random_campaign(job, db: AsyncSession) -> dict:
+    """Create the random campaign. Generators run on the job thread pool."""
+    from sta.generators import generate_starship, generate_character
     from sta.generators.starship import generate_enemy_ship
     from sta.models.enums import CrewQuality
     import random
@@ -864,9 +895,8 @@ async def api_generate_random_campaign(db: AsyncSession = Depends(get_db)):
     )
     db.add(gm_player)
 
-    from sta.generators import generate_starship, generate_character
-
-    ship = generate_starship()
+    await job.progress(10, "Generating ship")
+    ship = await job.run_sync(generate_starship)
     ship_record = StarshipRecord.from_model(ship)
     db.add(ship_record)
     await db.flush()
@@ -878,13 +908,15 @@ async def api_generate_random_campaign(db: AsyncSession = Depends(get_db)):
     db.add(campaign_ship)
     campaign.active_ship_id = ship_record.id
 
-    char = generate_character()
+    await job.progress(40, "Generating character")
+    char = await job.run_sync(generate_character)
     char_record = CharacterRecord.from_model(char)
     db.add(char_record)
     await db.flush()
 
-    enemy = generate_enemy_ship(
-        difficulty="standard", crew_quality=CrewQuality.TALENTED
+    await job.progress(70, "Generating enemy ship")
+    enemy = await job.run_sync(
+        generate_enemy_ship, difficulty="standard", crew_quality=CrewQuality.TALENTED
     )
     enemy_record = StarshipRecord.from_model(enemy)
     db.add(enemy_record)
@@ -902,7 +934,7 @@ async def api_generate_random_campaign(db: AsyncSession = Depends(get_db)):
         threat=2,
     )
     db.add(encounter)
-    await db.commit()
+    await db.flush()
 
     return {
         "success": True,
@@ -952,7 +984,10 @@ async def update_campaign_momentum(
         raise HTTPException(status_code=404, detail="Campaign not found")
 
     amount = data.get("amount", 0)
-    campaign.momentum = max(0, min(6, (campaign.momentum or 0) + amount))
+    await change_pool(
+        db, campaign, "momentum", amount, data.get("reason", "gm_adjustment"),
+        maximum=MOMENTUM_MAX,
+    )
     await db.commit()
 
     return {"momentum": campaign.momentum}
@@ -973,12 +1008,217 @@ async def update_campaign_threat(
         raise HTTPException(status_code=404, detail="Campaign not found")
 
     amount = data.get("amount", 0)
-    campaign.threat = max(0, (campaign.threat or 0) + amount)
+    await change_pool(db, campaign, "threat", amount, data.get("reason", "gm_adjustment"))
     await db.commit()
 
     return {"threat": campaign.threat}
 
 
+@campaigns_router.get("/api/campaign/{campaign_id}/ledger")
+async def get_campaign_pool_ledger(
+    campaign_id: str,
+    pool: Optional[str] = Query(None),
+    scene_id: Optional[int] = Query(None),
+    encounter_id: Optional[int] = Query(None),
+    campaign_only: bool = Query(False),
+    before: Optional[int] = Query(None),
+    limit: int = Query(HISTORY_PAGE, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Momentum/Threat ledger entries, newest first, paged by entry id."""
+    stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
+    result = await db.execute(stmt)
+    campaign = result.scalars().first()
+
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    await _require_gm_auth(campaign.id, sta_session_token, db)
+
+    if pool is not None and pool not in POOLS:
+        raise HTTPException(status_code=400, detail=f"pool must be one of {list(POOLS)}")
+
+    entries = await pool_history(
+        db,
+        campaign_pk=campaign.id,
+        encounter_pk=encounter_id,
+        scene_id=scene_id,
+        pool=pool,
+        campaign_only=campaign_only,
+        before=before,
+        limit=limit,
+    )
+    return {
+        "entries": [entry.to_dict() for entry in entries],
+        "next_before": entries[-1].id if len(entries) == limit else None,
+    }
+
+
+@campaigns_router.get("/api/campaign/{campaign_id}/ledger/totals")
+async def get_campaign_pool_totals(
+    campaign_id: str,
+    group_by: str = Query("scene"),
+    encounter_id: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Momentum/Threat gained and spent per scene or per encounter round."""
+    if group_by not in ("scene", "round"):
+        raise HTTPException(status_code=400, detail="group_by must be 'scene' or 'round'")
+
+    stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
+    result = await db.execute(stmt)
+    campaign = result.scalars().first()
+
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    await _require_gm_auth(campaign.id, sta_session_token, db)
+
+    totals = await pool_totals(
+        db, group_by, campaign_pk=campaign.id, encounter_pk=encounter_id
+    )
+    return {"group_by": group_by, "totals": totals}
+
+
+def _log_cursor(log: LogEntryRecord) -> str:
+    """The feed cursor that pages past a log entry: its created_at and id."""
+    return f"{log.created_at.isoformat()}_{log.id}"
+
+
+def _parse_log_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, log_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(created_at), int(log_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid log cursor")
+
+
+@campaigns_router.get("/api/campaign/{campaign_id}/logs")
+async def get_campaign_log_feed(
+    campaign_id: str,
+    log_type: Optional[str] = Query(None),
+    event_type: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+    limit: int = Query(LOG_FEED_PAGE, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+):
+    """Character log entries across the campaign, newest first.
+
+    Paged by (created_at, id): pass the returned next_before as before to
+    get the next page. Entries logged while a page is being read don't
+    shift later pages.
+    """
+    stmt = select(CampaignRecord.id).filter(CampaignRecord.campaign_id == campaign_id)
+    campaign_pk = (await db.execute(stmt)).scalar()
+
+    if campaign_pk is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    stmt = select(LogEntryRecord).filter(LogEntryRecord.campaign_id == campaign_pk)
+    if log_type:
+        stmt = stmt.filter(LogEntryRecord.log_type == log_type.upper())
+    if event_type:
+        stmt = stmt.filter(LogEntryRecord.event_type == event_type)
+    if before:
+        created_at, log_id = _parse_log_cursor(before)
+        # A row value, so the index seeks straight to the cursor
+        stmt = stmt.filter(
+            tuple_(LogEntryRecord.created_at, LogEntryRecord.id) < tuple_(created_at, log_id)
+        )
+    stmt = stmt.order_by(LogEntryRecord.created_at.desc(), LogEntryRecord.id.desc())
+    logs = (await db.execute(stmt.limit(limit))).scalars().all()
+
+    return {
+        "logs": [log.to_dict() for log in logs],
+        "next_before": _log_cursor(logs[-1]) if len(logs) == limit else None,
+    }
+
+
+def _values_reset_for_session():
+    """
+    values_json with every Value unused and untriggered, as in
+    /characters/{id}/values/reset-session, computed by SQLite JSON1.
+    values_json that isn't a JSON array is left alone.
+    """
+    values = VTTCharacterRecord.values_json
+    each = func.json_each(values).table_valued("value")
+    value = func.json_remove(
+        func.json_set(each.c.value, "$.used_this_session", func.json("false")),
+        "$.last_challenged_session",
+        "$.last_complied_session",
+    )
+    return case(
+        (func.json_valid(values) == 0, values),
+        (func.json_type(values) != "array", values),
+        else_=select(func.json_group_array(value)).select_from(each).scalar_subquery(),
+    )
+
+
+@campaigns_router.post("/api/campaign/{campaign_id}/session/rollover")
+async def rollover_campaign_session(
+    campaign_id: str,
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Start a new game session for every character in the campaign.
+
+    Values are refreshed, Determination reset and Stress recovered for all
+    characters in one UPDATE, and each gets a MISSION log entry from one
+    INSERT ... SELECT.
+    """
+    stmt = select(CampaignRecord.id).filter(CampaignRecord.campaign_id == campaign_id)
+    campaign_pk = (await db.execute(stmt)).scalar()
+
+    if campaign_pk is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    await _require_gm_auth(campaign_pk, sta_session_token, db)
+
+    in_campaign = VTTCharacterRecord.campaign_id == campaign_pk
+    result = await db.execute(
+        update(VTTCharacterRecord)
+        .where(in_campaign)
+        .values(
+            values_json=_values_reset_for_session(),
+            determination=func.min(
+                SESSION_DETERMINATION, VTTCharacterRecord.determination_max
+            ),
+            stress=0,
+        )
+    )
+
+    now = datetime.now()
+    await db.execute(
+        insert(LogEntryRecord).from_select(
+            [
+                "character_id",
+                "campaign_id",
+                "log_type",
+                "content",
+                "event_type",
+                "character_name",
+                "created_at",
+                "updated_at",
+            ],
+            select(
+                VTTCharacterRecord.id,
+                VTTCharacterRecord.campaign_id,
+                literal("MISSION"),
+                literal(SESSION_LOG),
+                literal("session_start"),
+                VTTCharacterRecord.name,
+                literal(now),
+                literal(now),
+            ).where(in_campaign),
+        )
+    )
+    await db.commit()
+
+    return {"characters": result.rowcount, "message": SESSION_LOG}
+
+
 # Campaign Scene Management
 
 
@@ -1092,6 +1332,7 @@ async def delete_scene(
     if scene.status == "active":
         raise HTTPException(status_code=400, detail="Cannot delete active scene")
 
+    await delete_scene_edges(db, [scene.id])
     await db.delete(scene)
     await db.commit()
 
@@ -1232,21 +1473,29 @@ async def campaign_join_page(
     players_result = await db.execute(players_stmt)
     all_players = players_result.scalars().all()
 
+    unclaimed_players = [
+        player
+        for player in all_players
+        if not player.session_token or player.session_token.startswith("unclaimed_")
+    ]
+    character_ids = [p.vtt_character_id for p in unclaimed_players if p.vtt_character_id]
+    chars_by_id = {}
+    if character_ids:
+        char_stmt = select(VTTCharacterRecord).filter(
+            VTTCharacterRecord.id.in_(character_ids)
+        )
+        char_result = await db.execute(char_stmt)
+        chars_by_id = {c.id: c for c in char_result.scalars().all()}
+
     available_players = []
-    for player in all_players:
-        if player.session_token and not player.session_token.startswith("unclaimed_"):
-            continue
+    for player in unclaimed_players:
         player_data = {
             "id": player.id,
             "player_name": player.player_name,
             "character": None,
         }
         if player.vtt_character_id:
-            char_stmt = select(VTTCharacterRecord).filter(
-                VTTCharacterRecord.id == player.vtt_character_id
-            )
-            char_result = await db.execute(char_stmt)
-            char = char_result.scalars().first()
+            char = chars_by_id.get(player.vtt_character_id)
             if char:
                 player_data["character"] = {
                     "name": char.name,
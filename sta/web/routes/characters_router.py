@@ -10,6 +10,7 @@ from fastapi import (
     Body,
     Form,
     Cookie,
+    Query,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -21,6 +22,7 @@ from sta.database.schema import (
 )
 from sta.database.vtt_schema import (
     VTTCharacterRecord,
+    VTTShipRecord,
     LogEntryRecord,
 )
 from sta.generators.data import (
@@ -31,6 +33,7 @@ from sta.generators.data import (
     SHIP_CLASSES,
 )
 from sta.generators.data import GENERAL_TALENTS
+from sta.web.jobs import run_or_queue
 
 characters_router = APIRouter(tags=["characters"])
 
@@ -1075,12 +1078,7 @@ async def get_personal_logs_for_players(
     )
 
     if campaign_id:
-        from sqlalchemy.orm import joinedload
-
-        query = query.join(
-            VTTCharacterRecord, VTTCharacterRecord.id == LogEntryRecord.character_id
-        )
-        query = query.filter(VTTCharacterRecord.campaign_id == campaign_id)
+        query = query.filter(LogEntryRecord.campaign_id == campaign_id)
 
     query = query.order_by(LogEntryRecord.created_at.desc())
     result = await db.execute(query)
@@ -1126,6 +1124,7 @@ async def create_log_entry(
 
     log = LogEntryRecord(
         character_id=char_id,
+        campaign_id=char.campaign_id,
         log_type=log_type,
         content=data.get("content", ""),
         event_type=data.get("event_type"),
@@ -1226,6 +1225,7 @@ async def log_scene_event(
 
     log = LogEntryRecord(
         character_id=char_id,
+        campaign_id=char.campaign_id,
         log_type="MISSION",
         content=content,
         event_type=event_type,
@@ -1277,6 +1277,7 @@ async def log_value_event(
 
     log = LogEntryRecord(
         character_id=char_id,
+        campaign_id=char.campaign_id,
         log_type="VALUE",
         content=content,
         event_type=event_type,
@@ -1298,7 +1299,9 @@ async def log_value_event(
 @characters_router.post("/characters/wizard", status_code=status.HTTP_201_CREATED)
 async def create_character_wizard(
     data: dict = Body(...),
+    background: bool = Query(False),
     db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
 ):
     """Create a character using the 4-step guided wizard.
 
@@ -1314,6 +1317,9 @@ async def create_character_wizard(
     - Department ratings must be 1-5 each (total 15 pts)
     - Stress max = Fitness attribute
     - Determination starts at 1, max 3
+
+    With ?background=true the final step creates the character in a job
+    (see /api/jobs).
     """
     step = data.get("step")
     character_data = data.get("character", {})
@@ -1404,72 +1410,78 @@ async def create_character_wizard(
             "message": f"Step {step} validated. Continue to next step.",
         }
 
-    attributes = character_data.get(
-        "attributes",
-        {
-            "control": 7,
-            "fitness": 7,
-            "daring": 7,
-            "insight": 7,
-            "presence": 7,
-            "reason": 7,
-        },
-    )
-    disciplines = character_data.get(
-        "disciplines",
-        {
-            "command": 1,
-            "conn": 1,
-            "engineering": 1,
-            "medicine": 1,
-            "science": 1,
-            "security": 1,
-        },
-    )
+    async def work(job, db):
+        attributes = character_data.get(
+            "attributes",
+            {
+                "control": 7,
+                "fitness": 7,
+                "daring": 7,
+                "insight": 7,
+                "presence": 7,
+                "reason": 7,
+            },
+        )
+        disciplines = character_data.get(
+            "disciplines",
+            {
+                "command": 1,
+                "conn": 1,
+                "engineering": 1,
+                "medicine": 1,
+                "science": 1,
+                "security": 1,
+            },
+        )
 
-    fitness = attributes.get("fitness", 7)
-    stress_max = fitness
+        fitness = attributes.get("fitness", 7)
+        stress_max = fitness
 
-    values = character_data.get("values", [])
-    for v in values:
-        if isinstance(v, dict):
-            v["used_this_session"] = False
+        values = character_data.get("values", [])
+        for v in values:
+            if isinstance(v, dict):
+                v["used_this_session"] = False
 
-    char = VTTCharacterRecord(
-        name=character_data.get("name", "Unnamed Character"),
-        species=character_data.get("species"),
-        rank=character_data.get("rank"),
-        role=character_data.get("role"),
-        attributes_json=json.dumps(attributes),
-        disciplines_json=json.dumps(disciplines),
-        talents_json=json.dumps(character_data.get("talents", [])),
-        focuses_json=json.dumps(character_data.get("focuses", [])),
-        stress=0,
-        stress_max=stress_max,
-        determination=1,
-        determination_max=3,
-        character_type=character_data.get("character_type", "support"),
-        pronouns=character_data.get("pronouns"),
-        avatar_url=character_data.get("avatar_url"),
-        description=character_data.get("description"),
-        values_json=json.dumps(values),
-        equipment_json=json.dumps(character_data.get("equipment", [])),
-        environment=character_data.get("environment"),
-        upbringing=character_data.get("upbringing"),
-        career_path=character_data.get("career_path"),
-        campaign_id=campaign_id,
-        is_visible_to_players=True,
-    )
+        char = VTTCharacterRecord(
+            name=character_data.get("name", "Unnamed Character"),
+            species=character_data.get("species"),
+            rank=character_data.get("rank"),
+            role=character_data.get("role"),
+            attributes_json=json.dumps(attributes),
+            disciplines_json=json.dumps(disciplines),
+            talents_json=json.dumps(character_data.get("talents", [])),
+            focuses_json=json.dumps(character_data.get("focuses", [])),
+            stress=0,
+            stress_max=stress_max,
+            determination=1,
+            determination_max=3,
+            character_type=character_data.get("character_type", "support"),
+            pronouns=character_data.get("pronouns"),
+            avatar_url=character_data.get("avatar_url"),
+            description=character_data.get("description"),
+            values_json=json.dumps(values),
+            equipment_json=json.dumps(character_data.get("equipment", [])),
+            environment=character_data.get("environment"),
+            upbringing=character_data.get("upbringing"),
+            career_path=character_data.get("career_path"),
+            campaign_id=campaign_id,
+            is_visible_to_players=True,
+        )
 
-    db.add(char)
-    await db.commit()
-    await db.refresh(char)
+        db.add(char)
+        await db.flush()
+        await db.refresh(char)
 
-    return {
-        "success": True,
-        "character": _serialize_character(char),
-        "message": "Character created successfully via wizard",
-    }
+        return {
+            "success": True,
+            "character": _serialize_character(char),
+            "message": "Character created successfully via wizard",
+        }
+
+    return await run_or_queue(
+        background, "character_wizard", work, db,
+        session_token=sta_session_token,
+    )
 
 
 @characters_router.get("/characters/wizard/options")
@@ -1566,7 +1578,9 @@ async def get_character_creation_options(
 @characters_router.post("/ships/wizard", status_code=status.HTTP_201_CREATED)
 async def create_ship_wizard(
     data: dict = Body(...),
+    background: bool = Query(False),
     db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
 ):
     """Create a ship using the guided wizard.
 
@@ -1576,6 +1590,8 @@ async def create_ship_wizard(
     - Department ratings (0-5)
     - Crew Quality
     - Traits
+
+    With ?background=true the ship is created in a job (see /api/jobs).
     """
     ship_data = data.get("ship", {})
     campaign_id = data.get("campaign_id")
@@ -1602,39 +1618,45 @@ async def create_ship_wizard(
     if errors:
         return {"success": False, "errors": errors}
 
-    ship = VTTShipRecord(
-        name=name,
-        ship_class=ship_class,
-        ship_registry=ship_data.get("registry"),
-        scale=scale,
-        systems_json=json.dumps(systems),
-        departments_json=json.dumps(departments),
-        weapons_json=json.dumps(ship_data.get("weapons", [])),
-        talents_json=json.dumps(ship_data.get("talents", [])),
-        traits_json=json.dumps(ship_data.get("traits", [])),
-        shields=ship_data.get("shields", 0),
-        shields_max=ship_data.get("shields_max", 0),
-        resistance=ship_data.get("resistance", 0),
-        crew_quality=ship_data.get("crew_quality"),
-        campaign_id=campaign_id,
-        is_visible_to_players=True,
-    )
+    async def work(job, db):
+        ship = VTTShipRecord(
+            name=name,
+            ship_class=ship_class,
+            ship_registry=ship_data.get("registry"),
+            scale=scale,
+            systems_json=json.dumps(systems),
+            departments_json=json.dumps(departments),
+            weapons_json=json.dumps(ship_data.get("weapons", [])),
+            talents_json=json.dumps(ship_data.get("talents", [])),
+            traits_json=json.dumps(ship_data.get("traits", [])),
+            shields=ship_data.get("shields", 0),
+            shields_max=ship_data.get("shields_max", 0),
+            resistance=ship_data.get("resistance", 0),
+            crew_quality=ship_data.get("crew_quality"),
+            campaign_id=campaign_id,
+            is_visible_to_players=True,
+        )
 
-    db.add(ship)
-    await db.commit()
-    await db.refresh(ship)
+        db.add(ship)
+        await db.flush()
+        await db.refresh(ship)
 
-    return {
-        "success": True,
-        "ship": {
-            "id": ship.id,
-            "name": ship.name,
-            "ship_class": ship.ship_class,
-            "scale": ship.scale,
-            "registry": ship.ship_registry,
-        },
-        "message": "Ship created successfully via wizard",
-    }
+        return {
+            "success": True,
+            "ship": {
+                "id": ship.id,
+                "name": ship.name,
+                "ship_class": ship.ship_class,
+                "scale": ship.scale,
+                "registry": ship.ship_registry,
+            },
+            "message": "Ship created successfully via wizard",
+        }
+
+    return await run_or_queue(
+        background, "ship_wizard", work, db,
+        session_token=sta_session_token,
+    )
 
 
 @characters_router.get("/ships/wizard/options")
@@ -1864,6 +1886,7 @@ async def interact_with_value(
 
     log = LogEntryRecord(
         character_id=char_id,
+        campaign_id=char.campaign_id,
         log_type="VALUE",
         content=f"Value '{value_name}' {action}ed"
         + (f": {description}" if description else ""),
@@ -18,6 +18,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete as sqlalchemy_delete
 
 from sta.database.async_db import get_db
+from sta.database.encounter_journal import append_event
+from sta.database.pool_ledger import change_pool
+from sta.database.scene_graph import delete_scene_edges
 from sta.database.schema import (
     EncounterRecord,
     CharacterRecord,
@@ -26,11 +29,16 @@ from sta.database.schema import (
     CampaignPlayerRecord,
     SceneRecord,
     PersonnelEncounterRecord,
+    PersonnelParticipantRecord,
+    EncounterEventRecord,
+    EncounterSnapshotRecord,
+    EncounterUndoRecord,
 )
 from sta.models.enums import Position, CrewQuality
 from sta.models.combat import (
     ActiveEffect,
 )  # Assuming this structure is accessible and usable
+from sta.web.negotiation import NegotiatedResponse
 
 
 # --- STUB CLASSES/FUNCTIONS for migrated code paths ---
@@ -45,7 +53,7 @@ class PlaceholderGenerator:
 
 
 # --- ROUTER SETUP ---
-encounters_router = APIRouter()
+encounters_router = APIRouter(default_response_class=NegotiatedResponse)
 
 
 async def _handle_new_encounter_generation(
@@ -216,14 +224,18 @@ async def edit_encounter_post(
         encounter.name = name
     if description is not None:
         encounter.description = description.strip() or None
-    if threat is not None:
-        encounter.threat = threat
+    if threat is not None and threat != (encounter.threat or 0):
+        await change_pool(db, encounter, "threat", threat - (encounter.threat or 0), "gm_edit")
 
     if tactical_map_json is not None:
         encounter.tactical_map_json = tactical_map_json
 
     if ship_positions_json is not None:
-        encounter.ship_positions_json = ship_positions_json
+        try:
+            ship_positions = json.loads(ship_positions_json or "{}")
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid ship_positions_json")
+        await append_event(db, encounter, "ships_placed", ship_positions=ship_positions)
 
     await db.commit()
 
@@ -514,23 +526,53 @@ async def create_or_update_scene(
         "scene_traits": json.loads(scene.scene_traits_json or "[]"),
         "challenges": json.loads(scene.challenges_json or "[]"),
     }
+    personnel_ids = select(PersonnelEncounterRecord.id).where(
+        PersonnelEncounterRecord.scene_id.in_(
+            select(SceneRecord.id).where(SceneRecord.encounter_id == encounter_db_id)
+        )
+    )
+    await db.execute(
+        sqlalchemy_delete(PersonnelParticipantRecord).where(
+            PersonnelParticipantRecord.personnel_encounter_id.in_(personnel_ids)
+        )
+    )
     await db.execute(
         sqlalchemy_delete(PersonnelEncounterRecord).where(
-            PersonnelEncounterRecord.scene_id.in_(
-                select(SceneRecord.id).where(
-                    SceneRecord.encounter_id == encounter_db_id
-                )
-            )
+            PersonnelEncounterRecord.id.in_(personnel_ids)
         )
     )
 
     # Delete related Scene if it exists
+    scene_ids = (
+        await db.execute(
+            select(SceneRecord.id).where(SceneRecord.encounter_id == encounter_db_id)
+        )
+    ).scalars().all()
+    if scene_ids:
+        await delete_scene_edges(db, scene_ids)
     await db.execute(
         sqlalchemy_delete(SceneRecord).where(
             SceneRecord.encounter_id == encounter_db_id
         )
     )
 
+    # Delete the encounter's event journal and undo history
+    await db.execute(
+        sqlalchemy_delete(EncounterEventRecord).where(
+            EncounterEventRecord.encounter_id == encounter_db_id
+        )
+    )
+    await db.execute(
+        sqlalchemy_delete(EncounterSnapshotRecord).where(
+            EncounterSnapshotRecord.encounter_id == encounter_db_id
+        )
+    )
+    await db.execute(
+        sqlalchemy_delete(EncounterUndoRecord).where(
+            EncounterUndoRecord.encounter_id == encounter_db_id
+        )
+    )
+
     # Delete Encounter record itself
     delete_stmt = sqlalchemy_delete(EncounterRecord).where(
         EncounterRecord.id == encounter_db_id
@@ -566,26 +608,12 @@ async def personnel_combat_data(
             status_code=404, detail="Personnel encounter or associated scene not found."
         )
 
-    character_states = json.loads(encounter.character_states_json or "[]")
-    character_positions = json.loads(encounter.character_positions_json or "{}")
-
-    characters = []
-    for i, char_state in enumerate(character_states):
-        char_key = f"character_{i}"
-        pos = character_positions.get(char_key, {"q": 0, "r": 0})
-
-        characters.append(
-            {
-                "index": i,
-                "name": char_state.get("name", f"Character {i}"),
-                "is_player": char_state.get("is_player", False),
-                "stress": char_state.get("stress", 5),
-                "stress_max": char_state.get("stress_max", 5),
-                "injuries": char_state.get("injuries", []),
-                "is_defeated": char_state.get("is_defeated", False),
-                "position": pos,
-            }
-        )
+    participants = await db.execute(
+        select(PersonnelParticipantRecord)
+        .filter(PersonnelParticipantRecord.personnel_encounter_id == encounter.id)
+        .order_by(PersonnelParticipantRecord.slot)
+    )
+    characters = [participant.to_dict() for participant in participants.scalars().all()]
 
     minor_actions = [
         "Personnel Aim",
@@ -13,6 +13,7 @@ from fastapi import (
     status,
     Body,
     Cookie,
+    Query,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -30,6 +31,7 @@ from sta.database.vtt_schema import (
     VTTCharacterRecord,
     VTTShipRecord,
 )
+from sta.web.jobs import run_or_queue
 from werkzeug.security import generate_password_hash
 
 backup_router = APIRouter(prefix="/backup", tags=["backup"])
@@ -101,8 +103,16 @@ def _serialize_campaign(campaign: CampaignRecord) -> dict:
 
 
 @backup_router.get("/{campaign_id}")
-async def export_campaign(campaign_id: str, db: AsyncSession = Depends(get_db)):
-    """Export full campaign data including characters, NPCs, and ships."""
+async def export_campaign(
+    campaign_id: str,
+    background: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Export full campaign data including characters, NPCs, and ships.
+
+    With ?background=true the export runs as a job (see /api/jobs).
+    """
     stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
     result = await db.execute(stmt)
     campaign = result.scalars().first()
@@ -110,6 +120,22 @@ async def export_campaign(campaign_id: str, db: AsyncSession = Depends(get_db)):
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
+    async def work(job, db):
+        return await _export_campaign_data(job, db, campaign)
+
+    return await run_or_queue(
+        background,
+        "campaign_backup",
+        work,
+        db,
+        campaign_id=campaign.id,
+        filename=f"campaign-{campaign_id}.json",
+        session_token=sta_session_token,
+    )
+
+
+async def _export_campaign_data(job, db: AsyncSession, campaign: CampaignRecord) -> dict:
+    """Characters, NPCs, ships and settings of a campaign, as exported."""
     campaign_players_stmt = select(CampaignPlayerRecord).filter(
         CampaignPlayerRecord.campaign_id == campaign.id,
     )
@@ -119,15 +145,19 @@ async def export_campaign(campaign_id: str, db: AsyncSession = Depends(get_db)):
     characters = []
     npcs = []
 
+    character_ids = [p.vtt_character_id for p in campaign_players if p.vtt_character_id]
+    chars_by_id = {}
+    if character_ids:
+        char_stmt = select(VTTCharacterRecord).filter(
+            VTTCharacterRecord.id.in_(character_ids)
+        )
+        char_result = await db.execute(char_stmt)
+        chars_by_id = {c.id: c for c in char_result.scalars().all()}
+
     for player in campaign_players:
-        if player.vtt_character_id:
-            char_stmt = select(VTTCharacterRecord).filter(
-                VTTCharacterRecord.id == player.vtt_character_id
-            )
-            char_result = await db.execute(char_stmt)
-            char = char_result.scalars().first()
-            if char:
-                characters.append(_serialize_character(char))
+        char = chars_by_id.get(player.vtt_character_id)
+        if char:
+            characters.append(_serialize_character(char))
 
     npc_stmt = select(VTTCharacterRecord).filter(
         VTTCharacterRecord.campaign_id == campaign.id,
@@ -138,6 +168,7 @@ async def export_campaign(campaign_id: str, db: AsyncSession = Depends(get_db)):
 
     for npc in npc_chars:
         npcs.append(_serialize_character(npc))
+    await job.progress(50, "Characters exported")
 
     campaign_ships_stmt = select(CampaignShipRecord).filter(
         CampaignShipRecord.campaign_id == campaign.id
@@ -145,14 +176,18 @@ async def export_campaign(campaign_id: str, db: AsyncSession = Depends(get_db)):
     campaign_ships_result = await db.execute(campaign_ships_stmt)
     campaign_ships = campaign_ships_result.scalars().all()
 
+    ship_ids = [cs.vtt_ship_id for cs in campaign_ships if cs.vtt_ship_id]
+    ships_by_id = {}
+    if ship_ids:
+        ship_stmt = select(VTTShipRecord).filter(VTTShipRecord.id.in_(ship_ids))
+        ship_result = await db.execute(ship_stmt)
+        ships_by_id = {s.id: s for s in ship_result.scalars().all()}
+
     ships = []
     for cs in campaign_ships:
-        if cs.vtt_ship_id:
-            ship_stmt = select(VTTShipRecord).filter(VTTShipRecord.id == cs.vtt_ship_id)
-            ship_result = await db.execute(ship_stmt)
-            ship = ship_result.scalars().first()
-            if ship:
-                ships.append(_serialize_ship(ship))
+        ship = ships_by_id.get(cs.vtt_ship_id)
+        if ship:
+            ships.append(_serialize_ship(ship))
 
     return {
         "version": "1.0",
@@ -165,8 +200,16 @@ async def export_campaign(campaign_id: str, db: AsyncSession = Depends(get_db)):
 
 
 @backup_router.post("/import")
-async def import_campaign(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
-    """Import campaign data from a backup JSON."""
+async def import_campaign(
+    data: dict = Body(...),
+    background: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Import campaign data from a backup JSON.
+
+    With ?background=true the import runs as a job (see /api/jobs).
+    """
     version = data.get("version")
     if not version:
         raise HTTPException(status_code=400, detail="Invalid backup: missing version")
@@ -181,8 +224,19 @@ async def import_campaign(data: dict = Body(...), db: AsyncSession = Depends(get
             status_code=400, detail="Invalid backup: missing campaign data"
         )
 
-    campaign_data = campaigns_data[0]
+    async def work(job, db):
+        return await _import_campaign_data(job, db, campaigns_data[0], characters, npcs, ships)
+
+    return await run_or_queue(
+        background, "campaign_import", work, db,
+        session_token=sta_session_token,
+    )
+
 
+async def _import_campaign_data(
+    job, db: AsyncSession, campaign_data: dict, characters: list, npcs: list, ships: list
+) -> dict:
+    """Create a campaign from backup data. The caller commits."""
     campaign = CampaignRecord(
         campaign_id=str(uuid.uuid4())[:8],
         name=campaign_data.get("name", "Imported Campaign"),
@@ -236,6 +290,7 @@ async def import_campaign(data: dict = Body(...), db: AsyncSession = Depends(get
         await db.flush()
         created_character_ids.append(char.id)
         character_id_map[char_data.get("name")] = char.id
+    await job.progress(40, "Characters imported")
 
     for npc_data in npcs:
         npc = VTTCharacterRecord(
@@ -266,6 +321,7 @@ async def import_campaign(data: dict = Body(...), db: AsyncSession = Depends(get
         db.add(npc)
         await db.flush()
         created_character_ids.append(npc.id)
+    await job.progress(70, "NPCs imported")
 
     created_ship_ids = []
 
@@ -302,7 +358,7 @@ async def import_campaign(data: dict = Body(...), db: AsyncSession = Depends(get
         )
         db.add(campaign_ship)
 
-    await db.commit()
+    await db.flush()
 
     return {
         "success": True,
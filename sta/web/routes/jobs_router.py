@@ -0,0 +1,124 @@
+"""Background job routes: progress polling, cancellation and result download (FastAPI).
+
+A job is visible to the campaign player who queued it and to its
+campaign's GM, identified by the sta_session_token cookie.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Query
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, select
+
+from sta.database.async_db import get_db
+from sta.database.schema import CampaignPlayerRecord, JobRecord
+from sta.web.jobs import job_runner, job_to_dict
+
+jobs_router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _require_session(sta_session_token: Optional[str]) -> str:
+    if not sta_session_token:
+        raise HTTPException(status_code=401, detail="Session required")
+    return sta_session_token
+
+
+async def _get_job(job_id: str, sta_session_token: Optional[str], db: AsyncSession) -> JobRecord:
+    """The job, if the session queued it or is its campaign's GM."""
+    token = _require_session(sta_session_token)
+    job = await db.get(JobRecord, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    stmt = select(CampaignPlayerRecord.id).filter(
+        CampaignPlayerRecord.session_token == token,
+        or_(
+            CampaignPlayerRecord.id == job.created_by,
+            and_(
+                CampaignPlayerRecord.campaign_id == job.campaign_id,
+                CampaignPlayerRecord.is_gm == True,
+            ),
+        ),
+    )
+    if (await db.execute(stmt)).first() is None:
+        raise HTTPException(
+            status_code=401, detail="Only the job's owner or campaign GM can access it"
+        )
+    return job
+
+
+@jobs_router.get("")
+async def list_jobs(
+    status: Optional[str] = Query(None),
+    kind: Optional[str] = Query(None),
+    campaign_id: Optional[int] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """The session's recent jobs and its campaigns' (as GM), newest first."""
+    token = _require_session(sta_session_token)
+    players = select(CampaignPlayerRecord).filter(
+        CampaignPlayerRecord.session_token == token
+    ).subquery()
+    stmt = select(JobRecord).filter(
+        or_(
+            JobRecord.created_by.in_(select(players.c.id)),
+            JobRecord.campaign_id.in_(
+                select(players.c.campaign_id).filter(players.c.is_gm == True)
+            ),
+        )
+    )
+    if status:
+        stmt = stmt.filter(JobRecord.status == status)
+    if kind:
+        stmt = stmt.filter(JobRecord.kind == kind)
+    if campaign_id is not None:
+        stmt = stmt.filter(JobRecord.campaign_id == campaign_id)
+    result = await db.execute(stmt.order_by(JobRecord.created_at.desc()).limit(limit))
+    return {"jobs": [job_to_dict(job) for job in result.scalars().all()]}
+
+
+@jobs_router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Job status and progress."""
+    return job_to_dict(await _get_job(job_id, sta_session_token, db))
+
+
+@jobs_router.post("/{job_id}/cancel")
+async def cancel_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Cancel a queued or running job."""
+    job = await _get_job(job_id, sta_session_token, db)
+    if not await job_runner.cancel(db, job_id):
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    await db.commit()
+    await db.refresh(job)
+    return job_to_dict(job)
+
+
+@jobs_router.get("/{job_id}/result")
+async def download_job_result(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """The JSON result of a completed job, as a download if it has a filename."""
+    job = await _get_job(job_id, sta_session_token, db)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    headers = {}
+    if job.result_filename:
+        headers["Content-Disposition"] = f'attachment; filename="{job.result_filename}"'
+    return Response(
+        content=job.result_json or "null", media_type="application/json", headers=headers
+    )
@@ -17,6 +17,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
 from sta.database.async_db import get_db
+from sta.database.pool_ledger import MOMENTUM_MAX, change_pool
+from sta.database.scene_graph import (
+    campaign_flowchart,
+    connect_scenes,
+    disconnect_scenes,
+    next_scene_candidates,
+    reachable_scene_ids,
+    scene_connections,
+    scene_distances,
+    scene_path,
+    set_scene_connections,
+)
 from sta.database.schema import (
     SceneRecord,
     CampaignRecord,
@@ -28,6 +40,7 @@ from sta.database.schema import (
     CampaignShipRecord,
     EncounterRecord,
     PersonnelEncounterRecord,
+    PersonnelParticipantRecord,
     SceneParticipantRecord,
     SceneShipRecord,
 )
@@ -285,13 +298,10 @@ async def remove_npc_from_scene(
 # =============================================================================
 
 
-@scenes_router.get("/{scene_id}/connections")
-async def get_scene_connections(
-    scene_id: int,
-    db: AsyncSession = Depends(get_db),
-    sta_session_token: Optional[str] = Cookie(None),
-):
-    """Get scene connections (next and previous scene IDs)."""
+async def _get_gm_scene(
+    scene_id: int, sta_session_token: Optional[str], db: AsyncSession
+) -> SceneRecord:
+    """Load a scene and check the caller is its campaign's GM."""
     scene_stmt = select(SceneRecord).filter(SceneRecord.id == scene_id)
     scene_result = await db.execute(scene_stmt)
     scene = scene_result.scalars().first()
@@ -300,10 +310,38 @@ async def get_scene_connections(
         raise HTTPException(status_code=404, detail="Scene not found")
 
     await _require_gm_auth(scene.campaign_id, sta_session_token, db)
+    return scene
+
+
+async def _get_connection_target(
+    db: AsyncSession, scene: SceneRecord, target_scene_id: int
+) -> SceneRecord:
+    if target_scene_id == scene.id:
+        raise HTTPException(status_code=400, detail="Cannot connect scene to itself")
+
+    target_stmt = select(SceneRecord).filter(SceneRecord.id == target_scene_id)
+    target_result = await db.execute(target_stmt)
+    target = target_result.scalars().first()
+
+    if not target:
+        raise HTTPException(status_code=400, detail="Target scene not found")
+
+    if target.campaign_id != scene.campaign_id:
+        raise HTTPException(
+            status_code=400, detail="Target scene must be in same campaign"
+        )
+    return target
 
-    next_ids = json.loads(scene.next_scene_ids_json or "[]")
-    previous_ids = json.loads(scene.previous_scene_ids_json or "[]")
-    return {"next_scene_ids": next_ids, "previous_scene_ids": previous_ids}
+
+@scenes_router.get("/{scene_id}/connections")
+async def get_scene_connections(
+    scene_id: int,
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Get scene connections (next and previous scene IDs)."""
+    await _get_gm_scene(scene_id, sta_session_token, db)
+    return await scene_connections(db, scene_id)
 
 
 @scenes_router.put("/{scene_id}/connections")
@@ -314,72 +352,29 @@ async def update_scene_connections(
     next_scene_ids: Optional[list] = Body(None, embed=True),
     previous_scene_ids: Optional[list] = Body(None, embed=True),
 ):
-    """Update scene connections (replace with given lists)."""
-    scene_stmt = select(SceneRecord).filter(SceneRecord.id == scene_id)
-    scene_result = await db.execute(scene_stmt)
-    scene = scene_result.scalars().first()
+    """Update scene connections (replace with given lists).
 
-    if not scene:
-        raise HTTPException(status_code=404, detail="Scene not found")
-
-    await _require_gm_auth(scene.campaign_id, sta_session_token, db)
-
-    current_next_ids = json.loads(scene.next_scene_ids_json or "[]")
-    current_previous_ids = json.loads(scene.previous_scene_ids_json or "[]")
-
-    if next_scene_ids is not None:
-        try:
-            next_ids_input = [int(i) for i in next_scene_ids]
-        except (ValueError, TypeError):
-            raise HTTPException(
-                status_code=400, detail="next_scene_ids must be integers"
-            )
-
-        valid_next_ids = []
-        for nid in next_ids_input:
-            target_stmt = select(SceneRecord).filter(
-                SceneRecord.id == nid,
-                SceneRecord.campaign_id == scene.campaign_id,
-            )
-            target_result = await db.execute(target_stmt)
-            target = target_result.scalars().first()
-            if target:
-                valid_next_ids.append(nid)
-        next_ids = valid_next_ids
-    else:
-        next_ids = current_next_ids
+    Ids that are not scenes of the same campaign are ignored.
+    """
+    scene = await _get_gm_scene(scene_id, sta_session_token, db)
 
-    if previous_scene_ids is not None:
+    for name, ids in (
+        ("next_scene_ids", next_scene_ids),
+        ("previous_scene_ids", previous_scene_ids),
+    ):
+        if ids is None:
+            continue
         try:
-            prev_ids_input = [int(i) for i in previous_scene_ids]
+            ids = [int(i) for i in ids]
         except (ValueError, TypeError):
-            raise HTTPException(
-                status_code=400, detail="previous_scene_ids must be integers"
-            )
-
-        valid_prev_ids = []
-        for pid in prev_ids_input:
-            target_stmt = select(SceneRecord).filter(
-                SceneRecord.id == pid,
-                SceneRecord.campaign_id == scene.campaign_id,
-            )
-            target_result = await db.execute(target_stmt)
-            target = target_result.scalars().first()
-            if target:
-                valid_prev_ids.append(pid)
-        previous_ids = valid_prev_ids
-    else:
-        previous_ids = current_previous_ids
+            raise HTTPException(status_code=400, detail=f"{name} must be integers")
+        direction = "next" if name == "next_scene_ids" else "previous"
+        await set_scene_connections(db, scene, ids, direction)
 
-    scene.next_scene_ids_json = json.dumps(next_ids)
-    scene.previous_scene_ids_json = json.dumps(previous_ids)
+    connections = await scene_connections(db, scene_id)
     await db.commit()
 
-    return {
-        "success": True,
-        "next_scene_ids": next_ids,
-        "previous_scene_ids": previous_ids,
-    }
+    return {"success": True, **connections}
 
 
 @scenes_router.post("/{scene_id}/connections/next")
@@ -390,51 +385,15 @@ async def add_next_connection(
     sta_session_token: Optional[str] = Cookie(None),
 ):
     """Add a next scene connection (bidirectional)."""
-    scene_stmt = select(SceneRecord).filter(SceneRecord.id == scene_id)
-    scene_result = await db.execute(scene_stmt)
-    scene = scene_result.scalars().first()
-
-    if not scene:
-        raise HTTPException(status_code=404, detail="Scene not found")
+    scene = await _get_gm_scene(scene_id, sta_session_token, db)
+    await _get_connection_target(db, scene, target_scene_id)
 
-    await _require_gm_auth(scene.campaign_id, sta_session_token, db)
-
-    if target_scene_id == scene_id:
-        raise HTTPException(status_code=400, detail="Cannot connect scene to itself")
-
-    next_ids = json.loads(scene.next_scene_ids_json or "[]")
-    if target_scene_id in next_ids:
+    if not await connect_scenes(db, scene.campaign_id, scene_id, target_scene_id):
         raise HTTPException(status_code=400, detail="Scenes already connected")
 
-    target_stmt = select(SceneRecord).filter(SceneRecord.id == target_scene_id)
-    target_result = await db.execute(target_stmt)
-    target = target_result.scalars().first()
-
-    if not target:
-        raise HTTPException(status_code=400, detail="Target scene not found")
-
-    if target.campaign_id != scene.campaign_id:
-        raise HTTPException(
-            status_code=400, detail="Target scene must be in same campaign"
-        )
-
-    next_ids.append(target_scene_id)
-    scene.next_scene_ids_json = json.dumps(next_ids)
-
-    previous_ids = json.loads(target.previous_scene_ids_json or "[]")
-    if scene_id not in previous_ids:
-        previous_ids.append(scene_id)
-        target.previous_scene_ids_json = json.dumps(previous_ids)
-
+    connections = await scene_connections(db, scene_id)
     await db.commit()
-
-    updated_next = json.loads(scene.next_scene_ids_json or "[]")
-    updated_previous = json.loads(scene.previous_scene_ids_json or "[]")
-    return {
-        "success": True,
-        "next_scene_ids": updated_next,
-        "previous_scene_ids": updated_previous,
-    }
+    return {"success": True, **connections}
 
 
 @scenes_router.post("/{scene_id}/connections/previous")
@@ -445,51 +404,15 @@ async def add_previous_connection(
     sta_session_token: Optional[str] = Cookie(None),
 ):
     """Add a previous scene connection."""
-    scene_stmt = select(SceneRecord).filter(SceneRecord.id == scene_id)
-    scene_result = await db.execute(scene_stmt)
-    scene = scene_result.scalars().first()
-
-    if not scene:
-        raise HTTPException(status_code=404, detail="Scene not found")
-
-    await _require_gm_auth(scene.campaign_id, sta_session_token, db)
-
-    if target_scene_id == scene_id:
-        raise HTTPException(status_code=400, detail="Cannot connect scene to itself")
+    scene = await _get_gm_scene(scene_id, sta_session_token, db)
+    await _get_connection_target(db, scene, target_scene_id)
 
-    previous_ids = json.loads(scene.previous_scene_ids_json or "[]")
-    if target_scene_id in previous_ids:
+    if not await connect_scenes(db, scene.campaign_id, target_scene_id, scene_id):
         raise HTTPException(status_code=400, detail="Connection already exists")
 
-    target_stmt = select(SceneRecord).filter(SceneRecord.id == target_scene_id)
-    target_result = await db.execute(target_stmt)
-    target = target_result.scalars().first()
-
-    if not target:
-        raise HTTPException(status_code=400, detail="Target scene not found")
-
-    if target.campaign_id != scene.campaign_id:
-        raise HTTPException(
-            status_code=400, detail="Target scene must be in same campaign"
-        )
-
-    previous_ids.append(target_scene_id)
-    scene.previous_scene_ids_json = json.dumps(previous_ids)
-
-    target_next_ids = json.loads(target.next_scene_ids_json or "[]")
-    if scene_id not in target_next_ids:
-        target_next_ids.append(scene_id)
-        target.next_scene_ids_json = json.dumps(target_next_ids)
-
+    connections = await scene_connections(db, scene_id)
     await db.commit()
-
-    updated_next = json.loads(scene.next_scene_ids_json or "[]")
-    updated_previous = previous_ids
-    return {
-        "success": True,
-        "next_scene_ids": updated_next,
-        "previous_scene_ids": updated_previous,
-    }
+    return {"success": True, **connections}
 
 
 @scenes_router.delete("/{scene_id}/connections/next/{target_id}")
@@ -500,46 +423,12 @@ async def remove_next_connection(
     sta_session_token: Optional[str] = Cookie(None),
 ):
     """Remove a next scene connection (bidirectional)."""
-    scene_stmt = select(SceneRecord).filter(SceneRecord.id == scene_id)
-    scene_result = await db.execute(scene_stmt)
-    scene = scene_result.scalars().first()
-
-    if not scene:
-        raise HTTPException(status_code=404, detail="Scene not found")
-
-    await _require_gm_auth(scene.campaign_id, sta_session_token, db)
-
-    next_ids = json.loads(scene.next_scene_ids_json or "[]")
-    if target_id not in next_ids:
-        updated_next = next_ids
-        updated_previous = json.loads(scene.previous_scene_ids_json or "[]")
-        return {
-            "success": True,
-            "next_scene_ids": updated_next,
-            "previous_scene_ids": updated_previous,
-        }
-
-    new_next = [i for i in next_ids if i != target_id]
-    scene.next_scene_ids_json = json.dumps(new_next)
-
-    target_stmt = select(SceneRecord).filter(SceneRecord.id == target_id)
-    target_result = await db.execute(target_stmt)
-    target = target_result.scalars().first()
-
-    if target:
-        previous_ids = json.loads(target.previous_scene_ids_json or "[]")
-        new_previous = [i for i in previous_ids if i != scene_id]
-        target.previous_scene_ids_json = json.dumps(new_previous)
+    await _get_gm_scene(scene_id, sta_session_token, db)
+    await disconnect_scenes(db, scene_id, target_id)
 
+    connections = await scene_connections(db, scene_id)
     await db.commit()
-
-    updated_next = new_next
-    updated_previous = json.loads(scene.previous_scene_ids_json or "[]")
-    return {
-        "success": True,
-        "next_scene_ids": updated_next,
-        "previous_scene_ids": updated_previous,
-    }
+    return {"success": True, **connections}
 
 
 @scenes_router.delete("/{scene_id}/connections/previous/{target_id}")
@@ -550,46 +439,59 @@ async def remove_previous_connection(
     sta_session_token: Optional[str] = Cookie(None),
 ):
     """Remove a previous scene connection."""
-    scene_stmt = select(SceneRecord).filter(SceneRecord.id == scene_id)
-    scene_result = await db.execute(scene_stmt)
-    scene = scene_result.scalars().first()
+    await _get_gm_scene(scene_id, sta_session_token, db)
+    await disconnect_scenes(db, target_id, scene_id)
 
-    if not scene:
-        raise HTTPException(status_code=404, detail="Scene not found")
+    connections = await scene_connections(db, scene_id)
+    await db.commit()
+    return {"success": True, **connections}
 
-    await _require_gm_auth(scene.campaign_id, sta_session_token, db)
 
-    previous_ids = json.loads(scene.previous_scene_ids_json or "[]")
-    if target_id not in previous_ids:
-        updated_next = json.loads(scene.next_scene_ids_json or "[]")
-        updated_previous = previous_ids
-        return {
-            "success": True,
-            "next_scene_ids": updated_next,
-            "previous_scene_ids": updated_previous,
-        }
+@scenes_router.get("/{scene_id}/reachable")
+async def get_reachable_scenes(
+    scene_id: int,
+    direction: str = Query("next"),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """Scenes reachable from a scene (or leading to it), with their distance."""
+    if direction not in ("next", "previous"):
+        raise HTTPException(status_code=400, detail="direction must be 'next' or 'previous'")
+    await _get_gm_scene(scene_id, sta_session_token, db)
 
-    new_previous = [i for i in previous_ids if i != target_id]
-    scene.previous_scene_ids_json = json.dumps(new_previous)
+    reachable = await reachable_scene_ids(db, scene_id, direction)
+    distances = await scene_distances(db, scene_id, direction)
+    return {
+        "scene_id": scene_id,
+        "direction": direction,
+        "scenes": [
+            {"id": id, "distance": distances.get(id)} for id in sorted(reachable)
+        ],
+    }
 
-    target_stmt = select(SceneRecord).filter(SceneRecord.id == target_id)
-    target_result = await db.execute(target_stmt)
-    target = target_result.scalars().first()
 
-    if target:
-        target_next_ids = json.loads(target.next_scene_ids_json or "[]")
-        new_target_next = [i for i in target_next_ids if i != scene_id]
-        target.next_scene_ids_json = json.dumps(new_target_next)
+@scenes_router.get("/{scene_id}/path/{target_id}")
+async def get_scene_path(
+    scene_id: int,
+    target_id: int,
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """A shortest chain of next-scene connections from one scene to another."""
+    await _get_gm_scene(scene_id, sta_session_token, db)
+    path = await scene_path(db, scene_id, target_id)
+    return {"path": path, "reachable": path is not None}
 
-    await db.commit()
 
-    updated_next = json.loads(scene.next_scene_ids_json or "[]")
-    updated_previous = new_previous
-    return {
-        "success": True,
-        "next_scene_ids": updated_next,
-        "previous_scene_ids": updated_previous,
-    }
+@scenes_router.get("/campaign/{campaign_id}/flowchart")
+async def get_campaign_flowchart(
+    campaign_id: int,
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """The campaign's whole scene graph (scenes, edges, roots), cached."""
+    await _require_gm_auth(campaign_id, sta_session_token, db)
+    return await campaign_flowchart(db, campaign_id)
 
 
 # =============================================================================
@@ -1035,18 +937,8 @@ async def get_closing_options(
 
     await _require_gm_auth(scene.campaign_id, sta_session_token, db)
 
-    next_ids = json.loads(scene.next_scene_ids_json or "[]")
-    draft_next_stmt = select(SceneRecord).filter(
-        SceneRecord.id.in_(next_ids),
-        SceneRecord.status == "draft",
-    )
-    draft_next_result = await db.execute(draft_next_stmt)
-    draft_next = draft_next_result.scalars().all()
-
     return {
-        "next_scene_candidates": [
-            {"id": s.id, "name": s.name, "status": s.status} for s in draft_next
-        ],
+        "next_scene_candidates": await next_scene_candidates(db, scene.id),
         "allow_create_new": True,
         "allow_return_overview": True,
     }
@@ -1124,7 +1016,7 @@ async def activate_scene(
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    campaign.momentum = max(0, campaign.momentum - 1)
+    await change_pool(db, campaign, "momentum", -1, "scene_started", scene_id=scene.id)
 
     response_data = {"success": True, "scene_id": scene.id, "status": scene.status}
 
@@ -1181,7 +1073,7 @@ async def activate_scene(
     elif scene.scene_type == "personal_encounter":
         participants_stmt = select(SceneParticipantRecord).filter(
             SceneParticipantRecord.scene_id == scene.id
-        )
+        ).order_by(SceneParticipantRecord.id)
         participants_result = await db.execute(participants_stmt)
         participants = participants_result.scalars().all()
 
@@ -1191,41 +1083,43 @@ async def activate_scene(
                 detail="Personal encounter must have at least one participant",
             )
 
-        character_states = []
-        for p in participants:
-            char_stmt = select(VTTCharacterRecord).filter(
-                VTTCharacterRecord.id == p.character_id
+        characters_result = await db.execute(
+            select(VTTCharacterRecord).filter(
+                VTTCharacterRecord.id.in_([p.character_id for p in participants])
             )
-            char_result = await db.execute(char_stmt)
-            char = char_result.scalars().first()
-            if not char:
-                continue
-
-            is_player = p.player_id is not None
-            char_state = {
-                "character_id": char.id,
-                "name": char.name,
-                "is_player": is_player,
-                "stress": char.stress,
-                "determination": char.determination,
-                "stress_max": char.stress_max,
-                "determination_max": char.determination_max,
-                "is_defeated": char.stress >= char.stress_max,
-                "injuries": [],
-                "protection": 0,
-            }
-            character_states.append(char_state)
+        )
+        characters_by_id = {char.id: char for char in characters_result.scalars().all()}
 
         encounter = PersonnelEncounterRecord(
             scene_id=scene.id,
             momentum=campaign.momentum,
             threat=campaign.threat,
-            character_states_json=json.dumps(character_states),
             tactical_map_json=scene.tactical_map_json or "{}",
             is_active=True,
         )
         db.add(encounter)
         await db.flush()
+
+        present = [
+            (p, characters_by_id[p.character_id])
+            for p in participants
+            if p.character_id in characters_by_id
+        ]
+        db.add_all(
+            PersonnelParticipantRecord(
+                personnel_encounter_id=encounter.id,
+                slot=slot,
+                character_id=char.id,
+                name=char.name,
+                is_player=p.player_id is not None,
+                stress=char.stress,
+                stress_max=char.stress_max,
+                determination=char.determination,
+                determination_max=char.determination_max,
+                is_defeated=char.stress >= char.stress_max,
+            )
+            for slot, (p, char) in enumerate(present)
+        )
         response_data["personnel_encounter_id"] = encounter.id
 
     scene.status = "active"
@@ -1314,7 +1208,9 @@ async def end_scene(
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    campaign.momentum = max(0, min(campaign.momentum, 6) - 1)
+    await change_pool(
+        db, campaign, "momentum", -1, "scene_ended", maximum=MOMENTUM_MAX, scene_id=scene.id
+    )
     scene.status = "completed"
 
     if scene.encounter_id:
@@ -1336,18 +1232,8 @@ async def end_scene(
 
     await db.commit()
 
-    next_ids = json.loads(scene.next_scene_ids_json or "[]")
-    draft_next_stmt = select(SceneRecord).filter(
-        SceneRecord.id.in_(next_ids),
-        SceneRecord.status == "draft",
-    )
-    draft_next_result = await db.execute(draft_next_stmt)
-    draft_next = draft_next_result.scalars().all()
-
     closing_opts = {
-        "next_scene_candidates": [
-            {"id": s.id, "name": s.name, "status": s.status} for s in draft_next
-        ],
+        "next_scene_candidates": await next_scene_candidates(db, scene.id),
         "allow_create_new": True,
         "allow_return_overview": True,
     }
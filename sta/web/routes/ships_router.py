@@ -14,6 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from sta.database.async_db import get_db
+from sta.database.undo import encounter_for_scene, record_undo
 from sta.database.schema import (
     CampaignRecord,
     CampaignPlayerRecord,
@@ -22,6 +23,7 @@ from sta.database.vtt_schema import (
     VTTShipRecord,
 )
 from sta.models.enums import SystemType, CrewQuality
+from sta.mechanics.action_config import action_availability_cache
 
 ships_router = APIRouter(tags=["ships"])
 
@@ -60,6 +62,13 @@ def _serialize_ship(ship: VTTShipRecord) -> dict:
     }
 
 
+async def _record_ship_undo(db: AsyncSession, ship: VTTShipRecord, label: str) -> None:
+    """Make a ship change undoable when its scene is played out as an encounter."""
+    encounter = await encounter_for_scene(db, ship.scene_id)
+    if encounter:
+        await record_undo(db, encounter, f"{label}: {ship.name}")
+
+
 # =============================================================================
 # Ship CRUD Endpoints
 # =============================================================================
@@ -307,6 +316,7 @@ async def update_ship(
     if vtt_status_effects_json is not None:
         ship.vtt_status_effects_json = vtt_status_effects_json
 
+    await _record_ship_undo(db, ship, "Edit ship")
     await db.commit()
     await db.refresh(ship)
     return _serialize_ship(ship)
@@ -441,6 +451,7 @@ async def adjust_shields(
     if raised is not None:
         ship.shields_raised = raised
 
+    await _record_ship_undo(db, ship, "Adjust shields")
     await db.commit()
 
     return {
@@ -478,6 +489,7 @@ async def adjust_power(
     if reserve is not None:
         ship.has_reserve_power = reserve
 
+    await _record_ship_undo(db, ship, "Adjust power")
     await db.commit()
 
     return {
@@ -528,6 +540,7 @@ async def adjust_breach(
         raise HTTPException(status_code=400, detail="action must be 'add' or 'remove'")
 
     ship.breaches_json = json.dumps(breaches)
+    await _record_ship_undo(db, ship, f"Breach {system}")
     await db.commit()
 
     return {
@@ -535,6 +548,29 @@ async def adjust_breach(
     }
 
 
+@ships_router.get("/ships/{ship_id}/action-availability")
+async def get_ship_action_availability(ship_id: int, db: AsyncSession = Depends(get_db)):
+    """Get availability of all actions for the ship's breaches, shields and power."""
+    stmt = select(
+        VTTShipRecord.scale,
+        VTTShipRecord.breaches_json,
+        VTTShipRecord.shields,
+        VTTShipRecord.has_reserve_power,
+    ).filter(VTTShipRecord.id == ship_id)
+    row = (await db.execute(stmt)).first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Ship not found")
+
+    return action_availability_cache.get_or_build(
+        ("vtt_ships", ship_id),
+        row.scale,
+        row.breaches_json,
+        row.shields,
+        row.has_reserve_power,
+    )
+
+
 # =============================================================================
 # Ship Weapons Endpoints
 # =============================================================================
@@ -555,6 +591,7 @@ async def update_weapons(
         raise HTTPException(status_code=404, detail="Ship not found")
 
     ship.weapons_json = json.dumps(weapons)
+    await _record_ship_undo(db, ship, "Update weapons")
     await db.commit()
 
     return {
@@ -589,6 +626,7 @@ async def arm_weapon(
         raise HTTPException(status_code=404, detail=f"Weapon '{weapon_name}' not found")
 
     ship.weapons_armed = armed
+    await _record_ship_undo(db, ship, "Arm weapons")
     await db.commit()
 
     return {
@@ -642,6 +680,7 @@ async def set_crew_quality(
             )
 
     ship.crew_quality = crew_quality
+    await _record_ship_undo(db, ship, "Set crew quality")
     await db.commit()
 
     return {
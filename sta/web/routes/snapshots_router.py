@@ -0,0 +1,75 @@
+"""Database snapshot routes: list and take online backups (FastAPI).
+
+Restoring is deliberately not exposed over HTTP; use
+``python scripts/backup_db.py restore <name>`` with the server stopped.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sta.database.async_db import engine, get_db
+from sta.database.backup import create_snapshot, database_path, list_snapshots, prune_snapshots
+from sta.database.config import settings
+from sta.database.schema import CampaignPlayerRecord
+from sta.web.jobs import run_or_queue
+
+snapshots_router = APIRouter(prefix="/snapshots", tags=["snapshots"])
+
+
+async def _require_gm_auth(sta_session_token: Optional[str], db: AsyncSession) -> None:
+    """Snapshots cover every campaign, so any campaign's GM session will do."""
+    if sta_session_token:
+        result = await db.execute(
+            select(CampaignPlayerRecord.id).filter(
+                CampaignPlayerRecord.session_token == sta_session_token,
+                CampaignPlayerRecord.is_gm == True,
+            )
+        )
+        if result.first() is not None:
+            return
+    raise HTTPException(status_code=401, detail="GM authentication required")
+
+
+@snapshots_router.get("")
+async def get_snapshots():
+    """Snapshots in the backup directory, newest first, and the schedule."""
+    return {
+        "snapshots": [snapshot.to_dict() for snapshot in list_snapshots(Path(settings.BACKUP_DIR))],
+        "interval_minutes": settings.BACKUP_INTERVAL_MINUTES,
+        "keep": settings.BACKUP_KEEP,
+        "compress": settings.BACKUP_COMPRESS,
+    }
+
+
+@snapshots_router.post("")
+async def take_snapshot(
+    background: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """
+    Take a snapshot of the live database now, then prune old ones (GM only).
+    With ?background=true it runs as a job (see /api/jobs).
+    """
+    await _require_gm_auth(sta_session_token, db)
+    source = database_path(engine)
+    if source is None:
+        raise HTTPException(status_code=409, detail="Snapshots need a database file")
+    directory = Path(settings.BACKUP_DIR)
+
+    async def work(job, db):
+        def progress(copied, total):
+            job.report(copied * 100 // max(total, 1), f"Copied {copied} of {total} pages")
+
+        snapshot = await job.run_sync(create_snapshot, source, directory, progress=progress)
+        removed = await job.run_sync(prune_snapshots, directory)
+        return {**snapshot.to_dict(), "pruned": [path.name for path in removed]}
+
+    return await run_or_queue(
+        background, "db_snapshot", work, db,
+        session_token=sta_session_token,
+    )
@@ -7,13 +7,17 @@ from sqlalchemy import select
 from starlette.templating import Jinja2Templates
 
 from sta.database.async_db import get_db
+from sta.database.dashboard import (
+    campaign_sidebar,
+    first_with_status,
+    status_counts,
+    status_page,
+)
 from sta.database.schema import (
     CampaignRecord,
     CampaignPlayerRecord,
     SceneRecord,
     EncounterRecord,
-    CampaignShipRecord,
-    StarshipRecord,
     CharacterRecord,
 )
 from werkzeug.security import check_password_hash
@@ -176,6 +180,8 @@ async def campaign_dashboard(
     campaign_id: str,
     request: Request,
     sta_session_token: str = Cookie(None),
+    drafts_page: int = Query(1, ge=1),
+    completed_page: int = Query(1, ge=1),
     db: AsyncSession = Depends(get_db),
 ):
     stmt = select(CampaignRecord).filter(CampaignRecord.campaign_id == campaign_id)
@@ -185,61 +191,29 @@ async def campaign_dashboard(
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    is_gm = False
-    current_player = None
-
-    if sta_session_token:
-        player_stmt = select(CampaignPlayerRecord).filter(
-            CampaignPlayerRecord.campaign_id == campaign.id,
-            CampaignPlayerRecord.session_token == sta_session_token,
-        )
-        player_result = await db.execute(player_stmt)
-        player = player_result.scalars().first()
-        if player:
-            is_gm = player.is_gm
-            current_player = player
+    sidebar = await campaign_sidebar(db, campaign)
+    current_player = sidebar.player_for_token(sta_session_token)
+    is_gm = bool(current_player and current_player.is_gm)
 
-    players_stmt = select(CampaignPlayerRecord).filter(
-        CampaignPlayerRecord.campaign_id == campaign.id
+    counts = await status_counts(db, campaign.id)
+    drafts_pages = max(
+        counts.pages("scenes", "draft"), counts.pages("encounters", "draft")
     )
-    players_result = await db.execute(players_stmt)
-    players = players_result.scalars().all()
+    drafts_page = min(drafts_page, drafts_pages)
+    completed_pages = counts.pages("encounters", "completed")
+    completed_page = min(completed_page, completed_pages)
 
-    ships_stmt = select(CampaignShipRecord).filter(
-        CampaignShipRecord.campaign_id == campaign.id
+    active_scene_data = await first_with_status(db, SceneRecord, campaign.id, "active")
+    active_encounter = await first_with_status(
+        db, EncounterRecord, campaign.id, "active"
     )
-    ships_result = await db.execute(ships_stmt)
-    ships = ships_result.scalars().all()
-
-    active_ship = None
-    if campaign.active_ship_id:
-        ship_stmt = select(StarshipRecord).filter(
-            StarshipRecord.id == campaign.active_ship_id
-        )
-        ship_result = await db.execute(ship_stmt)
-        active_ship = ship_result.scalars().first()
-
-    scenes_stmt = select(SceneRecord).filter(SceneRecord.campaign_id == campaign.id)
-    scenes_result = await db.execute(scenes_stmt)
-    scenes = scenes_result.scalars().all()
-
-    draft_scenes = [s for s in scenes if s.status == "draft"]
-    completed_scenes = [s for s in scenes if s.status == "completed"]
-
-    active_scene_data = None
-    active_scene = next((s for s in scenes if s.status == "active"), None)
-    if active_scene:
-        active_scene_data = active_scene
-
-    encounters_stmt = select(EncounterRecord).filter(
-        EncounterRecord.campaign_id == campaign.id
+    draft_scenes = await status_page(db, SceneRecord, campaign.id, "draft", drafts_page)
+    draft_encounters = await status_page(
+        db, EncounterRecord, campaign.id, "draft", drafts_page
+    )
+    completed_encounters = await status_page(
+        db, EncounterRecord, campaign.id, "completed", completed_page, newest_first=True
     )
-    encounters_result = await db.execute(encounters_stmt)
-    encounters = encounters_result.scalars().all()
-
-    active_encounter = next((e for e in encounters if e.status == "active"), None)
-    draft_encounters = [e for e in encounters if e.status == "draft"]
-    completed_encounters = [e for e in encounters if e.status == "completed"]
 
     return templates.TemplateResponse(
         request,
@@ -252,15 +226,23 @@ async def campaign_dashboard(
             },
             "is_gm": is_gm,
             "current_player": current_player,
-            "players": [{"id": p.id, "player_name": p.player_name} for p in players],
-            "ships": list(ships),
-            "active_ship": active_ship,
+            "players": [
+                {"id": p.id, "player_name": p.player_name, "is_gm": p.is_gm}
+                for p in sidebar.players
+            ],
+            "ships": sidebar.ships,
+            "active_ship": sidebar.active_ship,
             "draft_scenes": draft_scenes,
-            "completed_scenes": completed_scenes,
             "active_scene_data": active_scene_data,
             "active_encounter": active_encounter,
             "draft_encounters": draft_encounters,
             "completed_encounters": completed_encounters,
+            "scene_count": counts.total("scenes"),
+            "encounter_count": counts.total("encounters"),
+            "drafts_page": drafts_page,
+            "drafts_pages": drafts_pages,
+            "completed_page": completed_page,
+            "completed_pages": completed_pages,
             "flash_message": None,
         },
     )
@@ -3,11 +3,12 @@
 import json
 import uuid
 import asyncio
+import random
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Body, Query, status, Cookie
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete as sqlalchemy_delete
+from sqlalchemy import insert, select, delete as sqlalchemy_delete
 from sta.database.async_db import get_db
 from sta.database.schema import (
     CampaignRecord,
@@ -24,6 +25,9 @@ from sta.database.vtt_schema import (
 )
 from sta.models.character import Character  # Used by serialization check
 from sta.models.starship import Starship  # Used by generation stub
+from sta.models.enums import CrewQuality
+from sta.generators.bulk import BULK_MAX_COUNT, character_rows, ship_rows
+from sta.web.jobs import run_or_queue
 
 universe_router = APIRouter(prefix="/universe")
 
@@ -312,6 +316,77 @@ async def delete_universe_item(item_id: int, db: AsyncSession = Depends(get_db))
     return {"success": True}
 
 
+# ========== BULK GENERATION ==========
+
+
+@universe_router.post("/generate", status_code=status.HTTP_201_CREATED)
+async def generate_library_items(
+    data: dict = Body(...),
+    background: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    sta_session_token: Optional[str] = Cookie(None),
+):
+    """
+    API: Generate random NPCs or ships into the library in bulk.
+
+    Body: item_type ("character" or "ship"), count, and optionally seed,
+    category (characters only), faction and crew_quality (ships only).
+    The seed is returned so a batch can be reproduced. Rows are generated
+    in chunks on the job thread pool and inserted chunk by chunk; with
+    ?background=true this runs as a job (see /api/jobs).
+    """
+    item_type = data.get("item_type", "character")
+    if item_type not in VALID_ITEM_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid item_type. Must be one of: {VALID_ITEM_TYPES}",
+        )
+    count = data.get("count")
+    if not isinstance(count, int) or not 1 <= count <= BULK_MAX_COUNT:
+        raise HTTPException(
+            status_code=400, detail=f"count must be between 1 and {BULK_MAX_COUNT}"
+        )
+    seed = data.get("seed")
+    if seed is None:
+        seed = random.randrange(2**32)
+    elif not isinstance(seed, int):
+        raise HTTPException(status_code=400, detail="seed must be an integer")
+
+    if item_type == "character":
+        category = data.get("category", "npcs")
+        if category not in VALID_CATEGORIES or category == "ships":
+            raise HTTPException(status_code=400, detail="Invalid character category")
+        chunks = character_rows(count, seed, category=category)
+    else:
+        category = "ships"
+        crew_quality = data.get("crew_quality")
+        try:
+            crew_quality = CrewQuality(crew_quality) if crew_quality else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid crew_quality")
+        chunks = ship_rows(
+            count, seed, faction=data.get("faction", "any"), crew_quality=crew_quality
+        )
+
+    async def work(job, db):
+        created = 0
+        while rows := await job.run_sync(next, chunks, None):
+            await db.execute(insert(UniverseItemRecord), rows)
+            created += len(rows)
+            await job.progress(created * 100 // count, f"Generated {created} of {count}")
+        return {
+            "item_type": item_type,
+            "category": category,
+            "count": created,
+            "seed": seed,
+        }
+
+    return await run_or_queue(
+        background, "universe_generate", work, db,
+        session_token=sta_session_token,
+    )
+
+
 @universe_router.get("/characters", response_model=List[Dict[str, Any]])
 async def list_characters(
     category: Optional[str] = Query(None),
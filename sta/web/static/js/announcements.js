@@ -9,11 +9,11 @@ class CombatAnnouncements {
     constructor(encounterId, options = {}) {
         this.encounterId = encounterId;
         this.lastLogId = null;
-        this.pollInterval = options.pollInterval || 2000; // Poll every 2 seconds
+        this.pollInterval = options.pollInterval || 2000; // Pace when the server recommends none
         this.displayDuration = options.displayDuration || 6000; // Show for 6 seconds
         this.isDisplaying = false;
         this.announcementQueue = [];
-        this.pollingTimer = null;
+        this.poller = null;
 
         // Display mode: 'modal' (old fullscreen), 'banner' (persistent top bar), 'tts-only' (no visual)
         this.displayMode = options.displayMode || 'banner';
@@ -235,14 +235,16 @@ class CombatAnnouncements {
         // Initial fetch to get latest ID (don't display)
         await this.fetchInitialLog();
 
-        // Poll for new entries
-        this.pollingTimer = setInterval(() => this.pollForNewActions(), this.pollInterval);
+        // Poll for new entries (see polling.js)
+        this.poller = new Poller(poll => this.pollForNewActions(poll), {
+            interval: this.pollInterval
+        }).start();
     }
 
     stopPolling() {
-        if (this.pollingTimer) {
-            clearInterval(this.pollingTimer);
-            this.pollingTimer = null;
+        if (this.poller) {
+            this.poller.stop();
+            this.poller = null;
         }
     }
 
@@ -260,14 +262,14 @@ class CombatAnnouncements {
         }
     }
 
-    async pollForNewActions() {
+    async pollForNewActions(poll = Poller.direct) {
         try {
             let url = `/api/encounter/${this.encounterId}/combat-log?limit=10&role=${this.role}`;
             if (this.lastLogId) {
                 url += `&since_id=${this.lastLogId}`;
             }
 
-            const response = await fetch(url);
+            const response = await poll.fetch(url);
             if (!response.ok) return;
 
             const data = await response.json();
@@ -0,0 +1,122 @@
+/**
+ * MessagePack decoding for the API's compact responses
+ *
+ * The encounter and API routes answer in MessagePack instead of JSON when
+ * asked to (see sta/web/negotiation.py). MsgPack.fetch() asks, and gives
+ * back the response with json() decoding whichever format arrived, so
+ * callers don't change:
+ *
+ *     const response = await MsgPack.fetch(`/api/encounter/${encounterId}/status`);
+ *     const data = await response.json();
+ *
+ * Only the JSON data model is decoded (nil, bools, ints, floats, strings,
+ * arrays, maps, plus bin as Uint8Array); extension types are rejected.
+ */
+
+const MsgPack = (() => {
+    const ACCEPT = 'application/msgpack, application/json;q=0.9';
+    const utf8 = new TextDecoder();
+
+    function decode(buffer) {
+        const bytes = buffer instanceof Uint8Array ? buffer : new Uint8Array(buffer);
+        const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+        let pos = 0;
+
+        function str(size) {
+            const start = pos;
+            pos += size;
+            // Short ASCII strings (most keys) are quicker by hand than TextDecoder
+            if (size < 24) {
+                let out = '';
+                for (let i = start; i < pos; i++) {
+                    const c = bytes[i];
+                    if (c > 0x7f) return utf8.decode(bytes.subarray(start, pos));
+                    out += String.fromCharCode(c);
+                }
+                return out;
+            }
+            return utf8.decode(bytes.subarray(start, pos));
+        }
+
+        function array(size) {
+            const out = new Array(size);
+            for (let i = 0; i < size; i++) out[i] = read();
+            return out;
+        }
+
+        function map(size) {
+            const out = {};
+            for (let i = 0; i < size; i++) {
+                const key = read();
+                out[key] = read();
+            }
+            return out;
+        }
+
+        function read() {
+            const marker = bytes[pos++];
+            if (marker < 0x80) return marker;
+            if (marker >= 0xe0) return marker - 0x100;
+            if (marker >= 0xa0 && marker <= 0xbf) return str(marker & 0x1f);
+            if (marker >= 0x90 && marker <= 0x9f) return array(marker & 0x0f);
+            if (marker >= 0x80 && marker <= 0x8f) return map(marker & 0x0f);
+
+            let value;
+            switch (marker) {
+                case 0xc0: return null;
+                case 0xc2: return false;
+                case 0xc3: return true;
+                case 0xca: value = view.getFloat32(pos); pos += 4; return value;
+                case 0xcb: value = view.getFloat64(pos); pos += 8; return value;
+                case 0xcc: return bytes[pos++];
+                case 0xcd: value = view.getUint16(pos); pos += 2; return value;
+                case 0xce: value = view.getUint32(pos); pos += 4; return value;
+                case 0xcf: value = Number(view.getBigUint64(pos)); pos += 8; return value;
+                case 0xd0: return view.getInt8(pos++);
+                case 0xd1: value = view.getInt16(pos); pos += 2; return value;
+                case 0xd2: value = view.getInt32(pos); pos += 4; return value;
+                case 0xd3: value = Number(view.getBigInt64(pos)); pos += 8; return value;
+                case 0xd9: return str(bytes[pos++]);
+                case 0xda: value = view.getUint16(pos); pos += 2; return str(value);
+                case 0xdb: value = view.getUint32(pos); pos += 4; return str(value);
+                case 0xdc: value = view.getUint16(pos); pos += 2; return array(value);
+                case 0xdd: value = view.getUint32(pos); pos += 4; return array(value);
+                case 0xde: value = view.getUint16(pos); pos += 2; return map(value);
+                case 0xdf: value = view.getUint32(pos); pos += 4; return map(value);
+                case 0xc4: case 0xc5: case 0xc6: {
+                    const width = marker === 0xc4 ? 1 : marker === 0xc5 ? 2 : 4;
+                    const size = width === 1 ? bytes[pos] : width === 2 ? view.getUint16(pos) : view.getUint32(pos);
+                    pos += width;
+                    value = bytes.slice(pos, pos + size);
+                    pos += size;
+                    return value;
+                }
+            }
+            throw new Error(`Unsupported MessagePack marker 0x${marker.toString(16)}`);
+        }
+
+        const result = read();
+        if (pos !== bytes.length) throw new Error('Extra bytes after MessagePack value');
+        return result;
+    }
+
+    function isMsgPack(response) {
+        return (response.headers.get('Content-Type') || '').startsWith('application/msgpack');
+    }
+
+    // fetch() asking for MessagePack; response.json() decodes either format
+    async function fetchCompact(url, options = {}) {
+        const headers = new Headers(options.headers || {});
+        if (!headers.has('Accept')) headers.set('Accept', ACCEPT);
+        const response = await fetch(url, { ...options, headers });
+        if (isMsgPack(response)) {
+            response.json = async () => decode(await response.arrayBuffer());
+        }
+        return response;
+    }
+
+    return { ACCEPT, decode, fetch: fetchCompact, isMsgPack };
+})();
+
+// Export for use in templates
+window.MsgPack = MsgPack;
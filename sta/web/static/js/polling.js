@@ -0,0 +1,152 @@
+/**
+ * Adaptive polling for the encounter pages
+ *
+ * Replaces fixed setInterval polls. A Poller runs its task, which reads
+ * the polled endpoints through poll.fetch(), then schedules the next run:
+ *
+ * - The server's X-Poll-Interval header (milliseconds) sets the pace;
+ *   without one the poller's own interval is used
+ * - While responses stay the same the delay doubles, up to maxInterval,
+ *   so a page left open on a paused game slows right down
+ * - As soon as a response changes the delay drops back to the server's
+ *   pace, and every other poller on the page is brought forward too
+ * - A hidden tab polls at maxInterval; showing it polls at once
+ *
+ * Polls ask for JSON, and the encounter pages stay on it; responses are
+ * gzipped. The server also answers in MessagePack when asked, so a page
+ * can opt in by loading msgpack.js and setting Poller.msgpack = true
+ * (response.json() still returns the decoded data).
+ *
+ * Usage:
+ *     async function fetchStatus(poll = Poller.direct) {
+ *         const response = await poll.fetch(`/api/encounter/${encounterId}/status`);
+ *         ...
+ *     }
+ *     new Poller(fetchStatus, { interval: 2000 }).start();
+ */
+
+function pollFetch(url, options) {
+    return Poller.msgpack && window.MsgPack ? MsgPack.fetch(url, options) : fetch(url, options);
+}
+
+class PollRun {
+    constructor() {
+        this.hint = null;
+        this.bodies = [];
+    }
+
+    async fetch(url, options) {
+        const response = await pollFetch(url, options);
+        const hint = parseInt(response.headers.get('X-Poll-Interval'), 10);
+        if (!Number.isNaN(hint)) {
+            this.hint = this.hint === null ? hint : Math.min(this.hint, hint);
+        }
+        if (response.ok) {
+            this.bodies.push(new Uint8Array(await response.clone().arrayBuffer()));
+        }
+        return response;
+    }
+
+    sameBodies(other) {
+        return other !== null && other.length === this.bodies.length &&
+            this.bodies.every((body, i) => {
+                const old = other[i];
+                if (old.length !== body.length) return false;
+                for (let j = 0; j < body.length; j++) {
+                    if (old[j] !== body[j]) return false;
+                }
+                return true;
+            });
+    }
+}
+
+class Poller {
+    constructor(task, options = {}) {
+        this.task = task;
+        this.interval = options.interval || 2000;  // Pace when the server sends none
+        this.maxInterval = options.maxInterval || 60000;  // Slowest idle pace
+        this.backoff = options.backoff || 2;  // Idle delay multiplier per unchanged run
+        this.pace = this.interval;  // Latest server pace
+        this.delay = this.interval;
+        this.lastBodies = null;
+        this.timer = null;
+        this.dueAt = null;
+        this.running = false;
+        this.busy = false;
+    }
+
+    start(delay = this.interval) {
+        if (this.running) return this;
+        this.running = true;
+        Poller.active.add(this);
+        this.schedule(delay);
+        return this;
+    }
+
+    stop() {
+        this.running = false;
+        Poller.active.delete(this);
+        clearTimeout(this.timer);
+        this.timer = null;
+    }
+
+    schedule(delay) {
+        clearTimeout(this.timer);
+        this.dueAt = Date.now() + delay;
+        this.timer = setTimeout(() => this.run(), delay);
+    }
+
+    // Poll now (e.g. right after this page changed something)
+    poke() {
+        if (this.running && !this.busy) this.schedule(0);
+    }
+
+    // Poll at the server's pace if backed off beyond it
+    hurry() {
+        if (this.running && !this.busy && this.dueAt - Date.now() > this.pace) {
+            this.delay = this.pace;
+            this.schedule(this.pace);
+        }
+    }
+
+    async run() {
+        this.busy = true;
+        const poll = new PollRun();
+        try {
+            await this.task(poll);
+        } catch (error) {
+            console.error('Poll failed:', error);
+        }
+        this.busy = false;
+        if (!this.running) return;
+
+        this.pace = poll.hint === null ? this.interval : poll.hint;
+        const changed = poll.bodies.length > 0 && !poll.sameBodies(this.lastBodies);
+        this.lastBodies = poll.bodies;
+
+        if (changed) {
+            this.delay = this.pace;
+            Poller.active.forEach(other => other !== this && other.hurry());
+        } else {
+            this.delay = Math.min(Math.max(this.delay * this.backoff, this.pace), this.maxInterval);
+        }
+        this.schedule(document.hidden ? this.maxInterval : this.delay);
+    }
+
+    static pokeAll() {
+        Poller.active.forEach(poller => poller.poke());
+    }
+}
+
+Poller.active = new Set();
+Poller.msgpack = false;  // Set by pages that poll in MessagePack (needs msgpack.js)
+
+// For calling a poll task directly, outside a Poller
+Poller.direct = { fetch: pollFetch };
+
+document.addEventListener('visibilitychange', () => {
+    if (!document.hidden) Poller.pokeAll();
+});
+
+// Export for use in templates
+window.Poller = Poller;
@@ -12,6 +12,7 @@ from unittest.mock import patch, MagicMock
 import random
 import asyncio
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.pool import StaticPool
 
@@ -64,7 +65,7 @@ async def test_session():
 @pytest.fixture(scope="function")
 async def app(test_session):
     from sta.web.app import create_app
-    from sta.database.async_db import get_db
+    from sta.database.async_db import get_db, get_read_db
 
     fastapi_app = create_app()
 
@@ -72,6 +73,7 @@ async def app(test_session):
         yield test_session
 
     fastapi_app.dependency_overrides[get_db] = override_get_db
+    fastapi_app.dependency_overrides[get_read_db] = override_get_db
 
     with patch("sta.database.get_session", lambda: test_session):
         yield fastapi_app
@@ -84,6 +86,80 @@ def client(app):
     return TestClient(app)
 
 
+# ============== QUERY BUDGET FIXTURES ==============
+
+
+class QueryCounter:
+    """Collects every SQL statement executed on the shared async engine."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+
+@pytest.fixture
+def query_counter():
+    counter = QueryCounter()
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def query_budget(client, query_counter):
+    """Issue a request and fail the test if it runs more SQL than its budget.
+
+    Usage: ``query_budget("GET", "/api/encounter/x/status", budget=3)``
+    """
+
+    def _request(method, url, budget, **kwargs):
+        query_counter.reset()
+        response = client.request(method, url, **kwargs)
+        executed = list(query_counter.statements)
+        if len(executed) > budget:
+            pytest.fail(
+                f"{method} {url} executed {len(executed)} SQL statements "
+                f"(budget {budget}):\n" + "\n".join(executed)
+            )
+        return response
+
+    return _request
+
+
+# ============== SYNTHETIC DATASET FIXTURES ==============
+
+
+@pytest.fixture
+def build_synthetic_campaign(test_session):
+    """
+    Load a seeded synthetic campaign (see benchmarks/dataset.py).
+
+    Usage: ``dataset = await build_synthetic_campaign("medium", seed=3)``
+    """
+    from benchmarks.dataset import SCALES, build_campaign
+
+    async def _build(scale="small", seed=0, campaign_id=None):
+        return await build_campaign(test_session, SCALES[scale], seed, campaign_id)
+
+    return _build
+
+
+@pytest.fixture
+async def synthetic_campaign(build_synthetic_campaign):
+    """A synthetic campaign at the "small" scale."""
+    return await build_synthetic_campaign()
+
+
 # ============== SAMPLE DATA FIXTURES ==============
 
 
@@ -137,7 +137,7 @@ class TestMomentumManager:
         await manager.gain_momentum(campaign.campaign_id, 2, "task_success")
         await manager.spend_momentum(campaign.campaign_id, 2, "keep_initiative")
 
-        history = manager.get_history(campaign.campaign_id)
+        history = await manager.get_history(campaign.campaign_id)
 
         assert len(history) == 3
         assert history[0].amount == 3
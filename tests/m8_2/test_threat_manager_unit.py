@@ -107,7 +107,7 @@ class TestThreatManager:
         await manager.gain_threat(campaign.campaign_id, 3, "complication")
         await manager.spend_threat(campaign.campaign_id, 2, "hazard")
 
-        history = manager.get_history(campaign.campaign_id)
+        history = await manager.get_history(campaign.campaign_id)
 
         assert len(history) == 3
         assert history[0].amount == 5
@@ -0,0 +1,168 @@
+"""
+Tests for the precomputed action availability matrix.
+
+Tests verify:
+- The system -> actions index covers every action
+- Destroyed systems, Reserve Power and shields at 0 are reflected
+- Matrices are shared per ship state, and the per-ship cache is bounded
+- Destroyed systems agree with Starship.is_system_destroyed at every Scale
+- The availability endpoints follow breach, damage and power changes
+"""
+
+import json
+import pytest
+
+from sta.mechanics.action_config import (
+    ACTION_CONFIGS,
+    ACTIONS_BY_SYSTEM,
+    SPECIAL_ACTION_SYSTEMS,
+    ActionAvailabilityCache,
+    availability_matrix,
+    get_action_required_system,
+    get_ship_action_availability,
+)
+from sta.database.vtt_schema import VTTShipRecord
+from sta.generators import generate_starship
+from sta.models.enums import SystemType
+from sta.models.starship import Breach
+
+
+@pytest.mark.actions
+class TestAvailabilityMatrix:
+    """availability_matrix for a ship state."""
+
+    def test_index_covers_every_action(self):
+        indexed = [name for names in ACTIONS_BY_SYSTEM.values() for name in names]
+        assert sorted(indexed) == sorted([*ACTION_CONFIGS, *SPECIAL_ACTION_SYSTEMS])
+        for system, names in ACTIONS_BY_SYSTEM.items():
+            assert all(get_action_required_system(name) == system for name in names)
+
+    def test_undamaged_ship_can_take_every_action(self):
+        matrix = availability_matrix(4, [], 10, True)
+        assert all(info["available"] for info in matrix.values())
+        assert all(info["difficulty_modifier"] == 0 for info in matrix.values())
+
+    def test_destroyed_system_disables_its_actions(self):
+        matrix = availability_matrix(4, [("weapons", 1), ("weapons", 1)], 10, True)
+        for name in ACTIONS_BY_SYSTEM["weapons"]:
+            assert matrix[name]["available"] is False
+            assert matrix[name]["reason"] == "WEAPONS DESTROYED"
+        assert matrix["Impulse"]["available"] is True
+
+    def test_breach_raises_difficulty(self):
+        matrix = availability_matrix(6, [("engines", 2)], 10, True)
+        assert matrix["Impulse"]["breach_modifier"] == 2
+        assert matrix["Impulse"]["difficulty_modifier"] == 2
+
+    def test_reserve_power_and_shields_down(self):
+        matrix = availability_matrix(4, [], 0, False)
+        assert matrix["Regenerate Shields"]["reason"] == "NO RESERVE POWER"
+
+        matrix = availability_matrix(4, [], 0, True)
+        assert matrix["Regenerate Shields"]["available"] is True
+        assert matrix["Regenerate Shields"]["difficulty_modifier"] == 1
+
+    def test_same_state_shares_matrix(self):
+        first = availability_matrix(4, [("sensors", 1)], 5, True)
+        second = availability_matrix(4, [("sensors", 1)], 7, True)
+        assert first is second  # Shields only matter at 0
+
+    def test_cache_reuses_until_row_changes(self):
+        cache = ActionAvailabilityCache()
+        key = ("starships", 1)
+        first = cache.get_or_build(key, 4, "[]", 5, True)
+        assert cache.get(key, (4, "[]", 5, True)) is first
+
+        breached = json.dumps([{"system": "weapons", "potency": 2}])
+        assert cache.get(key, (4, breached, 5, True)) is None
+        assert cache.get_or_build(key, 4, breached, 5, True)["Fire"]["available"] is False
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = ActionAvailabilityCache(max_entries=2)
+        for ship_id in (1, 2):
+            cache.get_or_build(("starships", ship_id), 4, "[]", 5, True)
+        assert cache.get(("starships", 1), (4, "[]", 5, True)) is not None
+
+        cache.get_or_build(("starships", 3), 4, "[]", 5, True)
+        assert cache.get(("starships", 2), (4, "[]", 5, True)) is None
+        assert cache.get(("starships", 1), (4, "[]", 5, True)) is not None
+
+    @pytest.mark.parametrize("scale", [1, 2, 3, 4, 5])
+    def test_destroyed_matches_starship(self, scale):
+        ship = generate_starship()
+        ship.scale = scale
+        for potency in range(3):
+            ship.breaches = [Breach(SystemType.WEAPONS, potency)] if potency else []
+            matrix = get_ship_action_availability(ship)
+            destroyed = ship.is_system_destroyed(SystemType.WEAPONS)
+            assert matrix["Fire"]["available"] is not destroyed
+            assert matrix["Impulse"]["available"] is not ship.is_system_destroyed(
+                SystemType.ENGINES
+            )
+
+
+@pytest.mark.actions
+@pytest.mark.api
+class TestActionAvailabilityEndpoints:
+    """GET /api/encounter/{id}/action-availability and /api/ships/{id}/action-availability"""
+
+    def test_encounter_availability(self, client, sample_encounter):
+        encounter_id = sample_encounter["encounter"].encounter_id
+        response = client.get(f"/api/encounter/{encounter_id}/action-availability")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["Fire"]["available"] is True
+        assert data["Fire"]["required_system"] == "weapons"
+
+    def test_encounter_availability_follows_breaches(self, client, sample_encounter):
+        encounter_id = sample_encounter["encounter"].encounter_id
+        ship_id = sample_encounter["player_ship"].id
+        url = f"/api/encounter/{encounter_id}/action-availability"
+        assert client.get(url).json()["Fire"]["available"] is True
+
+        for _ in range(2):
+            client.post(f"/api/ship/{ship_id}/breach", json={"system": "weapons"})
+
+        data = client.get(url).json()
+        assert data["Fire"]["available"] is False
+        assert data["Fire"]["reason"] == "WEAPONS DESTROYED"
+
+    def test_encounter_availability_follows_reserve_power(self, client, sample_encounter):
+        encounter_id = sample_encounter["encounter"].encounter_id
+        url = f"/api/encounter/{encounter_id}/action-availability"
+        assert client.get(url).json()["Regenerate Shields"]["available"] is True
+
+        client.post(f"/api/encounter/{encounter_id}/reserve-power")
+        assert client.get(url).json()["Regenerate Shields"]["available"] is False
+
+    def test_unknown_encounter(self, client):
+        response = client.get("/api/encounter/missing/action-availability")
+        assert response.status_code == 404
+
+    async def test_vtt_ship_availability(self, client, test_session):
+        ship = VTTShipRecord(
+            name="USS Matrix",
+            ship_class="Test Class",
+            scale=4,
+            shields=8,
+            shields_max=8,
+            breaches_json="[]",
+            systems_json=json.dumps({"comms": 9, "computers": 10, "engines": 10,
+                                     "sensors": 11, "structure": 9, "weapons": 10}),
+            departments_json=json.dumps({"command": 3, "conn": 3, "engineering": 3,
+                                         "medicine": 2, "science": 3, "security": 3}),
+        )
+        test_session.add(ship)
+        await test_session.commit()
+        url = f"/api/ships/{ship.id}/action-availability"
+        assert client.get(url).json()["Impulse"]["available"] is True
+
+        client.put(f"/api/ships/{ship.id}/breach",
+                   json={"system": "engines", "potency": 2, "action": "add"})
+        assert client.get(url).json()["Impulse"]["reason"] == "ENGINES DESTROYED"
+
+        client.put(f"/api/ships/{ship.id}/power", json={"reserve": False})
+        assert client.get(url).json()["Regenerate Shields"]["reason"] == "NO RESERVE POWER"
+
+    def test_unknown_ship(self, client):
+        assert client.get("/api/ships/999/action-availability").status_code == 404
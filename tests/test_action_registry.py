@@ -0,0 +1,152 @@
+"""
+Tests for the compiled action registry.
+
+Tests verify:
+- Every configured, special and bridge action gets one immutable spec
+- Major/minor classification follows one set of rules everywhere
+- Name and position indexes
+- /api/execute-action ends the turn only for configured major actions
+- Invalid configuration is rejected when the registry is built
+"""
+
+import dataclasses
+import pytest
+
+from sta.mechanics.action_config import (
+    ACTION_CONFIGS,
+    SPECIAL_ACTION_SYSTEMS,
+    is_major_action,
+)
+from sta.mechanics.action_registry import (
+    ACTION_REGISTRY,
+    ActionConfigError,
+    build_action_registry,
+    validate_action_configs,
+)
+from sta.mechanics.actions import ALL_ACTIONS, get_action_by_name, get_actions_for_position
+from sta.models.enums import ActionType, Position
+
+
+@pytest.mark.actions
+class TestActionRegistry:
+    """ACTION_REGISTRY contents and indexes."""
+
+    def test_covers_every_action_once(self):
+        expected = {*ACTION_CONFIGS, *SPECIAL_ACTION_SYSTEMS, *(a.name for a in ALL_ACTIONS)}
+        assert {spec.name for spec in ACTION_REGISTRY} == expected
+        assert len(ACTION_REGISTRY) == len(expected)
+
+    def test_specs_are_immutable(self):
+        spec = ACTION_REGISTRY.get("Fire")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            spec.is_major = False
+        with pytest.raises(TypeError):
+            ACTION_REGISTRY.get("Scan For Weakness").config["max_range"] = 9
+        assert not hasattr(spec, "__dict__")
+
+    def test_precomputed_rules(self):
+        scan = ACTION_REGISTRY.get("Scan For Weakness")
+        assert scan.required_system == "sensors"
+        assert scan.in_range(2) and not scan.in_range(3)
+
+        sweep = ACTION_REGISTRY.get("Sensor Sweep")
+        assert sweep.difficulty_at(0) == 1
+        assert sweep.difficulty_at(3) == 4
+
+        fire = ACTION_REGISTRY.get("Fire")
+        assert fire.required_system == "weapons"
+        assert not fire.configured
+        assert fire.positions == (Position.TACTICAL,)
+
+        assert ACTION_REGISTRY.get("Regenerate Shields").requires_reserve_power
+
+    @pytest.mark.parametrize("name, major", [
+        ("Calibrate Weapons", False),  # buff
+        ("Attack Pattern", True),  # explicit is_major
+        ("Modulate Shields", True),  # task_roll
+        ("Raise Shields", False),  # toggle
+        ("Change Position", False),  # special, minor on the bridge
+        ("Defensive Fire", True),  # special, major on the bridge
+        ("Draw Item", False),  # special with explicit is_minor
+        ("Personnel Attack", True),  # special, not on the bridge
+        ("Impulse", False),  # bridge listing only
+        ("Assist", True),
+    ])
+    def test_classification(self, name, major):
+        assert ACTION_REGISTRY.get(name).is_major is major
+        assert is_major_action(name) is major
+
+    def test_unknown_actions_are_major(self):
+        assert ACTION_REGISTRY.get("Not An Action") is None
+        assert is_major_action("Not An Action") is True
+
+    def test_lookup_by_exact_name(self):
+        assert ACTION_REGISTRY.get("scan for weakness") is None
+        assert is_major_action("calibrate weapons") is True  # Unknown, so major
+
+    def test_find_for_position_ignores_case(self):
+        assert ACTION_REGISTRY.find("scan for weakness", Position.SCIENCE).name == (
+            "Scan For Weakness"
+        )
+        assert ACTION_REGISTRY.find("Scan For Weakness", Position.HELM) is None
+
+    def test_position_index_matches_station_lists(self):
+        for position in Position:
+            actions = get_actions_for_position(position)
+            listed = [a.name for a in actions["minor"] + actions["major"]]
+            assert [s.name for s in ACTION_REGISTRY.for_position(position)] == listed
+
+        helm_minor = {s.name for s in ACTION_REGISTRY.for_position(Position.HELM, major=False)}
+        assert {"Impulse", "Thrusters", "Change Position"} <= helm_minor
+        assert "Ram" not in helm_minor
+
+    def test_get_action_by_name(self):
+        action = get_action_by_name("fire", Position.TACTICAL)
+        assert action is ACTION_REGISTRY.get("Fire").bridge_action
+        assert action.name == "Fire"
+        assert action.action_type == ActionType.MAJOR
+        assert get_action_by_name("Fire", Position.HELM) is None
+
+
+@pytest.mark.actions
+class TestExecuteActionClassification:
+    """Major/minor handling in /api/execute-action"""
+
+    @pytest.mark.parametrize("name, turn_after", [
+        ("Attack Pattern", "enemy"),  # configured major
+        ("attack pattern", "player"),  # names are exact
+        ("Direct", "player"),  # bridge listing only: not classified
+    ])
+    def test_only_configured_major_actions_end_the_turn(
+        self, sample_encounter, execute_action, get_encounter_status, name, turn_after
+    ):
+        eid = sample_encounter["encounter"].encounter_id
+        assert execute_action(eid, name).status_code == 200
+        assert get_encounter_status(eid).json()["current_turn"] == turn_after
+
+
+@pytest.mark.actions
+class TestActionConfigValidation:
+    """validate_action_configs / build_action_registry"""
+
+    def test_shipped_configuration_is_valid(self):
+        validate_action_configs()
+
+    @pytest.mark.parametrize("config, problem", [
+        ({"type": "buff_action", "effect": {}}, "unknown type"),
+        ({"type": "buff", "effect": {}, "requires_system": "warp_core"}, "requires_system"),
+        ({"type": "task_roll"}, "need a roll"),
+        ({"type": "task_roll", "roll": {"difficulty": -1}}, "roll.difficulty"),
+        ({"type": "buff", "effect": {"duration": "forever"}}, "effect.duration"),
+        ({"type": "special", "is_major": True, "is_minor": True}, "both"),
+        ({"type": "special", "max_range": "far"}, "max_range"),
+        ({"type": "special", "blocks": ["Missing"]}, "unknown action"),
+        ({"type": "toggle"}, "toggles"),
+    ])
+    def test_rejects_invalid_config(self, config, problem):
+        with pytest.raises(ActionConfigError, match=problem):
+            build_action_registry({"Broken": config}, {}, [])
+
+    def test_rejects_unknown_special_system(self):
+        with pytest.raises(ActionConfigError, match="Fire"):
+            validate_action_configs({}, {"Fire": "phasers"})
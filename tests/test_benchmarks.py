@@ -0,0 +1,62 @@
+"""
+Tests for the mechanics benchmark harness.
+
+Tests verify:
+- Every registered case runs
+- The stored baseline covers every case
+- Regressions beyond the threshold are flagged
+"""
+
+import pytest
+
+from benchmarks.suite import (
+    BASELINE_PATH,
+    BENCHMARKS,
+    compare,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+
+def _results(**cases):
+    return {"benchmarks": {name: {"best_us": us} for name, us in cases.items()}}
+
+
+@pytest.mark.benchmark
+class TestBenchmarkSuite:
+    """The benchmark cases and stored baseline."""
+
+    def test_every_case_runs(self):
+        results = run_benchmarks(repeat=1, min_time=0)
+        assert set(results["benchmarks"]) == set(BENCHMARKS)
+        assert all(case["best_us"] > 0 for case in results["benchmarks"].values())
+
+    def test_filter_selects_cases(self):
+        results = run_benchmarks(["movement"], repeat=1, min_time=0)
+        assert results["benchmarks"]
+        assert all(name.startswith("movement.") for name in results["benchmarks"])
+
+    def test_baseline_covers_every_case(self):
+        baseline = load_results(BASELINE_PATH)
+        assert set(baseline["benchmarks"]) == set(BENCHMARKS)
+
+
+@pytest.mark.benchmark
+class TestCompare:
+    """Regression detection against a baseline."""
+
+    def test_flags_slowdown_beyond_threshold(self):
+        rows = compare(_results(a=10.0, b=10.0), _results(a=13.0, b=12.0), threshold=0.25)
+        assert {row["name"]: row["regressed"] for row in rows} == {"a": True, "b": False}
+        assert rows[0]["ratio"] == pytest.approx(1.3)
+
+    def test_missing_cases_are_not_regressions(self):
+        rows = compare(_results(old=10.0), _results(new=10.0))
+        assert [row["ratio"] for row in rows] == [None, None]
+        assert not any(row["regressed"] for row in rows)
+
+    def test_results_round_trip(self, tmp_path):
+        results = _results(a=1.5)
+        path = save_results(results, tmp_path / "results.json")
+        assert load_results(path) == results
@@ -0,0 +1,130 @@
+"""
+Tests for bulk NPC and ship generation.
+
+Tests verify:
+- Point-buy draws stay within bounds and hit the requested totals
+- Bulk rows are reproducible from a seed and come in chunks
+- POST /api/universe/generate inserts the rows into the library
+- Generated items import into a campaign like any other library item
+"""
+
+import json
+import random
+
+from sqlalchemy import func, select
+
+from sta.database.vtt_schema import UniverseItemRecord, VTTCharacterRecord, VTTShipRecord
+from sta.generators.bulk import character_batches, character_rows, ship_batches, ship_rows
+from sta.generators.character import random_attributes, random_disciplines
+
+
+class TestPointBuy:
+    """random_attributes / random_disciplines"""
+
+    def test_totals_and_bounds(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            attributes = random_attributes(rng=rng)
+            disciplines = random_disciplines(rng=rng)
+            assert attributes.total() == 56 and disciplines.total() == 16
+            assert all(7 <= attributes.get(a) <= 12 for a in ("control", "reason"))
+            assert all(1 <= disciplines.get(d) <= 5 for d in ("command", "security"))
+
+    def test_unreachable_total_is_capped(self):
+        assert random_attributes(100).total() == 72
+        assert random_disciplines(0).total() == 6
+
+
+class TestBulkRows:
+    """character_rows / ship_rows"""
+
+    def test_seeded_chunks(self):
+        chunks = list(character_rows(1200, seed=42, category="creatures"))
+        assert [len(rows) for rows in chunks] == [500, 500, 200]
+        assert chunks == list(character_rows(1200, seed=42, category="creatures"))
+        assert chunks != list(character_rows(1200, seed=43, category="creatures"))
+
+        row = chunks[0][0]
+        data = next(character_batches(1200, seed=42))[0]
+        assert (row["category"], row["item_type"]) == ("creatures", "character")
+        assert row["name"] == data["name"]
+        # data_json holds the attributes map, like characters added from a campaign
+        assert json.loads(row["data_json"]) == data["attributes"]
+        assert sum(data["attributes"].values()) == 56
+        assert len(data["focuses"]) == 4 and len(data["talents"]) == 2
+
+    def test_ship_faction(self):
+        [rows] = list(ship_rows(50, seed=1, faction="Klingon"))
+        [ships] = list(ship_batches(50, seed=1, faction="Klingon"))
+        assert {ship["faction"] for ship in ships} == {"Klingon"}
+        assert all(ship["name"].startswith("IKS ") for ship in ships)
+        for row, ship in zip(rows, ships):
+            assert row["description"] == ship["ship_class"]
+            assert json.loads(row["data_json"]) == ship["systems"]
+
+
+class TestGenerateRoute:
+    """POST /api/universe/generate"""
+
+    async def test_generates_into_library(self, client, test_session):
+        response = client.post(
+            "/api/universe/generate", json={"item_type": "character", "count": 700, "seed": 9}
+        )
+        assert response.status_code == 201
+        assert response.json() == {
+            "item_type": "character", "category": "npcs", "count": 700, "seed": 9,
+        }
+        response = client.post(
+            "/api/universe/generate",
+            json={"item_type": "ship", "count": 5, "crew_quality": "talented"},
+        )
+        assert isinstance(response.json()["seed"], int)
+
+        counts = dict((await test_session.execute(
+            select(UniverseItemRecord.item_type, func.count()).group_by(
+                UniverseItemRecord.item_type)
+        )).all())
+        assert counts == {"character": 700, "ship": 5}
+
+        first = await test_session.scalar(select(UniverseItemRecord.name).limit(1))
+        assert first == next(character_rows(700, seed=9))[0]["name"]
+
+    def test_rejects_bad_requests(self, client):
+        for body in (
+            {"count": 0},
+            {"count": 20000},
+            {"item_type": "planet", "count": 1},
+            {"count": 1, "category": "ships"},
+            {"item_type": "ship", "count": 1, "crew_quality": "legendary"},
+        ):
+            assert client.post("/api/universe/generate", json=body).status_code == 400
+
+    async def test_generated_items_import_into_a_campaign(
+        self, client, test_session, sample_campaign
+    ):
+        campaign_id = sample_campaign["campaign"].id
+        for item_type in ("character", "ship"):
+            response = client.post(
+                "/api/universe/generate", json={"item_type": item_type, "count": 1, "seed": 5}
+            )
+            assert response.status_code == 201
+
+        items = (await test_session.execute(select(UniverseItemRecord))).scalars().all()
+        for item in items:
+            response = client.post(
+                f"/api/universe/import/{item.item_type}/{item.id}",
+                json={"campaign_id": campaign_id},
+            )
+            assert response.status_code == 201
+
+        character = await test_session.scalar(
+            select(VTTCharacterRecord).filter(
+                VTTCharacterRecord.name == next(character_batches(1, seed=5))[0]["name"])
+        )
+        ship_data = next(ship_batches(1, seed=5))[0]
+        ship = await test_session.scalar(
+            select(VTTShipRecord).filter(VTTShipRecord.name == ship_data["name"])
+        )
+        assert character.to_model().attributes.total() == 56
+        assert ship.to_model().ship_class == ship_data["ship_class"]
+        assert ship.to_model().systems.engines == ship_data["systems"]["engines"]
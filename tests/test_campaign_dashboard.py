@@ -0,0 +1,80 @@
+"""
+Tests for the campaign dashboard queries.
+
+Tests verify:
+- Scene and encounter counts per status come from one grouped query
+- Draft and completed lists are paged
+- The sidebar joins the ship pool with its starships
+"""
+
+import pytest
+
+from sta.database.dashboard import campaign_sidebar, status_counts, status_page
+from sta.database.schema import CampaignShipRecord, EncounterRecord, SceneRecord
+
+
+@pytest.fixture
+async def long_campaign(test_session, sample_campaign):
+    """The sample campaign with 25 draft scenes and 23 completed encounters."""
+    campaign = sample_campaign["campaign"]
+    test_session.add_all(
+        SceneRecord(campaign_id=campaign.id, name=f"Draft {i}", status="draft")
+        for i in range(25)
+    )
+    test_session.add(SceneRecord(campaign_id=campaign.id, name="Live", status="active"))
+    test_session.add_all(
+        EncounterRecord(encounter_id=f"done-{i}", name=f"Done {i}", campaign_id=campaign.id,
+                        status="completed", round=i + 1)
+        for i in range(23)
+    )
+    test_session.add(CampaignShipRecord(campaign_id=campaign.id,
+                                        ship_id=sample_campaign["player_ship"].id))
+    await test_session.commit()
+    return sample_campaign
+
+
+class TestDashboardQueries:
+    """sta.database.dashboard"""
+
+    async def test_counts_and_pages(self, test_session, long_campaign):
+        campaign = long_campaign["campaign"]
+        counts = await status_counts(test_session, campaign.id)
+        assert counts.scenes == {"draft": 25, "active": 1}
+        assert counts.encounters == {"completed": 23}
+        assert counts.total("scenes") == 26
+        assert counts.pages("scenes", "draft") == 2
+        assert counts.pages("encounters", "draft") == 1
+
+        second = await status_page(test_session, SceneRecord, campaign.id, "draft", page=2)
+        assert [scene.name for scene in second] == [f"Draft {i}" for i in range(20, 25)]
+        newest = await status_page(test_session, EncounterRecord, campaign.id, "completed",
+                                   page_size=2, newest_first=True)
+        assert [encounter.name for encounter in newest] == ["Done 22", "Done 21"]
+
+    async def test_sidebar(self, test_session, long_campaign):
+        campaign = long_campaign["campaign"]
+        sidebar = await campaign_sidebar(test_session, campaign)
+
+        assert len(sidebar.players) == len(long_campaign["players"])
+        assert sidebar.player_for_token("test-token-1").is_gm
+        assert sidebar.player_for_token(None) is None
+        assert sidebar.active_ship.id == campaign.active_ship_id
+        [ship] = sidebar.ships
+        assert (ship["name"], ship["is_active"]) == (long_campaign["player_ship"].name, True)
+
+
+class TestDashboardPage:
+    """GET /campaigns/{campaign_id}"""
+
+    def test_pages_render(self, client, long_campaign):
+        campaign_id = long_campaign["campaign"].campaign_id
+        client.cookies.set("sta_session_token", "test-token-1")
+
+        html = client.get(f"/campaigns/{campaign_id}").text
+        assert "Draft 19" in html and "Draft 20" not in html
+        assert "Page 1 of 2" in html
+        assert "Done 22" in html and "Done 2<" not in html
+
+        html = client.get(f"/campaigns/{campaign_id}?drafts_page=9&completed_page=2").text
+        assert "Draft 24" in html and "Draft 19" not in html
+        assert "Done 2<" in html
@@ -0,0 +1,224 @@
+"""
+Tests for the campaign log feed.
+
+Tests verify:
+- Log entries carry their character's campaign_id, however they are added
+- The feed pages newest first by (created_at, id) without gaps or repeats
+- Log type and event type filters
+- A page costs two queries however deep it is
+- Revision 007 fills campaign_id on existing entries
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+
+from sta.database.schema import Base, CampaignRecord
+from sta.database.schema_version import alembic_config, ensure_schema
+from sta.database.vtt_schema import LogEntryRecord, VTTCharacterRecord
+
+LOGGED_AT = datetime(2026, 10, 1, 20, 0)
+
+
+def _character(campaign_id, name):
+    return VTTCharacterRecord(
+        campaign_id=campaign_id,
+        name=name,
+        attributes_json=json.dumps({}),
+        disciplines_json=json.dumps({}),
+    )
+
+
+@pytest.fixture
+async def crew(test_session, sample_campaign):
+    campaign = sample_campaign["campaign"]
+    characters = [_character(campaign.id, "Sisko"), _character(campaign.id, "Kira")]
+    test_session.add_all(characters)
+    await test_session.commit()
+    return campaign, characters
+
+
+async def _log_entries(test_session, crew, count):
+    """count entries, alternating characters, two to each minute."""
+    campaign, characters = crew
+    test_session.add_all(
+        LogEntryRecord(
+            character_id=characters[i % 2].id,
+            campaign_id=campaign.id,
+            log_type="VALUE" if i % 3 == 0 else "MISSION",
+            event_type="scene_enter" if i % 2 == 0 else "scene_exit",
+            content=f"Entry {i}",
+            character_name=characters[i % 2].name,
+            created_at=LOGGED_AT + timedelta(minutes=i // 2),
+        )
+        for i in range(count)
+    )
+    await test_session.commit()
+
+
+def _feed_url(campaign):
+    return f"/campaigns/api/campaign/{campaign.campaign_id}/logs"
+
+
+class TestLoggedCampaign:
+    """campaign_id on new log entries"""
+
+    def test_character_routes_set_campaign(self, client, crew):
+        campaign, (sisko, _) = crew
+        created = client.post(
+            f"/api/characters/{sisko.id}/logs",
+            json={"log_type": "PERSONAL", "content": "Baseball"},
+        )
+        assert created.status_code == 201
+        assert created.json()["campaign_id"] == campaign.id
+
+        event = client.post(
+            f"/api/characters/{sisko.id}/logs/scene-event",
+            json={"event_type": "scene_enter", "scene_name": "Ops"},
+        ).json()
+        assert event["campaign_id"] == campaign.id
+
+        personal = client.get(
+            f"/api/characters/{sisko.id}/logs/personal?campaign_id={campaign.id}"
+        ).json()
+        assert [log["content"] for log in personal["logs"]] == ["Baseball"]
+
+    async def test_orm_insert_takes_character_campaign(self, test_session, crew):
+        campaign, (_, kira) = crew
+        log = LogEntryRecord(character_id=kira.id, content="Bajor", character_name=kira.name)
+        test_session.add(log)
+        await test_session.commit()
+        await test_session.refresh(log)
+        assert log.campaign_id == campaign.id
+
+
+class TestCampaignLogFeed:
+    """GET /campaigns/api/campaign/{campaign_id}/logs"""
+
+    async def test_pages_cover_every_entry_once(self, client, test_session, crew):
+        await _log_entries(test_session, crew, 25)
+        url = _feed_url(crew[0])
+
+        seen, before = [], None
+        while True:
+            params = {"limit": 4} | ({"before": before} if before else {})
+            page = client.get(url, params=params).json()
+            seen.extend(page["logs"])
+            before = page["next_before"]
+            if before is None:
+                break
+
+        keys = [(log["created_at"], log["id"]) for log in seen]
+        assert len(keys) == 25
+        assert keys == sorted(keys, reverse=True)
+        assert len(set(keys)) == 25
+
+    async def test_new_entries_do_not_shift_pages(self, client, test_session, crew):
+        await _log_entries(test_session, crew, 6)
+        url = _feed_url(crew[0])
+        first = client.get(url, params={"limit": 3}).json()
+
+        campaign, (sisko, _) = crew
+        test_session.add(
+            LogEntryRecord(character_id=sisko.id, campaign_id=campaign.id,
+                           content="Late", character_name=sisko.name)
+        )
+        await test_session.commit()
+
+        second = client.get(url, params={"limit": 3, "before": first["next_before"]}).json()
+        assert [log["content"] for log in second["logs"]] == ["Entry 2", "Entry 1", "Entry 0"]
+
+    async def test_filters(self, client, test_session, crew):
+        await _log_entries(test_session, crew, 12)
+        url = _feed_url(crew[0])
+
+        values = client.get(url, params={"log_type": "value"}).json()["logs"]
+        assert [log["content"] for log in values] == ["Entry 9", "Entry 6", "Entry 3", "Entry 0"]
+
+        exits = client.get(
+            url, params={"log_type": "MISSION", "event_type": "scene_exit"}
+        ).json()["logs"]
+        assert {log["event_type"] for log in exits} == {"scene_exit"}
+        assert len(exits) == 4
+
+    async def test_other_campaigns_excluded(self, client, test_session, crew):
+        await _log_entries(test_session, crew, 3)
+        outsider = _character(None, "Garak")
+        test_session.add(outsider)
+        await test_session.flush()
+        test_session.add(
+            LogEntryRecord(character_id=outsider.id, content="Tailoring",
+                           character_name=outsider.name)
+        )
+        await test_session.commit()
+
+        logs = client.get(_feed_url(crew[0])).json()["logs"]
+        assert "Tailoring" not in {log["content"] for log in logs}
+
+    def test_bad_cursor(self, client, crew):
+        response = client.get(_feed_url(crew[0]), params={"before": "yesterday"})
+        assert response.status_code == 400
+
+    def test_unknown_campaign(self, client):
+        assert client.get("/campaigns/api/campaign/nope/logs").status_code == 404
+
+    @pytest.mark.query_budget
+    async def test_deep_page_within_budget(self, query_budget, client, test_session, crew):
+        await _log_entries(test_session, crew, 60)
+        url = _feed_url(crew[0])
+        before = client.get(url, params={"limit": 50}).json()["next_before"]
+
+        response = query_budget("GET", f"{url}?limit=50&before={before}", budget=2)
+        assert len(response.json()["logs"]) == 10
+        assert response.json()["next_before"] is None
+
+
+class TestLogCampaignMigration:
+    """Revision 007 on a database without log_entries.campaign_id"""
+
+    def test_campaign_id_filled_from_character(self, tmp_path):
+        db_path = tmp_path / "sta.db"
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            command.stamp(alembic_config(conn), "006_personnel_participants")
+        with Session(engine) as session:
+            campaign = CampaignRecord(campaign_id="c-1", name="Old")
+            session.add(campaign)
+            session.flush()
+            session.add_all([_character(campaign.id, "Odo"), _character(None, "Quark")])
+            session.commit()
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript(
+                """
+                DROP TABLE log_entries;
+                CREATE TABLE log_entries (
+                    id INTEGER PRIMARY KEY,
+                    character_id INTEGER NOT NULL REFERENCES vtt_characters(id),
+                    log_type VARCHAR(20), content TEXT, event_type VARCHAR(50),
+                    character_name VARCHAR(100), created_by_user_id INTEGER,
+                    created_at DATETIME, updated_at DATETIME
+                );
+                INSERT INTO log_entries (id, character_id, log_type, content, character_name, created_at)
+                    VALUES (1, 1, 'PERSONAL', 'Changeling', 'Odo', CURRENT_TIMESTAMP),
+                           (2, 2, 'PERSONAL', 'Latinum', 'Quark', CURRENT_TIMESTAMP);
+                """
+            )
+
+        with engine.begin() as conn:
+            assert ensure_schema(conn) is True
+
+        assert "ix_log_entries_campaign_feed" in {
+            i["name"] for i in inspect(engine).get_indexes("log_entries")
+        }
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute(
+                "SELECT id, campaign_id FROM log_entries ORDER BY id"
+            ).fetchall()
+        engine.dispose()
+        assert rows == [(1, 1), (2, None)]
@@ -0,0 +1,145 @@
+"""
+Tests for the cross-process change journal.
+
+Tests verify:
+- Inserts, updates and deletes of tracked records are journaled on flush
+- Versions track the latest change per entity
+- The notifier wakes waiters and subscribers
+- The /api/changes endpoint
+"""
+
+import asyncio
+import pytest
+
+from sta.database.async_db import engine as async_engine
+from sta.database.changes import (
+    Change,
+    ChangeNotifier,
+    changes_since,
+    get_version,
+    latest_seq,
+    record_change,
+)
+from sta.database.schema import SceneRecord
+
+
+def _keys(changes):
+    return [(c.entity_type, c.entity_id) for c in changes]
+
+
+@pytest.mark.api
+class TestChangeJournal:
+    """Journal rows written by the flush hooks."""
+
+    async def test_new_records_are_journaled(self, test_session, sample_encounter):
+        changes = await changes_since(test_session, 0)
+        assert ("campaign", sample_encounter["campaign"].id) in _keys(changes)
+        assert ("encounter", sample_encounter["encounter"].id) in _keys(changes)
+
+    async def test_update_bumps_version(self, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        before = await get_version(test_session, "encounter", encounter.id)
+        since = await latest_seq(test_session)
+
+        encounter.momentum = 3
+        await test_session.commit()
+
+        assert _keys(await changes_since(test_session, since)) == [("encounter", encounter.id)]
+        assert await get_version(test_session, "encounter", encounter.id) > before
+
+    async def test_unchanged_records_are_not_journaled(self, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        since = await latest_seq(test_session)
+
+        encounter.momentum = encounter.momentum
+        await test_session.commit()
+
+        assert await changes_since(test_session, since) == []
+
+    async def test_delete_is_journaled(self, test_session, sample_campaign):
+        scene = SceneRecord(campaign_id=sample_campaign["campaign"].id, name="Bridge")
+        test_session.add(scene)
+        await test_session.commit()
+        scene_id = scene.id
+        since = await latest_seq(test_session)
+
+        await test_session.delete(scene)
+        await test_session.commit()
+
+        assert _keys(await changes_since(test_session, since)) == [("scene", scene_id)]
+
+    async def test_record_change_and_filters(self, test_session, sample_encounter):
+        since = await latest_seq(test_session)
+        await record_change(test_session, "scene", 99)
+        await record_change(test_session, "encounter", 7)
+        await test_session.commit()
+
+        assert _keys(await changes_since(test_session, since, entity_type="scene")) == [
+            ("scene", 99)
+        ]
+        assert _keys(await changes_since(test_session, since, entity_id=7)) == [
+            ("encounter", 7)
+        ]
+
+
+@pytest.mark.api
+class TestChangeNotifier:
+    """In-process follower of the journal."""
+
+    async def test_poll_wakes_waiters_and_subscribers(self, test_session, sample_encounter):
+        notifier = ChangeNotifier()
+        notifier.last_seq = await latest_seq(test_session)
+        received = []
+        unsubscribe = notifier.subscribe(received.extend)
+
+        waiter = asyncio.create_task(notifier.wait(notifier.last_seq, timeout=2))
+        encounter = sample_encounter["encounter"]
+        encounter.threat = 5
+        await test_session.commit()
+
+        async with async_engine.connect() as conn:
+            await notifier.poll(conn)
+
+        assert await waiter is True
+        assert _keys(received) == [("encounter", encounter.id)]
+        assert notifier.version("encounter", encounter.id) == notifier.last_seq
+
+        unsubscribe()
+        encounter.threat = 6
+        await test_session.commit()
+        async with async_engine.connect() as conn:
+            await notifier.poll(conn)
+        assert len(received) == 1
+
+    async def test_wait_times_out(self):
+        notifier = ChangeNotifier()
+        assert await notifier.wait(0, timeout=0.01) is False
+
+
+@pytest.mark.api
+class TestChangesEndpoint:
+    """GET /api/changes"""
+
+    async def test_lists_changes_after_seq(self, client, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        since = await latest_seq(test_session)
+
+        client.cookies.set("sta_session_token", "test-token-1")
+        response = client.post(
+            f"/api/encounter/{encounter.encounter_id}/momentum", json={"change": 1}
+        )
+        assert response.status_code == 200
+
+        data = client.get(f"/api/changes?since={since}").json()
+        assert data["changes"] == [
+            Change(data["seq"], "encounter", encounter.id).to_dict()
+        ]
+
+    async def test_no_changes_returns_current_seq(self, client, test_session, sample_encounter):
+        seq = await latest_seq(test_session)
+        data = client.get(f"/api/changes?since={seq}&entity_type=scene").json()
+        assert data == {"seq": seq, "changes": []}
+
+    def test_unknown_entity_type(self, client):
+        response = client.get("/api/changes?entity_type=starship")
+        assert response.status_code == 400
@@ -0,0 +1,152 @@
+"""
+Tests for the headless combat simulator.
+
+Tests verify:
+- Exact task roll odds match brute-force enumeration
+- Encounters are reproducible from their seed, in and out of the process pool
+- Both policies play encounters to a result
+- Aggregation and CSV output
+"""
+
+import csv
+import itertools
+from dataclasses import asdict
+
+import pytest
+
+from benchmarks.report import write_rows
+from sta.mechanics.dice import count_successes, task_success_probability
+from sta.generators import generate_starship
+from sta.mechanics.simulator import (
+    SimulationConfig,
+    _best_weapon,
+    enemy_turns_per_round,
+    get_policy,
+    run_batch,
+    simulate_encounter,
+    summarize,
+)
+from sta.models.combat import ShipCombatant
+from sta.models.enums import DamageType, Range
+from sta.models.starship import Weapon
+
+
+def _enumerate_odds(target_number, difficulty, dice, focus_value=None, assist=None):
+    hits = 0
+    total = 0
+    for rolls in itertools.product(range(1, 21), repeat=dice + (assist is not None)):
+        successes = count_successes(list(rolls[:dice]), target_number, focus_value)
+        if assist is not None:
+            successes += count_successes([rolls[dice]], assist)
+        hits += successes >= difficulty
+        total += 1
+    return hits / total
+
+
+@pytest.mark.combat
+class TestTaskSuccessProbability:
+    """Exact dice odds used by the simulator's policies."""
+
+    @pytest.mark.parametrize(
+        "target_number,difficulty,dice,focus_value,assist",
+        [
+            (12, 1, 2, None, None),
+            (12, 2, 2, 3, None),
+            (14, 3, 3, 4, None),
+            (11, 2, 2, 2, 9),
+            (25, 4, 2, 25, None),
+        ],
+    )
+    def test_matches_enumeration(self, target_number, difficulty, dice, focus_value, assist):
+        expected = _enumerate_odds(target_number, difficulty, dice, focus_value, assist)
+        actual = task_success_probability(
+            target_number,
+            difficulty,
+            dice_count=dice,
+            focus_value=focus_value,
+            assist_target_number=assist,
+        )
+        assert actual == pytest.approx(expected)
+
+    def test_zero_difficulty_always_succeeds(self):
+        assert task_success_probability(2, 0) == pytest.approx(1.0)
+
+
+@pytest.mark.combat
+class TestCombatSimulator:
+    """Seeded headless encounters."""
+
+    def test_enemy_turns_scale_with_multiplier(self):
+        assert enemy_turns_per_round(6, 0.5) == 3
+        assert enemy_turns_per_round(4, 1.0) == 4
+        assert enemy_turns_per_round(3, 0.1) == 1
+
+    def test_same_seed_same_outcome(self):
+        config = SimulationConfig(enemy_count=2)
+        assert simulate_encounter(config, 42) == simulate_encounter(config, 42)
+
+    @pytest.mark.parametrize("policy", ["scripted", "heuristic"])
+    def test_policies_play_to_a_result(self, policy):
+        config = SimulationConfig(player_policy=policy, enemy_policy=policy)
+        outcomes = run_batch(config, runs=10, workers=1)
+        assert all(o.winner in ("player", "enemy", "draw") for o in outcomes)
+        assert all(1 <= o.rounds <= config.max_rounds for o in outcomes)
+        assert sum(o.player_attacks + o.enemy_attacks for o in outcomes) > 0
+
+    def test_weapon_overrides_apply(self):
+        config = SimulationConfig(
+            player_weapons=["Photon Torpedoes"], enemy_weapons=["Disruptor Cannons"]
+        )
+        outcome = simulate_encounter(config, 7)
+        assert outcome.player_attacks + outcome.enemy_attacks > 0
+
+    def test_weapon_reach_matches_planner(self):
+        ship = generate_starship()
+        ship.weapons = [
+            Weapon("Long Lance", DamageType.ENERGY, 4, Range.EXTREME),
+            Weapon("Close Cannon", DamageType.ENERGY, 9, Range.CLOSE),
+        ]
+        combatant = ShipCombatant(ship=ship)
+        assert _best_weapon(combatant, 0).name == "Close Cannon"
+        # Extreme range has no upper bound, as in npc_planner.weapon_in_range
+        assert _best_weapon(combatant, 8).name == "Long Lance"
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError, match="Unknown policy"):
+            get_policy("berserk")
+
+    @pytest.mark.slow
+    def test_process_pool_matches_serial_run(self):
+        config = SimulationConfig()
+        serial = run_batch(config, runs=8, base_seed=100, workers=1)
+        pooled = run_batch(config, runs=8, base_seed=100, workers=2)
+        assert pooled == serial
+
+
+@pytest.mark.combat
+class TestSimulationReporting:
+    """Aggregates and file output."""
+
+    def test_summary_rates(self):
+        config = SimulationConfig()
+        outcomes = run_batch(config, runs=20, workers=1)
+        summary = summarize(outcomes, config)
+
+        assert summary["runs"] == 20
+        assert summary["enemy_turn_multiplier"] == 0.5
+        rates = (
+            summary["player_win_rate"]
+            + summary["enemy_win_rate"]
+            + summary["draw_rate"]
+        )
+        assert rates == pytest.approx(1.0)
+        assert summary["rounds_p10"] <= summary["rounds_p50"] <= summary["rounds_p90"]
+
+    def test_write_outcomes_csv(self, tmp_path):
+        outcomes = run_batch(SimulationConfig(), runs=3, workers=1)
+        path = write_rows([asdict(o) for o in outcomes], tmp_path / "outcomes.csv")
+
+        with path.open() as handle:
+            rows = list(csv.DictReader(handle))
+        assert [int(row["seed"]) for row in rows] == [0, 1, 2]
+        assert rows[0]["winner"] == outcomes[0].winner
@@ -0,0 +1,195 @@
+"""
+Tests for online database snapshots.
+
+Tests verify:
+- Paged backups let writers commit between steps and still finish
+- Snapshots are compressed, listed newest first and pruned to BACKUP_KEEP
+- Restore brings a snapshot back and refuses a damaged one
+- The scheduler skips its turn while a recent snapshot exists, and logs failures
+- /api/snapshots lists snapshots; taking one needs a GM session and a database file
+"""
+
+import asyncio
+import gzip
+import logging
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from sta.database import backup
+from sta.database.backup import (
+    BackupScheduler,
+    backup_database,
+    create_snapshot,
+    list_snapshots,
+    prune_snapshots,
+    restore_snapshot,
+)
+from sta.database.config import settings
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A file database of a few hundred pages."""
+    path = tmp_path / "live.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE logs (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO logs (body) VALUES (?)", [("x" * 500,)] * 2000)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT count(*) FROM logs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestBackupDatabase:
+    """backup_database"""
+
+    def test_copies_in_steps(self, source, tmp_path):
+        steps = []
+        backup_database(source, tmp_path / "copy.db", pages=50, pause=0,
+                        progress=lambda copied, total: steps.append((copied, total)))
+        assert len(steps) > 5
+        assert steps[-1][0] == steps[-1][1]
+        assert _count(tmp_path / "copy.db") == 2000
+
+    def test_writer_commits_between_steps(self, source, tmp_path):
+        writer = sqlite3.connect(source, timeout=5, check_same_thread=False)
+        waits = []
+
+        def write(copied, total):
+            started = time.perf_counter()
+            writer.execute("INSERT INTO logs (body) VALUES ('during')")
+            writer.commit()
+            waits.append(time.perf_counter() - started)
+
+        thread = threading.Thread(target=backup_database, args=(source, tmp_path / "copy.db"),
+                                  kwargs={"pages": 20, "pause": 0, "progress": write})
+        thread.start()
+        thread.join(timeout=30)
+        writer.close()
+
+        assert not thread.is_alive()
+        # Every write restarts the copy, so the single-step fallback finishes it
+        assert len(waits) == backup.MAX_RESTARTS + 1
+        assert max(waits) < 1
+        assert 2000 < _count(tmp_path / "copy.db") <= _count(source)
+
+
+class TestSnapshots:
+    """create_snapshot / list_snapshots / prune_snapshots"""
+
+    def test_compressed_snapshot(self, source, tmp_path):
+        snapshot = create_snapshot(source, tmp_path / "backups", compress=True)
+        assert snapshot.compressed and snapshot.path.name.endswith(".db.gz")
+        assert snapshot.size < source.stat().st_size
+        with gzip.open(snapshot.path) as packed:
+            assert packed.read(16) == b"SQLite format 3\x00"
+        assert [p.name for p in (tmp_path / "backups").iterdir()] == [snapshot.path.name]
+
+    def test_list_and_prune(self, source, tmp_path):
+        directory = tmp_path / "backups"
+        taken = [create_snapshot(source, directory, compress=i % 2 == 0) for i in range(4)]
+        (directory / "notes.txt").write_text("not a snapshot")
+        (directory / "sta-unfinished.db.partial").write_bytes(b"")
+
+        assert [s.path for s in list_snapshots(directory)] == [s.path for s in reversed(taken)]
+        removed = prune_snapshots(directory, keep=2)
+        assert removed == [taken[1].path, taken[0].path]
+        assert [s.path for s in list_snapshots(directory)] == [taken[3].path, taken[2].path]
+        assert list_snapshots(tmp_path / "missing") == []
+
+
+class TestRestore:
+    """restore_snapshot"""
+
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_round_trip(self, source, tmp_path, compress):
+        snapshot = create_snapshot(source, tmp_path / "backups", compress=compress)
+        conn = sqlite3.connect(source)
+        conn.execute("DELETE FROM logs")
+        conn.commit()
+        conn.close()
+
+        restore_snapshot(snapshot.path, source)
+        assert _count(source) == 2000
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["backups", "live.db"]
+
+    def test_refuses_damaged_snapshot(self, source, tmp_path):
+        snapshot = create_snapshot(source, tmp_path / "backups", compress=False)
+        data = bytearray(snapshot.path.read_bytes())
+        data[4096:8192] = b"\xff" * 4096
+        snapshot.path.write_bytes(bytes(data))
+
+        with pytest.raises(ValueError, match="damaged"):
+            restore_snapshot(snapshot.path, source)
+        assert _count(source) == 2000
+
+
+class TestScheduler:
+    """BackupScheduler.run_once"""
+
+    async def test_skips_recent_snapshot(self, source, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "BACKUP_DIR", str(tmp_path / "backups"))
+        monkeypatch.setattr(settings, "BACKUP_INTERVAL_MINUTES", 60)
+        monkeypatch.setattr(settings, "BACKUP_KEEP", 1)
+        scheduler = BackupScheduler()
+
+        first = await scheduler.run_once(source)
+        assert first is not None
+        assert await scheduler.run_once(source) is None
+
+        monkeypatch.setattr(settings, "BACKUP_INTERVAL_MINUTES", 0)
+        second = await scheduler.run_once(source)
+        assert [s.path for s in list_snapshots(tmp_path / "backups")] == [second.path]
+
+
+    async def test_logs_failures(self, source, monkeypatch, caplog):
+        async def fail(self, source):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(BackupScheduler, "run_once", fail)
+        task = asyncio.create_task(BackupScheduler()._run(source))
+        with caplog.at_level(logging.ERROR, logger="sta.database.backup"):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert "Scheduled snapshot" in caplog.text and "disk full" in caplog.text
+
+
+class TestSnapshotRoutes:
+    """/api/snapshots"""
+
+    def test_list(self, client, source, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "BACKUP_DIR", str(tmp_path / "backups"))
+        snapshot = create_snapshot(source, tmp_path / "backups", compress=True)
+
+        response = client.get("/api/snapshots")
+        assert response.status_code == 200
+        body = response.json()
+        assert [s["name"] for s in body["snapshots"]] == [snapshot.path.name]
+        assert body["snapshots"][0]["compressed"] is True
+        assert body["keep"] == settings.BACKUP_KEEP
+
+    def test_needs_gm_session(self, client, sample_campaign, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "BACKUP_DIR", str(tmp_path / "backups"))
+        assert client.post("/api/snapshots").status_code == 401
+        client.cookies.set("sta_session_token", "test-token-2")  # Not a GM
+        assert client.post("/api/snapshots").status_code == 401
+        assert not (tmp_path / "backups").exists()
+
+    def test_needs_database_file(self, client, sample_campaign, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "BACKUP_DIR", str(tmp_path / "backups"))
+        client.cookies.set("sta_session_token", "test-token-1")
+        response = client.post("/api/snapshots")
+        assert response.status_code == 409
+        assert not (tmp_path / "backups").exists()
@@ -0,0 +1,249 @@
+"""
+Tests for the event-sourced encounter journal.
+
+Tests verify:
+- Combat mutations append typed events
+- State materialized from snapshot + events matches the encounter records
+- Snapshots are taken every SNAPSHOT_INTERVAL events
+- Clients can catch up by event seq
+- Every mutating route journals, so /state never drifts from the records
+- Concurrent appends get distinct seqs
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from sta.database import encounter_journal
+from sta.database.encounter_journal import (
+    append_event,
+    encounter_state,
+    events_since,
+    materialize,
+    validate_event,
+)
+from sta.database.schema import Base, EncounterRecord, EncounterSnapshotRecord
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+
+@pytest.fixture
+def gm_client(client):
+    client.cookies.set("sta_session_token", "test-token-1")
+    return client
+
+
+def _types(data):
+    return [event["event_type"] for event in data["events"]]
+
+
+@pytest.mark.combat
+class TestEncounterJournal:
+    """append_event / materialize"""
+
+    def test_validate_event(self):
+        validate_event("momentum_changed", {"change": 1, "momentum": 1})
+        with pytest.raises(ValueError, match="Unknown"):
+            validate_event("teleported", {})
+        with pytest.raises(ValueError, match="momentum"):
+            validate_event("momentum_changed", {"change": 1})
+
+    async def test_no_events_materializes_from_records(self, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        seq, state = await materialize(test_session, encounter)
+        assert seq == 0
+        assert state == await encounter_state(test_session, encounter)
+
+    async def test_snapshot_every_interval(self, test_session, sample_encounter, monkeypatch):
+        monkeypatch.setattr(encounter_journal, "SNAPSHOT_INTERVAL", 3)
+        encounter = sample_encounter["encounter"]
+        for momentum in range(1, 8):
+            encounter.momentum = momentum
+            await append_event(test_session, encounter, "momentum_changed",
+                               change=1, momentum=momentum)
+        await test_session.commit()
+
+        result = await test_session.execute(
+            select(EncounterSnapshotRecord.seq)
+            .filter(EncounterSnapshotRecord.encounter_id == encounter.id)
+            .order_by(EncounterSnapshotRecord.seq)
+        )
+        assert result.scalars().all() == [1, 3, 6]
+
+        seq, state = await materialize(test_session, encounter)
+        assert (seq, state["momentum"]) == (7, 7)
+        seq, state = await materialize(test_session, encounter, at=4)
+        assert (seq, state["momentum"]) == (4, 4)
+
+    async def test_concurrent_appends_take_distinct_seqs(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'journal.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            encounter = EncounterRecord(encounter_id="race", name="Race")
+            session.add(encounter)
+            await session.commit()
+            encounter_pk = encounter.id
+
+        async def journal(momentum):
+            async with AsyncSession(engine) as session:
+                encounter = await session.get(EncounterRecord, encounter_pk)
+                seq = await append_event(session, encounter, "momentum_changed",
+                                         change=1, momentum=momentum)
+                await session.commit()
+                return seq
+
+        seqs = await asyncio.gather(*(journal(momentum) for momentum in range(1, 5)))
+        async with AsyncSession(engine) as session:
+            events = await events_since(session, encounter_pk)
+        await engine.dispose()
+
+        assert sorted(seqs) == [1, 2, 3, 4]
+        assert len(events) == 4
+
+
+@pytest.mark.combat
+@pytest.mark.api
+class TestEncounterEventRoutes:
+    """Journaled routes and GET /api/encounter/{id}/events and /state"""
+
+    async def test_mutations_are_journaled(self, gm_client, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        eid = encounter.encounter_id
+        ship_id = sample_encounter["player_ship"].id
+
+        gm_client.post(f"/api/encounter/{eid}/momentum", json={"change": 2})
+        gm_client.post(f"/api/encounter/{eid}/threat", json={"change": 3})
+        gm_client.post(f"/api/encounter/{eid}/move", json={"ship": "enemy_0", "q": 2, "r": -1})
+        gm_client.post(f"/api/encounter/{eid}/effects", json={
+            "source_action": "Calibrate Weapons", "applies_to": "attack",
+            "duration": "next_action", "damage_bonus": 1,
+        })
+        gm_client.post(f"/api/ship/{ship_id}/damage", json={"damage": 3, "encounter_id": eid})
+        gm_client.post(f"/api/ship/{ship_id}/breach", json={"system": "weapons", "encounter_id": eid})
+        gm_client.post(f"/api/encounter/{eid}/claim-turn", json={"player_id": 1})
+        gm_client.post(f"/api/encounter/{eid}/release-turn", json={})
+        gm_client.post(f"/api/encounter/{eid}/next-turn")
+
+        data = gm_client.get(f"/api/encounter/{eid}/events").json()
+        assert _types(data) == [
+            "momentum_changed", "threat_changed", "ship_moved", "effect_added",
+            "damage_taken", "breach_added", "turn_claimed", "turn_released",
+            "turn_advanced",
+        ]
+        assert data["seq"] == 9
+
+        await test_session.refresh(encounter)
+        materialized = gm_client.get(f"/api/encounter/{eid}/state").json()
+        assert materialized["seq"] == 9
+        assert materialized["state"] == await encounter_state(test_session, encounter)
+
+    async def test_materialize_replays_from_first_snapshot(
+        self, gm_client, test_session, sample_encounter
+    ):
+        encounter = sample_encounter["encounter"]
+        eid = encounter.encounter_id
+        for _ in range(3):
+            gm_client.post(f"/api/encounter/{eid}/momentum", json={"change": 1})
+
+        state = gm_client.get(f"/api/encounter/{eid}/state?at=1").json()
+        assert state["seq"] == 1
+        assert state["state"]["momentum"] == 1
+        assert gm_client.get(f"/api/encounter/{eid}/state").json()["state"]["momentum"] == 3
+
+    def test_catch_up_by_seq(self, gm_client, sample_encounter):
+        eid = sample_encounter["encounter"].encounter_id
+        for change in (1, 1, -1):
+            gm_client.post(f"/api/encounter/{eid}/momentum", json={"change": change})
+
+        first = gm_client.get(f"/api/encounter/{eid}/events?limit=2").json()
+        assert [e["seq"] for e in first["events"]] == [1, 2]
+        assert first["has_more"] is True
+
+        rest = gm_client.get(f"/api/encounter/{eid}/events?since={first['seq']}").json()
+        assert [e["payload"]["momentum"] for e in rest["events"]] == [1]
+        assert rest["has_more"] is False
+
+        idle = gm_client.get(f"/api/encounter/{eid}/events?since={rest['seq']}").json()
+        assert idle == {"seq": 3, "events": [], "has_more": False}
+
+    async def test_clear_effects_by_source(self, gm_client, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        eid = encounter.encounter_id
+        for source in ("Calibrate Weapons", "Modulate Shields"):
+            gm_client.post(f"/api/encounter/{eid}/effects", json={
+                "source_action": source, "applies_to": "all", "duration": "end_of_round",
+            })
+
+        response = gm_client.post(f"/api/encounter/{eid}/effects/clear",
+                                  json={"source_action": "Calibrate Weapons"})
+        assert response.json()["cleared"] == 1
+
+        state = gm_client.get(f"/api/encounter/{eid}/state").json()["state"]
+        assert [e["source_action"] for e in state["active_effects"]] == ["Modulate Shields"]
+        events = await events_since(test_session, encounter.id)
+        assert events[-1].payload == {"source_action": "Calibrate Weapons"}
+
+    async def test_round_tracker_is_journaled(
+        self, gm_client, test_session, sample_encounter, sample_campaign
+    ):
+        encounter = sample_encounter["encounter"]
+        eid = encounter.encounter_id
+        player = [p for p in sample_campaign["players"] if not p.is_gm][0]
+
+        gm_client.post(f"/api/encounter/{eid}/participant/{player.id}/action-status",
+                       json={"participant_type": "player", "action_taken": True})
+        gm_client.post(f"/api/encounter/{eid}/participant/0/action-status",
+                       json={"participant_type": "enemy_ship", "action_taken": True})
+        gm_client.post(f"/api/encounter/{eid}/reserve-power")
+        state = gm_client.get(f"/api/encounter/{eid}/state").json()["state"]
+        assert state["players_turns"] == {str(player.id): {"acted": True}}
+        assert state["ships_turns"] == {"0": 1}
+
+        gm_client.post(f"/api/encounter/{eid}/round/start")
+        data = gm_client.get(f"/api/encounter/{eid}/events").json()
+        assert _types(data) == ["player_acted", "ship_acted", "reserve_power_changed",
+                                "turn_advanced"]
+
+        materialized = gm_client.get(f"/api/encounter/{eid}/state").json()["state"]
+        round_status = gm_client.get(f"/api/encounter/{eid}/round-status").json()
+        assert materialized["round"] == round_status["round"] == 2
+        assert (materialized["players_turns"], materialized["ships_turns"]) == ({}, {})
+
+        await test_session.refresh(encounter)
+        assert materialized == await encounter_state(test_session, encounter)
+
+    async def test_gm_edit_is_journaled(self, gm_client, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        eid = encounter.encounter_id
+        positions = {"player": {"q": 1, "r": 1}}
+
+        gm_client.post(f"/encounters/{eid}/edit",
+                       data={"threat": 9, "ship_positions_json": json.dumps(positions)})
+        data = gm_client.get(f"/api/encounter/{eid}/events").json()
+        assert _types(data) == ["threat_changed", "ships_placed"]
+
+        state = gm_client.get(f"/api/encounter/{eid}/state").json()["state"]
+        assert (state["threat"], state["ship_positions"]) == (9, positions)
+        await test_session.refresh(encounter)
+        assert state == await encounter_state(test_session, encounter)
+
+    def test_invalid_requests(self, gm_client, sample_encounter):
+        eid = sample_encounter["encounter"].encounter_id
+        assert gm_client.post(f"/api/encounter/{eid}/move",
+                              json={"ship": "enemy_5", "q": 0, "r": 0}).status_code == 400
+        assert gm_client.post(f"/api/encounter/{eid}/effects",
+                              json={"applies_to": "all"}).status_code == 400
+        assert gm_client.get("/api/encounter/missing/events").status_code == 404
+
+    def test_journal_writes_are_gm_only(self, client, sample_encounter):
+        eid = sample_encounter["encounter"].encounter_id
+        client.cookies.set("sta_session_token", "test-token-2")
+        assert client.post(f"/api/encounter/{eid}/move",
+                           json={"ship": "enemy_0", "q": 0, "r": 0}).status_code == 401
+        assert client.post(f"/api/encounter/{eid}/effects", json={
+            "source_action": "Calibrate Weapons", "applies_to": "allies", "duration": "next_action",
+        }).status_code == 401
+        assert client.post(f"/api/encounter/{eid}/effects/clear", json={}).status_code == 401
+        assert client.get(f"/api/encounter/{eid}/events").json()["events"] == []
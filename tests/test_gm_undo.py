@@ -0,0 +1,154 @@
+"""
+Tests for GM undo and rewind.
+
+Tests verify:
+- Mutating routes record reverse diffs of the fields they touched
+- Undo of the last N operations restores encounter and ship fields
+- Rewind to the start of a round
+- Diff storage is capped per encounter
+- Undo is GM-only
+"""
+
+import json
+import pytest
+
+from sta.database import undo
+from sta.database.schema import SceneRecord
+from sta.database.vtt_schema import VTTShipRecord
+
+
+@pytest.fixture
+def gm_client(client):
+    client.cookies.set("sta_session_token", "test-token-1")
+    return client
+
+
+def _labels(data):
+    return [operation["label"] for operation in data["undone"]]
+
+
+@pytest.mark.combat
+@pytest.mark.api
+class TestGMUndo:
+    """POST /api/encounter/{id}/undo and /rewind"""
+
+    async def test_undo_last_operation(self, gm_client, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        eid = encounter.encounter_id
+        gm_client.post(f"/api/encounter/{eid}/threat", json={"change": 4})
+        gm_client.post(f"/api/encounter/{eid}/threat/spend", json={"spend_type": "hazard"})
+        assert gm_client.get(f"/api/encounter/{eid}/undo").json()["operations"][0]["label"] == (
+            "Spend Threat: Introduce Hazard"
+        )
+
+        data = gm_client.post(f"/api/encounter/{eid}/undo", json={}).json()
+        assert _labels(data) == ["Spend Threat: Introduce Hazard"]
+        assert data["threat"] == 4
+        assert data["remaining"] == 1
+
+        await test_session.refresh(encounter)
+        assert encounter.threat == 4
+
+    async def test_undo_restores_ships_and_journal(self, gm_client, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        eid = encounter.encounter_id
+        ship = sample_encounter["enemy_ship"]
+        shields_before = ship.shields
+
+        gm_client.post(f"/api/ship/{ship.id}/damage", json={"damage": 5, "encounter_id": eid})
+        gm_client.post(f"/api/ship/{ship.id}/breach", json={"system": "engines", "encounter_id": eid})
+        gm_client.post(f"/api/encounter/{eid}/momentum", json={"change": 2})
+
+        data = gm_client.post(f"/api/encounter/{eid}/undo", json={"steps": 3}).json()
+        assert len(data["undone"]) == 3
+        assert data["momentum"] == 0
+
+        await test_session.refresh(ship)
+        assert ship.shields == shields_before
+        assert json.loads(ship.breaches_json or "[]") == []
+
+        state = gm_client.get(f"/api/encounter/{eid}/state").json()["state"]
+        assert state["ships"][str(ship.id)]["shields"] == shields_before
+        assert state["momentum"] == 0
+
+    async def test_ship_changes_find_their_encounter(
+        self, gm_client, test_session, sample_encounter
+    ):
+        # The GM console's quick damage and breach controls send only the ship
+        encounter = sample_encounter["encounter"]
+        eid = encounter.encounter_id
+        ship = sample_encounter["enemy_ship"]
+        shields_before = ship.shields
+
+        gm_client.post(f"/api/ship/{ship.id}/damage", json={"damage": 5})
+        gm_client.post(f"/api/ship/{ship.id}/breach", json={"system": "engines"})
+        operations = gm_client.get(f"/api/encounter/{eid}/undo").json()["operations"]
+        assert [operation["label"] for operation in operations] == [
+            f"Engines breach on {ship.name}", f"5 damage to {ship.name}",
+        ]
+        events = gm_client.get(f"/api/encounter/{eid}/events").json()["events"]
+        assert {"damage_taken", "breach_added"} <= {event["event_type"] for event in events}
+
+        gm_client.post(f"/api/encounter/{eid}/undo", json={"steps": 2})
+        await test_session.refresh(ship)
+        assert ship.shields == shields_before
+        assert json.loads(ship.breaches_json or "[]") == []
+
+    async def test_rewind_to_round_start(self, gm_client, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        eid = encounter.encounter_id
+        gm_client.post(f"/api/encounter/{eid}/momentum", json={"change": 1})
+        gm_client.post(f"/api/encounter/{eid}/round/start")
+        gm_client.post(f"/api/encounter/{eid}/momentum", json={"change": 2})
+        gm_client.post(f"/api/encounter/{eid}/threat", json={"change": 1})
+
+        # Start of the current round (2): round 1's momentum survives
+        data = gm_client.post(f"/api/encounter/{eid}/rewind", json={}).json()
+        assert _labels(data) == ["Threat +1", "Momentum +2"]
+        assert (data["round"], data["momentum"], data["threat"]) == (2, 1, 0)
+
+        # Start of round 1 undoes the round advance too
+        data = gm_client.post(f"/api/encounter/{eid}/rewind", json={"round": 1}).json()
+        assert (data["round"], data["momentum"]) == (1, 0)
+        assert data["remaining"] == 0
+
+    async def test_vtt_ship_changes_are_undoable(self, gm_client, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        scene = SceneRecord(campaign_id=encounter.campaign_id, name="Bridge",
+                            encounter_id=encounter.id)
+        test_session.add(scene)
+        await test_session.flush()
+        ship = VTTShipRecord(name="USS Undo", ship_class="Test", scale=4, shields=8,
+                             shields_max=8, scene_id=scene.id,
+                             systems_json="{}", departments_json="{}")
+        test_session.add(ship)
+        await test_session.commit()
+
+        gm_client.put(f"/api/ships/{ship.id}/shields", json={"shields": 2, "raised": True})
+        data = gm_client.post(f"/api/encounter/{encounter.encounter_id}/undo", json={}).json()
+        assert _labels(data) == ["Adjust shields: USS Undo"]
+
+        await test_session.refresh(ship)
+        assert (ship.shields, ship.shields_raised) == (8, False)
+
+    def test_storage_is_capped(self, gm_client, sample_encounter, monkeypatch):
+        monkeypatch.setattr(undo, "MAX_UNDO_OPERATIONS", 3)
+        eid = sample_encounter["encounter"].encounter_id
+        for _ in range(5):
+            gm_client.post(f"/api/encounter/{eid}/threat", json={"change": 1})
+
+        assert len(gm_client.get(f"/api/encounter/{eid}/undo").json()["operations"]) == 3
+        data = gm_client.post(f"/api/encounter/{eid}/undo", json={"steps": 10}).json()
+        assert data["threat"] == 2
+
+    def test_nothing_to_undo(self, gm_client, sample_encounter):
+        eid = sample_encounter["encounter"].encounter_id
+        data = gm_client.post(f"/api/encounter/{eid}/undo", json={}).json()
+        assert data["undone"] == []
+
+    def test_requires_gm(self, client, sample_encounter):
+        eid = sample_encounter["encounter"].encounter_id
+        assert client.post(f"/api/encounter/{eid}/undo", json={}).status_code == 401
+        client.cookies.set("sta_session_token", "test-token-1")
+        assert client.post(f"/api/encounter/{eid}/undo",
+                           json={"steps": 0}).status_code == 400
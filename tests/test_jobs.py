@@ -0,0 +1,184 @@
+"""
+Tests for the background job runner.
+
+Tests verify:
+- Queued work runs on a worker with progress and thread-pool calls
+- Cancelled jobs stop and roll back their writes
+- Failures are recorded with their error
+- Routes hand work off with ?background=true, and results can be downloaded
+- Only the player who queued a job and its campaign's GM can see it
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from sta.database.schema import JobRecord, NPCRecord
+from sta.web.jobs import JobRunner, job_runner
+
+
+@pytest.fixture
+async def runner():
+    local = JobRunner(workers=1, threads=1)
+    yield local
+    await local.stop()
+
+
+async def _finished(test_session, runner, job_id) -> JobRecord:
+    await asyncio.wait_for(runner._queue.join(), timeout=5)
+    job = await test_session.get(JobRecord, job_id)
+    await test_session.refresh(job)
+    return job
+
+
+class TestJobRunner:
+    """JobRunner"""
+
+    async def test_runs_work(self, test_session, runner):
+        async def work(job, db):
+            await job.progress(50, "Halfway")
+            total = await job.run_sync(sum, range(10))
+            db.add(NPCRecord(name="Generated"))
+            return {"total": total}
+
+        job_id = await runner.submit("test", work, filename="result.json")
+        job = await _finished(test_session, runner, job_id)
+
+        assert (job.status, job.progress, job.message) == ("completed", 100, "Halfway")
+        assert job.result_json == '{"total": 45}'
+        assert job.started_at is not None and job.finished_at is not None
+        assert await test_session.scalar(select(func.count(NPCRecord.id))) == 1
+
+    async def test_cancel_rolls_back(self, test_session, runner):
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def work(job, db):
+            db.add(NPCRecord(name="Discarded"))
+            started.set()
+            await release.wait()
+            await job.progress(90)
+            return {}
+
+        job_id = await runner.submit("test", work)
+        await asyncio.wait_for(started.wait(), timeout=5)
+        assert runner.live(job_id).progress_percent == 0
+        assert await runner.cancel(test_session, job_id)
+        await test_session.commit()
+        release.set()
+
+        job = await _finished(test_session, runner, job_id)
+        assert job.status == "cancelled"
+        assert job.result_json is None
+        assert await test_session.scalar(select(func.count(NPCRecord.id))) == 0
+        assert not await runner.cancel(test_session, job_id)
+
+    async def test_failure_is_recorded(self, test_session, runner):
+        async def work(job, db):
+            raise HTTPException(status_code=400, detail="Bad backup")
+
+        async def crash(job, db):
+            await job.run_sync(int, "x")
+
+        failed = await runner.submit("test", work)
+        crashed = await runner.submit("test", crash)
+        assert (await _finished(test_session, runner, failed)).error == "Bad backup"
+        job = await _finished(test_session, runner, crashed)
+        assert job.status == "failed"
+        assert job.error.startswith("ValueError")
+
+
+class TestJobRoutes:
+    """?background=true and /api/jobs"""
+
+    @pytest.fixture
+    async def http(self, app, sample_campaign):
+        """Client with the sample campaign GM's session."""
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test",
+            cookies={"sta_session_token": "test-token-1"},
+        ) as http:
+            yield http
+        await job_runner.stop()
+
+    @pytest.fixture
+    async def player_http(self, app, sample_campaign):
+        """Client with a non-GM player's session in the same campaign."""
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test",
+            cookies={"sta_session_token": "test-token-2"},
+        ) as http:
+            yield http
+
+    @staticmethod
+    async def _wait(http, job_id):
+        await asyncio.wait_for(job_runner._queue.join(), timeout=5)
+        return (await http.get(f"/api/jobs/{job_id}")).json()
+
+    async def test_backup_as_job(self, http, sample_campaign):
+        campaign_id = sample_campaign["campaign"].campaign_id
+        response = await http.get(f"/api/backup/{campaign_id}?background=true")
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        data = await self._wait(http, job_id)
+        assert (data["status"], data["kind"]) == ("completed", "campaign_backup")
+
+        result = await http.get(data["result_url"])
+        assert result.headers["content-disposition"] == (
+            f'attachment; filename="campaign-{campaign_id}.json"'
+        )
+        assert result.json()["campaigns"][0]["name"] == sample_campaign["campaign"].name
+
+        assert (await http.post(f"/api/jobs/{job_id}/cancel")).status_code == 409
+        listed = (await http.get("/api/jobs?kind=campaign_backup")).json()["jobs"]
+        assert [job["job_id"] for job in listed] == [job_id]
+
+    async def test_generate_random_as_job(self, http):
+        response = await http.post("/campaigns/api/generate-random?background=true")
+        data = await self._wait(http, response.json()["job_id"])
+        assert data["status"] == "completed"
+        assert (await http.get(data["result_url"])).json()["success"] is True
+
+    def test_unknown_jobs(self, client, sample_campaign):
+        client.cookies.set("sta_session_token", "test-token-1")
+        assert client.get("/api/jobs/missing").status_code == 404
+        assert client.get("/api/jobs/missing/result").status_code == 404
+
+    async def test_jobs_require_a_session(self, http, app, sample_campaign):
+        campaign_id = sample_campaign["campaign"].campaign_id
+        job_id = (await http.get(f"/api/backup/{campaign_id}?background=true")).json()["job_id"]
+        await self._wait(http, job_id)
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as anonymous:
+            assert (await anonymous.get("/api/jobs")).status_code == 401
+            for url in (f"/api/jobs/{job_id}", f"/api/jobs/{job_id}/result"):
+                assert (await anonymous.get(url)).status_code == 401
+            assert (await anonymous.post(f"/api/jobs/{job_id}/cancel")).status_code == 401
+
+    async def test_players_see_only_their_own_jobs(self, http, player_http, sample_campaign):
+        campaign_id = sample_campaign["campaign"].campaign_id
+        gm_job = (await http.get(f"/api/backup/{campaign_id}?background=true")).json()["job_id"]
+        player_job = (
+            await player_http.post("/campaigns/api/generate-random?background=true")
+        ).json()["job_id"]
+        await asyncio.wait_for(job_runner._queue.join(), timeout=5)
+
+        # The player can't see the GM's job...
+        for url in (f"/api/jobs/{gm_job}", f"/api/jobs/{gm_job}/result"):
+            assert (await player_http.get(url)).status_code == 401
+        assert (await player_http.post(f"/api/jobs/{gm_job}/cancel")).status_code == 401
+        listed = (await player_http.get("/api/jobs")).json()["jobs"]
+        assert [job["job_id"] for job in listed] == [player_job]
+
+        # ...but the GM sees every job in their campaign
+        data = (await http.get(f"/api/jobs/{player_job}")).json()
+        assert data["campaign_id"] == sample_campaign["campaign"].id
+        assert (await http.get(f"/api/jobs/{player_job}/result")).status_code == 200
+        listed = (await http.get("/api/jobs")).json()["jobs"]
+        assert {job["job_id"] for job in listed} == {gm_job, player_job}
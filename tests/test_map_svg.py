@@ -0,0 +1,146 @@
+"""
+Tests for the server-rendered tactical map.
+
+Tests verify:
+- The terrain layer draws every hex with its terrain overlays
+- Ship tokens are drawn and their names escaped
+- Moving ships redraws only the token layer; the terrain layer is reused
+- /map.svg revalidates by ETag and honours visibility like /map
+"""
+
+import json
+
+import pytest
+
+import sta.web.map_svg as map_svg
+from sta.models.combat import HexCoord, TacticalMap
+from sta.models.enums import TerrainType
+from sta.web.map_svg import MEDIA_TYPE, MapSvgCache, render_terrain_layer, render_token_layer
+from sta.web.polling import POLL_HEADER
+
+NEBULA_MAP = json.dumps({
+    "radius": 3,
+    "tiles": [
+        {"coord": {"q": 2, "r": 0}, "terrain": "dense_nebula", "traits": []},
+        {"coord": {"q": -1, "r": 1}, "terrain": "asteroid_field", "traits": []},
+    ],
+})
+
+
+def _ship(name, q, r, is_player=False):
+    return {"id": 1, "name": name, "ship_class": "Test", "is_player": is_player, "q": q, "r": r}
+
+
+class TestLayers:
+    """render_terrain_layer / render_token_layer"""
+
+    def test_terrain_layer(self):
+        tactical_map = TacticalMap(radius=2)
+        tactical_map.set_terrain(HexCoord(1, 0), TerrainType.DUST_CLOUD)
+        tactical_map.set_terrain(HexCoord(0, 1), TerrainType.DEBRIS_FIELD)
+        layer = render_terrain_layer(tactical_map)
+
+        assert layer.count('stroke="#ff9900"') == 19  # 3r(r+1)+1 hexes
+        assert layer.count("url(#fog-pattern)") == 1
+        assert layer.count("url(#hazard-pattern)") == 1
+        assert layer.count("url(#hindrance-pattern)") == 1
+        assert "CENTER" in layer
+
+    def test_token_layer(self):
+        layer = render_token_layer(TacticalMap(), [
+            _ship("U.S.S. <Defiant>", 0, 0, is_player=True),
+            _ship("", 1, 0),
+        ])
+        assert layer.count("<polygon") == 2
+        assert "U.S.S. &lt;Defiant&gt;" in layer
+        assert "Enemy 2" in layer
+
+
+class TestCache:
+    """MapSvgCache"""
+
+    def test_moving_ships_redraws_only_tokens(self, monkeypatch):
+        drawn = []
+        render = map_svg.render_terrain_layer
+        monkeypatch.setattr(
+            map_svg, "render_terrain_layer", lambda m: drawn.append(m) or render(m)
+        )
+        cache = MapSvgCache()
+
+        etag, svg = cache.render(NEBULA_MAP, [_ship("Enterprise", 0, 0, True)])
+        assert svg.startswith("<svg") and svg.endswith("</svg>")
+        assert cache.render(NEBULA_MAP, [_ship("Enterprise", 0, 0, True)]) == (etag, svg)
+
+        moved_etag, moved = cache.render(NEBULA_MAP, [_ship("Enterprise", 1, 0, True)])
+        assert len(drawn) == 1
+        assert moved_etag != etag
+        assert moved_etag.split("-")[0] == etag.split("-")[0]
+        assert moved.split('<g id="ships">')[0] == svg.split('<g id="ships">')[0]
+
+        cache.render(json.dumps({"radius": 4, "tiles": []}), [])
+        assert len(drawn) == 2
+
+    def test_bounded(self):
+        cache = MapSvgCache(max_maps=2, max_documents=3)
+        for q in range(5):
+            cache.render(json.dumps({"radius": q + 1, "tiles": []}), [_ship("A", 0, 0)])
+        assert len(cache._maps) == 2
+        assert len(cache._documents) == 3
+
+    def test_bad_map_json_draws_default_map(self):
+        _, svg = MapSvgCache().render('{"tiles": [{"coord": {}, "terrain": "lava"}]}', [])
+        assert svg.count('stroke="#ff9900"') == 37
+
+
+class TestEndpoint:
+    """GET /api/encounter/{id}/map.svg"""
+
+    @pytest.fixture
+    async def nebula_encounter(self, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        encounter.tactical_map_json = NEBULA_MAP
+        encounter.ship_positions_json = json.dumps(
+            {"player": {"q": 0, "r": 0}, "enemy_0": {"q": 2, "r": 0}}
+        )
+        await test_session.commit()
+        return sample_encounter
+
+    def test_svg_with_etag(self, client, nebula_encounter):
+        url = f"/api/encounter/{nebula_encounter['encounter'].encounter_id}/map.svg"
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == MEDIA_TYPE
+        assert response.headers["cache-control"] == "no-cache"
+        assert POLL_HEADER in response.headers
+        assert nebula_encounter["player_ship"].name in response.text
+
+        cached = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == response.headers["etag"]
+
+    async def test_ships_moving_change_etag(self, client, test_session, nebula_encounter):
+        encounter = nebula_encounter["encounter"]
+        url = f"/api/encounter/{encounter.encounter_id}/map.svg?role=gm"
+        before = client.get(url).headers["etag"]
+
+        encounter.ship_positions_json = json.dumps(
+            {"player": {"q": 1, "r": 0}, "enemy_0": {"q": 2, "r": 0}}
+        )
+        await test_session.commit()
+        after = client.get(url, headers={"If-None-Match": before})
+
+        assert after.status_code == 200
+        assert after.headers["etag"] != before
+        assert after.headers["etag"].split("-")[0] == before.split("-")[0]
+
+    def test_hidden_ships_stay_hidden(self, client, nebula_encounter):
+        url = f"/api/encounter/{nebula_encounter['encounter'].encounter_id}/map.svg"
+        enemy = nebula_encounter["enemy_ship"].name
+
+        assert enemy not in client.get(url).text
+        assert enemy in client.get(f"{url}?role=gm").text
+
+    def test_not_found(self, client):
+        assert client.get("/api/encounter/nope/map.svg").status_code == 404
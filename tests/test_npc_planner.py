@@ -0,0 +1,148 @@
+"""
+Tests for the time-bounded NPC turn planner.
+
+Tests verify:
+- Ships in range fire, ships out of range close the distance
+- Badly damaged ships prefer repairs
+- The planning budget is respected
+- The enemy-plan endpoint
+"""
+
+import json
+import random
+import time
+import pytest
+
+from sta.generators import generate_starship
+from sta.generators.starship import generate_enemy_ship, get_weapon
+from sta.mechanics.npc_planner import (
+    BREACH_VALUE,
+    expected_hit_damage,
+    plan_enemy_turn,
+    plan_enemy_turns,
+    weapon_in_range,
+)
+from sta.models.combat import Encounter, HexCoord, ShipCombatant, TacticalMap
+from sta.models.enums import SystemType
+
+
+def _encounter(enemy_positions, radius=4, threat=6):
+    random.seed(1234)
+    player = ShipCombatant(ship=generate_starship(), position=HexCoord(0, 0))
+    enemies = []
+    for q, r in enemy_positions:
+        ship = generate_enemy_ship(difficulty="standard", faction="Klingon")
+        ship.weapons = [get_weapon("Disruptor Banks")]
+        enemies.append(ShipCombatant(ship=ship, faction="enemy", position=HexCoord(q, r)))
+    return Encounter(
+        player_ship=player,
+        enemy_ships=enemies,
+        tactical_map=TacticalMap(radius=radius),
+        threat=threat,
+    )
+
+
+@pytest.mark.combat
+class TestNPCPlanner:
+    """Plan selection for enemy ships."""
+
+    def test_weapon_range_bands(self):
+        weapon = get_weapon("Disruptor Banks")  # medium range
+        assert weapon_in_range(weapon, 0)
+        assert weapon_in_range(weapon, 1)
+        assert not weapon_in_range(weapon, 2)
+
+    def test_breaches_make_hits_more_valuable(self):
+        ship = generate_starship()
+        ship.shields = 0
+        # A breach per 5 hull damage past Resistance, as in take_damage
+        assert expected_hit_damage(ship.resistance + 4, ship) == 4
+        assert expected_hit_damage(ship.resistance + 5, ship) == 5 + BREACH_VALUE
+        ship.shields = 20
+        assert expected_hit_damage(5, ship) == 5
+
+    def test_ship_in_range_fires_and_calibrates(self):
+        encounter = _encounter([(1, 0)])
+        plan = plan_enemy_turn(encounter, 0)
+
+        assert plan.major == "Fire"
+        assert plan.weapon_name == "Disruptor Banks"
+        assert plan.range_category in ("close", "medium")
+        assert 0 < plan.hit_chance <= 1
+        assert plan.expected_damage > 0
+
+    def test_distant_ship_moves_closer(self):
+        encounter = _encounter([(4, 0)])
+        plan = plan_enemy_turn(encounter, 0)
+
+        assert plan.minor == "Impulse"
+        assert plan.move_to.distance_to(HexCoord(0, 0)) < 4
+
+    def test_crippled_ship_repairs(self):
+        encounter = _encounter([(4, 0)])
+        ship = encounter.enemy_ships[0].ship
+        for system in [SystemType.COMMS, SystemType.SENSORS, SystemType.COMPUTERS]:
+            ship.add_breach(system)
+
+        plan = plan_enemy_turn(encounter, 0)
+        assert plan.major == "Damage Control"
+
+    def test_acted_ships_are_skipped_and_best_plan_first(self):
+        encounter = _encounter([(1, 0), (4, 0), (0, 1)])
+        encounter.enemy_ships[2].has_acted = True
+
+        plans = plan_enemy_turns(encounter)
+        assert {p.ship_index for p in plans} == {0, 1}
+        assert plans == sorted(plans, key=lambda p: p.score, reverse=True)
+
+    def test_budget_is_respected(self):
+        encounter = _encounter([(q % 5 - 2, 3 if q < 5 else -3) for q in range(10)], radius=6)
+
+        started = time.perf_counter()
+        plans = plan_enemy_turns(encounter, budget_ms=50)
+        assert (time.perf_counter() - started) * 1000 < 250  # Generous for slow CI
+        assert len(plans) == 10
+
+        # With no budget every ship still gets a hold-position plan
+        plans = plan_enemy_turns(encounter, budget_ms=0)
+        assert len(plans) == 10
+        assert all(p.timed_out for p in plans)
+
+
+@pytest.mark.combat
+@pytest.mark.api
+class TestEnemyPlanEndpoint:
+    """GET /api/encounter/{encounter_id}/enemy-plan"""
+
+    async def test_returns_plan_for_each_enemy(self, client, sample_encounter, test_session):
+        encounter = sample_encounter["encounter"]
+        encounter.ship_positions_json = json.dumps(
+            {"player": {"q": 0, "r": 0}, "enemy_0": {"q": 1, "r": 0}}
+        )
+        await test_session.commit()
+
+        response = client.get(f"/api/encounter/{encounter.encounter_id}/enemy-plan")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["budget_ms"] == 50
+        assert len(data["plans"]) == 1
+        assert data["plans"][0]["ship_name"] == sample_encounter["enemy_ship"].name
+        assert data["plans"][0]["major"] == "Fire"
+
+    async def test_acted_enemy_has_no_plan(self, client, sample_encounter, test_session):
+        encounter = sample_encounter["encounter"]
+        enemy_id = sample_encounter["enemy_ship"].id
+        encounter.ships_turns_used_json = json.dumps({str(enemy_id): 1})
+        await test_session.commit()
+
+        response = client.get(f"/api/encounter/{encounter.encounter_id}/enemy-plan")
+        assert response.json()["plans"] == []
+
+    def test_unknown_encounter(self, client):
+        response = client.get("/api/encounter/missing/enemy-plan")
+        assert response.status_code == 404
+
+    def test_budget_is_bounded(self, client, sample_encounter):
+        encounter_id = sample_encounter["encounter"].encounter_id
+        response = client.get(f"/api/encounter/{encounter_id}/enemy-plan?budget_ms=5000")
+        assert response.status_code == 422
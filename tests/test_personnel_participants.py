@@ -0,0 +1,203 @@
+"""
+Tests for per-character personnel encounter rows.
+
+Tests verify:
+- /api/personnel/{scene_id}/status returns every participant in slot order
+- The status ETag is the encounter's change version; unchanged polls get 304
+- A change to one participant bumps the version
+- The poll interval follows changes to the personnel encounter
+- A 30+ participant brawl costs the same two queries as a duel
+- Revision 006 moves the old JSON columns into rows
+"""
+
+import json
+import sqlite3
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect, select
+
+from sta.database.schema import (
+    Base,
+    PersonnelEncounterRecord,
+    PersonnelParticipantRecord,
+    SceneRecord,
+)
+from sta.database.changes import Change, ChangeNotifier
+from sta.database.schema_version import alembic_config, ensure_schema
+from sta.web import polling
+from sta.web.polling import POLL_ACTIVE_MS, POLL_BUSY_MS, POLL_HEADER
+
+BRAWL = 32
+
+
+async def _personnel_scene(test_session, campaign, participants):
+    scene = SceneRecord(
+        campaign_id=campaign.id,
+        name="Bar Fight",
+        scene_type="personal_encounter",
+        status="active",
+    )
+    test_session.add(scene)
+    await test_session.flush()
+    encounter = PersonnelEncounterRecord(scene_id=scene.id, momentum=2, threat=4)
+    test_session.add(encounter)
+    await test_session.flush()
+    test_session.add_all(
+        PersonnelParticipantRecord(
+            personnel_encounter_id=encounter.id,
+            slot=slot,
+            name=f"Brawler {slot}",
+            is_player=slot % 2 == 0,
+            q=slot % 3,
+            r=-(slot % 2),
+        )
+        for slot in reversed(range(participants))
+    )
+    await test_session.commit()
+    return scene, encounter
+
+
+@pytest.fixture
+async def duel(test_session, sample_campaign):
+    return await _personnel_scene(test_session, sample_campaign["campaign"], 2)
+
+
+class TestPersonnelStatus:
+    """GET /api/personnel/{scene_id}/status"""
+
+    def test_participants_in_slot_order(self, client, duel):
+        scene, encounter = duel
+        response = client.get(f"/api/personnel/{scene.id}/status")
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["has_active_encounter"] is True
+        assert data["personnel_encounter_id"] == encounter.id
+        assert (data["momentum"], data["threat"], data["round"]) == (2, 4, 1)
+        assert [c["index"] for c in data["characters"]] == [0, 1]
+        assert data["characters"][1]["position"] == {"q": 1, "r": -1}
+        assert data["characters"][0]["has_acted"] is False
+        assert response.headers["etag"] == f'"personnel-{encounter.id}-{data["version"]}"'
+        assert POLL_HEADER in response.headers
+
+    def test_unchanged_is_not_modified(self, client, duel):
+        scene, _ = duel
+        url = f"/api/personnel/{scene.id}/status"
+        etag = client.get(url).headers["etag"]
+
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert POLL_HEADER in response.headers
+
+    def test_paced_by_personnel_changes(self, client, duel, monkeypatch):
+        scene, encounter = duel
+        notifier = ChangeNotifier()
+        monkeypatch.setattr(polling, "notifier", notifier)
+        url = f"/api/personnel/{scene.id}/status"
+        assert client.get(url).headers[POLL_HEADER] == str(POLL_ACTIVE_MS)
+
+        # Participant changes are recorded against the personnel encounter
+        notifier._publish([Change(seq=1, entity_type="personnel", entity_id=encounter.id)])
+        response = client.get(url)
+        assert response.headers[POLL_HEADER] == str(POLL_BUSY_MS)
+        response = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+        assert response.headers[POLL_HEADER] == str(POLL_BUSY_MS)
+
+    async def test_participant_change_bumps_version(self, client, test_session, duel):
+        scene, encounter = duel
+        url = f"/api/personnel/{scene.id}/status"
+        before = client.get(url)
+
+        participant = (
+            await test_session.execute(
+                select(PersonnelParticipantRecord).filter(
+                    PersonnelParticipantRecord.personnel_encounter_id == encounter.id,
+                    PersonnelParticipantRecord.slot == 1,
+                )
+            )
+        ).scalar_one()
+        participant.stress = 1
+        await test_session.commit()
+
+        after = client.get(url, headers={"If-None-Match": before.headers["etag"]})
+        assert after.status_code == 200
+        assert after.json()["version"] > before.json()["version"]
+        assert after.json()["characters"][1]["stress"] == 1
+
+    async def test_no_active_encounter(self, client, test_session, duel):
+        scene, encounter = duel
+        encounter.is_active = False
+        await test_session.commit()
+
+        response = client.get(f"/api/personnel/{scene.id}/status")
+        assert response.json() == {"has_active_encounter": False}
+
+    def test_unknown_scene(self, client):
+        assert client.get("/api/personnel/9999/status").status_code == 404
+
+    @pytest.mark.query_budget
+    async def test_brawl_within_budget(self, query_budget, test_session, sample_campaign):
+        scene, _ = await _personnel_scene(test_session, sample_campaign["campaign"], BRAWL)
+        response = query_budget("GET", f"/api/personnel/{scene.id}/status", budget=2)
+        assert len(response.json()["characters"]) == BRAWL
+
+
+class TestParticipantMigration:
+    """Revision 006 on a database with the JSON columns"""
+
+    def test_json_state_becomes_rows(self, tmp_path):
+        db_path = tmp_path / "sta.db"
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            command.stamp(alembic_config(conn), "005_fold_startup_migrations")
+        states = [
+            {"character_id": 7, "name": "Worf", "is_player": True, "stress": 3,
+             "stress_max": 12, "injuries": [{"type": "stun", "severity": 1, "name": "Dazed"}],
+             "is_defeated": False, "protection": 2},
+            {"name": "Klingon", "stress": 0, "is_defeated": True},
+        ]
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript(
+                """
+                ALTER TABLE personnel_encounters ADD COLUMN character_states_json TEXT NOT NULL DEFAULT '[]';
+                ALTER TABLE personnel_encounters ADD COLUMN character_positions_json TEXT NOT NULL DEFAULT '{}';
+                ALTER TABLE personnel_encounters ADD COLUMN characters_turns_used_json TEXT NOT NULL DEFAULT '{}';
+                INSERT INTO campaigns (id, campaign_id, name, momentum, threat, is_active, created_at, updated_at)
+                    VALUES (1, 'c-1', 'Old', 0, 0, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP);
+                """
+            )
+            conn.execute(
+                "INSERT INTO personnel_encounters (id, scene_id, momentum, threat, round, "
+                "current_turn, is_active, active_effects_json, tactical_map_json, created_at, "
+                "updated_at, character_states_json, character_positions_json, "
+                "characters_turns_used_json) VALUES (1, 1, 0, 0, 1, 'player', 1, '[]', '{}', "
+                "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, ?, ?, ?)",
+                (
+                    json.dumps(states),
+                    json.dumps({"character_1": {"q": 2, "r": -1}}),
+                    json.dumps({"0": {"acted": True, "acted_at": "2026-05-01T10:00:00"}}),
+                ),
+            )
+
+        with engine.begin() as conn:
+            assert ensure_schema(conn) is True
+
+        columns = {c["name"] for c in inspect(engine).get_columns("personnel_encounters")}
+        assert "character_states_json" not in columns
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute(
+                "SELECT slot, character_id, name, is_player, stress, stress_max, injuries_json, "
+                "is_defeated, protection, q, r, has_acted, acted_at "
+                "FROM personnel_participants ORDER BY slot"
+            ).fetchall()
+        engine.dispose()
+
+        worf, klingon = rows
+        assert worf[:6] == (0, 7, "Worf", 1, 3, 12)
+        assert json.loads(worf[6]) == states[0]["injuries"]
+        assert worf[7:] == (0, 2, 0, 0, 1, "2026-05-01 10:00:00")
+        assert klingon == (1, None, "Klingon", 0, 0, 5, "[]", 1, 0, 2, -1, 0, None)
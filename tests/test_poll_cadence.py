@@ -0,0 +1,77 @@
+"""
+Tests for the recommended poll interval on polled endpoints.
+
+Tests verify:
+- The interval follows encounter activity and recent changes
+- Polled endpoints send it in the X-Poll-Interval header
+"""
+
+import pytest
+
+from sta.database.changes import Change, ChangeNotifier
+from sta.web import polling
+from sta.web.polling import (
+    POLL_ACTIVE_MS,
+    POLL_BUSY_MS,
+    POLL_HEADER,
+    POLL_IDLE_MS,
+    POLL_QUIET_MS,
+    poll_interval,
+)
+
+
+@pytest.fixture
+def notifier(monkeypatch):
+    notifier = ChangeNotifier()
+    monkeypatch.setattr(polling, "notifier", notifier)
+    return notifier
+
+
+def _changed(notifier, seconds_ago, entity_id=1):
+    notifier._publish([Change(seq=notifier.last_seq + 1, entity_type="encounter",
+                              entity_id=entity_id)])
+    notifier.changed_at[("encounter", entity_id)] -= seconds_ago
+
+
+class TestPollInterval:
+    """poll_interval"""
+
+    def test_follows_activity(self, notifier, monkeypatch):
+        assert poll_interval("encounter", 1, active=False) == POLL_IDLE_MS
+        # Without a running notifier recent changes are unknown
+        assert poll_interval("encounter", 1, active=True) == POLL_ACTIVE_MS
+
+        _changed(notifier, seconds_ago=1)
+        assert poll_interval("encounter", 1, active=True) == POLL_BUSY_MS
+        assert poll_interval("encounter", 1, active=False) == POLL_IDLE_MS
+        _changed(notifier, seconds_ago=60)
+        assert poll_interval("encounter", 1, active=True) == POLL_ACTIVE_MS
+        _changed(notifier, seconds_ago=600)
+        assert poll_interval("encounter", 1, active=True) == POLL_QUIET_MS
+
+        monkeypatch.setattr(ChangeNotifier, "running", True)
+        assert poll_interval("encounter", 2, active=True) == POLL_QUIET_MS
+
+
+class TestPolledEndpoints:
+    """X-Poll-Interval on the polled encounter endpoints"""
+
+    @pytest.mark.parametrize("path", ["status", "map", "combat-log", "round-status"])
+    async def test_header(self, client, test_session, sample_encounter, notifier, path):
+        encounter = sample_encounter["encounter"]
+        url = f"/api/encounter/{encounter.encounter_id}/{path}"
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers[POLL_HEADER] == str(POLL_ACTIVE_MS)
+
+        _changed(notifier, seconds_ago=0, entity_id=encounter.id)
+        assert client.get(url).headers[POLL_HEADER] == str(POLL_BUSY_MS)
+
+        encounter.status = "completed"
+        await test_session.commit()
+        assert client.get(url).headers[POLL_HEADER] == str(POLL_IDLE_MS)
+
+    def test_missing_encounter_has_no_header(self, client):
+        response = client.get("/api/encounter/nope/status")
+        assert response.status_code == 404
+        assert POLL_HEADER not in response.headers
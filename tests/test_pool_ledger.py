@@ -0,0 +1,134 @@
+"""
+Tests for the Momentum/Threat pool ledger.
+
+Tests verify:
+- Pool changes are clamped in SQL and appended to the ledger with running totals
+- Required spends fail without touching the pool
+- History is persistent and paged newest first
+- Per-scene and per-round totals
+- GM undo is recorded as a correction
+"""
+
+import pytest
+
+from sta.database.pool_ledger import change_pool, pool_history, pool_totals
+from sta.database.schema import SceneRecord
+from sta.mechanics.momentum_manager import MomentumManager
+
+
+@pytest.fixture
+def gm_client(client):
+    client.cookies.set("sta_session_token", "test-token-1")
+    return client
+
+
+@pytest.mark.combat
+class TestChangePool:
+    """change_pool / pool_history / pool_totals"""
+
+    async def test_running_totals(self, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        await change_pool(test_session, encounter, "momentum", 4, "task_success", maximum=6)
+        capped = await change_pool(test_session, encounter, "momentum", 4, "task_success", maximum=6)
+        await test_session.commit()
+
+        assert (capped.previous, capped.change, capped.balance) == (4, 2, 6)
+        assert encounter.momentum == 6
+        await test_session.refresh(encounter)
+        assert encounter.momentum == 6
+
+    async def test_required_spend(self, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        await change_pool(test_session, encounter, "threat", 3, "complication")
+
+        assert await change_pool(test_session, encounter, "threat", -4, "hazard", require=True) is None
+        assert encounter.threat == 3
+        spent = await change_pool(test_session, encounter, "threat", -3, "hazard", require=True)
+        assert spent.balance == 0
+
+        entries = await pool_history(test_session, encounter_pk=encounter.id)
+        assert [entry.change for entry in entries] == [-3, 3]
+
+    async def test_history_survives_manager(self, test_session, sample_campaign):
+        campaign = sample_campaign["campaign"]
+        await MomentumManager(test_session).gain_momentum(campaign.campaign_id, 2, "task_success")
+
+        history = await MomentumManager(test_session).get_history(campaign.campaign_id)
+        assert [(change.amount, change.new_total) for change in history] == [(2, 2)]
+
+    async def test_totals_by_scene_and_round(self, test_session, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        scene = SceneRecord(campaign_id=encounter.campaign_id, name="Ambush",
+                            encounter_id=encounter.id)
+        test_session.add(scene)
+        await test_session.flush()
+
+        await change_pool(test_session, encounter, "momentum", 3, "task_success")
+        await change_pool(test_session, encounter, "momentum", -1, "bonus_dice")
+        encounter.round = 2
+        await change_pool(test_session, encounter, "momentum", -2, "bonus_dice")
+        await test_session.commit()
+
+        by_scene = await pool_totals(test_session, "scene", campaign_pk=encounter.campaign_id)
+        assert by_scene == [{
+            "scene_id": scene.id, "pool": "momentum",
+            "gained": 3, "spent": 3, "changes": 3, "balance": 0,
+        }]
+        by_round = await pool_totals(test_session, "round", encounter_pk=encounter.id)
+        assert [(row["round"], row["gained"], row["spent"], row["balance"]) for row in by_round] == [
+            (1, 3, 1, 2), (2, 0, 2, 0),
+        ]
+
+
+@pytest.mark.api
+class TestPoolLedgerRoutes:
+    """Ledger-backed pool routes"""
+
+    def test_encounter_routes_append_to_ledger(self, gm_client, sample_encounter):
+        encounter = sample_encounter["encounter"]
+        eid = encounter.encounter_id
+        campaign_id = sample_encounter["campaign"].campaign_id
+
+        gm_client.post(f"/api/encounter/{eid}/momentum", json={"change": 4})
+        gm_client.post(f"/api/encounter/{eid}/claim-momentum", json={"amount": 2})
+        response = gm_client.post(f"/api/encounter/{eid}/threat/spend", json={"spend_type": "trait_3"})
+        assert response.status_code == 400
+
+        data = gm_client.get(f"/campaigns/api/campaign/{campaign_id}/ledger").json()
+        assert [(e["pool"], e["change"], e["balance"], e["reason"]) for e in data["entries"]] == [
+            ("threat", 2, 2, "claim_momentum"),
+            ("momentum", -4, 0, "claim_momentum"),
+            ("momentum", 4, 4, "gm_adjustment"),
+        ]
+        assert data["next_before"] is None
+
+        page = gm_client.get(f"/campaigns/api/campaign/{campaign_id}/ledger?pool=momentum&limit=1").json()
+        assert [e["change"] for e in page["entries"]] == [-4]
+        rest = gm_client.get(
+            f"/campaigns/api/campaign/{campaign_id}/ledger?pool=momentum&before={page['next_before']}"
+        ).json()
+        assert [e["change"] for e in rest["entries"]] == [4]
+
+    def test_undo_is_ledgered(self, gm_client, sample_encounter):
+        eid = sample_encounter["encounter"].encounter_id
+        campaign_id = sample_encounter["campaign"].campaign_id
+        gm_client.post(f"/api/encounter/{eid}/threat", json={"change": 5})
+        assert gm_client.post(f"/api/encounter/{eid}/undo", json={}).json()["threat"] == 0
+
+        entries = gm_client.get(f"/campaigns/api/campaign/{campaign_id}/ledger").json()["entries"]
+        assert [(e["change"], e["balance"], e["reason"]) for e in entries] == [
+            (-5, 0, "gm_undo"), (5, 5, "gm_adjustment"),
+        ]
+
+    def test_totals_route(self, gm_client, client, sample_encounter):
+        eid = sample_encounter["encounter"].encounter_id
+        campaign_id = sample_encounter["campaign"].campaign_id
+        gm_client.post(f"/api/encounter/{eid}/threat", json={"change": 2})
+
+        data = gm_client.get(f"/campaigns/api/campaign/{campaign_id}/ledger/totals?group_by=round").json()
+        assert data["totals"][0]["gained"] == 2
+        assert gm_client.get(
+            f"/campaigns/api/campaign/{campaign_id}/ledger/totals?group_by=ship"
+        ).status_code == 400
+        client.cookies.clear()
+        assert client.get(f"/campaigns/api/campaign/{campaign_id}/ledger").status_code == 401
@@ -0,0 +1,256 @@
+"""Per-endpoint SQL statement budgets for polled routes.
+
+Every polled endpoint is exercised against a scaled-up encounter (many
+ships, players and log rows) and must stay within its declared budget,
+so an N+1 query creeping into a loop fails the suite instead of
+slowing down every table.
+"""
+
+import json
+import pytest
+
+from sta.database.schema import (
+    StarshipRecord,
+    EncounterRecord,
+    CombatLogRecord,
+    CampaignPlayerRecord,
+    CampaignShipRecord,
+    SceneRecord,
+    SceneParticipantRecord,
+    SceneNPCRecord,
+    NPCRecord,
+)
+from sta.database.vtt_schema import VTTCharacterRecord, VTTShipRecord
+
+ENEMY_SHIPS = 25
+PLAYERS = 30
+SCENE_NPCS = 20
+LOG_ROWS = 500
+
+# Maximum SQL statements per request, independent of fixture size.
+QUERY_BUDGETS = {
+    "/api/encounter/{encounter_id}/status": 3,
+    "/api/encounter/{encounter_id}/map": 2,
+    "/api/encounter/{encounter_id}/combat-log": 2,
+    "/api/encounter/{encounter_id}/round-status": 7,
+    "/api/encounter/{encounter_id}/player-resources": 5,
+    "/api/encounter/{encounter_id}/action-availability": 1,
+    "/api/encounter/{encounter_id}/scene": 2,
+    "/api/encounter/{encounter_id}/enemy-plan": 2,
+    "/api/backup/{campaign_id}": 6,
+    "/campaigns/{campaign_id}/join": 3,
+    "/campaigns/{campaign_id}": 10,
+}
+
+
+def _character(name, campaign_id):
+    return VTTCharacterRecord(
+        name=name,
+        attributes_json=json.dumps(
+            {
+                "control": 9,
+                "daring": 9,
+                "fitness": 9,
+                "insight": 9,
+                "presence": 9,
+                "reason": 9,
+            }
+        ),
+        disciplines_json=json.dumps(
+            {
+                "command": 2,
+                "conn": 2,
+                "engineering": 2,
+                "medicine": 2,
+                "science": 2,
+                "security": 2,
+            }
+        ),
+        values_json=json.dumps([{"name": "Duty", "description": "", "status": "available"}]),
+        campaign_id=campaign_id,
+    )
+
+
+@pytest.fixture
+async def scaled_encounter(
+    test_session, sample_campaign, sample_enemy_ship_data, sample_player_ship_data
+):
+    """An encounter large enough to expose per-row queries."""
+    campaign = sample_campaign["campaign"]
+    player_ship = sample_campaign["player_ship"]
+
+    enemy_ships = [
+        StarshipRecord(**{**sample_enemy_ship_data, "name": f"Raider {i}"})
+        for i in range(ENEMY_SHIPS)
+    ]
+    test_session.add_all(enemy_ships)
+
+    characters = [_character(f"Crew {i}", campaign.id) for i in range(PLAYERS)]
+    test_session.add_all(characters)
+    await test_session.flush()
+
+    players = [
+        CampaignPlayerRecord(
+            campaign_id=campaign.id,
+            player_name=f"Scaled Player {i}",
+            session_token=f"unclaimed_scaled_{i}" if i % 2 else f"scaled-token-{i}",
+            vtt_character_id=characters[i].id,
+            position="science",
+        )
+        for i in range(PLAYERS)
+    ]
+    test_session.add_all(players)
+
+    vtt_ships = [
+        VTTShipRecord(
+            name=f"Pool Ship {i}",
+            ship_class="Miranda",
+            scale=3,
+            systems_json=sample_player_ship_data["systems_json"],
+            departments_json=sample_player_ship_data["departments_json"],
+            campaign_id=campaign.id,
+        )
+        for i in range(ENEMY_SHIPS)
+    ]
+    test_session.add_all(vtt_ships)
+    await test_session.flush()
+    test_session.add_all(
+        CampaignShipRecord(
+            campaign_id=campaign.id, ship_id=player_ship.id, vtt_ship_id=ship.id
+        )
+        for ship in vtt_ships
+    )
+
+    encounter = EncounterRecord(
+        encounter_id="scaled-001",
+        name="Scaled",
+        campaign_id=campaign.id,
+        player_ship_id=player_ship.id,
+        enemy_ship_ids_json=json.dumps([s.id for s in enemy_ships]),
+        ship_positions_json=json.dumps(
+            {f"enemy_{i}": {"q": i % 3, "r": 0} for i in range(ENEMY_SHIPS)}
+        ),
+        round=3,
+        current_turn="player",
+        is_active=True,
+        active_effects_json="[]",
+    )
+    test_session.add(encounter)
+    await test_session.flush()
+
+    scene = SceneRecord(
+        campaign_id=campaign.id,
+        encounter_id=encounter.id,
+        name="Scaled Scene",
+        scene_type="starship_encounter",
+        status="active",
+    )
+    test_session.add(scene)
+    await test_session.flush()
+
+    test_session.add_all(
+        SceneParticipantRecord(
+            scene_id=scene.id, character_id=char.id, player_id=player.id
+        )
+        for char, player in zip(characters, players)
+    )
+    npcs = [NPCRecord(name=f"Officer {i}") for i in range(SCENE_NPCS)]
+    test_session.add_all(npcs)
+    await test_session.flush()
+    test_session.add_all(
+        SceneNPCRecord(scene_id=scene.id, npc_id=npc.id, order_index=i)
+        for i, npc in enumerate(npcs)
+    )
+
+    test_session.add_all(
+        CombatLogRecord(
+            encounter_id=encounter.id,
+            round=1 + i % 3,
+            actor_name="Actor",
+            actor_type="player",
+            ship_name=player_ship.name,
+            action_name="Pass",
+            action_type="major",
+            description=f"Entry {i}",
+        )
+        for i in range(LOG_ROWS)
+    )
+    await test_session.commit()
+
+    return {"encounter": encounter, "campaign": campaign, "scene": scene}
+
+
+def _url(template, scaled_encounter):
+    return template.format(
+        encounter_id=scaled_encounter["encounter"].encounter_id,
+        campaign_id=scaled_encounter["campaign"].campaign_id,
+    )
+
+
+@pytest.mark.query_budget
+class TestPolledEndpointBudgets:
+    """Polled endpoints issue a constant number of queries."""
+
+    @pytest.mark.parametrize("template", sorted(QUERY_BUDGETS))
+    async def test_endpoint_within_budget(
+        self, query_budget, scaled_encounter, template
+    ):
+        url = _url(template, scaled_encounter)
+        response = query_budget("GET", url, budget=QUERY_BUDGETS[template])
+        assert response.status_code == 200
+
+    async def test_status_returns_all_ships_for_gm(self, query_budget, scaled_encounter):
+        url = _url("/api/encounter/{encounter_id}/status", scaled_encounter)
+        response = query_budget(
+            "GET", url + "?role=gm", budget=QUERY_BUDGETS[
+                "/api/encounter/{encounter_id}/status"
+            ]
+        )
+        assert len(response.json()["ships_info"]) == ENEMY_SHIPS + 1
+
+    async def test_round_status_lists_every_participant(
+        self, query_budget, scaled_encounter
+    ):
+        template = "/api/encounter/{encounter_id}/round-status"
+        response = query_budget(
+            "GET", _url(template, scaled_encounter), budget=QUERY_BUDGETS[template]
+        )
+        data = response.json()
+        assert data["summary"]["players_total"] == PLAYERS
+        assert data["summary"]["npcs_total"] == SCENE_NPCS
+        assert data["summary"]["enemy_ships_total"] == ENEMY_SHIPS
+        assert data["npcs"][0]["name"] == "Officer 0"
+
+    async def test_combat_log_returns_all_rows(self, query_budget, scaled_encounter):
+        template = "/api/encounter/{encounter_id}/combat-log"
+        response = query_budget(
+            "GET", _url(template, scaled_encounter), budget=QUERY_BUDGETS[template]
+        )
+        assert response.json()["count"] == LOG_ROWS
+
+
+@pytest.mark.query_budget
+class TestQueryBudgetFixture:
+    """The budget fixture itself reports overruns."""
+
+    async def test_overrun_fails_the_test(self, query_budget, scaled_encounter):
+        url = _url("/api/encounter/{encounter_id}/status", scaled_encounter)
+        with pytest.raises(pytest.fail.Exception, match="budget 0"):
+            query_budget("GET", url, budget=0)
+
+
+@pytest.mark.query_budget
+class TestSyntheticCampaignBudgets:
+    """The same budgets hold against a synthetic long-running campaign."""
+
+    @pytest.mark.parametrize("template", sorted(QUERY_BUDGETS))
+    async def test_endpoint_within_budget(
+        self, client, query_budget, build_synthetic_campaign, template
+    ):
+        dataset = await build_synthetic_campaign("medium")
+        client.cookies.set("sta_session_token", dataset.gm_token)
+        url = template.format(
+            encounter_id=dataset.active_encounter_id, campaign_id=dataset.campaign_id
+        )
+        response = query_budget("GET", url, budget=QUERY_BUDGETS[template])
+        assert response.status_code == 200
@@ -0,0 +1,84 @@
+"""
+Tests for the read-only session pool.
+
+Tests verify:
+- Read sessions refuse writes
+- Under WAL a read session neither waits for nor sees an open write
+- The polled GET endpoints use the read-only dependency
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from sta.database.async_db import create_read_engine, get_read_db, is_file_database, use_wal
+from sta.web.routes.api_router import api_router
+
+POLLED_PATHS = [
+    "/encounter/{encounter_id}/status",
+    "/encounter/{encounter_id}/map",
+    "/encounter/{encounter_id}/round-status",
+    "/encounter/{encounter_id}/combat-log",
+    "/encounter/{encounter_id}/player-resources",
+    "/personnel/{scene_id}/status",
+]
+
+
+@pytest.fixture
+async def engines(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'live.db'}"
+    writer = create_async_engine(url)
+    use_wal(writer)
+    async with writer.begin() as conn:
+        await conn.execute(text("CREATE TABLE logs (id INTEGER PRIMARY KEY, body TEXT)"))
+        await conn.execute(text("INSERT INTO logs (body) VALUES ('first')"))
+    reader = create_read_engine(url, pool_size=2)
+    yield writer, reader
+    await reader.dispose()
+    await writer.dispose()
+
+
+async def _count(session):
+    return await session.scalar(text("SELECT count(*) FROM logs"))
+
+
+class TestReadEngine:
+    """create_read_engine"""
+
+    def test_file_databases_only(self, engines):
+        writer, _ = engines
+        assert is_file_database(writer.url)
+        assert not is_file_database(create_async_engine("sqlite+aiosqlite:///:memory:").url)
+
+    async def test_refuses_writes(self, engines):
+        writer, reader = engines
+        async with AsyncSession(reader) as session:
+            assert await session.scalar(text("PRAGMA journal_mode")) == "wal"
+            with pytest.raises(OperationalError, match="readonly"):
+                await session.execute(text("INSERT INTO logs (body) VALUES ('nope')"))
+
+    async def test_snapshot_reads_beside_a_writer(self, engines):
+        writer, reader = engines
+        async with AsyncSession(writer) as write_session:
+            await write_session.execute(text("INSERT INTO logs (body) VALUES ('second')"))
+
+            # The writer holds its lock; reads go straight through
+            async with AsyncSession(reader) as read_session:
+                assert await _count(read_session) == 1
+                await write_session.commit()
+                # Still the snapshot the read transaction started with
+                assert await _count(read_session) == 1
+
+        async with AsyncSession(reader) as read_session:
+            assert await _count(read_session) == 2
+
+
+class TestPolledRoutes:
+    """Polled GETs depend on get_read_db"""
+
+    def test_routes_use_read_sessions(self):
+        routes = {route.path: route for route in api_router.routes if "GET" in route.methods}
+        for path in POLLED_PATHS:
+            calls = {dependency.call for dependency in routes[path].dependant.dependencies}
+            assert get_read_db in calls, path
@@ -10,6 +10,7 @@ from sta.database import (
     StarshipRecord,
     EncounterRecord,
     PersonnelEncounterRecord,
+    PersonnelParticipantRecord,
     VTTCharacterRecord,
     CampaignPlayerRecord,
 )
@@ -329,9 +330,15 @@ class TestSceneActivationAPI:
         assert pe.momentum == 2
         assert pe.threat == campaign.threat  # unchanged
 
-        # Verify character_states_json
-        states = json.loads(pe.character_states_json)
+        # Verify participant rows
+        rows = await test_session.execute(
+            select(PersonnelParticipantRecord)
+            .filter(PersonnelParticipantRecord.personnel_encounter_id == pe_id)
+            .order_by(PersonnelParticipantRecord.slot)
+        )
+        states = [row.to_dict() for row in rows.scalars().all()]
         assert len(states) == 2
+        assert [s["index"] for s in states] == [0, 1]
         # Find PC state
         pc_state = next(s for s in states if s["character_id"] == pc_char.id)
         assert pc_state["name"] == "PC Hero"
@@ -1,9 +1,8 @@
 """Tests for scene connection management (M3 Task 3.2)."""
 
-import json
 import pytest
-from sqlalchemy import select
 from sta.database import SceneRecord
+from sta.database.scene_graph import connect_scenes, scene_connections
 
 
 class TestSceneConnectionsAPI:
@@ -83,12 +82,8 @@ class TestSceneConnectionsAPI:
         data = response.json()
         assert next_scene.id in data["next_scene_ids"]
 
-        session.expire(scene)
-        result = await session.execute(
-            select(SceneRecord).filter(SceneRecord.id == scene_id)
-        )
-        scene = result.scalars().first()
-        assert next_scene.id in json.loads(scene.next_scene_ids_json)
+        connections = await scene_connections(session, scene_id)
+        assert next_scene.id in connections["next_scene_ids"]
 
     @pytest.mark.asyncio
     async def test_update_connections_add_previous(self, client, setup_scene_with_data):
@@ -131,7 +126,7 @@ class TestSceneConnectionsAPI:
         session.add(next_scene)
         await session.flush()
 
-        scene.next_scene_ids_json = json.dumps([next_scene.id])
+        await connect_scenes(session, campaign.id, scene_id, next_scene.id)
         await session.commit()
 
         response = client.put(
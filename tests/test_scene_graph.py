@@ -0,0 +1,143 @@
+"""
+Tests for the scene graph edge table.
+
+Tests verify:
+- Connections are stored once and visible from both scenes
+- Reachability and distances over cyclic graphs
+- Shortest paths between scenes
+- The cached campaign flowchart is rebuilt when scenes or edges change
+- Edges are removed with their scenes
+"""
+
+import pytest
+
+from sta.database.scene_graph import (
+    campaign_flowchart,
+    connect_scenes,
+    flowchart_cache,
+    next_scene_candidates,
+    reachable_scene_ids,
+    scene_connections,
+    scene_distances,
+    scene_path,
+)
+from sta.database.schema import SceneRecord
+
+
+@pytest.fixture
+async def scenes(test_session, sample_campaign):
+    """Five draft scenes of the sample campaign, keyed 1..5 by position."""
+    campaign = sample_campaign["campaign"]
+    records = [
+        SceneRecord(campaign_id=campaign.id, name=f"Scene {n}", status="draft")
+        for n in range(1, 6)
+    ]
+    test_session.add_all(records)
+    await test_session.commit()
+    return {n: record.id for n, record in enumerate(records, start=1)}
+
+
+@pytest.fixture
+def gm_client(client):
+    client.cookies.set("sta_session_token", "test-token-1")
+    return client
+
+
+async def _chain(db, campaign_id, *pairs):
+    for from_id, to_id in pairs:
+        await connect_scenes(db, campaign_id, from_id, to_id)
+    await db.commit()
+
+
+@pytest.mark.scene_connections
+class TestSceneGraph:
+    """Edge helpers and CTE traversal"""
+
+    async def test_traversal_with_cycle(self, test_session, sample_campaign, scenes):
+        campaign_id = sample_campaign["campaign"].id
+        s = scenes
+        # 1 -> 2 -> 3 -> 1 (cycle), 3 -> 4, 1 -> 4
+        await _chain(test_session, campaign_id,
+                     (s[1], s[2]), (s[2], s[3]), (s[3], s[1]), (s[3], s[4]), (s[1], s[4]))
+
+        assert await reachable_scene_ids(test_session, s[2]) == {s[1], s[3], s[4]}
+        assert await reachable_scene_ids(test_session, s[4], "previous") == {s[1], s[2], s[3]}
+        assert await reachable_scene_ids(test_session, s[5]) == set()
+        assert await scene_distances(test_session, s[2]) == {s[3]: 1, s[1]: 2, s[4]: 2}
+
+        assert await scene_path(test_session, s[2], s[4]) == [s[2], s[3], s[4]]
+        assert await scene_path(test_session, s[3], s[2]) == [s[3], s[1], s[2]]
+        assert await scene_path(test_session, s[4], s[1]) is None
+
+    async def test_connections_are_symmetric(self, test_session, sample_campaign, scenes):
+        campaign_id = sample_campaign["campaign"].id
+        s = scenes
+        await _chain(test_session, campaign_id, (s[1], s[2]), (s[1], s[3]))
+        assert not await connect_scenes(test_session, campaign_id, s[1], s[2])
+
+        assert await scene_connections(test_session, s[1]) == {
+            "next_scene_ids": [s[2], s[3]], "previous_scene_ids": [],
+        }
+        assert (await scene_connections(test_session, s[3]))["previous_scene_ids"] == [s[1]]
+        assert [c["id"] for c in await next_scene_candidates(test_session, s[1])] == [s[2], s[3]]
+
+    async def test_flowchart_cache(self, test_session, sample_campaign, scenes):
+        flowchart_cache.clear()
+        campaign_id = sample_campaign["campaign"].id
+        s = scenes
+        await _chain(test_session, campaign_id, (s[1], s[2]))
+
+        first = await campaign_flowchart(test_session, campaign_id)
+        assert first["edges"] == [{"from": s[1], "to": s[2]}]
+        assert first["roots"] == [s[1], s[3], s[4], s[5]]
+        assert await campaign_flowchart(test_session, campaign_id) is first
+
+        await _chain(test_session, campaign_id, (s[2], s[3]))
+        second = await campaign_flowchart(test_session, campaign_id)
+        assert second is not first
+        assert second["roots"] == [s[1], s[4], s[5]]
+
+
+@pytest.mark.scene_connections
+@pytest.mark.api
+class TestSceneGraphRoutes:
+    """Routes backed by the edge table"""
+
+    def test_put_and_traverse(self, gm_client, sample_campaign, scenes):
+        s = scenes
+        response = gm_client.put(f"/scenes/{s[1]}/connections",
+                                 json={"next_scene_ids": [s[2], s[3], 99999]})
+        assert response.json()["next_scene_ids"] == [s[2], s[3]]
+        gm_client.post(f"/scenes/{s[3]}/connections/next", json={"target_scene_id": s[4]})
+
+        previous = gm_client.get(f"/scenes/{s[4]}/connections").json()["previous_scene_ids"]
+        assert previous == [s[3]]
+        reachable = gm_client.get(f"/scenes/{s[1]}/reachable").json()["scenes"]
+        assert reachable == [
+            {"id": s[2], "distance": 1}, {"id": s[3], "distance": 1}, {"id": s[4], "distance": 2},
+        ]
+        assert gm_client.get(f"/scenes/{s[1]}/path/{s[4]}").json() == {
+            "path": [s[1], s[3], s[4]], "reachable": True,
+        }
+        assert gm_client.get(f"/scenes/{s[1]}/reachable?direction=up").status_code == 400
+
+        options = gm_client.get(f"/scenes/{s[1]}/closing-options").json()
+        assert [c["id"] for c in options["next_scene_candidates"]] == [s[2], s[3]]
+
+    def test_flowchart_and_delete(self, gm_client, client, sample_campaign, scenes):
+        flowchart_cache.clear()
+        campaign_pk = sample_campaign["campaign"].id
+        s = scenes
+        gm_client.put(f"/scenes/{s[2]}/connections",
+                      json={"previous_scene_ids": [s[1]], "next_scene_ids": [s[3]]})
+
+        chart = gm_client.get(f"/scenes/campaign/{campaign_pk}/flowchart").json()
+        assert len(chart["edges"]) == 2
+
+        assert gm_client.delete(f"/campaigns/api/scene/{s[2]}").status_code == 200
+        chart = gm_client.get(f"/scenes/campaign/{campaign_pk}/flowchart").json()
+        assert chart["edges"] == []
+        assert gm_client.get(f"/scenes/{s[1]}/connections").json()["next_scene_ids"] == []
+
+        client.cookies.clear()
+        assert client.get(f"/scenes/campaign/{campaign_pk}/flowchart").status_code == 401
@@ -0,0 +1,157 @@
+"""
+Tests for the startup schema check.
+
+Tests verify:
+- A new database is created and stamped at the Alembic head
+- An up-to-date database costs one statement at startup
+- A database from before the Alembic tree was run gets the old startup migrations
+- A stale version with a versioned database re-runs the upgrade
+- Alembic, which startup imports, is a runtime dependency
+"""
+
+import json
+import sqlite3
+import tomllib
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import Session
+
+from sta.database.schema import Base, CampaignRecord, SceneRecord
+from sta.database.schema_version import (
+    ensure_schema,
+    schema_fingerprint,
+    schema_version,
+    stored_version,
+)
+
+HEAD = "008_job_created_by"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "sta.db"
+
+
+@pytest.fixture
+def sync_engine(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    yield engine
+    engine.dispose()
+
+
+def _alembic_revision(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT version_num FROM alembic_version").fetchall()
+
+
+def _make_legacy_database(sync_engine, db_path):
+    """Tables from create_all, minus what the old run_migrations() added."""
+    Base.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        campaign = CampaignRecord(campaign_id="c-1", name="Legacy")
+        session.add(campaign)
+        session.flush()
+        session.add_all([
+            SceneRecord(id=1, campaign_id=campaign.id, name="First",
+                        next_scene_ids_json=json.dumps([2])),
+            SceneRecord(id=2, campaign_id=campaign.id, name="Second",
+                        previous_scene_ids_json=json.dumps([1])),
+        ])
+        session.commit()
+
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(
+            """
+            ALTER TABLE starships RENAME COLUMN ship_registry TO registry;
+            ALTER TABLE starships DROP COLUMN weapons_armed;
+            DROP INDEX ix_encounters_campaign_status;
+            ALTER TABLE encounters DROP COLUMN hailing_state_json;
+            ALTER TABLE encounters DROP COLUMN status;
+            ALTER TABLE campaigns DROP COLUMN gm_password_hash;
+            """
+        )
+
+
+class TestFreshDatabase:
+    """ensure_schema on an empty database"""
+
+    def test_creates_and_stamps_head(self, sync_engine, db_path):
+        with sync_engine.begin() as conn:
+            assert ensure_schema(conn) is True
+
+        tables = set(inspect(sync_engine).get_table_names())
+        assert set(Base.metadata.tables) <= tables
+        assert _alembic_revision(db_path) == [(HEAD,)]
+        with sync_engine.connect() as conn:
+            assert stored_version(conn) == schema_version()
+
+    def test_up_to_date_is_one_statement(self, sync_engine):
+        with sync_engine.begin() as conn:
+            ensure_schema(conn)
+
+        statements = []
+        event.listen(
+            sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        with sync_engine.begin() as conn:
+            assert ensure_schema(conn) is False
+        assert statements == ["PRAGMA user_version"]
+
+
+class TestExistingDatabase:
+    """ensure_schema on databases made before this version"""
+
+    def test_legacy_database_gets_startup_migrations(self, sync_engine, db_path):
+        _make_legacy_database(sync_engine, db_path)
+
+        with sync_engine.begin() as conn:
+            assert ensure_schema(conn) is True
+
+        inspector = inspect(sync_engine)
+        starship_columns = {c["name"] for c in inspector.get_columns("starships")}
+        assert {"ship_registry", "weapons_armed"} <= starship_columns
+        assert "registry" not in starship_columns
+        encounter_columns = {c["name"] for c in inspector.get_columns("encounters")}
+        assert {"status", "hailing_state_json"} <= encounter_columns
+        assert "gm_password_hash" in {c["name"] for c in inspector.get_columns("campaigns")}
+        assert "ix_encounters_campaign_status" in {
+            i["name"] for i in inspector.get_indexes("encounters")
+        }
+        assert _alembic_revision(db_path) == [(HEAD,)]
+
+        with sqlite3.connect(db_path) as conn:
+            edges = conn.execute(
+                "SELECT from_scene_id, to_scene_id FROM scene_edges"
+            ).fetchall()
+            legacy = conn.execute(
+                "SELECT next_scene_ids_json, previous_scene_ids_json FROM scenes"
+            ).fetchall()
+        assert edges == [(1, 2)]
+        assert set(legacy) == {("[]", "[]")}
+
+    def test_stale_version_reruns_upgrade(self, sync_engine, db_path):
+        with sync_engine.begin() as conn:
+            ensure_schema(conn)
+            conn.exec_driver_sql("PRAGMA user_version = 7")
+
+        with sync_engine.begin() as conn:
+            assert ensure_schema(conn) is True
+            assert stored_version(conn) == schema_version()
+        assert _alembic_revision(db_path) == [(HEAD,)]
+
+
+def test_version_follows_fingerprint():
+    assert 0 < schema_version() < 2**31
+    assert schema_version() == int(schema_fingerprint()[:8], 16) & 0x7FFFFFFF
+
+
+class TestPackaging:
+    """pyproject.toml"""
+
+    def test_alembic_is_a_runtime_dependency(self):
+        pyproject = Path(__file__).resolve().parent.parent / "pyproject.toml"
+        project = tomllib.loads(pyproject.read_text())["project"]
+        assert any(dep.startswith("alembic") for dep in project["dependencies"])
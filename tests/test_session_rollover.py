@@ -0,0 +1,136 @@
+"""
+Tests for the campaign session rollover.
+
+Tests verify:
+- Every character's Values are refreshed, Determination reset and Stress recovered
+- Each character gets a MISSION log entry
+- Characters in other campaigns are untouched
+- Only the GM can roll over, and the whole campaign costs a fixed number of queries
+"""
+
+import json
+
+import pytest
+from sqlalchemy import select
+
+from sta.database.vtt_schema import LogEntryRecord, VTTCharacterRecord
+from sta.web.routes.campaigns_router import SESSION_LOG
+
+CREW = 24
+
+USED_VALUES = [
+    {"name": "Duty First", "helpful": True, "used_this_session": True,
+     "last_challenged_session": True},
+    {"name": "Curiosity", "description": "Always asks", "last_complied_session": True,
+     "interaction_count": 2},
+]
+
+
+def _character(campaign_id, name, values_json=json.dumps(USED_VALUES)):
+    return VTTCharacterRecord(
+        campaign_id=campaign_id,
+        name=name,
+        attributes_json=json.dumps({}),
+        disciplines_json=json.dumps({}),
+        values_json=values_json,
+        stress=1,
+        stress_max=11,
+        determination=3,
+        determination_max=3,
+    )
+
+
+@pytest.fixture
+def gm_client(client):
+    client.cookies.set("sta_session_token", "test-token-1")
+    return client
+
+
+@pytest.fixture
+async def crew(test_session, sample_campaign):
+    campaign = sample_campaign["campaign"]
+    characters = [_character(campaign.id, f"Crew {i}") for i in range(CREW)]
+    test_session.add_all(characters)
+    await test_session.commit()
+    return campaign, characters
+
+
+def _rollover_url(campaign):
+    return f"/campaigns/api/campaign/{campaign.campaign_id}/session/rollover"
+
+
+class TestSessionRollover:
+    """POST /campaigns/api/campaign/{campaign_id}/session/rollover"""
+
+    async def test_resets_every_character(self, gm_client, test_session, crew):
+        campaign, characters = crew
+        response = gm_client.post(_rollover_url(campaign))
+        assert response.status_code == 200
+        assert response.json()["characters"] == CREW
+
+        for character in characters:
+            await test_session.refresh(character)
+            assert (character.stress, character.determination) == (0, 1)
+            assert json.loads(character.values_json) == [
+                {"name": "Duty First", "helpful": True, "used_this_session": False},
+                {"name": "Curiosity", "description": "Always asks",
+                 "interaction_count": 2, "used_this_session": False},
+            ]
+
+        values = gm_client.get(f"/api/characters/{characters[0].id}/values/status").json()
+        assert {v["status"] for v in values["values"]} == {"Available"}
+
+    async def test_logs_mission_entry_per_character(self, gm_client, test_session, crew):
+        campaign, characters = crew
+        gm_client.post(_rollover_url(campaign))
+
+        logs = (
+            await test_session.execute(
+                select(LogEntryRecord).filter(LogEntryRecord.campaign_id == campaign.id)
+            )
+        ).scalars().all()
+        assert sorted(log.character_id for log in logs) == sorted(c.id for c in characters)
+        assert {(log.log_type, log.event_type, log.content) for log in logs} == {
+            ("MISSION", "session_start", SESSION_LOG)
+        }
+        assert {log.character_name for log in logs} == {c.name for c in characters}
+
+        feed = gm_client.get(
+            f"/campaigns/api/campaign/{campaign.campaign_id}/logs",
+            params={"event_type": "session_start"},
+        ).json()
+        assert len(feed["logs"]) == CREW
+
+    async def test_odd_values_and_other_campaigns(self, gm_client, test_session, crew):
+        campaign, _ = crew
+        low_max = _character(campaign.id, "Cadet", values_json="[]")
+        low_max.determination, low_max.determination_max = 0, 0
+        broken = _character(campaign.id, "Garbled", values_json="not json")
+        outsider = _character(None, "Outsider")
+        test_session.add_all([low_max, broken, outsider])
+        await test_session.commit()
+
+        gm_client.post(_rollover_url(campaign))
+
+        for character in (low_max, broken, outsider):
+            await test_session.refresh(character)
+        assert (low_max.values_json, low_max.determination) == ("[]", 0)
+        assert (broken.values_json, broken.stress) == ("not json", 0)
+        assert (outsider.stress, outsider.determination) == (1, 3)
+        assert json.loads(outsider.values_json) == USED_VALUES
+
+    def test_requires_gm(self, client, crew):
+        campaign, _ = crew
+        assert client.post(_rollover_url(campaign)).status_code == 401
+        client.cookies.set("sta_session_token", "test-token-2")
+        assert client.post(_rollover_url(campaign)).status_code == 401
+
+    def test_unknown_campaign(self, gm_client):
+        response = gm_client.post("/campaigns/api/campaign/nope/session/rollover")
+        assert response.status_code == 404
+
+    @pytest.mark.query_budget
+    def test_whole_campaign_within_budget(self, query_budget, gm_client, crew):
+        campaign, _ = crew
+        response = query_budget("POST", _rollover_url(campaign), budget=4)
+        assert response.json()["characters"] == CREW
@@ -0,0 +1,82 @@
+"""
+Tests for the synthetic campaign dataset generator.
+
+Tests verify:
+- Every table is loaded at the requested scale
+- The same seed loads the same data
+- The loaded rows hang together (scene graph, players, active encounter)
+"""
+
+from sqlalchemy import func, select
+
+from benchmarks.dataset import SCALES
+from sta.database.scene_graph import reachable_scene_ids
+from sta.database.schema import (
+    CampaignPlayerRecord,
+    CombatLogRecord,
+    EncounterRecord,
+    SceneRecord,
+)
+from sta.database.vtt_schema import LogEntryRecord, VTTCharacterRecord
+
+
+async def _names(db, campaign_pk):
+    result = await db.execute(
+        select(VTTCharacterRecord.name)
+        .filter(VTTCharacterRecord.campaign_id == campaign_pk)
+        .order_by(VTTCharacterRecord.id)
+    )
+    return result.scalars().all()
+
+
+class TestSyntheticCampaign:
+    """benchmarks.dataset.build_campaign"""
+
+    async def test_loads_every_table(self, synthetic_campaign):
+        scale = SCALES["small"]
+        counts = synthetic_campaign.counts
+        assert counts["vtt_characters"] == scale.characters
+        assert counts["log_entries"] == scale.log_entries
+        assert counts["vtt_ships"] == counts["campaign_ships"] == scale.ships
+        assert counts["universe_items"] == scale.universe_items
+        assert counts["scenes"] == scale.scenes
+        assert counts["scene_edges"] >= scale.scenes - 1
+        assert counts["encounters"] == scale.encounters
+        assert counts["combat_log"] == scale.encounters * scale.combat_log_per_encounter
+
+    async def test_seeded(self, test_session, build_synthetic_campaign):
+        first = await build_synthetic_campaign(seed=5)
+        again = await build_synthetic_campaign(seed=5, campaign_id="again")
+        other = await build_synthetic_campaign(seed=6)
+
+        names = await _names(test_session, first.campaign_pk)
+        assert names == await _names(test_session, again.campaign_pk)
+        assert names != await _names(test_session, other.campaign_pk)
+
+    async def test_rows_hang_together(self, test_session, synthetic_campaign):
+        dataset = synthetic_campaign
+        first_scene = await test_session.scalar(
+            select(func.min(SceneRecord.id)).filter(SceneRecord.campaign_id == dataset.campaign_pk)
+        )
+        reachable = await reachable_scene_ids(test_session, first_scene)
+        assert len(reachable) == SCALES["small"].scenes - 1
+
+        scene = await test_session.get(SceneRecord, dataset.active_scene_id)
+        encounter = await test_session.get(EncounterRecord, scene.encounter_id)
+        assert (scene.status, encounter.encounter_id) == ("active", dataset.active_encounter_id)
+        assert await test_session.scalar(
+            select(func.count(CombatLogRecord.id))
+            .filter(CombatLogRecord.encounter_id == encounter.id)
+        ) == SCALES["small"].combat_log_per_encounter
+
+        players = (await test_session.execute(
+            select(CampaignPlayerRecord).filter(
+                CampaignPlayerRecord.campaign_id == dataset.campaign_pk)
+        )).scalars().all()
+        assert [p.session_token for p in players if p.is_gm] == [dataset.gm_token]
+        character_ids = {p.vtt_character_id for p in players if not p.is_gm}
+        logged = await test_session.scalar(
+            select(func.count(LogEntryRecord.id))
+            .filter(LogEntryRecord.character_id.in_(character_ids))
+        )
+        assert logged > SCALES["small"].log_entries // 2  # Logs lean towards the players
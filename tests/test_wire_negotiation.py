@@ -0,0 +1,130 @@
+"""
+Tests for Accept-negotiated MessagePack responses.
+
+Tests verify:
+- packb/unpackb round-trip the JSON data model with the smallest encodings
+- Accept headers pick MessagePack only when they prefer it
+- Polled endpoints answer in either format with the same payload
+- Integers beyond 64 bits fall back to JSON
+- Responses are gzipped for clients that accept it
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from sta.web.negotiation import (
+    MSGPACK_MEDIA_TYPE,
+    NegotiatedResponse,
+    packb,
+    prefers_msgpack,
+    unpackb,
+)
+from sta.web.polling import POLL_HEADER
+
+
+class TestCodec:
+    """packb / unpackb"""
+
+    @pytest.mark.parametrize("value, encoded", [
+        (None, b"\xc0"),
+        (True, b"\xc3"),
+        (0, b"\x00"),
+        (127, b"\x7f"),
+        (128, b"\xcc\x80"),
+        (-32, b"\xe0"),
+        (-33, b"\xd0\xdf"),
+        (65536, b"\xce\x00\x01\x00\x00"),
+        (1.5, b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00"),
+        ("a", b"\xa1a"),
+        ([1, 2], b"\x92\x01\x02"),
+        ({"a": 1}, b"\x81\xa1a\x01"),
+    ])
+    def test_encodings(self, value, encoded):
+        assert packb(value) == encoded
+        assert unpackb(encoded) == value
+
+    def test_round_trips_like_json(self):
+        value = {
+            "players_info": [{"has_claimed": i % 2 == 0, "id": i, "stress": -i} for i in range(40)],
+            "ints": [2**16, 2**32, 2**63 - 1, -2**15 - 1, -2**63],
+            "text": ["é" * 40, "x" * 300, "y" * 70000],
+            7: "non-string keys become strings",
+        }
+        assert unpackb(packb(value)) == json.loads(json.dumps(value))
+
+    def test_rejects_other_types(self):
+        with pytest.raises(TypeError):
+            packb({"when": object()})
+        with pytest.raises(ValueError):
+            unpackb(b"\xc0\xc0")
+        with pytest.raises(OverflowError):
+            packb({"id": 2**64})
+
+
+class TestNegotiation:
+    """prefers_msgpack"""
+
+    @pytest.mark.parametrize("accept, expected", [
+        ("application/msgpack", True),
+        ("application/vnd.msgpack, application/json;q=0.9", True),
+        ("*/*", False),
+        ("application/json", False),
+        ("application/json, application/msgpack;q=0.5", False),
+        ("application/msgpack;q=0", False),
+        ("text/html, application/x-msgpack;q=0.8", True),
+    ])
+    def test_accept(self, accept, expected):
+        assert prefers_msgpack(accept) is expected
+
+
+class TestPolledEndpoints:
+    """Negotiated responses from the polled encounter endpoints"""
+
+    @pytest.mark.parametrize("path", ["status", "map", "combat-log", "round-status"])
+    def test_same_payload(self, client, sample_encounter, path):
+        url = f"/api/encounter/{sample_encounter['encounter'].encounter_id}/{path}"
+        identity = {"Accept-Encoding": "identity"}
+        as_json = client.get(url, headers=identity)
+        as_msgpack = client.get(url, headers={"Accept": MSGPACK_MEDIA_TYPE, **identity})
+
+        assert as_json.headers["content-type"] == "application/json"
+        assert as_msgpack.headers["content-type"] == MSGPACK_MEDIA_TYPE
+        assert as_json.headers["vary"] == as_msgpack.headers["vary"]
+        assert "Accept" in as_json.headers["vary"].split(", ")
+        assert as_msgpack.headers[POLL_HEADER] == as_json.headers[POLL_HEADER]
+        assert int(as_msgpack.headers["content-length"]) == len(as_msgpack.content)
+        assert len(as_msgpack.content) < len(as_json.content)
+        assert unpackb(as_msgpack.content) == as_json.json()
+
+    def test_errors_stay_json(self, client):
+        response = client.get("/api/encounter/nope/status", headers={"Accept": MSGPACK_MEDIA_TYPE})
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Encounter not found"}
+
+    def test_wide_ints_stay_json(self):
+        app = FastAPI(default_response_class=NegotiatedResponse)
+
+        @app.get("/wide")
+        async def wide():
+            return {"id": 2**64, "offset": -2**63 - 1}
+
+        response = TestClient(app).get("/wide", headers={"Accept": MSGPACK_MEDIA_TYPE})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"id": 2**64, "offset": -2**63 - 1}
+
+    @pytest.mark.parametrize("accept", ["application/json", MSGPACK_MEDIA_TYPE])
+    def test_gzipped(self, client, sample_encounter, accept):
+        url = f"/api/encounter/{sample_encounter['encounter'].encounter_id}/status"
+        plain = client.get(url, headers={"Accept": accept, "Accept-Encoding": "identity"})
+        with client.stream("GET", url, headers={"Accept": accept, "Accept-Encoding": "gzip"}) as zipped:
+            body = b"".join(zipped.iter_raw())
+
+        assert zipped.headers["content-encoding"] == "gzip"
+        assert zipped.headers["vary"] == "Accept, Accept-Encoding"
+        assert len(body) < len(plain.content)
+        assert gzip.decompress(body) == plain.content